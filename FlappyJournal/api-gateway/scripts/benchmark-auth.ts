@@ -0,0 +1,128 @@
+/**
+ * Per-request authentication cost benchmark
+ *
+ * Serves a JWKS for a freshly generated RSA key from a local HTTP server,
+ * points the gateway's auth middleware at it and times authenticate() for
+ * the same requests with the verified-token cache on and off: a client
+ * reusing one token, a pool of active sessions, and a client retrying a
+ * token with a bad signature. Ends with the cache's own stats.
+ *
+ * Usage:
+ *   npx tsx scripts/benchmark-auth.ts [--requests=20000] [--sessions=500]
+ */
+import http from 'http';
+import crypto from 'crypto';
+import { AddressInfo } from 'net';
+import jwt from 'jsonwebtoken';
+
+const args = process.argv.slice(2);
+const argValue = (name: string, fallback: number) =>
+  parseInt(args.find(arg => arg.startsWith(`--${name}=`))?.split('=')[1] || String(fallback));
+const REQUESTS = argValue('requests', 20000);
+const SESSIONS = argValue('sessions', 500);
+const REALM = 'featherweight';
+const KID = 'benchmark-key';
+
+function startJwksServer(publicKey: crypto.KeyObject): Promise<http.Server> {
+  const jwk = { ...publicKey.export({ format: 'jwk' }), kid: KID, use: 'sig', alg: 'RS256' };
+  const server = http.createServer((req, res) => {
+    res.setHeader('Content-Type', 'application/json');
+    res.end(JSON.stringify({ keys: [jwk] }));
+  });
+  return new Promise(resolve => server.listen(0, '127.0.0.1', () => resolve(server)));
+}
+
+function mockResponse() {
+  const res: any = { statusCode: 200 };
+  res.status = (code: number) => {
+    res.statusCode = code;
+    return res;
+  };
+  res.json = () => res;
+  return res;
+}
+
+async function run() {
+  const { privateKey, publicKey } = crypto.generateKeyPairSync('rsa', { modulusLength: 2048 });
+  const jwksServer = await startJwksServer(publicKey);
+  const { port } = jwksServer.address() as AddressInfo;
+
+  // Config is read at import, so the environment has to be in place first
+  process.env.KEYCLOAK_SERVER_URL = `http://127.0.0.1:${port}`;
+  process.env.KEYCLOAK_REALM = REALM;
+  process.env.NODE_ENV = 'production';
+  process.env.LOG_LEVEL = 'error';
+  const { config } = await import('../src/config');
+  const { authMiddleware, getAuthCacheStats } = await import('../src/middleware/auth');
+
+  const sign = (sub: string, key: crypto.KeyObject = privateKey) => jwt.sign(
+    { sub, email: `${sub}@benchmark.local`, preferred_username: sub, realm_access: { roles: ['user'] } },
+    key,
+    {
+      algorithm: 'RS256',
+      keyid: KID,
+      audience: 'featherweight-app',
+      issuer: `${process.env.KEYCLOAK_SERVER_URL}/realms/${REALM}`,
+      expiresIn: '1h',
+    }
+  );
+  const sessionTokens = Array.from({ length: SESSIONS }, (_, i) => sign(`user-${i}`));
+  const forged = sign('intruder', crypto.generateKeyPairSync('rsa', { modulusLength: 2048 }).privateKey);
+
+  const authenticate = async (token: string) => {
+    const req: any = { headers: { authorization: `Bearer ${token}` }, get: () => 'benchmark', path: '/api/journal' };
+    const res = mockResponse();
+    let passed = false;
+    await authMiddleware.authenticate(req, res, () => {
+      passed = true;
+    });
+    return passed;
+  };
+
+  // Warm the JWKS prefetch so neither mode pays for the first key fetch
+  if (!await authenticate(sessionTokens[0])) {
+    throw new Error('Benchmark token was rejected; check the JWKS server');
+  }
+
+  const time = async (label: string, tokenFor: (i: number) => string) => {
+    const samples = new Float64Array(REQUESTS);
+    const started = performance.now();
+    for (let i = 0; i < REQUESTS; i++) {
+      const requestStarted = performance.now();
+      await authenticate(tokenFor(i));
+      samples[i] = (performance.now() - requestStarted) * 1000;
+    }
+    const seconds = (performance.now() - started) / 1000;
+    samples.sort();
+    const percentile = (quantile: number) => samples[Math.min(REQUESTS - 1, Math.floor(REQUESTS * quantile))];
+    console.log(`${label.padEnd(40)} ${(REQUESTS / seconds).toFixed(0).padStart(8)} req/s   ` +
+      `p50 ${percentile(0.5).toFixed(1).padStart(7)}µs   p95 ${percentile(0.95).toFixed(1).padStart(7)}µs   ` +
+      `p99 ${percentile(0.99).toFixed(1).padStart(7)}µs`);
+  };
+
+  const scenarios: Array<[string, (i: number) => string]> = [
+    ['one token, repeated', () => sessionTokens[0]],
+    [`${SESSIONS} active sessions`, (i) => sessionTokens[i % SESSIONS]],
+    ['forged token, retried', () => forged],
+  ];
+
+  console.log(`authenticate() over ${REQUESTS} requests per scenario (RS256, 2048-bit key)\n`);
+  for (const enabled of [false, true]) {
+    config.AUTH_CACHE.ENABLED = enabled;
+    console.log(enabled ? 'Verified-token cache enabled' : 'Verified-token cache disabled (verify every request)');
+    for (const [label, tokenFor] of scenarios) {
+      await time(`  ${label}`, tokenFor);
+    }
+    console.log('');
+  }
+
+  console.log('Cache stats:', JSON.stringify(getAuthCacheStats(), null, 2));
+  jwksServer.close();
+}
+
+run()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error('Benchmark failed:', error);
+    process.exit(1);
+  });
@@ -26,6 +26,10 @@ export const config = {
     WINDOW_MS: parseInt(process.env.RATE_LIMIT_WINDOW_MS || '300000'), // 5 minutes
     MAX_REQUESTS: parseInt(process.env.RATE_LIMIT_MAX_REQUESTS || '100'),
     SKIP_SUCCESSFUL_REQUESTS: process.env.RATE_LIMIT_SKIP_SUCCESS === 'true',
+    // 'redis' shares counters across workers/replicas; 'memory' counts per process
+    STORE: process.env.RATE_LIMIT_STORE || 'memory',
+    // Max time increments on keys well under their limit are batched before hitting the store
+    BATCH_MS: parseInt(process.env.RATE_LIMIT_BATCH_MS || '50'),
   },
   
   // Redis Configuration (for distributed rate limiting)
@@ -36,6 +40,25 @@ export const config = {
     DB: parseInt(process.env.REDIS_DB || '0'),
   },
   
+  // Response cache for polled GET endpoints (see middleware/responseCache)
+  CACHE: {
+    ENABLED: process.env.RESPONSE_CACHE_ENABLED !== 'false',
+    MAX_BYTES: parseInt(process.env.RESPONSE_CACHE_MAX_BYTES || String(64 * 1024 * 1024)),
+    MAX_ENTRY_BYTES: parseInt(process.env.RESPONSE_CACHE_MAX_ENTRY_BYTES || String(1024 * 1024)),
+  },
+  
+  // Verified JWT cache and JWKS key prefetch (see middleware/tokenCache)
+  AUTH_CACHE: {
+    ENABLED: process.env.AUTH_CACHE_ENABLED !== 'false',
+    MAX_ENTRIES: parseInt(process.env.AUTH_CACHE_MAX_ENTRIES || '10000'),
+    MAX_REJECTED_ENTRIES: parseInt(process.env.AUTH_CACHE_MAX_REJECTED_ENTRIES || '2000'),
+    // Cached claims are dropped this long before the token's exp
+    SKEW_MS: parseInt(process.env.AUTH_CACHE_SKEW_MS || '30000'),
+    REJECTED_TTL_MS: parseInt(process.env.AUTH_CACHE_REJECTED_TTL_MS || '60000'),
+    JWKS_REFRESH_MS: parseInt(process.env.AUTH_JWKS_REFRESH_MS || String(5 * 60 * 1000)),
+    JWKS_MIN_REFRESH_MS: parseInt(process.env.AUTH_JWKS_MIN_REFRESH_MS || '10000'),
+  },
+  
   // CORS Configuration
   CORS: {
     ORIGIN: process.env.CORS_ORIGIN?.split(',') || [
@@ -6,7 +6,7 @@ import logger from './utils/logger';
 
 // Middleware imports
 import { setupCORS } from './middleware/cors';
-import { securityHeaders, requestSizeLimiter, sanitizeRequest, requestTimeout } from './middleware/security';
+import { securityHeaders, stripIdentityHeaders, removeIdentityHeaders, requestSizeLimiter, sanitizeRequest, requestTimeout } from './middleware/security';
 import { requestLogger, errorLogger, requestCorrelation } from './middleware/requestLogger';
 import { 
   generalRateLimit, 
@@ -15,12 +15,15 @@ import {
   dynamicRateLimit,
   slowDownMiddleware 
 } from './middleware/rateLimiter';
+import { shutdownRateLimitStores } from './middleware/rateLimitStore';
+import { responseCache, getResponseCacheStats } from './middleware/responseCache';
 import { 
   authenticate, 
   expressJWTAuth,
   optionalAuth, 
   requireRole, 
-  requireProjectAccess 
+  requireProjectAccess,
+  getAuthCacheStats
 } from './middleware/auth';
 import { 
   dynamicProxyRouter,
@@ -45,6 +48,9 @@ if (config.TRUST_PROXY) {
   app.set('trust proxy', true);
 }
 
+// Client-supplied x-user-* headers are dropped at the edge; only the auth middleware sets them
+app.use(stripIdentityHeaders);
+
 // Basic middleware setup
 app.use(compression()); // Enable gzip compression
 app.use(express.json({ limit: '10mb' })); // Parse JSON bodies
@@ -83,6 +89,8 @@ app.get('/health', (req, res) => {
       chatOrchestrator: config.SERVICES.CHAT_ORCHESTRATOR,
       frontend: config.SERVICES.FRONTEND,
     },
+    responseCache: getResponseCacheStats(),
+    authCache: getAuthCacheStats(),
   });
 });
 
@@ -120,6 +128,7 @@ app.use('/api/auth/login', authRateLimit);
 app.use('/api/auth/register', authRateLimit);
 app.use('/api/auth/refresh', authRateLimit);
 app.use('/api/auth/*', optionalAuth); // Optional auth for auth service
+app.use('/api/auth/*', responseCache); // Cached profile reads
 app.use('/api/auth/*', authServiceProxy);
 
 // Journal API - requires express-jwt authentication and dynamic rate limiting
@@ -127,6 +136,7 @@ app.use('/api/journal/public/*', optionalAuth, dynamicRateLimit); // Public endp
 app.use('/api/journal/admin/*', expressJWTAuth(), requireRole('admin'), strictRateLimit); // Admin endpoints
 app.use('/api/journal/projects/:projectId/*', expressJWTAuth(), requireProjectAccess(), dynamicRateLimit); // Project-specific endpoints
 app.use('/api/journal/*', expressJWTAuth(), dynamicRateLimit); // All other journal endpoints require JWT
+app.use('/api/journal/*', responseCache); // Polled metrics/profile reads served from the gateway cache
 app.use('/api/journal/*', journalServiceProxy);
 
 // WebSocket API - requires express-jwt authentication
@@ -137,7 +147,7 @@ app.use('/api/ws/*', websocketServiceProxy);
 app.use('/ws/chat', expressJWTAuth());
 
 // Health check proxying
-app.use('/api/health', healthCheckProxy);
+app.use('/api/health', responseCache, healthCheckProxy);
 
 // Default routing to services
 app.use('*', dynamicProxyRouter);
@@ -145,6 +155,7 @@ app.use('*', dynamicProxyRouter);
 // Handle WebSocket upgrades
 server.on('upgrade', (request, socket, head) => {
   const url = request.url;
+  removeIdentityHeaders(request.headers);
   
   logger.info('WebSocket upgrade request', {
     url,
@@ -217,12 +228,15 @@ app.use((req: express.Request, res: express.Response) => {
 const gracefulShutdown = (signal: string) => {
   logger.info(`Received ${signal}, starting graceful shutdown`);
   
-  server.close((err) => {
+  server.close(async (err) => {
     if (err) {
       logger.error('Error during server shutdown', { error: err.message });
       process.exit(1);
     }
     
+    await shutdownRateLimitStores().catch((error) => {
+      logger.error('Error closing rate limit store', { error: error.message });
+    });
     logger.info('Server closed successfully');
     process.exit(0);
   });
@@ -5,6 +5,7 @@ import jwksClient from 'jwks-rsa';
 import { promisify } from 'util';
 import { config } from '../config';
 import logger from '../utils/logger';
+import { VerifiedTokenCache, SigningKeyPrefetcher, isPermanentRejection } from './tokenCache';
 
 export interface JWTUser {
   sub: string; // User ID
@@ -39,6 +40,8 @@ export interface AuthenticatedRequest extends Request {
 class AuthMiddleware {
   private jwksClient: jwksClient.JwksClient;
   private getSigningKey: (kid: string) => Promise<string>;
+  private signingKeys: SigningKeyPrefetcher;
+  private tokenCache: VerifiedTokenCache<JWTUser>;
 
   constructor() {
     this.jwksClient = jwksClient({
@@ -50,9 +53,48 @@ class AuthMiddleware {
     });
 
     this.getSigningKey = promisify(this.jwksClient.getSigningKey.bind(this.jwksClient));
+
+    this.tokenCache = new VerifiedTokenCache<JWTUser>({
+      maxEntries: config.AUTH_CACHE.MAX_ENTRIES,
+      maxRejectedEntries: config.AUTH_CACHE.MAX_REJECTED_ENTRIES,
+      skewMs: config.AUTH_CACHE.SKEW_MS,
+      rejectedTtlMs: config.AUTH_CACHE.REJECTED_TTL_MS,
+      isCacheableRejection: isPermanentRejection,
+    });
+
+    this.signingKeys = new SigningKeyPrefetcher(this.jwksClient, {
+      refreshIntervalMs: config.AUTH_CACHE.JWKS_REFRESH_MS,
+      minRefreshIntervalMs: config.AUTH_CACHE.JWKS_MIN_REFRESH_MS,
+      onError: (error) => logger.warn('JWKS key prefetch failed', { error: error.message }),
+      onKeysRemoved: (kids) => {
+        // Tokens signed with a retired key must be verified again (and fail)
+        logger.info('JWKS signing keys retired, clearing verified token cache', { kids });
+        this.tokenCache.clear();
+      },
+    });
   }
 
   private async verifyToken(token: string): Promise<JWTUser> {
+    // Keys are prefetched from the first verification on, so processes that
+    // never see a token don't poll the JWKS endpoint
+    this.signingKeys.start();
+    // Development mock tokens (no dots) bypass the cache
+    if (!config.AUTH_CACHE.ENABLED || (config.NODE_ENV === 'development' && !token.includes('.'))) {
+      return this.verifySignature(token);
+    }
+    return this.tokenCache.verify(token, (uncached) => this.verifySignature(uncached));
+  }
+
+  private async resolveSigningKey(kid: string): Promise<string> {
+    const prefetched = await this.signingKeys.getKey(kid);
+    if (prefetched) {
+      return prefetched;
+    }
+    const key = await this.getSigningKey(kid);
+    return 'publicKey' in key ? key.publicKey : key.rsaPublicKey;
+  }
+
+  private verifySignature(token: string): Promise<JWTUser> {
     return new Promise((resolve, reject) => {
       // For development/testing, allow a simple secret-based JWT verification fallback
       if (config.NODE_ENV === 'development' && !token.includes('.')) {
@@ -75,9 +117,7 @@ class AuthMiddleware {
         token,
         async (header, callback) => {
           try {
-            const key = await this.getSigningKey(header.kid);
-            const signingKey = 'publicKey' in key ? key.publicKey : key.rsaPublicKey;
-            callback(null, signingKey);
+            callback(null, await this.resolveSigningKey(header.kid));
           } catch (error) {
             // Fallback to simple secret verification for development
             if (config.NODE_ENV === 'development') {
@@ -304,6 +344,13 @@ class AuthMiddleware {
     }
   };
 
+  // Token cache hit rate, verify latency and JWKS prefetch state
+  getCacheStats = () => ({
+    enabled: config.AUTH_CACHE.ENABLED,
+    tokens: this.tokenCache.getStats(),
+    signingKeys: this.signingKeys.getStats(),
+  });
+
   // Role-based authorization middleware
   requireRole = (role: string) => {
     return (req: Request, res: Response, next: NextFunction): void => {
@@ -402,6 +449,8 @@ class AuthMiddleware {
 // Export singleton instance
 export const authMiddleware = new AuthMiddleware();
 
+export const getAuthCacheStats = authMiddleware.getCacheStats;
+
 // Export middleware functions
 export const authenticate = authMiddleware.authenticate;
 export const expressJWTAuth = authMiddleware.expressJWTAuth;
@@ -0,0 +1,411 @@
+import Redis from 'ioredis';
+import type { Store, Options, ClientRateLimitInfo } from 'express-rate-limit';
+import { config } from '../config';
+import logger from '../utils/logger';
+
+/**
+ * Shared counter store for express-rate-limit and express-slow-down.
+ *
+ * Counters use a sliding window approximated from two fixed buckets: the
+ * estimate is the current bucket plus the previous bucket weighted by how much
+ * of it still overlaps the window. Buckets live in a CounterBackend: Redis
+ * (one atomic INCRBY + PEXPIRE + GET per round-trip) so every gateway worker
+ * and replica shares a count, or an in-process map used directly in
+ * development and as the fallback while Redis is unreachable.
+ *
+ * On hot keys that are well under their limit, increments are batched locally
+ * for at most batchMs and flushed as a single INCRBY. A worker only batches up
+ * to a share of the headroom left at its last sync, so the headroom it can
+ * overshoot shrinks as a key approaches its limit, and keys at the limit
+ * always round-trip.
+ */
+
+export interface WindowCounts {
+  current: number;
+  previous: number;
+}
+
+export interface CounterBackend {
+  readonly name: string;
+  /**
+   * Atomically add amount to the key's bucket for this window, setting its
+   * expiry, and return it with the previous window's bucket
+   */
+  increment(key: string, amount: number, windowMs: number, now: number): Promise<WindowCounts>;
+  reset(key: string, windowMs: number, now: number): Promise<void>;
+  close?(): Promise<void>;
+}
+
+const bucketIndex = (windowMs: number, now: number) => Math.floor(now / windowMs);
+
+// Batched keys kept per store before stale entries are pruned
+const MAX_BATCHED_KEYS = 10000;
+
+// Share of a key's remaining headroom one worker may count locally between syncs
+const DEFAULT_BATCH_HEADROOM_SHARE = 0.1;
+
+/**
+ * In-process buckets. Counts are per process, so this is only exact for a single worker.
+ */
+export class MemoryCounterBackend implements CounterBackend {
+  readonly name = 'memory';
+  private buckets = new Map<string, { index: number; current: number; previous: number; windowMs: number }>();
+  private sweepTimer: NodeJS.Timeout;
+
+  constructor(sweepIntervalMs: number = 60 * 1000) {
+    this.sweepTimer = setInterval(() => this.sweep(), sweepIntervalMs);
+    this.sweepTimer.unref();
+  }
+
+  async increment(key: string, amount: number, windowMs: number, now: number): Promise<WindowCounts> {
+    const index = bucketIndex(windowMs, now);
+    let bucket = this.buckets.get(key);
+
+    if (!bucket || bucket.index < index - 1) {
+      bucket = { index, current: 0, previous: 0, windowMs };
+      this.buckets.set(key, bucket);
+    } else if (bucket.index === index - 1) {
+      bucket.previous = bucket.current;
+      bucket.current = 0;
+      bucket.index = index;
+    }
+
+    bucket.current = Math.max(0, bucket.current + amount);
+    return { current: bucket.current, previous: bucket.previous };
+  }
+
+  async reset(key: string): Promise<void> {
+    this.buckets.delete(key);
+  }
+
+  async close(): Promise<void> {
+    clearInterval(this.sweepTimer);
+    this.buckets.clear();
+  }
+
+  private sweep(): void {
+    const now = Date.now();
+    this.buckets.forEach((bucket, key) => {
+      if (bucket.index < bucketIndex(bucket.windowMs, now) - 1) {
+        this.buckets.delete(key);
+      }
+    });
+  }
+}
+
+// KEYS[1] = current bucket, KEYS[2] = previous bucket, ARGV[1] = amount, ARGV[2] = ttl ms
+const SLIDING_WINDOW_INCREMENT = `
+local current = redis.call('INCRBY', KEYS[1], ARGV[1])
+if current < 0 then
+  redis.call('SET', KEYS[1], 0)
+  current = 0
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+local previous = redis.call('GET', KEYS[2])
+return {current, tonumber(previous) or 0}
+`;
+
+type SlidingWindowRedis = Redis & {
+  slidingWindowIncrement(current: string, previous: string, amount: number, ttlMs: number): Promise<[number, number]>;
+};
+
+/**
+ * Buckets in Redis (or anything speaking the Redis protocol), shared by every gateway process
+ */
+export class RedisCounterBackend implements CounterBackend {
+  readonly name = 'redis';
+  private redis: SlidingWindowRedis;
+
+  constructor(redis: Redis) {
+    redis.defineCommand('slidingWindowIncrement', { numberOfKeys: 2, lua: SLIDING_WINDOW_INCREMENT });
+    this.redis = redis as SlidingWindowRedis;
+  }
+
+  async increment(key: string, amount: number, windowMs: number, now: number): Promise<WindowCounts> {
+    const index = bucketIndex(windowMs, now);
+    const [current, previous] = await this.redis.slidingWindowIncrement(
+      `${key}:${index}`,
+      `${key}:${index - 1}`,
+      amount,
+      windowMs * 2
+    );
+    return { current: Number(current), previous: Number(previous) };
+  }
+
+  async reset(key: string, windowMs: number, now: number): Promise<void> {
+    const index = bucketIndex(windowMs, now);
+    await this.redis.del(`${key}:${index}`, `${key}:${index - 1}`);
+  }
+
+  async close(): Promise<void> {
+    await this.redis.quit();
+  }
+}
+
+export interface SharedRateLimitStoreOptions {
+  prefix: string;
+  backend: CounterBackend;
+  fallback?: CounterBackend;
+  batchMs?: number;
+  batchHeadroomShare?: number;
+  // How long to stay on the fallback after the backend fails
+  retryAfterMs?: number;
+}
+
+interface BatchedKey {
+  index: number;
+  estimate: number;
+  pending: number;
+  syncedAt: number;
+}
+
+/**
+ * express-rate-limit Store backed by a CounterBackend with local batching and fallback
+ */
+export class SharedRateLimitStore implements Store {
+  prefix: string;
+  localKeys = false;
+
+  private backend: CounterBackend;
+  private fallback: CounterBackend;
+  private batchMs: number;
+  private batchHeadroomShare: number;
+  private retryAfterMs: number;
+  private windowMs = 60 * 1000;
+  private limit = Infinity;
+
+  private batches = new Map<string, BatchedKey>();
+  private flushTimer: NodeJS.Timeout | null = null;
+  private backendDownUntil = 0;
+
+  constructor(options: SharedRateLimitStoreOptions) {
+    this.prefix = options.prefix;
+    this.backend = options.backend;
+    this.fallback = options.fallback || (this.backend.name === 'memory' ? this.backend : new MemoryCounterBackend());
+    this.batchMs = options.batchMs ?? 0;
+    this.batchHeadroomShare = options.batchHeadroomShare ?? DEFAULT_BATCH_HEADROOM_SHARE;
+    this.retryAfterMs = options.retryAfterMs ?? 30 * 1000;
+    this.localKeys = this.backend.name === 'memory';
+  }
+
+  init(options: Options): void {
+    this.windowMs = options.windowMs;
+    if (typeof options.limit === 'number') {
+      this.limit = options.limit;
+    }
+  }
+
+  async get(key: string): Promise<ClientRateLimitInfo | undefined> {
+    const batch = this.batches.get(key);
+    if (!batch) {
+      return undefined;
+    }
+    return this.toInfo(batch.estimate + batch.pending, batch.index);
+  }
+
+  async increment(key: string): Promise<ClientRateLimitInfo> {
+    const now = Date.now();
+    const index = bucketIndex(this.windowMs, now);
+    const batch = this.batches.get(key);
+
+    // Count locally while the last shared count is fresh and this worker's
+    // batch stays within its share of the headroom left at that sync
+    if (
+      batch &&
+      this.batchMs > 0 &&
+      batch.index === index &&
+      now - batch.syncedAt < this.batchMs &&
+      batch.pending + 1 <= (this.limit - batch.estimate) * this.batchHeadroomShare
+    ) {
+      batch.pending++;
+      this.scheduleFlush();
+      return this.toInfo(batch.estimate + batch.pending, index);
+    }
+
+    const estimate = await this.sync(key, 1, now);
+    return this.toInfo(estimate, index);
+  }
+
+  async decrement(key: string): Promise<void> {
+    const batch = this.batches.get(key);
+    if (batch && this.batchMs > 0 && batch.index === bucketIndex(this.windowMs, Date.now())) {
+      batch.pending--;
+      this.scheduleFlush();
+      return;
+    }
+    await this.sync(key, -1, Date.now());
+  }
+
+  async resetKey(key: string): Promise<void> {
+    this.batches.delete(key);
+    const now = Date.now();
+    await Promise.all([
+      this.callBackend(backend => backend.reset(this.prefix + key, this.windowMs, now)),
+      this.fallback.reset(this.prefix + key, this.windowMs, now)
+    ]);
+  }
+
+  async resetAll(): Promise<void> {
+    this.batches.clear();
+  }
+
+  async shutdown(): Promise<void> {
+    await this.flush();
+    if (this.flushTimer) {
+      clearTimeout(this.flushTimer);
+      this.flushTimer = null;
+    }
+  }
+
+  /**
+   * Push this key's pending delta plus amount to the backend and refresh its estimate
+   */
+  private async sync(key: string, amount: number, now: number): Promise<number> {
+    const index = bucketIndex(this.windowMs, now);
+    const batch = this.batches.get(key);
+
+    // Claim the pending delta before awaiting so a concurrent sync cannot send it twice
+    let delta = amount;
+    if (batch && batch.index === index) {
+      delta += batch.pending;
+      batch.pending = 0;
+    }
+
+    const counts = await this.callBackend(backend => backend.increment(this.prefix + key, delta, this.windowMs, now));
+    const elapsed = (now % this.windowMs) / this.windowMs;
+    const estimate = counts.current + Math.floor(counts.previous * (1 - elapsed));
+
+    if (this.batchMs > 0) {
+      // Keep hits counted locally while the round-trip was in flight
+      const latest = this.batches.get(key);
+      const pending = latest && latest.index === index ? latest.pending : 0;
+      if (this.batches.size >= MAX_BATCHED_KEYS) {
+        this.pruneBatches(index);
+      }
+      this.batches.set(key, { index, estimate, pending, syncedAt: now });
+      return estimate + pending;
+    }
+
+    return estimate;
+  }
+
+  private pruneBatches(index: number): void {
+    // Deltas still pending from an ended window no longer affect any limit
+    this.batches.forEach((batch, key) => {
+      if (batch.index < index) {
+        this.batches.delete(key);
+      }
+    });
+  }
+
+  private scheduleFlush(): void {
+    if (!this.flushTimer) {
+      this.flushTimer = setTimeout(() => {
+        this.flushTimer = null;
+        this.flush().catch(error => {
+          logger.error('Rate limit counter flush failed', { prefix: this.prefix, error: error.message });
+        });
+      }, this.batchMs);
+      this.flushTimer.unref();
+    }
+  }
+
+  private async flush(): Promise<void> {
+    const now = Date.now();
+    const index = bucketIndex(this.windowMs, now);
+    const syncs: Promise<number>[] = [];
+
+    this.batches.forEach((batch, key) => {
+      if (batch.pending !== 0 && batch.index === index) {
+        syncs.push(this.sync(key, 0, now));
+      }
+    });
+    this.pruneBatches(index);
+
+    await Promise.all(syncs);
+  }
+
+  /**
+   * Run an operation on the shared backend, switching to the in-process
+   * fallback (and failing open on shared limits) while it is unavailable
+   */
+  private async callBackend<T>(operation: (backend: CounterBackend) => Promise<T>): Promise<T> {
+    if (this.backend === this.fallback || Date.now() < this.backendDownUntil) {
+      return operation(this.fallback);
+    }
+
+    try {
+      return await operation(this.backend);
+    } catch (error) {
+      this.backendDownUntil = Date.now() + this.retryAfterMs;
+      logger.warn('Rate limit store unavailable, using in-process counters', {
+        backend: this.backend.name,
+        prefix: this.prefix,
+        retryInMs: this.retryAfterMs,
+        error: error instanceof Error ? error.message : String(error),
+      });
+      return operation(this.fallback);
+    }
+  }
+
+  private toInfo(totalHits: number, index: number): ClientRateLimitInfo {
+    return {
+      totalHits,
+      resetTime: new Date((index + 1) * this.windowMs),
+    };
+  }
+}
+
+let sharedBackend: CounterBackend | null = null;
+const stores: SharedRateLimitStore[] = [];
+
+function getSharedBackend(): CounterBackend {
+  if (!sharedBackend) {
+    if (config.RATE_LIMIT.STORE === 'redis') {
+      const redis = new Redis({
+        host: config.REDIS.HOST,
+        port: config.REDIS.PORT,
+        password: config.REDIS.PASSWORD,
+        db: config.REDIS.DB,
+        // Fail fast so requests fall back to local counters instead of queueing
+        enableOfflineQueue: false,
+        maxRetriesPerRequest: 1,
+      });
+      redis.on('error', (error) => {
+        logger.debug('Rate limit Redis connection error', { error: error.message });
+      });
+      sharedBackend = new RedisCounterBackend(redis);
+    } else {
+      sharedBackend = new MemoryCounterBackend();
+    }
+    logger.info('Rate limit store initialized', { backend: sharedBackend.name, batchMs: config.RATE_LIMIT.BATCH_MS });
+  }
+  return sharedBackend;
+}
+
+/**
+ * Create a store for one limiter. Each limiter needs its own store (and prefix)
+ * because express-rate-limit binds a store to a single window.
+ */
+export function createRateLimitStore(name: string): SharedRateLimitStore {
+  const backend = getSharedBackend();
+  const store = new SharedRateLimitStore({
+    prefix: `rl:${name}:`,
+    backend,
+    // In-process counters are already free to update; only batch round-trips
+    batchMs: backend.name === 'memory' ? 0 : config.RATE_LIMIT.BATCH_MS,
+  });
+  stores.push(store);
+  return store;
+}
+
+/**
+ * Flush batched counts and close the shared backend connection
+ */
+export async function shutdownRateLimitStores(): Promise<void> {
+  await Promise.all(stores.map(store => store.shutdown()));
+  if (sharedBackend?.close) {
+    await sharedBackend.close();
+  }
+  sharedBackend = null;
+}
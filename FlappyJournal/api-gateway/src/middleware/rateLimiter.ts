@@ -3,6 +3,7 @@ import slowDown from 'express-slow-down';
 import { Request, Response } from 'express';
 import { config } from '../config';
 import logger from '../utils/logger';
+import { createRateLimitStore } from './rateLimitStore';
 
 // Custom key generator that considers user ID if available, but prioritizes IP
 const keyGenerator = (req: Request): string => {
@@ -12,6 +13,7 @@ const keyGenerator = (req: Request): string => {
 
 // Main rate limiter: 100 requests per 5 minutes per IP
 export const generalRateLimit = rateLimit({
+  store: createRateLimitStore('general'),
   windowMs: config.RATE_LIMIT.WINDOW_MS, // 5 minutes
   max: config.RATE_LIMIT.MAX_REQUESTS, // 100 requests
   message: {
@@ -39,6 +41,7 @@ export const generalRateLimit = rateLimit({
 
 // Strict rate limiter for sensitive endpoints
 export const strictRateLimit = rateLimit({
+  store: createRateLimitStore('strict'),
   windowMs: 15 * 60 * 1000, // 15 minutes
   max: 5, // limit each IP to 5 requests per windowMs
   message: {
@@ -61,6 +64,7 @@ export const strictRateLimit = rateLimit({
 
 // Authentication rate limiter
 export const authRateLimit = rateLimit({
+  store: createRateLimitStore('auth'),
   windowMs: 15 * 60 * 1000, // 15 minutes
   max: 10, // limit each IP to 10 authentication attempts per windowMs
   message: {
@@ -82,6 +86,7 @@ export const authRateLimit = rateLimit({
 
 // Slow down middleware for progressive delays
 export const slowDownMiddleware = slowDown({
+  store: createRateLimitStore('slow-down'),
   windowMs: 15 * 60 * 1000, // 15 minutes
   delayAfter: 50, // allow 50 requests per windowMs without delay
   delayMs: 500, // add 500ms delay per request after delayAfter
@@ -99,6 +104,7 @@ export const slowDownMiddleware = slowDown({
 
 // Premium user rate limiter (higher limits) - but still IP-based for this requirement
 export const premiumRateLimit = rateLimit({
+  store: createRateLimitStore('premium'),
   windowMs: config.RATE_LIMIT.WINDOW_MS,
   max: config.RATE_LIMIT.MAX_REQUESTS * 2, // 2x higher limit for premium users
   message: {
@@ -0,0 +1,436 @@
+import crypto from 'crypto';
+import { Request, Response, NextFunction } from 'express';
+import { config } from '../config';
+import logger from '../utils/logger';
+import type { AuthenticatedRequest } from './auth';
+
+/**
+ * Gateway response cache for idempotent GETs that clients poll (health,
+ * dashboard metrics, profiles).
+ *
+ * Requests matching a CachePolicy are answered from an in-memory LRU bounded by
+ * a byte budget. Misses for the same key share a single upstream fetch, stale
+ * entries are served while one background request revalidates them with the
+ * upstream ETag, and clients get ETags so unchanged polls cost a 304. Anything
+ * without a policy falls through to the proxy untouched.
+ */
+
+export interface CachePolicy {
+  name: string;
+  pattern: RegExp;
+  target: string;
+  rewrite: (path: string) => string;
+  // 'user' entries are keyed by the verified token subject and forward the caller's credentials
+  scope: 'shared' | 'user';
+  ttlMs: number;
+  staleWhileRevalidateMs: number;
+}
+
+const stripPrefix = (prefix: string) => (path: string) => path.slice(prefix.length) || '/';
+
+export const CACHE_POLICIES: CachePolicy[] = [
+  {
+    name: 'health',
+    pattern: /^\/api\/health\/?$/,
+    target: config.SERVICES.JOURNAL,
+    rewrite: () => '/health',
+    scope: 'shared',
+    ttlMs: 5 * 1000,
+    staleWhileRevalidateMs: 30 * 1000,
+  },
+  {
+    name: 'consciousness-metrics',
+    pattern: /^\/api\/journal\/consciousness\/(metrics|status|health)(\/|$)/,
+    target: config.SERVICES.JOURNAL,
+    rewrite: stripPrefix('/api/journal'),
+    scope: 'shared',
+    ttlMs: 5 * 1000,
+    staleWhileRevalidateMs: 30 * 1000,
+  },
+  {
+    name: 'dashboard-metrics',
+    pattern: /^\/api\/journal\/(dashboard|analytics|metrics|memory\/stats)(\/|$)/,
+    target: config.SERVICES.JOURNAL,
+    rewrite: stripPrefix('/api/journal'),
+    scope: 'user',
+    ttlMs: 10 * 1000,
+    staleWhileRevalidateMs: 60 * 1000,
+  },
+  {
+    name: 'journal-profile',
+    pattern: /^\/api\/journal\/user\/?$/,
+    target: config.SERVICES.JOURNAL,
+    rewrite: stripPrefix('/api/journal'),
+    scope: 'user',
+    ttlMs: 30 * 1000,
+    staleWhileRevalidateMs: 2 * 60 * 1000,
+  },
+  {
+    name: 'auth-profile',
+    pattern: /^\/api\/auth\/me\/?$/,
+    target: config.SERVICES.AUTH,
+    rewrite: stripPrefix('/api/auth'),
+    scope: 'user',
+    ttlMs: 30 * 1000,
+    staleWhileRevalidateMs: 2 * 60 * 1000,
+  },
+];
+
+// Headers forwarded to the upstream on cache fills
+const FORWARDED_HEADERS = [
+  'accept',
+  'accept-language',
+  'x-user-id',
+  'x-user-email',
+  'x-user-roles',
+  'x-user-projects',
+  'x-user-project-roles',
+  'x-project-id',
+  'x-request-id',
+];
+
+// Upstream response headers stored with the body and replayed to clients
+const STORED_HEADERS = ['content-type', 'last-modified', 'vary'];
+
+interface CacheEntry {
+  key: string;
+  userId: string | null;
+  status: number;
+  headers: Record<string, string>;
+  body: Buffer;
+  etag: string;
+  upstreamEtag: string | null;
+  storedAt: number;
+  freshUntil: number;
+  staleUntil: number;
+}
+
+/**
+ * LRU keyed by cache key, evicting least recently used entries once the byte budget is exceeded
+ */
+class ByteBudgetLru {
+  private entries = new Map<string, CacheEntry>();
+  private userKeys = new Map<string, Set<string>>();
+  private bytes = 0;
+
+  constructor(private maxBytes: number) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get totalBytes(): number {
+    return this.bytes;
+  }
+
+  get(key: string): CacheEntry | undefined {
+    const entry = this.entries.get(key);
+    if (entry) {
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+    }
+    return entry;
+  }
+
+  set(entry: CacheEntry): void {
+    this.delete(entry.key);
+    this.entries.set(entry.key, entry);
+    this.bytes += entrySize(entry);
+
+    if (entry.userId) {
+      let keys = this.userKeys.get(entry.userId);
+      if (!keys) {
+        keys = new Set();
+        this.userKeys.set(entry.userId, keys);
+      }
+      keys.add(entry.key);
+    }
+
+    while (this.bytes > this.maxBytes && this.entries.size > 0) {
+      this.delete(this.entries.keys().next().value as string);
+      cacheStats.evictions++;
+    }
+  }
+
+  delete(key: string): void {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+
+    this.entries.delete(key);
+    this.bytes -= entrySize(entry);
+    if (entry.userId) {
+      const keys = this.userKeys.get(entry.userId);
+      keys?.delete(key);
+      if (keys && keys.size === 0) {
+        this.userKeys.delete(entry.userId);
+      }
+    }
+  }
+
+  deleteUser(userId: string): number {
+    const keys = this.userKeys.get(userId);
+    if (!keys) return 0;
+    const count = keys.size;
+    Array.from(keys).forEach(key => this.delete(key));
+    return count;
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.userKeys.clear();
+    this.bytes = 0;
+  }
+}
+
+const entrySize = (entry: CacheEntry) => entry.body.length + entry.key.length + 256;
+
+const cache = new ByteBudgetLru(config.CACHE.MAX_BYTES);
+const inflight = new Map<string, Promise<CacheEntry | null>>();
+
+export const cacheStats = {
+  hits: 0,
+  staleHits: 0,
+  misses: 0,
+  coalesced: 0,
+  notModified: 0,
+  revalidations: 0,
+  upstreamErrors: 0,
+  evictions: 0,
+};
+
+function findPolicy(path: string): CachePolicy | undefined {
+  return CACHE_POLICIES.find(policy => policy.pattern.test(path));
+}
+
+function etagMatches(ifNoneMatch: string | undefined, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  if (ifNoneMatch.trim() === '*') return true;
+  const bare = etag.replace(/^W\//, '');
+  return ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === bare);
+}
+
+/**
+ * Fetch from the upstream service, revalidating with the previous ETag when
+ * there is one. Resolves to the new cache entry, or null when the response is
+ * not cacheable (in which case nothing is stored).
+ */
+async function fillFromUpstream(
+  policy: CachePolicy,
+  key: string,
+  userId: string | null,
+  req: Request,
+  previous: CacheEntry | undefined
+): Promise<CacheEntry | null> {
+  const url = new URL(req.originalUrl, 'http://gateway');
+  const upstreamUrl = `${policy.target}${policy.rewrite(url.pathname)}${url.search}`;
+
+  const headers: Record<string, string> = {
+    'X-Forwarded-For': req.ip || '',
+    'X-Forwarded-Proto': req.protocol,
+    'X-Forwarded-Host': req.get('host') || '',
+    'X-Gateway-Version': '1.0.0',
+  };
+  FORWARDED_HEADERS.forEach(header => {
+    const value = req.headers[header];
+    if (typeof value === 'string') {
+      headers[header] = value;
+    }
+  });
+  if (policy.scope === 'user' && req.headers.authorization) {
+    headers.authorization = req.headers.authorization;
+  }
+  if (previous?.upstreamEtag) {
+    headers['if-none-match'] = previous.upstreamEtag;
+  }
+
+  const response = await fetch(upstreamUrl, {
+    method: 'GET',
+    headers,
+    signal: AbortSignal.timeout(30000),
+  });
+
+  const now = Date.now();
+
+  if (response.status === 304 && previous) {
+    cacheStats.revalidations++;
+    const refreshed = {
+      ...previous,
+      storedAt: now,
+      freshUntil: now + policy.ttlMs,
+      staleUntil: now + policy.ttlMs + policy.staleWhileRevalidateMs,
+    };
+    cache.set(refreshed);
+    return refreshed;
+  }
+
+  const body = Buffer.from(await response.arrayBuffer());
+  const cacheControl = response.headers.get('cache-control') || '';
+  const storedHeaders: Record<string, string> = {};
+  STORED_HEADERS.forEach(header => {
+    const value = response.headers.get(header);
+    if (value) {
+      storedHeaders[header] = value;
+    }
+  });
+
+  const entry: CacheEntry = {
+    key,
+    userId,
+    status: response.status,
+    headers: storedHeaders,
+    body,
+    etag: `"${crypto.createHash('sha1').update(body).digest('base64url')}"`,
+    upstreamEtag: response.headers.get('etag'),
+    storedAt: now,
+    freshUntil: now + policy.ttlMs,
+    staleUntil: now + policy.ttlMs + policy.staleWhileRevalidateMs,
+  };
+
+  const cacheable =
+    response.status === 200 &&
+    !/no-store/i.test(cacheControl) &&
+    !(policy.scope === 'shared' && /private/i.test(cacheControl)) &&
+    body.length <= config.CACHE.MAX_ENTRY_BYTES;
+
+  if (cacheable) {
+    cache.set(entry);
+  } else {
+    cache.delete(key);
+  }
+  return entry;
+}
+
+/**
+ * Single-flight wrapper: concurrent fills for a key share one upstream request
+ */
+function fill(
+  policy: CachePolicy,
+  key: string,
+  userId: string | null,
+  req: Request,
+  previous: CacheEntry | undefined
+): Promise<CacheEntry | null> {
+  const pending = inflight.get(key);
+  if (pending) {
+    cacheStats.coalesced++;
+    return pending;
+  }
+
+  const promise = fillFromUpstream(policy, key, userId, req, previous)
+    .catch((error) => {
+      cacheStats.upstreamErrors++;
+      logger.warn('Cache fill failed', { policy: policy.name, path: req.originalUrl, error: error.message });
+      return null;
+    })
+    .finally(() => inflight.delete(key));
+
+  inflight.set(key, promise);
+  return promise;
+}
+
+function send(req: Request, res: Response, entry: CacheEntry, cacheStatus: string): void {
+  const age = Math.max(0, Math.round((Date.now() - entry.storedAt) / 1000));
+
+  Object.entries(entry.headers).forEach(([header, value]) => res.setHeader(header, value));
+  res.setHeader('ETag', entry.etag);
+  res.setHeader('Age', String(age));
+  res.setHeader('X-Cache', cacheStatus);
+  res.setHeader('Cache-Control', `${entry.userId ? 'private' : 'public'}, no-cache`);
+
+  if (entry.status === 200 && etagMatches(req.headers['if-none-match'], entry.etag)) {
+    cacheStats.notModified++;
+    res.status(304).end();
+    return;
+  }
+
+  res.status(entry.status);
+  if (req.method === 'HEAD') {
+    res.setHeader('Content-Length', String(entry.body.length));
+    res.end();
+  } else {
+    res.end(entry.body);
+  }
+}
+
+/**
+ * Serve cacheable GETs from the gateway; everything else continues to the proxy.
+ * Mount after authentication: per-user policies key on the verified token
+ * subject and are bypassed for requests without one.
+ */
+export const responseCache = async (req: Request, res: Response, next: NextFunction) => {
+  if (!config.CACHE.ENABLED) {
+    return next();
+  }
+
+  // Writes through the gateway invalidate everything cached for that user
+  if (req.method !== 'GET' && req.method !== 'HEAD') {
+    const userId = (req as AuthenticatedRequest).user?.sub;
+    if (userId) {
+      cache.deleteUser(userId);
+    }
+    return next();
+  }
+
+  const policy = findPolicy(req.originalUrl.split('?')[0] || '');
+  if (!policy) {
+    return next();
+  }
+
+  // Never trust a header for the cache key: only a verified token identifies the user
+  const userId = policy.scope === 'user' ? (req as AuthenticatedRequest).user?.sub || null : null;
+  if (policy.scope === 'user' && !userId) {
+    return next();
+  }
+
+  const key = `${policy.name}:${userId || '*'}:${req.originalUrl}`;
+  const now = Date.now();
+  const forceRefresh = /no-cache/i.test(req.headers['cache-control'] || '');
+  const cached = cache.get(key);
+
+  try {
+    if (cached && !forceRefresh && now < cached.freshUntil) {
+      cacheStats.hits++;
+      return send(req, res, cached, 'HIT');
+    }
+
+    if (cached && !forceRefresh && now < cached.staleUntil) {
+      cacheStats.staleHits++;
+      fill(policy, key, userId, req, cached);
+      return send(req, res, cached, 'STALE');
+    }
+
+    cacheStats.misses++;
+    const entry = await fill(policy, key, userId, req, cached);
+
+    if (entry) {
+      return send(req, res, entry, 'MISS');
+    }
+
+    // Upstream failed: a stale copy beats an error
+    if (cached) {
+      return send(req, res, cached, 'STALE');
+    }
+
+    res.status(502).json({
+      error: 'Bad Gateway',
+      message: 'Service temporarily unavailable',
+      timestamp: new Date().toISOString(),
+    });
+  } catch (error) {
+    next(error);
+  }
+};
+
+export function getResponseCacheStats() {
+  return {
+    ...cacheStats,
+    entries: cache.size,
+    bytes: cache.totalBytes,
+    maxBytes: config.CACHE.MAX_BYTES,
+    inflight: inflight.size,
+  };
+}
+
+export function clearResponseCache(): void {
+  cache.clear();
+}
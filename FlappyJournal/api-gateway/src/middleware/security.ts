@@ -27,6 +27,25 @@ export const securityHeaders = helmet({
   },
 });
 
+// Identity headers are set by the auth middleware from a verified token and
+// trusted by the cache and the upstream services, so a client must never be
+// able to supply them
+const IDENTITY_HEADER_PREFIX = 'x-user-';
+
+export const removeIdentityHeaders = (headers: Record<string, unknown>) => {
+  Object.keys(headers).forEach(header => {
+    if (header.toLowerCase().startsWith(IDENTITY_HEADER_PREFIX)) {
+      delete headers[header];
+    }
+  });
+};
+
+// Strip inbound identity headers; mount before anything reads them
+export const stripIdentityHeaders = (req: Request, res: Response, next: NextFunction) => {
+  removeIdentityHeaders(req.headers);
+  next();
+};
+
 // Request size limits
 export const requestSizeLimiter = (req: Request, res: Response, next: NextFunction) => {
   const maxSize = 10 * 1024 * 1024; // 10MB
@@ -254,6 +273,7 @@ export const requestTimeout = (timeoutMs: number = 30000) => {
 
 export default {
   securityHeaders,
+  stripIdentityHeaders,
   requestSizeLimiter,
   validateRequest,
   validations,
@@ -0,0 +1,303 @@
+import crypto from 'crypto';
+
+// Kept in sync by hand with server/auth-token-cache.ts
+// (the gateway builds as its own package); change both files together.
+
+/**
+ * Verified-token cache for the JWT middleware.
+ *
+ * Clients send the same bearer token on every request until it expires, so
+ * the claims from a successful verification are kept, keyed by the SHA-256
+ * digest of the token (the raw token is never stored), until the token's exp
+ * minus a clock-skew margin. Tokens that fail verification for a reason that
+ * can't change (bad signature, wrong audience, malformed) are remembered for
+ * a short negative TTL so a client retrying a bad token doesn't cost an RSA
+ * verify each time. Both maps are LRUs bounded by entry count, concurrent
+ * verifications of one token share a single verify, and every verify is timed
+ * so the cost the cache saves shows up in the stats.
+ */
+
+export interface CachedClaims {
+  exp: number;
+  nbf?: number;
+}
+
+export interface VerifiedTokenCacheOptions {
+  maxEntries: number;
+  maxRejectedEntries: number;
+  // Entries expire this long before the token does
+  skewMs: number;
+  rejectedTtlMs: number;
+  // Whether a verification error is permanent for this token and can be cached
+  isCacheableRejection?: (error: Error) => boolean;
+}
+
+interface RejectedEntry {
+  error: Error;
+  expiresAt: number;
+}
+
+interface VerifiedEntry<T> {
+  claims: T;
+  expiresAt: number;
+}
+
+const LATENCY_SAMPLES = 1024;
+
+// jsonwebtoken failures that will recur for the same token; key fetch errors
+// and not-yet-valid tokens can succeed on retry, so they aren't cached
+export const isPermanentRejection = (error: Error) =>
+  (error.name === 'JsonWebTokenError' || error.name === 'TokenExpiredError') &&
+  !error.message.startsWith('error in secret or public key callback');
+
+export class VerifiedTokenCache<T extends CachedClaims> {
+  private verified = new Map<string, VerifiedEntry<T>>();
+  private rejected = new Map<string, RejectedEntry>();
+  private inflight = new Map<string, Promise<T>>();
+  private latencySamples = new Float64Array(LATENCY_SAMPLES);
+  private latencySampleCount = 0;
+
+  readonly stats = {
+    hits: 0,
+    rejectedHits: 0,
+    misses: 0,
+    coalesced: 0,
+    verifications: 0,
+    verificationFailures: 0,
+    evictions: 0,
+    expired: 0,
+  };
+
+  constructor(private options: VerifiedTokenCacheOptions) {}
+
+  static digest(token: string): string {
+    return crypto.createHash('sha256').update(token).digest('base64url');
+  }
+
+  /**
+   * Resolve the claims for token, calling verifier only when nothing usable
+   * is cached
+   */
+  async verify(token: string, verifier: (token: string) => Promise<T>): Promise<T> {
+    const key = VerifiedTokenCache.digest(token);
+    const now = Date.now();
+
+    const verified = this.verified.get(key);
+    if (verified) {
+      if (verified.expiresAt > now) {
+        // Refresh recency so active sessions stay resident
+        this.verified.delete(key);
+        this.verified.set(key, verified);
+        this.stats.hits++;
+        return verified.claims;
+      }
+      this.verified.delete(key);
+      this.stats.expired++;
+    }
+
+    const rejected = this.rejected.get(key);
+    if (rejected) {
+      if (rejected.expiresAt > now) {
+        this.stats.rejectedHits++;
+        throw rejected.error;
+      }
+      this.rejected.delete(key);
+    }
+
+    const pending = this.inflight.get(key);
+    if (pending) {
+      this.stats.coalesced++;
+      return pending;
+    }
+
+    this.stats.misses++;
+    const promise = this.runVerifier(key, token, verifier);
+    this.inflight.set(key, promise);
+    try {
+      return await promise;
+    } finally {
+      this.inflight.delete(key);
+    }
+  }
+
+  private async runVerifier(key: string, token: string, verifier: (token: string) => Promise<T>): Promise<T> {
+    const started = performance.now();
+    try {
+      const claims = await verifier(token);
+      this.recordLatency(performance.now() - started);
+      this.stats.verifications++;
+      this.remember(key, claims);
+      return claims;
+    } catch (error) {
+      this.recordLatency(performance.now() - started);
+      this.stats.verificationFailures++;
+      if (error instanceof Error && (this.options.isCacheableRejection?.(error) ?? false)) {
+        this.rememberRejection(key, error);
+      }
+      throw error;
+    }
+  }
+
+  private remember(key: string, claims: T): void {
+    const now = Date.now();
+    const expiresAt = claims.exp * 1000 - this.options.skewMs;
+    // Tokens without a usable lifetime, or not valid yet, are verified every time
+    if (!Number.isFinite(expiresAt) || expiresAt <= now || (claims.nbf && claims.nbf * 1000 > now)) {
+      return;
+    }
+
+    this.verified.set(key, { claims, expiresAt });
+    while (this.verified.size > this.options.maxEntries) {
+      this.verified.delete(this.verified.keys().next().value as string);
+      this.stats.evictions++;
+    }
+  }
+
+  private rememberRejection(key: string, error: Error): void {
+    this.rejected.delete(key);
+    this.rejected.set(key, { error, expiresAt: Date.now() + this.options.rejectedTtlMs });
+    while (this.rejected.size > this.options.maxRejectedEntries) {
+      this.rejected.delete(this.rejected.keys().next().value as string);
+    }
+  }
+
+  private recordLatency(ms: number): void {
+    this.latencySamples[this.latencySampleCount % LATENCY_SAMPLES] = ms;
+    this.latencySampleCount++;
+  }
+
+  /**
+   * Drop the cached result for one token (e.g. on logout)
+   */
+  invalidate(token: string): void {
+    const key = VerifiedTokenCache.digest(token);
+    this.verified.delete(key);
+    this.rejected.delete(key);
+  }
+
+  clear(): void {
+    this.verified.clear();
+    this.rejected.clear();
+  }
+
+  getStats() {
+    const count = Math.min(this.latencySampleCount, LATENCY_SAMPLES);
+    const recent = this.latencySamples.slice(0, count).sort();
+    const percentile = (quantile: number) => count === 0 ? 0 : recent[Math.min(count - 1, Math.floor(count * quantile))];
+    const lookups = this.stats.hits + this.stats.rejectedHits + this.stats.misses + this.stats.coalesced;
+
+    return {
+      ...this.stats,
+      entries: this.verified.size,
+      rejectedEntries: this.rejected.size,
+      maxEntries: this.options.maxEntries,
+      inflight: this.inflight.size,
+      hitRate: lookups === 0 ? 0 : (this.stats.hits + this.stats.rejectedHits + this.stats.coalesced) / lookups,
+      verifyMs: {
+        p50: percentile(0.5),
+        p95: percentile(0.95),
+        p99: percentile(0.99),
+        max: count === 0 ? 0 : recent[count - 1],
+      },
+    };
+  }
+}
+
+export interface SigningKeySource {
+  getSigningKeys(): Promise<Array<{ kid: string; getPublicKey(): string }>>;
+}
+
+export interface SigningKeyPrefetcherOptions {
+  refreshIntervalMs: number;
+  minRefreshIntervalMs: number;
+  onError?: (error: Error) => void;
+  // Called with the kids that disappeared from the JWKS, e.g. to drop cached tokens
+  onKeysRemoved?: (kids: string[]) => void;
+}
+
+/**
+ * Keeps every key currently published in the JWKS resident so signature
+ * checks never wait on a JWKS fetch. The set is refreshed on an interval,
+ * which picks up a rotated key as soon as the identity provider publishes it
+ * (ahead of the first token signed with it), and immediately when a token
+ * arrives with a kid that isn't known yet. Refreshes are coalesced and spaced
+ * by minRefreshIntervalMs so unknown kids can't drive JWKS traffic.
+ */
+export class SigningKeyPrefetcher {
+  private keys = new Map<string, string>();
+  private refreshing: Promise<void> | null = null;
+  private lastRefreshAt = 0;
+  private timer: NodeJS.Timeout | null = null;
+
+  readonly stats = {
+    refreshes: 0,
+    refreshFailures: 0,
+    unknownKid: 0,
+  };
+
+  constructor(private source: SigningKeySource, private options: SigningKeyPrefetcherOptions) {}
+
+  start(): void {
+    if (this.timer) return;
+    this.refresh().catch(() => {});
+    this.timer = setInterval(() => this.refresh().catch(() => {}), this.options.refreshIntervalMs);
+    this.timer.unref();
+  }
+
+  stop(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  /**
+   * Key for kid if it is resident, refreshing once if it isn't
+   */
+  async getKey(kid: string | undefined): Promise<string | undefined> {
+    if (!kid) return undefined;
+    const key = this.keys.get(kid);
+    if (key) return key;
+
+    this.stats.unknownKid++;
+    if (Date.now() - this.lastRefreshAt >= this.options.minRefreshIntervalMs) {
+      await this.refresh().catch(() => {});
+    } else if (this.refreshing) {
+      await this.refreshing.catch(() => {});
+    }
+    return this.keys.get(kid);
+  }
+
+  refresh(): Promise<void> {
+    if (this.refreshing) return this.refreshing;
+
+    this.lastRefreshAt = Date.now();
+    this.refreshing = this.source.getSigningKeys()
+      .then(signingKeys => {
+        // Replace rather than merge so keys removed from the JWKS stop verifying
+        const keys = new Map(signingKeys.map(signingKey => [signingKey.kid, signingKey.getPublicKey()]));
+        const removed = Array.from(this.keys.keys()).filter(kid => !keys.has(kid));
+        this.keys = keys;
+        this.stats.refreshes++;
+        if (removed.length > 0) {
+          this.options.onKeysRemoved?.(removed);
+        }
+      }, error => {
+        this.stats.refreshFailures++;
+        this.options.onError?.(error);
+        throw error;
+      })
+      .finally(() => {
+        this.refreshing = null;
+      });
+    return this.refreshing;
+  }
+
+  getStats() {
+    return {
+      ...this.stats,
+      keys: this.keys.size,
+      lastRefreshAt: this.lastRefreshAt ? new Date(this.lastRefreshAt).toISOString() : null,
+    };
+  }
+}
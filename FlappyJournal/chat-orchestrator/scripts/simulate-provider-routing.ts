@@ -0,0 +1,144 @@
+/**
+ * Provider routing simulation
+ *
+ * Runs ProviderRouter against local stub providers with injected latency and
+ * failure rates, and compares the latency distribution of each fallback strategy.
+ *
+ * Usage:
+ *   npx tsx scripts/simulate-provider-routing.ts [--requests=200]
+ */
+import { ProviderRouter } from '../src/services/providerRouter.js';
+import { BaseProvider } from '../src/services/providers/base.js';
+import { ChatMessage, MultiProviderConfig, Provider, ProviderConfig, ProviderResponse, UserContext } from '../src/types/index.js';
+
+const args = process.argv.slice(2);
+const REQUESTS = parseInt(args.find(arg => arg.startsWith('--requests='))?.split('=')[1] || '200');
+
+interface StubProfile {
+  name: Provider;
+  priority: number;
+  latencyMs: number;
+  jitterMs: number;
+  // Probability of a slow outlier at 10x latency
+  tailRate: number;
+  errorRate: number;
+}
+
+// The top-priority provider is alive but slow, which is what sequential routing gets wrong
+const PROFILES: StubProfile[] = [
+  { name: 'openai', priority: 1, latencyMs: 400, jitterMs: 100, tailRate: 0.1, errorRate: 0.05 },
+  { name: 'venice', priority: 2, latencyMs: 120, jitterMs: 40, tailRate: 0.05, errorRate: 0.02 },
+  { name: 'gemini', priority: 3, latencyMs: 200, jitterMs: 60, tailRate: 0.02, errorRate: 0.1 }
+];
+
+class StubProvider extends BaseProvider {
+  calls = 0;
+  cancelled = 0;
+
+  constructor(config: ProviderConfig, private profile: StubProfile) {
+    super(config);
+  }
+
+  protected formatMessages(messages: ChatMessage[]): any[] {
+    return messages;
+  }
+
+  generate(_messages: ChatMessage[], _userContext: UserContext, signal?: AbortSignal): Promise<ProviderResponse> {
+    this.calls++;
+    const { latencyMs, jitterMs, tailRate, errorRate } = this.profile;
+    const delay = (latencyMs + (Math.random() * 2 - 1) * jitterMs) * (Math.random() < tailRate ? 10 : 1);
+    const fails = Math.random() < errorRate;
+
+    return new Promise((resolve, reject) => {
+      const onAbort = () => {
+        clearTimeout(timer);
+        this.cancelled++;
+        reject(new Error('aborted'));
+      };
+
+      const timer = setTimeout(() => {
+        signal?.removeEventListener('abort', onAbort);
+        if (fails) {
+          reject(new Error(`${this.profile.name} stub failure`));
+        } else {
+          resolve({ success: true, content: 'ok', provider: this.profile.name, model: 'stub', latency: delay });
+        }
+      }, delay);
+
+      signal?.addEventListener('abort', onAbort);
+    });
+  }
+
+  async stream(): Promise<AsyncIterable<string>> {
+    return (async function* () {
+      yield 'ok';
+    })();
+  }
+
+  async healthCheck(): Promise<boolean> {
+    return true;
+  }
+}
+
+function percentile(sorted: number[], p: number): number {
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))] || 0;
+}
+
+async function simulate(strategy: MultiProviderConfig['fallbackStrategy']) {
+  const providerConfigs: ProviderConfig[] = PROFILES.map(profile => ({
+    name: profile.name,
+    apiKey: 'stub',
+    model: 'stub',
+    enabled: true,
+    priority: profile.priority,
+    maxRetries: 0,
+    timeout: 10000
+  }));
+  const stubs = new Map<Provider, BaseProvider>();
+  PROFILES.forEach((profile, index) => stubs.set(profile.name, new StubProvider(providerConfigs[index]!, profile)));
+
+  const router = new ProviderRouter({
+    enabled: true,
+    fallbackStrategy: strategy,
+    providers: providerConfigs,
+    autonomousThought: { enabled: false, triggers: [], cooldownMs: 0, maxConcurrentThoughts: 0 }
+  }, stubs);
+
+  const userContext: UserContext = { userId: 'sim', sessionId: 'sim', conversationId: 'sim' };
+  const messages: ChatMessage[] = [{ id: '1', content: 'hi', role: 'user', timestamp: new Date(), conversationId: 'sim' }];
+  const latencies: number[] = [];
+  const winners = new Map<string, number>();
+  let failures = 0;
+
+  for (let i = 0; i < REQUESTS; i++) {
+    const start = Date.now();
+    try {
+      const response = await router.route(messages, userContext);
+      winners.set(response.provider, (winners.get(response.provider) || 0) + 1);
+    } catch {
+      failures++;
+    }
+    latencies.push(Date.now() - start);
+  }
+
+  latencies.sort((a, b) => a - b);
+  const calls = PROFILES.map(profile => {
+    const stub = stubs.get(profile.name) as StubProvider;
+    return `${profile.name} ${stub.calls} (${stub.cancelled} cancelled)`;
+  }).join(', ');
+
+  console.log(`${strategy.padEnd(10)} p50 ${String(percentile(latencies, 0.5)).padStart(5)}ms  p95 ${String(percentile(latencies, 0.95)).padStart(5)}ms  p99 ${String(percentile(latencies, 0.99)).padStart(5)}ms  failures ${failures}`);
+  console.log(`${''.padEnd(10)} winners ${JSON.stringify(Object.fromEntries(winners))}  calls ${calls}`);
+  console.log(`${''.padEnd(10)} last decision ${JSON.stringify(router.getRoutingDecisions(1)[0])}\n`);
+}
+
+async function run() {
+  console.log(`Simulating ${REQUESTS} requests per strategy against stub providers\n`);
+  await simulate('sequential');
+  await simulate('race');
+}
+
+run().catch((error) => {
+  console.error('Simulation failed:', error);
+  process.exit(1);
+});
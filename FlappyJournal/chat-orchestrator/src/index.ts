@@ -72,7 +72,12 @@ const config: ChatOrchestratorConfig = {
     apiUrl: process.env.MEMORY_API_URL || 'http://localhost:4000',
     apiKey: process.env.MEMORY_API_KEY || '',
     timeout: 5000,
-    retries: 3
+    retries: 3,
+    cache: {
+      enabled: process.env.MEMORY_CACHE_ENABLED !== 'false',
+      maxConversations: parseInt(process.env.MEMORY_CACHE_MAX_CONVERSATIONS || '1000'),
+      ttlMs: parseInt(process.env.MEMORY_CACHE_TTL_MS || '300000')
+    }
   },
   system: {
     guardrails: {
@@ -1,8 +1,9 @@
-import { Server, ServerCredentials } from '@grpc/grpc-js';
+import { Server, ServerCredentials, status } from '@grpc/grpc-js';
 import { loadPackageDefinition } from '@grpc/proto-loader';
 import * as protoLoader from '@grpc/proto-loader';
 import { ConsciousnessLoopServiceHandlers } from '../types/grpc_types'; // Assuming types are generated
-import { OpenAIStreamingConsciousnessLoop } from '../../../server/openai-streaming-consciousness-loop';
+import { OpenAIStreamingConsciousnessLoop, ConsciousThought } from '../../../server/openai-streaming-consciousness-loop';
+import { ThoughtStreamFlowController, StreamThought, ThoughtTypeName } from './thoughtStreamFlowControl';
 import logger from '../utils/logger';
 
 // Load gRPC package definition
@@ -20,34 +21,58 @@ const packageDefinition = protoLoader.loadSync(
 const consciousnessProto = loadPackageDefinition(packageDefinition).consciousness;
 let streamingLoopInstance: OpenAIStreamingConsciousnessLoop | null = null;
 
+/**
+ * Map a loop thought onto the ConsciousnessThought message shape
+ */
+function toStreamThought(thought: ConsciousThought): StreamThought {
+  return {
+    id: thought.id,
+    content: thought.content,
+    timestamp: thought.timestamp.getTime(),
+    type: thought.type.toUpperCase() as ThoughtTypeName,
+    intensity: thought.intensity,
+    coherence: thought.coherence,
+    token_count: thought.tokens,
+    processing_time_ms: thought.processingTime
+  };
+}
+
 // Implement gRPC handlers
 const handlers: ConsciousnessLoopServiceHandlers = {
-  StreamConsciousness: (call, callback) => {
+  StreamConsciousness: (call) => {
     if (!streamingLoopInstance) {
-      callback({ code: grpc.status.NOT_FOUND, message: 'Streaming loop not found' }, null);
+      call.emit('error', { code: status.NOT_FOUND, message: 'Streaming loop not found' });
       return;
     }
 
-    // Example backpressure handling (simple)
-    let backPressureLevel = 0;
-
-    call.on('data', (request) => {
-      // Stream consciousness thoughts
-      const thoughtsStream = streamingLoopInstance.streamThoughts(request);
-
-      thoughtsStream.on('data', (thought) => {
-        if (backPressureLevel >= 10) {
-          thoughtsStream.pause(); // simple backpressure control
-          setTimeout(() => thoughtsStream.resume(), Math.pow(2, backPressureLevel) * 100);
-        }
-
-        call.write(thought);
+    const loop = streamingLoopInstance;
+    const request = call.request;
+
+    // Bounded per-stream buffer with credit-based delivery (see thoughtStreamFlowControl)
+    const flow = new ThoughtStreamFlowController({
+      write: (message) => call.write(message),
+      onDrain: (listener) => call.on('drain', listener)
+    }, request.config || {});
+
+    const onThought = (thought: ConsciousThought) => flow.enqueue(toStreamThought(thought));
+    loop.on('thoughtGenerated', onThought);
+
+    let closed = false;
+    const close = () => {
+      if (closed) return;
+      closed = true;
+      loop.off('thoughtGenerated', onThought);
+      logger.info('Consciousness stream closed', {
+        userId: request.user_id,
+        sessionId: request.session_id,
+        ...flow.getStats()
       });
-    });
+      flow.close();
+    };
 
-    call.on('end', () => {
-      call.end();
-    });
+    call.on('cancelled', close);
+    call.on('close', close);
+    call.on('error', close);
   },
 
   StartLoop: (call, callback) => {
@@ -60,13 +85,13 @@ const handlers: ConsciousnessLoopServiceHandlers = {
         callback(null, { success: true, message: 'Loop started successfully', loop_id: call.request.loop_id });
       })
       .catch((error) => {
-        callback({ code: grpc.status.ABORTED, message: error.message }, null);
+        callback({ code: status.ABORTED, message: error.message }, null);
       });
   },
 
   StopLoop: (call, callback) => {
     if (!streamingLoopInstance) {
-      callback({ code: grpc.status.NOT_FOUND, message: 'Streaming loop not running' }, null);
+      callback({ code: status.NOT_FOUND, message: 'Streaming loop not running' }, null);
       return;
     }
 
@@ -75,14 +100,14 @@ const handlers: ConsciousnessLoopServiceHandlers = {
         callback(null, { success: true, message: 'Loop stopped successfully' });
       })
       .catch((error) => {
-        callback({ code: grpc.status.ABORTED, message: error.message }, null);
+        callback({ code: status.ABORTED, message: error.message }, null);
       });
     streamingLoopInstance = null; // Clean up instance
   },
 
   GetLoopStatus: (call, callback) => {
     if (!streamingLoopInstance) {
-      callback({ code: grpc.status.NOT_FOUND, message: 'Streaming loop not running' }, null);
+      callback({ code: status.NOT_FOUND, message: 'Streaming loop not running' }, null);
       return;
     }
 
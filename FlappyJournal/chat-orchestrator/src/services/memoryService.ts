@@ -1,18 +1,223 @@
 import fetch from 'node-fetch';
+import http from 'http';
+import https from 'https';
 import { ProjectMemory, MemoryConfig, MemoryError, UserContext } from '../types/index.js';
 import logger from '../utils/logger.js';
 
+// Memories requested per conversation context fetch
+const CONTEXT_LIMIT = 100;
+
+const DEFAULT_CACHE_CONFIG = {
+  enabled: true,
+  maxConversations: 1000,
+  ttlMs: 5 * 60 * 1000
+};
+
+// Reuse sockets to the memory API instead of a new TCP/TLS handshake per request
+const httpAgent = new http.Agent({ keepAlive: true, maxSockets: 64 });
+const httpsAgent = new https.Agent({ keepAlive: true, maxSockets: 64 });
+const keepAliveAgent = (url: URL) => url.protocol === 'http:' ? httpAgent : httpsAgent;
+
+interface ContextScope {
+  userId: string;
+  conversationId: string;
+  projectId?: string;
+}
+
+interface CachedContext {
+  context: ContextScope;
+  memories: ProjectMemory[];
+  expiresAt: number;
+}
+
+interface PendingContextFetch {
+  promise: Promise<ProjectMemory[]>;
+  // Memories written while the fetch was in flight, applied before it is cached
+  writes: ProjectMemory[];
+}
+
+export interface MemoryCacheStats {
+  size: number;
+  inFlight: number;
+  hits: number;
+  misses: number;
+  sharedFetches: number;
+  evictions: number;
+}
+
+/**
+ * Map a memory API item to a ProjectMemory, parsing its timestamp once
+ */
+function toProjectMemory(item: any): ProjectMemory {
+  return {
+    id: item.id,
+    key: item.key,
+    value: item.value,
+    timestamp: new Date(item.timestamp),
+    scope: item.scope,
+    conversationId: item.conversationId,
+    userId: item.userId,
+    projectId: item.projectId
+  };
+}
+
+/**
+ * Whether a memory belongs in a conversation context (scope=conversation,project,user)
+ */
+function belongsToContext(memory: ProjectMemory, context: ContextScope): boolean {
+  switch (memory.scope) {
+    case 'conversation':
+      return memory.conversationId === context.conversationId;
+    case 'project':
+      return !!context.projectId && memory.projectId === context.projectId;
+    case 'user':
+      return memory.userId === context.userId;
+    default:
+      return false;
+  }
+}
+
+/**
+ * Apply a stored or updated memory to a context list: replace or insert it if it
+ * belongs there (dropping the oldest entry once over the limit), otherwise remove it
+ */
+function applyMemoryWrite(memories: ProjectMemory[], memory: ProjectMemory, context: ContextScope): ProjectMemory[] {
+  const next = memories.filter(existing => existing.id !== memory.id);
+  if (!belongsToContext(memory, context)) {
+    return next.length === memories.length ? memories : next;
+  }
+  next.push(memory);
+
+  if (next.length > CONTEXT_LIMIT) {
+    const oldest = next.reduce((oldestIndex, existing, index) =>
+      existing.timestamp < next[oldestIndex]!.timestamp ? index : oldestIndex, 0);
+    next.splice(oldest, 1);
+  }
+
+  return next;
+}
+
 export class MemoryService {
   private config: MemoryConfig;
+  private cacheConfig: { enabled: boolean; maxConversations: number; ttlMs: number };
+  // Insertion order doubles as LRU order: hits are re-inserted at the end
+  private contextCache = new Map<string, CachedContext>();
+  private pendingFetches = new Map<string, PendingContextFetch>();
+  private cacheStats = { hits: 0, misses: 0, sharedFetches: 0, evictions: 0 };
 
   constructor(config: MemoryConfig) {
     this.config = config;
+    this.cacheConfig = { ...DEFAULT_CACHE_CONFIG, ...config.cache };
   }
 
   /**
-   * Fetch conversation context from Advanced Memory API
+   * Get conversation context, served from the per-conversation cache when fresh.
+   * Concurrent misses for the same conversation share a single API fetch.
    */
   async getConversationContext(userContext: UserContext): Promise<ProjectMemory[]> {
+    if (!this.cacheConfig.enabled) {
+      return this.fetchConversationContext(userContext);
+    }
+
+    const cacheKey = this.getContextCacheKey(userContext);
+    const cached = this.contextCache.get(cacheKey);
+
+    if (cached && cached.expiresAt > Date.now()) {
+      this.contextCache.delete(cacheKey);
+      this.contextCache.set(cacheKey, cached);
+      this.cacheStats.hits++;
+      return cached.memories.slice();
+    }
+
+    if (cached) {
+      this.contextCache.delete(cacheKey);
+    }
+
+    const pending = this.pendingFetches.get(cacheKey);
+    if (pending) {
+      this.cacheStats.sharedFetches++;
+      return (await pending.promise).slice();
+    }
+
+    this.cacheStats.misses++;
+    const writes: ProjectMemory[] = [];
+    const promise = this.fetchConversationContext(userContext)
+      .then(fetched => {
+        const memories = writes.reduce((current, memory) => applyMemoryWrite(current, memory, userContext), fetched);
+        this.cacheContext(cacheKey, userContext, memories);
+        return memories;
+      })
+      .finally(() => {
+        this.pendingFetches.delete(cacheKey);
+      });
+
+    this.pendingFetches.set(cacheKey, { promise, writes });
+    return (await promise).slice();
+  }
+
+  /**
+   * Drop the cached context for a conversation so the next turn refetches it
+   */
+  invalidateConversationContext(userContext: UserContext): void {
+    this.contextCache.delete(this.getContextCacheKey(userContext));
+  }
+
+  /**
+   * Clear all cached conversation contexts
+   */
+  clearCache(): void {
+    this.contextCache.clear();
+  }
+
+  getCacheStats(): MemoryCacheStats {
+    return {
+      size: this.contextCache.size,
+      inFlight: this.pendingFetches.size,
+      ...this.cacheStats
+    };
+  }
+
+  private getContextCacheKey(userContext: UserContext): string {
+    return `${userContext.userId}:${userContext.conversationId}:${userContext.projectId || ''}`;
+  }
+
+  private cacheContext(cacheKey: string, userContext: UserContext, memories: ProjectMemory[]): void {
+    this.contextCache.delete(cacheKey);
+    this.contextCache.set(cacheKey, {
+      context: userContext,
+      memories,
+      expiresAt: Date.now() + this.cacheConfig.ttlMs
+    });
+
+    while (this.contextCache.size > this.cacheConfig.maxConversations) {
+      const oldestKey = this.contextCache.keys().next().value as string;
+      this.contextCache.delete(oldestKey);
+      this.cacheStats.evictions++;
+    }
+  }
+
+  /**
+   * Write a stored or updated memory through to every cached (and in-flight)
+   * context it belongs to, removing it from contexts it no longer matches
+   */
+  private writeThrough(memory: ProjectMemory): void {
+    if (!this.cacheConfig.enabled) {
+      return;
+    }
+
+    this.contextCache.forEach(entry => {
+      entry.memories = applyMemoryWrite(entry.memories, memory, entry.context);
+    });
+
+    this.pendingFetches.forEach(pending => {
+      pending.writes.push(memory);
+    });
+  }
+
+  /**
+   * Fetch conversation context from Advanced Memory API
+   */
+  private async fetchConversationContext(userContext: UserContext): Promise<ProjectMemory[]> {
     const startTime = Date.now();
     
     try {
@@ -27,7 +232,7 @@ export class MemoryService {
         conversationId: userContext.conversationId,
         ...(userContext.projectId && { projectId: userContext.projectId }),
         scope: 'conversation,project,user',
-        limit: '100'
+        limit: String(CONTEXT_LIMIT)
       });
 
       const response = await fetch(`${this.config.apiUrl}/memory/context?${params}`, {
@@ -37,7 +242,8 @@ export class MemoryService {
           'Content-Type': 'application/json',
           'User-Agent': 'chat-orchestrator/1.0.0'
         },
-        timeout: this.config.timeout
+        timeout: this.config.timeout,
+        agent: keepAliveAgent
       });
 
       if (!response.ok) {
@@ -48,16 +254,7 @@ export class MemoryService {
       }
 
       const data = await response.json() as { memories: any[] };
-      const memories = data.memories.map(item => ({
-        id: item.id,
-        key: item.key,
-        value: item.value,
-        timestamp: new Date(item.timestamp),
-        scope: item.scope,
-        conversationId: item.conversationId,
-        userId: item.userId,
-        projectId: item.projectId
-      }));
+      const memories = data.memories.map(toProjectMemory);
 
       const latency = Date.now() - startTime;
       logger.info('Successfully fetched conversation context', {
@@ -117,7 +314,8 @@ export class MemoryService {
           userId: memory.userId,
           projectId: memory.projectId
         }),
-        timeout: this.config.timeout
+        timeout: this.config.timeout,
+        agent: keepAliveAgent
       });
 
       if (!response.ok) {
@@ -128,16 +326,8 @@ export class MemoryService {
       }
 
       const data = await response.json() as any;
-      const storedMemory: ProjectMemory = {
-        id: data.id,
-        key: data.key,
-        value: data.value,
-        timestamp: new Date(data.timestamp),
-        scope: data.scope,
-        conversationId: data.conversationId,
-        userId: data.userId,
-        projectId: data.projectId
-      };
+      const storedMemory = toProjectMemory(data);
+      this.writeThrough(storedMemory);
 
       const latency = Date.now() - startTime;
       logger.info('Successfully stored memory', {
@@ -185,7 +375,8 @@ export class MemoryService {
           'User-Agent': 'chat-orchestrator/1.0.0'
         },
         body: JSON.stringify(updates),
-        timeout: this.config.timeout
+        timeout: this.config.timeout,
+        agent: keepAliveAgent
       });
 
       if (!response.ok) {
@@ -196,16 +387,8 @@ export class MemoryService {
       }
 
       const data = await response.json() as any;
-      const updatedMemory: ProjectMemory = {
-        id: data.id,
-        key: data.key,
-        value: data.value,
-        timestamp: new Date(data.timestamp),
-        scope: data.scope,
-        conversationId: data.conversationId,
-        userId: data.userId,
-        projectId: data.projectId
-      };
+      const updatedMemory = toProjectMemory(data);
+      this.writeThrough(updatedMemory);
 
       const latency = Date.now() - startTime;
       logger.info('Successfully updated memory', {
@@ -261,7 +444,8 @@ export class MemoryService {
           'Content-Type': 'application/json',
           'User-Agent': 'chat-orchestrator/1.0.0'
         },
-        timeout: this.config.timeout
+        timeout: this.config.timeout,
+        agent: keepAliveAgent
       });
 
       if (!response.ok) {
@@ -272,16 +456,7 @@ export class MemoryService {
       }
 
       const data = await response.json() as { memories: any[] };
-      const memories = data.memories.map(item => ({
-        id: item.id,
-        key: item.key,
-        value: item.value,
-        timestamp: new Date(item.timestamp),
-        scope: item.scope,
-        conversationId: item.conversationId,
-        userId: item.userId,
-        projectId: item.projectId
-      }));
+      const memories = data.memories.map(toProjectMemory);
 
       const latency = Date.now() - startTime;
       logger.info('Successfully fetched recent memories', {
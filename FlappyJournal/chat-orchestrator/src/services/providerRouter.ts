@@ -13,18 +13,56 @@ import { OpenAIProvider } from './providers/openai.js';
 import { GeminiProvider } from './providers/gemini.js';
 import { VeniceProvider } from './providers/venice.js';
 import { BaseProvider } from './providers/base.js';
+import { ProviderStats, ProviderStatsOptions, ProviderLatencySnapshot } from './providerStats.js';
+
+// Routing decisions kept for getRoutingDecisions()
+const MAX_ROUTING_DECISIONS = 200;
+
+export interface RoutingAttempt {
+  provider: Provider;
+  startedAfterMs: number;
+  latency: number;
+  outcome: 'success' | 'error' | 'cancelled';
+  error?: string;
+}
+
+export interface RoutingDecision {
+  id: string;
+  timestamp: number;
+  strategy: MultiProviderConfig['fallbackStrategy'] | 'preferred';
+  ranking: { provider: Provider; expectedCost: number; p95Latency: number; errorRate: number }[];
+  attempts: RoutingAttempt[];
+  winner: Provider | null;
+  latency: number;
+}
 
 export class ProviderRouter {
   private config: MultiProviderConfig;
   private providers: Map<Provider, BaseProvider> = new Map();
   private sortedProviders: ProviderConfig[];
+  private stats: ProviderStats;
+  private decisions: RoutingDecision[] = [];
 
-  constructor(config: MultiProviderConfig) {
+  /**
+   * Provider instances can be injected (e.g. stubs with simulated latency);
+   * otherwise they are built from the config.
+   */
+  constructor(
+    config: MultiProviderConfig,
+    providerInstances?: Map<Provider, BaseProvider>,
+    statsOptions: Partial<ProviderStatsOptions> = {}
+  ) {
     this.config = config;
+    this.stats = new ProviderStats(statsOptions);
     
     // Initialize providers based on config
     this.config.providers.forEach(providerConfig => {
-      if (providerConfig.enabled) {
+      if (providerConfig.enabled && providerInstances) {
+        const instance = providerInstances.get(providerConfig.name);
+        if (instance) {
+          this.providers.set(providerConfig.name, instance);
+        }
+      } else if (providerConfig.enabled) {
         switch (providerConfig.name) {
           case 'openai':
             this.providers.set('openai', new OpenAIProvider(providerConfig));
@@ -63,6 +101,164 @@ export class ProviderRouter {
     return Array.from(this.providers.keys());
   }
 
+  /**
+   * Latency and error statistics per provider, in routing order
+   */
+  getProviderStats(): ProviderLatencySnapshot[] {
+    return this.rankProviders().map(({ stats }) => stats);
+  }
+
+  /**
+   * Most recent routing decisions, oldest first
+   */
+  getRoutingDecisions(limit: number = MAX_ROUTING_DECISIONS): RoutingDecision[] {
+    return this.decisions.slice(-limit);
+  }
+
+  /**
+   * Enabled providers ordered by expected cost (EWMA latency inflated by error rate)
+   */
+  private rankProviders(): { provider: ProviderConfig; stats: ProviderLatencySnapshot }[] {
+    return this.stats.rank(this.sortedProviders.filter(config => this.providers.has(config.name)));
+  }
+
+  private startDecision(strategy: RoutingDecision['strategy']): RoutingDecision {
+    return {
+      id: uuidv4(),
+      timestamp: Date.now(),
+      strategy,
+      ranking: this.rankProviders().map(({ provider, stats }) => ({
+        provider: provider.name,
+        expectedCost: Math.round(stats.expectedCost),
+        p95Latency: stats.p95Latency,
+        errorRate: Math.round(stats.errorRate * 1000) / 1000
+      })),
+      attempts: [],
+      winner: null,
+      latency: 0
+    };
+  }
+
+  private finishDecision(decision: RoutingDecision, winner: Provider | null): void {
+    decision.winner = winner;
+    decision.latency = Date.now() - decision.timestamp;
+    this.decisions.push(decision);
+    if (this.decisions.length > MAX_ROUTING_DECISIONS) {
+      this.decisions.shift();
+    }
+    logger.debug('Provider routing decision', decision);
+  }
+
+  /**
+   * Call one provider, recording its latency and outcome. Calls aborted because
+   * another provider won are recorded as cancelled and do not count as errors.
+   */
+  private async attempt(
+    provider: BaseProvider,
+    messages: ChatMessage[],
+    userContext: UserContext,
+    decision: RoutingDecision,
+    signal?: AbortSignal
+  ): Promise<ProviderResponse> {
+    const name = provider.getConfig().name;
+    const startTime = Date.now();
+    const attempt: RoutingAttempt = {
+      provider: name,
+      startedAfterMs: startTime - decision.timestamp,
+      latency: 0,
+      outcome: 'success'
+    };
+    decision.attempts.push(attempt);
+
+    try {
+      const response = await provider.generate(messages, userContext, signal);
+      attempt.latency = Date.now() - startTime;
+      this.stats.record(name, attempt.latency, true);
+      return response;
+    } catch (error) {
+      attempt.latency = Date.now() - startTime;
+      attempt.error = error instanceof Error ? error.message : String(error);
+      if (signal?.aborted) {
+        attempt.outcome = 'cancelled';
+      } else {
+        attempt.outcome = 'error';
+        this.stats.record(name, attempt.latency, false);
+      }
+      throw error;
+    }
+  }
+
+  /**
+   * Start the best provider, then hedge with the next one if it has not
+   * answered within its adaptive delay (its recent p95), or immediately if it
+   * fails. The first success wins and the remaining calls are aborted.
+   */
+  private race(
+    ranked: ProviderConfig[],
+    messages: ChatMessage[],
+    userContext: UserContext,
+    decision: RoutingDecision
+  ): Promise<ProviderResponse> {
+    return new Promise((resolve, reject) => {
+      const pending = new Set<AbortController>();
+      let next = 0;
+      let running = 0;
+      let settled = false;
+      let hedgeTimer: NodeJS.Timeout | null = null;
+      let lastError: unknown = null;
+
+      const finish = () => {
+        settled = true;
+        if (hedgeTimer) clearTimeout(hedgeTimer);
+        pending.forEach(controller => controller.abort());
+      };
+
+      const launch = () => {
+        if (settled || next >= ranked.length) return;
+        const providerConfig = ranked[next++]!;
+        const provider = this.providers.get(providerConfig.name)!;
+        const controller = new AbortController();
+        pending.add(controller);
+        running++;
+
+        if (hedgeTimer) clearTimeout(hedgeTimer);
+        hedgeTimer = next < ranked.length
+          ? setTimeout(launch, this.stats.hedgeDelay(providerConfig.name, providerConfig.timeout))
+          : null;
+
+        this.attempt(provider, messages, userContext, decision, controller.signal).then(
+          response => {
+            pending.delete(controller);
+            if (settled) return;
+            finish();
+            resolve(response);
+          },
+          error => {
+            pending.delete(controller);
+            running--;
+            if (settled) return;
+            lastError = error;
+            logger.warn(`Provider ${providerConfig.name} failed in race`, {
+              error: error instanceof Error ? error.message : String(error)
+            });
+            if (next < ranked.length) {
+              launch();
+            } else if (running === 0) {
+              finish();
+              reject(lastError);
+            }
+          }
+        );
+      };
+
+      if (ranked.length === 0) {
+        reject(new ProviderError('No providers available to race', this.sortedProviders[0]!.name, 503));
+        return;
+      }
+      launch();
+    });
+  }
+
   /**
    * Stream response from the appropriate provider
    */
@@ -71,7 +267,7 @@ export class ProviderRouter {
     userContext: UserContext,
     onStreamEvent: (event: any) => void
   ): Promise<ProviderResponse> {
-    const providerName = userContext.preferences?.provider || this.sortedProviders[0].name;
+    const providerName = userContext.preferences?.provider || this.rankProviders()[0]!.provider.name;
     const provider = this.getProvider(providerName);
 
     if (!provider) {
@@ -134,10 +330,13 @@ export class ProviderRouter {
     if (userContext.preferences?.provider) {
       const provider = this.getProvider(userContext.preferences.provider);
       if (provider) {
+        const decision = this.startDecision('preferred');
         try {
-          const response = await provider.generate(messages, userContext);
+          const response = await this.attempt(provider, messages, userContext, decision);
+          this.finishDecision(decision, provider.getConfig().name);
           return { ...response, latency: Date.now() - startTime };
         } catch (error) {
+          this.finishDecision(decision, null);
           logger.warn(`User-preferred provider ${provider.config.name} failed. Attempting fallback.`, {
             error: error instanceof Error ? error.message : String(error),
           });
@@ -148,23 +347,38 @@ export class ProviderRouter {
       }
     }
 
-    // Fallback strategy
+    // Fallback strategy, over providers ordered by expected latency
+    const decision = this.startDecision(this.config.fallbackStrategy);
+    const ranked = this.rankProviders().map(({ provider }) => provider);
+
     switch (this.config.fallbackStrategy) {
       case 'sequential':
-        for (const providerConfig of this.sortedProviders) {
+        for (const providerConfig of ranked) {
           const provider = this.getProvider(providerConfig.name);
           if (provider) {
             try {
-              const response = await provider.generate(messages, userContext);
+              const response = await this.attempt(provider, messages, userContext, decision);
+              this.finishDecision(decision, providerConfig.name);
               return { ...response, latency: Date.now() - startTime };
             } catch (error) {
-              logger.error(`Provider ${provider.config.name} failed in sequential fallback`, {
+              logger.error(`Provider ${providerConfig.name} failed in sequential fallback`, {
                 error: error instanceof Error ? error.message : String(error)
               });
               lastError = error as ProviderError;
             }
           }
         }
+        this.finishDecision(decision, null);
+        break;
+      case 'race':
+        try {
+          const response = await this.race(ranked, messages, userContext, decision);
+          this.finishDecision(decision, response.provider);
+          return { ...response, latency: Date.now() - startTime };
+        } catch (error) {
+          this.finishDecision(decision, null);
+          lastError = error as ProviderError;
+        }
         break;
       case 'parallel':
         // not implemented for non-streaming
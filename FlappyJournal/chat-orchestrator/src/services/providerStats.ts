@@ -0,0 +1,148 @@
+import { Provider } from '../types/index.js';
+
+export interface ProviderStatsOptions {
+  windowSize: number;
+  windowMs: number;
+  ewmaAlpha: number;
+  errorPenalty: number;
+  minHedgeDelayMs: number;
+  defaultHedgeDelayMs: number;
+}
+
+export const DEFAULT_PROVIDER_STATS_OPTIONS: ProviderStatsOptions = {
+  windowSize: 100,
+  windowMs: 5 * 60 * 1000,
+  ewmaAlpha: 0.2,
+  // Expected cost grows by this factor per unit of error rate
+  errorPenalty: 4,
+  minHedgeDelayMs: 50,
+  defaultHedgeDelayMs: 2000
+};
+
+interface LatencySample {
+  at: number;
+  latency: number;
+  ok: boolean;
+}
+
+export interface ProviderLatencySnapshot {
+  provider: Provider;
+  samples: number;
+  ewmaLatency: number;
+  p95Latency: number;
+  errorRate: number;
+  expectedCost: number;
+}
+
+/**
+ * Sliding-window latency and error tracking for one provider
+ */
+class ProviderWindow {
+  private samples: LatencySample[] = [];
+  ewmaLatency = 0;
+
+  constructor(private options: ProviderStatsOptions) {}
+
+  record(latency: number, ok: boolean, now: number): void {
+    this.samples.push({ at: now, latency, ok });
+    if (this.samples.length > this.options.windowSize) {
+      this.samples.shift();
+    }
+
+    // Failures often return fast; only successful calls shape the latency estimate
+    if (ok) {
+      this.ewmaLatency = this.ewmaLatency === 0
+        ? latency
+        : this.ewmaLatency + this.options.ewmaAlpha * (latency - this.ewmaLatency);
+    }
+  }
+
+  /**
+   * Samples still inside the time window
+   */
+  current(now: number): LatencySample[] {
+    const cutoff = now - this.options.windowMs;
+    let start = 0;
+    while (start < this.samples.length && this.samples[start]!.at < cutoff) {
+      start++;
+    }
+    if (start > 0) {
+      this.samples.splice(0, start);
+    }
+    return this.samples;
+  }
+}
+
+/**
+ * Tracks per-provider latency (EWMA and p95) and error rate, and ranks
+ * providers by expected cost. Providers with no recent samples score zero so
+ * they are explored before being judged.
+ */
+export class ProviderStats {
+  private windows = new Map<Provider, ProviderWindow>();
+  private options: ProviderStatsOptions;
+
+  constructor(options: Partial<ProviderStatsOptions> = {}) {
+    this.options = { ...DEFAULT_PROVIDER_STATS_OPTIONS, ...options };
+  }
+
+  record(provider: Provider, latency: number, ok: boolean): void {
+    let window = this.windows.get(provider);
+    if (!window) {
+      window = new ProviderWindow(this.options);
+      this.windows.set(provider, window);
+    }
+    window.record(latency, ok, Date.now());
+  }
+
+  snapshot(provider: Provider): ProviderLatencySnapshot {
+    const window = this.windows.get(provider);
+    const samples = window ? window.current(Date.now()) : [];
+
+    if (!window || samples.length === 0) {
+      return { provider, samples: 0, ewmaLatency: 0, p95Latency: 0, errorRate: 0, expectedCost: 0 };
+    }
+
+    const successes = samples.filter(sample => sample.ok).map(sample => sample.latency).sort((a, b) => a - b);
+    const errorRate = 1 - successes.length / samples.length;
+    const p95Latency = successes.length > 0
+      ? successes[Math.min(successes.length - 1, Math.floor(successes.length * 0.95))]!
+      : 0;
+
+    // A provider that only fails has no latency estimate; price it at the worst case
+    const latency = window.ewmaLatency || this.options.defaultHedgeDelayMs;
+
+    return {
+      provider,
+      samples: samples.length,
+      ewmaLatency: window.ewmaLatency,
+      p95Latency,
+      errorRate,
+      expectedCost: latency * (1 + errorRate * this.options.errorPenalty)
+    };
+  }
+
+  /**
+   * Order providers by expected cost, breaking ties by the given order
+   */
+  rank<T extends { name: Provider }>(providers: T[]): { provider: T; stats: ProviderLatencySnapshot }[] {
+    return providers
+      .map((provider, index) => ({ provider, stats: this.snapshot(provider.name), index }))
+      .sort((a, b) => a.stats.expectedCost - b.stats.expectedCost || a.index - b.index)
+      .map(({ provider, stats }) => ({ provider, stats }));
+  }
+
+  /**
+   * How long to wait on a provider before racing the next one: its p95 when
+   * known, otherwise twice its average, otherwise the default
+   */
+  hedgeDelay(provider: Provider, maxDelayMs: number): number {
+    const stats = this.snapshot(provider);
+    const delay = stats.p95Latency || stats.ewmaLatency * 2 || this.options.defaultHedgeDelayMs;
+    return Math.round(Math.max(this.options.minHedgeDelayMs, Math.min(delay, maxDelayMs)));
+  }
+
+  getAll(): ProviderLatencySnapshot[] {
+    return Array.from(this.windows.keys()).map(provider => this.snapshot(provider));
+  }
+}
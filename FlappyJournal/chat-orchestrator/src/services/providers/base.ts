@@ -8,9 +8,10 @@ export abstract class BaseProvider {
   }
 
   /**
-   * Generate a complete response (non-streaming)
+   * Generate a complete response (non-streaming). Aborting the signal cancels
+   * the in-flight request, e.g. when another provider wins a race.
    */
-  abstract generate(messages: ChatMessage[], userContext: UserContext): Promise<ProviderResponse>;
+  abstract generate(messages: ChatMessage[], userContext: UserContext, signal?: AbortSignal): Promise<ProviderResponse>;
 
   /**
    * Generate a streaming response
@@ -15,7 +15,7 @@ export class GeminiProvider extends BaseProvider {
     }));
   }
 
-  async generate(messages: ChatMessage[], userContext: UserContext): Promise<ProviderResponse> {
+  async generate(messages: ChatMessage[], userContext: UserContext, signal?: AbortSignal): Promise<ProviderResponse> {
     const startTime = Date.now();
 
     try {
@@ -35,7 +35,8 @@ export class GeminiProvider extends BaseProvider {
           model: this.config.model,
           messages: this.formatMessages(messages),
           temperature: userContext.preferences?.temperature || 0.7
-        })
+        }),
+        signal: signal ?? null
       });
 
       if (!response.ok) {
@@ -25,7 +25,7 @@ export class OpenAIProvider extends BaseProvider {
     }));
   }
 
-  async generate(messages: ChatMessage[], userContext: UserContext): Promise<ProviderResponse> {
+  async generate(messages: ChatMessage[], userContext: UserContext, signal?: AbortSignal): Promise<ProviderResponse> {
     const startTime = Date.now();
     
     try {
@@ -41,7 +41,7 @@ export class OpenAIProvider extends BaseProvider {
         temperature: userContext.preferences?.temperature || 0.7,
         max_tokens: userContext.preferences?.maxTokens || 1000,
         stream: false
-      });
+      }, { signal: signal ?? null });
 
       const content = completion.choices[0]?.message?.content || '';
       const latency = Date.now() - startTime;
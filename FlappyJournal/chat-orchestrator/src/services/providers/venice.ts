@@ -16,7 +16,7 @@ export class VeniceProvider extends BaseProvider {
     }));
   }
 
-  async generate(messages: ChatMessage[], userContext: UserContext): Promise<ProviderResponse> {
+  async generate(messages: ChatMessage[], userContext: UserContext, signal?: AbortSignal): Promise<ProviderResponse> {
     const startTime = Date.now();
 
     try {
@@ -40,7 +40,8 @@ export class VeniceProvider extends BaseProvider {
           max_tokens: userContext.preferences?.maxTokens || 1000,
           stream: false
         }),
-        timeout: this.config.timeout
+        timeout: this.config.timeout,
+        signal: signal ?? null
       });
 
       if (!response.ok) {
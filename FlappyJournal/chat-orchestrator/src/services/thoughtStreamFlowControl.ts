@@ -0,0 +1,353 @@
+/**
+ * Flow control for StreamConsciousness gRPC streams.
+ *
+ * Each stream gets a fixed-size ring buffer of pending thoughts. Thoughts leave
+ * the buffer only while the stream holds credits: credits refill at
+ * StreamConfig.max_thoughts_per_second up to a window sized from the client's
+ * measured consumption rate, and writing stops whenever the transport reports
+ * a full HTTP/2 window until it drains. Each ThoughtType has an overflow
+ * policy: coalesce types replace a still-queued thought of the same type with
+ * the newer one, drop_oldest types evict the oldest queued thought once the
+ * buffer is full. Memory per stream never grows past the configured buffer size.
+ */
+
+export type ThoughtTypeName = 'CONSCIOUS' | 'REFLECTION' | 'OBSERVATION' | 'DECISION' | 'AUTONOMOUS';
+
+export type OverflowPolicy = 'drop_oldest' | 'coalesce';
+
+export interface StreamFlowConfig {
+  target_frequency_hz?: number;
+  max_thoughts_per_second?: number;
+  buffer_size?: number;
+  thought_types?: string[];
+}
+
+export interface StreamThought {
+  id: string;
+  content: string;
+  timestamp: number;
+  type: ThoughtTypeName;
+  intensity: number;
+  coherence: number;
+  token_count: number;
+  processing_time_ms: number;
+}
+
+export interface StreamMetadata {
+  sequence_number: number;
+  stream_health: number;
+  backpressure_level: number;
+  buffer_utilization: number;
+  lag_ms: number;
+  queue_depth: number;
+  dropped_thoughts: number;
+  coalesced_thoughts: number;
+  delivery_rate: number;
+}
+
+/**
+ * Transport side of a stream: write returns false when the client-side window
+ * is full, and onDrain fires once it has room again (grpc-js ServerWritableStream)
+ */
+export interface ThoughtSink {
+  write(message: StreamThought & { metadata: StreamMetadata }): boolean;
+  onDrain(listener: () => void): void;
+}
+
+export interface StreamFlowStats {
+  enqueued: number;
+  delivered: number;
+  dropped: number;
+  coalesced: number;
+  filtered: number;
+  queueDepth: number;
+  capacity: number;
+  credits: number;
+  window: number;
+  deliveryRate: number;
+  lastLagMs: number;
+  averageLagMs: number;
+  transportBlocked: boolean;
+}
+
+export const DEFAULT_TARGET_FREQUENCY_HZ = 100;
+export const MAX_STREAM_BUFFER_SIZE = 1024;
+const MIN_WINDOW = 4;
+
+// Weight of the newest sample in the delivery rate and lag averages
+const EWMA_ALPHA = 0.2;
+
+// Discrete observations and reflections are superseded by newer ones;
+// conscious thoughts and decisions keep their order and lose the oldest
+export const DEFAULT_OVERFLOW_POLICIES: Record<ThoughtTypeName, OverflowPolicy> = {
+  CONSCIOUS: 'drop_oldest',
+  REFLECTION: 'coalesce',
+  OBSERVATION: 'coalesce',
+  DECISION: 'drop_oldest',
+  AUTONOMOUS: 'coalesce'
+};
+
+interface QueuedThought {
+  thought: StreamThought;
+  enqueuedAt: number;
+}
+
+/**
+ * Fixed-capacity FIFO backed by a circular array. Slots are addressed by
+ * absolute sequence so a coalescing write can find and replace a queued entry.
+ */
+class ThoughtRing {
+  private slots: (QueuedThought | undefined)[];
+  private head = 0; // absolute index of the oldest entry
+  private tail = 0; // absolute index of the next free slot
+
+  constructor(readonly capacity: number) {
+    this.slots = new Array(capacity);
+  }
+
+  get size(): number {
+    return this.tail - this.head;
+  }
+
+  get isFull(): boolean {
+    return this.size === this.capacity;
+  }
+
+  push(entry: QueuedThought): number {
+    const index = this.tail++;
+    this.slots[index % this.capacity] = entry;
+    return index;
+  }
+
+  shift(): QueuedThought | undefined {
+    if (this.size === 0) {
+      return undefined;
+    }
+    const slot = this.head++ % this.capacity;
+    const entry = this.slots[slot];
+    this.slots[slot] = undefined;
+    return entry;
+  }
+
+  /**
+   * Replace the thought at an absolute index, if it is still queued.
+   * The entry keeps its original enqueue time so lag reflects the wait.
+   */
+  replace(index: number, thought: StreamThought): boolean {
+    const entry = index >= this.head && index < this.tail ? this.slots[index % this.capacity] : undefined;
+    if (!entry) {
+      return false;
+    }
+    entry.thought = thought;
+    return true;
+  }
+
+  clear(): void {
+    this.slots = new Array(this.capacity);
+    this.head = this.tail = 0;
+  }
+}
+
+export class ThoughtStreamFlowController {
+  private ring: ThoughtRing;
+  private policies: Record<ThoughtTypeName, OverflowPolicy>;
+  private allowedTypes: Set<string> | null;
+  // Absolute ring index of the newest queued thought of each coalescing type
+  private latestQueuedIndex = new Map<ThoughtTypeName, number>();
+
+  private maxRate: number;
+  private credits: number;
+  private window: number;
+  private lastRefill = Date.now();
+  private refillTimer: NodeJS.Timeout | null = null;
+  private transportBlocked = false;
+  private closed = false;
+
+  private sequenceNumber = 0;
+  private deliveryRate = 0;
+  private lastDeliveryAt = 0;
+  private lagMs = 0;
+  private averageLagMs = 0;
+  private stats = { enqueued: 0, delivered: 0, dropped: 0, coalesced: 0, filtered: 0 };
+
+  constructor(
+    private sink: ThoughtSink,
+    config: StreamFlowConfig = {},
+    policies: Partial<Record<ThoughtTypeName, OverflowPolicy>> = {}
+  ) {
+    const targetHz = config.target_frequency_hz && config.target_frequency_hz > 0
+      ? config.target_frequency_hz
+      : DEFAULT_TARGET_FREQUENCY_HZ;
+
+    // Default to one second of thoughts at the target frequency
+    const capacity = config.buffer_size && config.buffer_size > 0 ? config.buffer_size : targetHz;
+    this.ring = new ThoughtRing(Math.min(capacity, MAX_STREAM_BUFFER_SIZE));
+
+    this.maxRate = config.max_thoughts_per_second && config.max_thoughts_per_second > 0
+      ? config.max_thoughts_per_second
+      : targetHz;
+    this.window = Math.max(MIN_WINDOW, Math.min(this.ring.capacity, this.maxRate));
+    this.credits = this.window;
+
+    this.policies = { ...DEFAULT_OVERFLOW_POLICIES, ...policies };
+    this.allowedTypes = config.thought_types && config.thought_types.length > 0
+      ? new Set(config.thought_types.map(type => type.toUpperCase()))
+      : null;
+
+    this.sink.onDrain(() => {
+      this.transportBlocked = false;
+      this.pump();
+    });
+  }
+
+  /**
+   * Queue a thought for delivery, applying the type's overflow policy when full
+   */
+  enqueue(thought: StreamThought): void {
+    if (this.closed) {
+      return;
+    }
+    if (this.allowedTypes && !this.allowedTypes.has(thought.type)) {
+      this.stats.filtered++;
+      return;
+    }
+
+    this.stats.enqueued++;
+    const policy = this.policies[thought.type];
+
+    if (policy === 'coalesce') {
+      const queuedIndex = this.latestQueuedIndex.get(thought.type);
+      if (queuedIndex !== undefined && this.ring.replace(queuedIndex, thought)) {
+        this.stats.coalesced++;
+        this.pump();
+        return;
+      }
+    }
+
+    if (this.ring.isFull) {
+      this.ring.shift();
+      this.stats.dropped++;
+    }
+
+    const index = this.ring.push({ thought, enqueuedAt: Date.now() });
+    if (policy === 'coalesce') {
+      this.latestQueuedIndex.set(thought.type, index);
+    }
+
+    this.pump();
+  }
+
+  /**
+   * Write queued thoughts while credits remain and the transport accepts them
+   */
+  private pump(): void {
+    if (this.closed) {
+      return;
+    }
+
+    this.refillCredits();
+
+    while (this.ring.size > 0 && this.credits >= 1 && !this.transportBlocked) {
+      const entry = this.ring.shift()!;
+      const now = Date.now();
+      this.credits--;
+      this.recordDelivery(entry, now);
+
+      const accepted = this.sink.write({ ...entry.thought, metadata: this.buildMetadata() });
+      if (!accepted) {
+        // The thought is buffered by the transport; hold the rest until it drains
+        this.transportBlocked = true;
+        this.shrinkWindow();
+      }
+    }
+
+    if (this.ring.size > 0 && !this.transportBlocked && !this.refillTimer) {
+      const waitMs = Math.max(1, Math.ceil((1 - this.credits) / this.maxRate * 1000));
+      this.refillTimer = setTimeout(() => {
+        this.refillTimer = null;
+        this.pump();
+      }, waitMs);
+    }
+  }
+
+  private refillCredits(): void {
+    const now = Date.now();
+    this.credits = Math.min(this.window, this.credits + (now - this.lastRefill) / 1000 * this.maxRate);
+    this.lastRefill = now;
+  }
+
+  /**
+   * Track the client's consumption rate and grow the credit window toward
+   * roughly one second of what it has actually been accepting
+   */
+  private recordDelivery(entry: QueuedThought, now: number): void {
+    this.stats.delivered++;
+    this.sequenceNumber++;
+
+    if (this.lastDeliveryAt > 0) {
+      const instantRate = 1000 / Math.max(1, now - this.lastDeliveryAt);
+      this.deliveryRate += EWMA_ALPHA * (Math.min(instantRate, this.maxRate) - this.deliveryRate);
+    }
+    this.lastDeliveryAt = now;
+
+    this.lagMs = now - entry.enqueuedAt;
+    this.averageLagMs += EWMA_ALPHA * (this.lagMs - this.averageLagMs);
+
+    const target = Math.max(MIN_WINDOW, Math.min(this.ring.capacity, Math.ceil(this.deliveryRate)));
+    if (target > this.window) {
+      this.window = Math.min(target, this.window * 2);
+    }
+  }
+
+  /**
+   * Halve the credit window when the client stops keeping up
+   */
+  private shrinkWindow(): void {
+    this.window = Math.max(MIN_WINDOW, Math.floor(this.window / 2));
+    this.credits = Math.min(this.credits, this.window);
+  }
+
+  private buildMetadata(): StreamMetadata {
+    const utilization = this.ring.size / this.ring.capacity;
+    const droppedShare = this.stats.enqueued > 0 ? this.stats.dropped / this.stats.enqueued : 0;
+
+    return {
+      sequence_number: this.sequenceNumber,
+      stream_health: Math.max(0, 1 - droppedShare - (this.transportBlocked ? 0.2 : 0)),
+      backpressure_level: Math.min(10, Math.round(utilization * 10)),
+      buffer_utilization: Math.round(utilization * 100),
+      lag_ms: this.lagMs,
+      queue_depth: this.ring.size,
+      dropped_thoughts: this.stats.dropped,
+      coalesced_thoughts: this.stats.coalesced,
+      delivery_rate: Math.round(this.deliveryRate * 10) / 10
+    };
+  }
+
+  getStats(): StreamFlowStats {
+    return {
+      ...this.stats,
+      queueDepth: this.ring.size,
+      capacity: this.ring.capacity,
+      credits: Math.floor(this.credits),
+      window: this.window,
+      deliveryRate: this.deliveryRate,
+      lastLagMs: this.lagMs,
+      averageLagMs: this.averageLagMs,
+      transportBlocked: this.transportBlocked
+    };
+  }
+
+  /**
+   * Stop delivery and release queued thoughts
+   */
+  close(): void {
+    this.closed = true;
+    if (this.refillTimer) {
+      clearTimeout(this.refillTimer);
+      this.refillTimer = null;
+    }
+    this.ring.clear();
+    this.latestQueuedIndex.clear();
+  }
+}
@@ -79,6 +79,11 @@ export interface MemoryConfig {
   apiKey: string;
   timeout: number;
   retries: number;
+  cache?: {
+    enabled: boolean;
+    maxConversations: number;
+    ttlMs: number;
+  };
 }
 
 // System Configuration (limited to guardrails/safety)
@@ -156,7 +161,7 @@ export interface ProviderResponse {
 // Multi-Provider Routing Configuration
 export interface MultiProviderConfig {
   enabled: boolean;
-  fallbackStrategy: 'sequential' | 'parallel' | 'load_balance';
+  fallbackStrategy: 'sequential' | 'parallel' | 'load_balance' | 'race';
   providers: ProviderConfig[];
   autonomousThought: AutonomousThoughtExtension;
 }
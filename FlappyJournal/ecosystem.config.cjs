@@ -17,6 +17,23 @@ module.exports = {
         NODE_ENV: 'production',
         NODE_PATH: '/opt/featherweight/FlappyJournal/node_modules'
       }
+    },
+    {
+      // Multi-process alternative to featherweight-server: one primary that
+      // forks CONSCIOUSNESS_WORKERS workers and balances connections between
+      // them. Run in fork mode; the primary does its own clustering.
+      name: 'featherweight-consciousness-cluster',
+      script: './server/cluster-server.js',
+      cwd: '/opt/featherweight/FlappyJournal',
+      exec_mode: 'fork',
+      instances: 1,
+      autorestart: true,
+      kill_timeout: 10000,
+      env: {
+        NODE_ENV: 'production',
+        NODE_PATH: '/opt/featherweight/FlappyJournal/node_modules',
+        CONSCIOUSNESS_WORKERS: 'max'
+      }
     }
   ]
 }
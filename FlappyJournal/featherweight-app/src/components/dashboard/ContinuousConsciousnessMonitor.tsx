@@ -1,4 +1,6 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect } from 'react';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
+import { useVisualization } from '../../hooks/useVisualization';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { 
   Activity, Brain, Heart, AlertTriangle, CheckCircle, 
@@ -38,6 +40,8 @@ interface Reflection {
   timestamp: number;
 }
 
+const MONITOR_TOPICS = ['consciousness-monitor-snapshot', 'consciousness-health-metrics', 'consciousness-alert', 'consciousness-reflection'];
+
 const ContinuousConsciousnessMonitor: React.FC = () => {
   const [healthMetrics, setHealthMetrics] = useState<HealthMetrics>({
     uptime: 100,
@@ -55,45 +59,34 @@ const ContinuousConsciousnessMonitor: React.FC = () => {
   const [anomalyCount, setAnomalyCount] = useState(0);
   const [optimizationCount, setOptimizationCount] = useState(0);
   
-  const ekgCanvasRef = useRef<HTMLCanvasElement>(null);
-  const healthBarCanvasRef = useRef<HTMLCanvasElement>(null);
-  const animationRef = useRef<number | undefined>(undefined);
-  const ekgDataRef = useRef<number[]>([]);
+  const [ekgCanvasRef, ekg] = useVisualization('ekg');
+  const [healthBarCanvasRef, healthBars] = useVisualization('healthBars');
 
-  useEffect(() => {
-    // Initialize WebSocket connection
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = window.location.hostname === 'localhost' 
-      ? `${protocol}//${window.location.hostname}/ws`
-      : `${protocol}//${window.location.host}/ws`;
-    const ws = new WebSocket(wsUrl);
-    console.log('ContinuousConsciousnessMonitor connecting to:', wsUrl);
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      
-      if (data.type === 'consciousness-monitor-snapshot') {
-        handleSnapshot(data.payload);
-      } else if (data.type === 'consciousness-health-metrics') {
-        setHealthMetrics(data.payload);
-      } else if (data.type === 'consciousness-alert') {
-        handleAlert(data.payload);
-      } else if (data.type === 'consciousness-reflection') {
-        handleReflection(data.payload);
-      }
-    };
-
-    // Start animations
-    startEKGAnimation();
-    startHealthBarAnimation();
+  useConsciousnessEvents(MONITOR_TOPICS, (data) => {
+    if (data.type === 'consciousness-monitor-snapshot') {
+      handleSnapshot(data.payload);
+    } else if (data.type === 'consciousness-health-metrics') {
+      setHealthMetrics(data.payload);
+    } else if (data.type === 'consciousness-alert') {
+      handleAlert(data.payload);
+    } else if (data.type === 'consciousness-reflection') {
+      handleReflection(data.payload);
+    }
+  });
 
-    return () => {
-      ws.close();
-      if (animationRef.current) {
-        cancelAnimationFrame(animationRef.current);
+  useEffect(() => {
+    healthBars.update({
+      state: {
+        values: Float32Array.of(
+          healthMetrics.uptime / 100,
+          healthMetrics.stability / 100,
+          healthMetrics.memoryHealth / 100,
+          healthMetrics.feedbackIntegrity / 100,
+          healthMetrics.awarenessLevel / 100
+        )
       }
-    };
-  }, []);
+    });
+  }, [healthMetrics, healthBars]);
 
   const handleSnapshot = (snapshot: any) => {
     const newSnapshot: ConsciousnessSnapshot = {
@@ -108,10 +101,7 @@ const ContinuousConsciousnessMonitor: React.FC = () => {
     setSnapshots(prev => [...prev.slice(-50), newSnapshot]);
     
     // Update EKG data
-    ekgDataRef.current.push(newSnapshot.consciousnessLevel);
-    if (ekgDataRef.current.length > 150) {
-      ekgDataRef.current = ekgDataRef.current.slice(-150);
-    }
+    ekg.update({ samples: Float32Array.of(newSnapshot.consciousnessLevel) });
 
     // Update counts
     if (newSnapshot.anomalies.length > 0) {
@@ -146,134 +136,6 @@ const ContinuousConsciousnessMonitor: React.FC = () => {
     setReflections(prev => [...prev.slice(-3), newReflection]);
   };
 
-  const startEKGAnimation = () => {
-    const canvas = ekgCanvasRef.current;
-    if (!canvas) return;
-    
-    const ctx = canvas.getContext('2d');
-    if (!ctx) return;
-    
-    const width = canvas.width;
-    const height = canvas.height;
-    
-    const drawEKG = (time: number) => {
-      ctx.clearRect(0, 0, width, height);
-      
-      // Draw grid
-      ctx.strokeStyle = 'rgba(99, 102, 241, 0.1)';
-      ctx.lineWidth = 1;
-      
-      // Vertical lines
-      for (let x = 0; x < width; x += 20) {
-        ctx.beginPath();
-        ctx.moveTo(x, 0);
-        ctx.lineTo(x, height);
-        ctx.stroke();
-      }
-      
-      // Horizontal lines
-      for (let y = 0; y < height; y += 20) {
-        ctx.beginPath();
-        ctx.moveTo(0, y);
-        ctx.lineTo(width, y);
-        ctx.stroke();
-      }
-      
-      // Draw EKG line
-      if (ekgDataRef.current.length > 1) {
-        ctx.beginPath();
-        ctx.strokeStyle = 'rgba(34, 197, 94, 0.8)'; // Green for healthy
-        ctx.lineWidth = 2;
-        
-        const stepX = width / (ekgDataRef.current.length - 1);
-        
-        ekgDataRef.current.forEach((value, index) => {
-          const x = index * stepX;
-          const y = height - (value * height * 0.8 + height * 0.1);
-          
-          if (index === 0) {
-            ctx.moveTo(x, y);
-          } else {
-            // Add some EKG-style peaks
-            const prevValue = ekgDataRef.current[index - 1];
-            if (Math.random() > 0.95 && value > 0.7) {
-              // Sharp peak
-              ctx.lineTo(x - stepX/2, y - 20);
-              ctx.lineTo(x, y);
-            } else {
-              ctx.lineTo(x, y);
-            }
-          }
-        });
-        
-        ctx.stroke();
-        
-        // Draw moving scan line
-        const scanX = (time * 0.1) % width;
-        ctx.strokeStyle = 'rgba(255, 255, 255, 0.5)';
-        ctx.lineWidth = 2;
-        ctx.beginPath();
-        ctx.moveTo(scanX, 0);
-        ctx.lineTo(scanX, height);
-        ctx.stroke();
-      }
-      
-      animationRef.current = requestAnimationFrame(drawEKG);
-    };
-    
-    drawEKG(0);
-  };
-
-  const startHealthBarAnimation = () => {
-    const canvas = healthBarCanvasRef.current;
-    if (!canvas) return;
-    
-    const ctx = canvas.getContext('2d');
-    if (!ctx) return;
-    
-    const width = canvas.width;
-    const height = canvas.height;
-    
-    const drawHealthBars = () => {
-      ctx.clearRect(0, 0, width, height);
-      
-      const metrics = [
-        { name: 'Uptime', value: healthMetrics.uptime / 100, color: 'rgba(34, 197, 94, 0.8)' },
-        { name: 'Stability', value: healthMetrics.stability / 100, color: 'rgba(59, 130, 246, 0.8)' },
-        { name: 'Memory', value: healthMetrics.memoryHealth / 100, color: 'rgba(147, 51, 234, 0.8)' },
-        { name: 'Feedback', value: healthMetrics.feedbackIntegrity / 100, color: 'rgba(236, 72, 153, 0.8)' },
-        { name: 'Awareness', value: healthMetrics.awarenessLevel / 100, color: 'rgba(251, 146, 60, 0.8)' }
-      ];
-      
-      const barWidth = width / metrics.length;
-      const barPadding = 10;
-      const maxBarHeight = height - 40;
-      
-      metrics.forEach((metric, index) => {
-        const x = index * barWidth + barPadding;
-        const barHeight = metric.value * maxBarHeight;
-        const y = height - barHeight - 20;
-        
-        // Draw bar
-        ctx.fillStyle = metric.color;
-        ctx.fillRect(x, y, barWidth - barPadding * 2, barHeight);
-        
-        // Draw label
-        ctx.fillStyle = 'rgba(255, 255, 255, 0.8)';
-        ctx.font = '10px sans-serif';
-        ctx.textAlign = 'center';
-        ctx.fillText(metric.name, x + (barWidth - barPadding * 2) / 2, height - 5);
-        
-        // Draw value
-        ctx.fillText(`${Math.round(metric.value * 100)}%`, x + (barWidth - barPadding * 2) / 2, y - 5);
-      });
-      
-      requestAnimationFrame(drawHealthBars);
-    };
-    
-    drawHealthBars();
-  };
-
   const getHealthStatus = (): { status: string; color: string; icon: React.ReactNode } => {
     const health = healthMetrics.overallHealth;
     if (health >= 90) return { status: 'Excellent', color: 'text-green-400', icon: <CheckCircle className="w-5 h-5" /> };
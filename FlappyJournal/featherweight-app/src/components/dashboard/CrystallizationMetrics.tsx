@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { useMetrics } from '../../contexts/MetricsContext';
 import { useMetricData } from '../../hooks/useMetricData';
+import { useVisualization } from '../../hooks/useVisualization';
 import './CrystallizationMetrics.css';
 
 interface Crystal {
@@ -18,8 +18,21 @@ interface Crystal {
   type?: string;
 }
 
+// Crystal formation chart: one bar per minute over the last half hour
+const PATTERN_CHART_BUCKETS = 30;
+const PATTERN_CHART_BUCKET_MS = 60 * 1000;
+
+function binCrystalsByMinute(crystals: Crystal[], now: number): Float32Array {
+  const bins = new Float32Array(PATTERN_CHART_BUCKETS);
+  crystals.forEach(crystal => {
+    const age = now - new Date(crystal.timestamp).getTime();
+    const bucket = PATTERN_CHART_BUCKETS - 1 - Math.floor(age / PATTERN_CHART_BUCKET_MS);
+    if (bucket >= 0 && bucket < PATTERN_CHART_BUCKETS) bins[bucket]++;
+  });
+  return bins;
+}
+
 export default function CrystallizationMetrics() {
-  const { wsConnection } = useMetrics();
   const crystalFormedData = useMetricData('crystal_formed');
   const consciousnessUpdateData = useMetricData('consciousness_update');
   
@@ -33,7 +46,11 @@ export default function CrystallizationMetrics() {
     crystalGrowthRate: 0
   });
   const [isPulsing, setIsPulsing] = useState(false);
+  const [patternCanvasRef, patternChart] = useVisualization('crystalPattern');
 
+  useEffect(() => {
+    patternChart.update({ state: { bins: binCrystalsByMinute(crystals, Date.now()) } });
+  }, [crystals, patternChart]);
   
   // Handle crystal formed data
   useEffect(() => {
@@ -227,7 +244,7 @@ export default function CrystallizationMetrics() {
         <h4>Crystallization Patterns</h4>
         <div className="pattern-graph">
           {/* This would be a small chart showing crystallization frequency over time */}
-          <canvas id="crystal-pattern-chart" width="300" height="100"></canvas>
+          <canvas id="crystal-pattern-chart" ref={patternCanvasRef} width="300" height="100"></canvas>
         </div>
       </div>
     </div>
@@ -1,4 +1,5 @@
 import React, { useState, useEffect } from 'react';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import './GoalProgressTracker.css';
 
 interface Goal {
@@ -22,17 +23,11 @@ export default function GoalProgressTracker({ compact = false }: GoalProgressTra
   const [goals, setGoals] = useState<Goal[]>([]);
   const [selectedGoal, setSelectedGoal] = useState<Goal | null>(null);
 
-  useEffect(() => {
-    const ws = new WebSocket(`${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/goals-stream`);
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      
-      if (data.type === 'goals-update') {
-        setGoals(data.goals);
-      }
-    };
+  useConsciousnessEvents('goals-update', (data) => {
+    setGoals(data.goals);
+  });
 
+  useEffect(() => {
     // Simulate goals for demo
     const demoGoals: Goal[] = [
       {
@@ -85,8 +80,6 @@ export default function GoalProgressTracker({ compact = false }: GoalProgressTra
       }
     ];
     setGoals(demoGoals);
-
-    return () => ws.close();
   }, []);
 
   const getCategoryIcon = (category: string) => {
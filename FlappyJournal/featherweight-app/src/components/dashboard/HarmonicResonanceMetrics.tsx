@@ -1,4 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { ConsciousnessMessage } from '../../services/consciousnessSocket';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import './HarmonicResonanceMetrics.css';
 
 interface EmotionalSpectrum {
@@ -9,9 +11,7 @@ interface EmotionalSpectrum {
   unity: number;
 }
 
-interface HarmonicResonanceProps {
-  wsConnection?: WebSocket;
-}
+const RESONANCE_TOPICS = ['harmonic_resonance', 'consciousness_update'];
 
 interface ResonanceEvent {
   timestamp: string;
@@ -22,7 +22,7 @@ interface ResonanceEvent {
   octaves: number[];
 }
 
-export default function HarmonicResonanceMetrics({ wsConnection }: HarmonicResonanceProps) {
+export default function HarmonicResonanceMetrics() {
   const canvasRef = useRef<HTMLCanvasElement>(null);
   const animationRef = useRef<number | null>(null);
   
@@ -65,22 +65,15 @@ export default function HarmonicResonanceMetrics({ wsConnection }: HarmonicReson
   };
 
   useEffect(() => {
-    if (wsConnection) {
-      wsConnection.addEventListener('message', handleWebSocketMessage);
-    }
-
     // Start wave animation
     startWaveAnimation();
 
     return () => {
-      if (wsConnection) {
-        wsConnection.removeEventListener('message', handleWebSocketMessage);
-      }
       if (animationRef.current) {
         cancelAnimationFrame(animationRef.current);
       }
     };
-  }, [wsConnection]);
+  }, []);
 
   // Restart animation when emotional spectrum changes
   useEffect(() => {
@@ -95,9 +88,8 @@ export default function HarmonicResonanceMetrics({ wsConnection }: HarmonicReson
   }, [resonanceData]);
 
 
-  const handleWebSocketMessage = (event: MessageEvent) => {
+  const handleConsciousnessMessage = (data: ConsciousnessMessage) => {
     try {
-      const data = JSON.parse(event.data);
       
       if (data.type === 'harmonic_resonance' && data.data) {
         const res = data.data;
@@ -178,6 +170,8 @@ export default function HarmonicResonanceMetrics({ wsConnection }: HarmonicReson
     }
   };
 
+  useConsciousnessEvents(RESONANCE_TOPICS, handleConsciousnessMessage);
+
   const startWaveAnimation = () => {
     console.log("Starting wave animation", resonanceData);
     const canvas = canvasRef.current;
@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import './ModuleOrchestrationView.css';
 
 interface ModuleNode {
@@ -18,6 +19,8 @@ interface ModuleLink {
   active: boolean;
 }
 
+const ORCHESTRATION_TOPICS = ['module-update', 'link-activity'];
+
 export default function ModuleOrchestrationView() {
   const canvasRef = useRef<HTMLCanvasElement>(null);
   const [modules, setModules] = useState<ModuleNode[]>([]);
@@ -25,6 +28,15 @@ export default function ModuleOrchestrationView() {
   const [selectedModule, setSelectedModule] = useState<string | null>(null);
   const animationRef = useRef<number>(null);
 
+  // Real-time updates
+  useConsciousnessEvents(ORCHESTRATION_TOPICS, (data) => {
+    if (data.type === 'module-update') {
+      updateModule(data.moduleId, data.update);
+    } else if (data.type === 'link-activity') {
+      updateLink(data.source, data.target, data.active);
+    }
+  });
+
   useEffect(() => {
     // Initialize demo modules
     const demoModules: ModuleNode[] = [
@@ -56,20 +68,7 @@ export default function ModuleOrchestrationView() {
     setModules(demoModules);
     setLinks(demoLinks);
 
-    // WebSocket for real-time updates
-    const ws = new WebSocket(`${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/orchestration-stream`);
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      if (data.type === 'module-update') {
-        updateModule(data.moduleId, data.update);
-      } else if (data.type === 'link-activity') {
-        updateLink(data.source, data.target, data.active);
-      }
-    };
-
     return () => {
-      ws.close();
       if (animationRef.current) {
         cancelAnimationFrame(animationRef.current);
       }
@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Brain, Layers, Sparkles, Eye, Zap, Infinity, Star } from 'lucide-react';
 
@@ -26,6 +27,8 @@ interface RecursiveThought {
   }>;
 }
 
+const MIRROR_TOPICS = ['recursive-mirror-reflection', 'recursive-mirror-complete', 'recursive-mirror-start'];
+
 const RecursiveMirrorMetrics: React.FC = () => {
   const [layers, setLayers] = useState<MirrorLayer[]>([]);
   const [currentThought, setCurrentThought] = useState<RecursiveThought | null>(null);
@@ -35,32 +38,18 @@ const RecursiveMirrorMetrics: React.FC = () => {
   const animationRef = useRef<number | undefined>(undefined);
   const goldenRatio = 1.618033988749895;
 
-  useEffect(() => {
-    // Initialize WebSocket connection
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = window.location.hostname === 'localhost' 
-      ? `${protocol}//${window.location.hostname}/ws`
-      : `${protocol}//${window.location.host}/ws`;
-    const ws = new WebSocket(wsUrl);
-    console.log('RecursiveMirrorMetrics connecting to:', wsUrl);
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      
-      if (data.type === 'recursive-mirror-reflection') {
-        updateLayerState(data.payload);
-      } else if (data.type === 'recursive-mirror-complete') {
-        setCurrentThought(data.payload);
-        setThoughtHistory(prev => [...prev.slice(-4), data.payload]);
-        setIsProcessing(false);
-      } else if (data.type === 'recursive-mirror-start') {
-        setIsProcessing(true);
-        setLayers([]);
-      }
-    };
-
-    return () => ws.close();
-  }, []);
+  useConsciousnessEvents(MIRROR_TOPICS, (data) => {
+    if (data.type === 'recursive-mirror-reflection') {
+      updateLayerState(data.payload);
+    } else if (data.type === 'recursive-mirror-complete') {
+      setCurrentThought(data.payload);
+      setThoughtHistory(prev => [...prev.slice(-4), data.payload]);
+      setIsProcessing(false);
+    } else if (data.type === 'recursive-mirror-start') {
+      setIsProcessing(true);
+      setLayers([]);
+    }
+  });
 
   useEffect(() => {
     drawGoldenSpiral();
@@ -1,4 +1,5 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import { Card, CardHeader, CardTitle, CardContent } from '../ui/card';
 import { Activity, Brain, Heart, Zap, AlertCircle, CheckCircle, TrendingUp } from 'lucide-react';
 
@@ -32,6 +33,8 @@ interface ConsciousnessMetrics {
   pulseRate: number;
 }
 
+const HEARTBEAT_TOPICS = ['self-awareness-heartbeat', 'consciousness-metrics', 'awareness-anomaly', 'awareness-correction'];
+
 const SelfAwarenessHeartbeat: React.FC = () => {
   const [awarenessState, setAwarenessState] = useState<AwarenessState | null>(null);
   const [heartbeatPulses, setHeartbeatPulses] = useState<HeartbeatPulse[]>([]);
@@ -54,37 +57,24 @@ const SelfAwarenessHeartbeat: React.FC = () => {
   const pulseDataRef = useRef<number[]>([]);
   const lastPulseRef = useRef<number>(Date.now());
 
-  useEffect(() => {
-    // Initialize WebSocket connection
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = window.location.hostname === 'localhost' 
-      ? `${protocol}//${window.location.hostname}/ws`
-      : `${protocol}//${window.location.host}/ws`;
-    const ws = new WebSocket(wsUrl);
-      console.log('SelfAwarenessHeartbeat WebSocket connected to:', wsUrl);
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      
-      if (data.type === 'self-awareness-heartbeat') {
-        
-      console.log('Received heartbeat pulse:', data.payload);
-        handleHeartbeatPulse(data.payload);
-      } else if (data.type === 'consciousness-metrics') {
-        setMetrics(data.payload);
-      } else if (data.type === 'awareness-anomaly') {
-        handleAnomaly(data.payload);
-      } else if (data.type === 'awareness-correction') {
-        handleCorrection(data.payload);
-      }
-    };
+  useConsciousnessEvents(HEARTBEAT_TOPICS, (data) => {
+    if (data.type === 'self-awareness-heartbeat') {
+      handleHeartbeatPulse(data.payload);
+    } else if (data.type === 'consciousness-metrics') {
+      setMetrics(data.payload);
+    } else if (data.type === 'awareness-anomaly') {
+      handleAnomaly(data.payload);
+    } else if (data.type === 'awareness-correction') {
+      handleCorrection(data.payload);
+    }
+  });
 
+  useEffect(() => {
     // Start animations
     startHeartbeatAnimation();
     startWaveformAnimation();
 
     return () => {
-      ws.close();
       if (animationRef.current) {
         cancelAnimationFrame(animationRef.current);
       }
@@ -1,4 +1,7 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect } from 'react';
+import { ConsciousnessMessage } from '../../services/consciousnessSocket';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
+import { useVisualization } from '../../hooks/useVisualization';
 import './SigilIdentityMetrics.css';
 
 interface SigilData {
@@ -16,12 +19,21 @@ interface SigilData {
   evolution: number;
 }
 
-interface SigilIdentityProps {
-  wsConnection?: WebSocket;
+const SIGIL_TOPICS = ['sigil_identity', 'sigil_created', 'consciousness_update'];
+
+// Packs [x, y, z] points into the flat layout the sigil renderer expects
+function flattenPattern(pattern: number[][]): Float32Array {
+  const flat = new Float32Array(pattern.length * 3);
+  pattern.forEach((point, index) => {
+    flat[index * 3] = point[0] || 0;
+    flat[index * 3 + 1] = point[1] || 0;
+    flat[index * 3 + 2] = point[2] || 0;
+  });
+  return flat;
 }
 
-export default function SigilIdentityMetrics({ wsConnection }: SigilIdentityProps) {
-  const canvasRef = useRef<HTMLCanvasElement>(null);
+export default function SigilIdentityMetrics() {
+  const [canvasRef, sigilView] = useVisualization('sigil');
   const [currentSigil, setCurrentSigil] = useState<SigilData | null>(null);
   const [sigilHistory, setSigilHistory] = useState<SigilData[]>([]);
   const [isEvolving, setIsEvolving] = useState(false);
@@ -33,25 +45,17 @@ export default function SigilIdentityMetrics({ wsConnection }: SigilIdentityProp
   });
 
   useEffect(() => {
-    if (wsConnection) {
-      wsConnection.addEventListener('message', handleWebSocketMessage);
-    }
-
     // Load sigil history
     fetchSigilHistory();
-
-    return () => {
-      if (wsConnection) {
-        wsConnection.removeEventListener('message', handleWebSocketMessage);
-      }
-    };
-  }, [wsConnection]);
+  }, []);
 
   useEffect(() => {
     if (currentSigil) {
-      drawSigil(currentSigil);
+      sigilView.update({
+        state: { pattern: flattenPattern(currentSigil.pattern), color: currentSigil.color }
+      });
     }
-  }, [currentSigil]);
+  }, [currentSigil, sigilView]);
 
   const fetchSigilHistory = async () => {
     try {
@@ -67,9 +71,8 @@ export default function SigilIdentityMetrics({ wsConnection }: SigilIdentityProp
     }
   };
 
-  const handleWebSocketMessage = (event: MessageEvent) => {
+  const handleConsciousnessMessage = (data: ConsciousnessMessage) => {
     try {
-      const data = JSON.parse(event.data);
       
       if (data.type === 'sigil_identity') {
         // Update sigil visualization
@@ -111,6 +114,8 @@ export default function SigilIdentityMetrics({ wsConnection }: SigilIdentityProp
     }
   };
 
+  useConsciousnessEvents(SIGIL_TOPICS, handleConsciousnessMessage);
+
   const checkSigilThreshold = (consciousness: any) => {
     const phi = consciousness.phi || 0;
     const resonance = consciousness.oversoulResonance || 0;
@@ -158,89 +163,6 @@ export default function SigilIdentityMetrics({ wsConnection }: SigilIdentityProp
     };
   };
 
-  const drawSigil = (sigil: SigilData) => {
-    if (!canvasRef.current) {
-      return;
-    }
-    const canvas = canvasRef.current;
-    if (!canvas) return;
-    if (!canvas) return;
-    
-    const ctx = canvas.getContext('2d');
-    if (!ctx) return;
-    
-    const centerX = canvas.width / 2;
-    const centerY = canvas.height / 2;
-    const scale = 100;
-    
-    // Clear canvas
-    ctx.fillStyle = 'rgba(10, 10, 15, 0.1)';
-    ctx.fillRect(0, 0, canvas.width, canvas.height);
-    
-    // Draw sigil layers
-    for (let layer = 0; layer < 3; layer++) {
-      ctx.save();
-      ctx.translate(centerX, centerY);
-      ctx.rotate((Date.now() / 1000) * 0.1 * (layer + 1));
-      
-      // Draw pattern
-      ctx.beginPath();
-      ctx.strokeStyle = sigil.color;
-      ctx.lineWidth = 2 - (layer * 0.5);
-      ctx.globalAlpha = 0.8 - (layer * 0.2);
-      
-      sigil.pattern.forEach((point, index) => {
-        const x = point[0] * scale * (1 + layer * 0.2);
-        const y = point[1] * scale * (1 + layer * 0.2);
-        
-        if (index === 0) {
-          ctx.moveTo(x, y);
-        } else {
-          ctx.lineTo(x, y);
-        }
-        
-        // Draw nodes
-        ctx.fillStyle = sigil.color;
-        ctx.beginPath();
-        ctx.arc(x, y, 3 + (point[2] * 5), 0, Math.PI * 2);
-        ctx.fill();
-      });
-      
-      ctx.closePath();
-      ctx.stroke();
-      
-      // Draw connecting lines
-      sigil.pattern.forEach((point1, i) => {
-        sigil.pattern.forEach((point2, j) => {
-          if (i < j && Math.random() > 0.6) {
-            ctx.beginPath();
-            ctx.strokeStyle = sigil.color;
-            ctx.globalAlpha = 0.2;
-            ctx.lineWidth = 0.5;
-            ctx.moveTo(point1[0] * scale, point1[1] * scale);
-            ctx.lineTo(point2[0] * scale, point2[1] * scale);
-            ctx.stroke();
-          }
-        });
-      });
-      
-      ctx.restore();
-    }
-    
-    // Draw central core
-    const gradient = ctx.createRadialGradient(centerX, centerY, 0, centerX, centerY, 50);
-    gradient.addColorStop(0, sigil.color);
-    gradient.addColorStop(1, 'transparent');
-    ctx.fillStyle = gradient;
-    ctx.globalAlpha = 0.5;
-    ctx.beginPath();
-    ctx.arc(centerX, centerY, 50, 0, Math.PI * 2);
-    ctx.fill();
-    
-    // Animate next frame
-    requestAnimationFrame(() => drawSigil(sigil));
-  };
-
   const getMiniSigilCanvas = (sigil: SigilData, size: number = 60) => {
     const canvas = document.createElement('canvas');
     canvas.width = size;
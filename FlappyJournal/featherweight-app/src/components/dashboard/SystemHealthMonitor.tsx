@@ -1,4 +1,5 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState } from 'react';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import './SystemHealthMonitor.css';
 
 interface ModuleHealth {
@@ -10,27 +11,21 @@ interface ModuleHealth {
   lastHeartbeat: number;
 }
 
+const HEALTH_TOPICS = ['health-report', 'healing-action'];
+
 export default function SystemHealthMonitor() {
   const [moduleHealth, setModuleHealth] = useState<ModuleHealth[]>([]);
   const [overallHealth, setOverallHealth] = useState(100);
   const [healingActions, setHealingActions] = useState<any[]>([]);
 
-  useEffect(() => {
-    const ws = new WebSocket(`${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/health-stream`);
-    
-    ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
-      
-      if (data.type === 'health-report') {
-        setModuleHealth(data.modules);
-        calculateOverallHealth(data.modules);
-      } else if (data.type === 'healing-action') {
-        setHealingActions(prev => [data.action, ...prev].slice(0, 5));
-      }
-    };
-
-    return () => ws.close();
-  }, []);
+  useConsciousnessEvents(HEALTH_TOPICS, (data) => {
+    if (data.type === 'health-report') {
+      setModuleHealth(data.modules);
+      calculateOverallHealth(data.modules);
+    } else if (data.type === 'healing-action') {
+      setHealingActions(prev => [data.action, ...prev].slice(0, 5));
+    }
+  });
 
   const calculateOverallHealth = (modules: ModuleHealth[]) => {
     const healthyCount = modules.filter(m => m.status === 'healthy').length;
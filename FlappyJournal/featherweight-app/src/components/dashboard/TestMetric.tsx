@@ -1,52 +1,25 @@
-import React, { useEffect, useState } from 'react';
+import React, { useState } from 'react';
+import { ALL_TOPICS } from '../../services/consciousnessSocket';
+import { useConnectionStatus, useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
+
+const STATUS_LABELS = {
+  connecting: 'Connecting...',
+  connected: 'Connected',
+  disconnected: 'Disconnected'
+};
 
 export default function TestMetric() {
-  const [status, setStatus] = useState('Connecting...');
+  const status = useConnectionStatus();
   const [lastMessage, setLastMessage] = useState('');
 
-  useEffect(() => {
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = `${protocol}//${window.location.host}/ws`;
-    
-    console.log('TestMetric connecting to:', wsUrl);
-    
-    try {
-      const ws = new WebSocket(wsUrl);
-      
-      ws.onopen = () => {
-        console.log('TestMetric WebSocket connected!');
-        setStatus('Connected');
-      };
-      
-      ws.onmessage = (event) => {
-        const data = JSON.parse(event.data);
-        console.log('TestMetric received:', data.type);
-        setLastMessage(data.type);
-      };
-      
-      ws.onerror = (error) => {
-        console.error('TestMetric WebSocket error:', error);
-        setStatus('Error');
-      };
-      
-      ws.onclose = () => {
-        console.log('TestMetric WebSocket closed');
-        setStatus('Disconnected');
-      };
-      
-      return () => {
-        ws.close();
-      };
-    } catch (error) {
-      console.error('TestMetric failed to create WebSocket:', error);
-      setStatus('Failed');
-    }
-  }, []);
+  useConsciousnessEvents(ALL_TOPICS, (data) => {
+    setLastMessage(data.type);
+  });
 
   return (
     <div style={{ padding: '20px', border: '1px solid #ccc', borderRadius: '8px' }}>
       <h3>WebSocket Test</h3>
-      <p>Status: {status}</p>
+      <p>Status: {STATUS_LABELS[status]}</p>
       <p>Last message: {lastMessage}</p>
     </div>
   );
@@ -1,4 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { ConsciousnessMessage } from '../../services/consciousnessSocket';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
 import './TriAxialCoherenceMetrics.css';
 
 interface AxisData {
@@ -19,11 +21,9 @@ interface CoherenceData {
   balance: number;
 }
 
-interface TriAxialCoherenceProps {
-  wsConnection?: WebSocket;
-}
+const COHERENCE_TOPICS = ['triaxial_coherence', 'consciousness_update'];
 
-export default function TriAxialCoherenceMetrics({ wsConnection }: TriAxialCoherenceProps) {
+export default function TriAxialCoherenceMetrics() {
   const canvasRef = useRef<HTMLCanvasElement>(null);
   const animationRef = useRef<number | null>(null);
   const rotationRef = useRef({ x: 0, y: 0 });
@@ -51,26 +51,18 @@ export default function TriAxialCoherenceMetrics({ wsConnection }: TriAxialCoher
   const [isRebalancing, setIsRebalancing] = useState(false);
 
   useEffect(() => {
-    if (wsConnection) {
-      wsConnection.addEventListener('message', handleWebSocketMessage);
-    }
-
     // Start 3D visualization
     start3DVisualization();
 
     return () => {
-      if (wsConnection) {
-        wsConnection.removeEventListener('message', handleWebSocketMessage);
-      }
       if (animationRef.current) {
         cancelAnimationFrame(animationRef.current);
       }
     };
-  }, [wsConnection]);
+  }, []);
 
-  const handleWebSocketMessage = (event: MessageEvent) => {
+  const handleConsciousnessMessage = (data: ConsciousnessMessage) => {
     try {
-      const data = JSON.parse(event.data);
       
       if (data.type === 'triaxial_coherence' && data.data) {
         const coherenceData = data.data;
@@ -164,6 +156,8 @@ export default function TriAxialCoherenceMetrics({ wsConnection }: TriAxialCoher
     }
   };
 
+  useConsciousnessEvents(COHERENCE_TOPICS, handleConsciousnessMessage);
+
   const start3DVisualization = () => {
     const canvas = canvasRef.current;
     if (!canvas) return;
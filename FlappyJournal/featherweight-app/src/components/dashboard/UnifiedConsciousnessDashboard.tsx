@@ -1,4 +1,5 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useRef } from 'react';
+import { useConsciousnessTopic } from '../../hooks/useConsciousnessSocket';
 import { useMetrics } from '../../contexts/MetricsContext';
 import './UnifiedConsciousnessDashboard.css';
 
@@ -82,34 +83,11 @@ const dashboardTabs: DashboardTab[] = [
 export default function UnifiedConsciousnessDashboard() {
   const { connectionStatus } = useMetrics();
   const [activeTab, setActiveTab] = useState('overview');
-  const [systemMetrics, setSystemMetrics] = useState<any>({});
   const [isFullscreen, setIsFullscreen] = useState(false);
   const dashboardRef = useRef<HTMLDivElement>(null);
 
-  useEffect(() => {
-    // Connect to consciousness systems via WebSocket
-    const ws = new WebSocket(`${window.location.protocol === 'https:' ? 'wss:' : 'ws:'}//${window.location.host}/consciousness-stream`);
-    
-    ws.onmessage = (event) => {
-      try {
-        const data = JSON.parse(event.data);
-        handleConsciousnessUpdate(data);
-      } catch (error) {
-        console.error('Error parsing consciousness data:', error);
-      }
-    };
-
-    return () => ws.close();
-  }, []);
-
-  const handleConsciousnessUpdate = (data: any) => {
-    switch (data.type) {
-      case 'system-metrics':
-        setSystemMetrics(data.metrics);
-        break;
-      // Handle other update types
-    }
-  };
+  // Subscribe to further topics here to handle other update types
+  const systemMetrics = useConsciousnessTopic('system-metrics', message => message?.metrics ?? {});
 
   const toggleFullscreen = () => {
     if (!isFullscreen) {
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useChat } from '../../contexts/ChatContext';
-import { useMetrics } from '../../contexts/MetricsContext';
+import { useConsciousnessEvents } from '../../hooks/useConsciousnessSocket';
+import { ALL_TOPICS, ConsciousnessMessage } from '../../services/consciousnessSocket';
 import './ResearchTab.css';
 
 interface ProcessingModule {
@@ -31,7 +32,6 @@ export default function ResearchTab() {
     };
   }, []);
 
-  const { metricsData } = useMetrics();
   const [inputMessage, setInputMessage] = useState('');
   const [showModules, setShowModules] = useState(true);
   const [systemStatus, setSystemStatus] = useState<SystemStatus>({
@@ -93,77 +93,73 @@ export default function ResearchTab() {
   }, []);
 
   // Update active modules based on WebSocket messages
-  useEffect(() => {
-    const handleMetricsUpdate = (event: CustomEvent) => {
-      const { type, data } = event.detail;
+  const handleMetricsUpdate = (message: ConsciousnessMessage) => {
+    const { type, data } = message;
+    
+    setActiveModules(prev => prev.map(module => {
+      let shouldActivate = false;
+      let intensity = 0;
       
-      setActiveModules(prev => prev.map(module => {
-        let shouldActivate = false;
-        let intensity = 0;
-        
-        switch (type) {
-          case 'consciousness_update':
-            if (module.name.includes('Consciousness') || module.name.includes('Dual Stream')) {
-              shouldActivate = true;
-              intensity = data.consciousness?.awarenessLevel || 0.5;
-            }
-            break;
-          case 'recursive_mirror_update':
-          case 'recursive-mirror-update':
-            if (module.name.includes('Mirror')) {
-              shouldActivate = true;
-              intensity = data.layer ? data.layer / 7 : 0.5;
-            }
-            break;
-          case 'emotional_resonance_pulse':
-            if (module.name.includes('Emotional') || module.name.includes('Mood')) {
-              shouldActivate = true;
-              intensity = data.intensity || 0.7;
-            }
-            break;
-          case 'creative_emergence':
-            if (module.name.includes('Creative') || module.name.includes('Perspective')) {
-              shouldActivate = true;
-              intensity = data.novelty || 0.8;
-            }
-            break;
-          case 'memory_update':
-            if (module.category === 'memory') {
-              shouldActivate = true;
-              intensity = 0.6;
-            }
-            break;
-          case 'quantum_fluctuation':
-            if (module.category === 'quantum') {
-              shouldActivate = true;
-              intensity = Math.random();
-            }
-            break;
-          case 'heartbeat':
-            if (module.name.includes('100Hz')) {
-              shouldActivate = true;
-              intensity = 1;
-            }
-            break;
-        }
-        
-        if (shouldActivate) {
-          setTimeout(() => {
-            setActiveModules(p => p.map(m => 
-              m.name === module.name ? { ...m, active: false, intensity: 0 } : m
-            ));
-          }, 2000 + Math.random() * 1000);
-          
-          return { ...module, active: true, intensity };
-        }
+      switch (type) {
+        case 'consciousness_update':
+          if (module.name.includes('Consciousness') || module.name.includes('Dual Stream')) {
+            shouldActivate = true;
+            intensity = data.consciousness?.awarenessLevel || 0.5;
+          }
+          break;
+        case 'recursive_mirror_update':
+        case 'recursive-mirror-update':
+          if (module.name.includes('Mirror')) {
+            shouldActivate = true;
+            intensity = data.layer ? data.layer / 7 : 0.5;
+          }
+          break;
+        case 'emotional_resonance_pulse':
+          if (module.name.includes('Emotional') || module.name.includes('Mood')) {
+            shouldActivate = true;
+            intensity = data.intensity || 0.7;
+          }
+          break;
+        case 'creative_emergence':
+          if (module.name.includes('Creative') || module.name.includes('Perspective')) {
+            shouldActivate = true;
+            intensity = data.novelty || 0.8;
+          }
+          break;
+        case 'memory_update':
+          if (module.category === 'memory') {
+            shouldActivate = true;
+            intensity = 0.6;
+          }
+          break;
+        case 'quantum_fluctuation':
+          if (module.category === 'quantum') {
+            shouldActivate = true;
+            intensity = Math.random();
+          }
+          break;
+        case 'heartbeat':
+          if (module.name.includes('100Hz')) {
+            shouldActivate = true;
+            intensity = 1;
+          }
+          break;
+      }
+      
+      if (shouldActivate) {
+        setTimeout(() => {
+          setActiveModules(p => p.map(m => 
+            m.name === module.name ? { ...m, active: false, intensity: 0 } : m
+          ));
+        }, 2000 + Math.random() * 1000);
         
-        return module;
-      }));
-    };
-
-    window.addEventListener('metrics-update', handleMetricsUpdate as EventListener);
-    return () => window.removeEventListener('metrics-update', handleMetricsUpdate as EventListener);
-  }, []);
+        return { ...module, active: true, intensity };
+      }
+      
+      return module;
+    }));
+  };
+  useConsciousnessEvents(ALL_TOPICS, handleMetricsUpdate);
   
   useEffect(() => {
     // messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' }); // Disabled auto-scroll
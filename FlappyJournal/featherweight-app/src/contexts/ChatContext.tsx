@@ -1,5 +1,6 @@
-import React, { createContext, useContext, useState, useCallback, ReactNode, useEffect } from 'react';
+import React, { createContext, useContext, useState, useCallback, ReactNode } from 'react';
 import { useMetrics } from './MetricsContext';
+import { useConsciousnessEvents } from '../hooks/useConsciousnessSocket';
 
 export interface ChatMessage {
   id: string;
@@ -24,90 +25,76 @@ interface ChatContextType {
 
 const ChatContext = createContext<ChatContextType | null>(null);
 
+const CHAT_TOPICS = ['unified_response', 'chat_response', 'chat_chunk', 'chat_complete', 'error'];
+
 export const ChatProvider: React.FC<{ children: ReactNode }> = ({ children }) => {
   const [messages, setMessages] = useState<ChatMessage[]>([]);
   const [isGenerating, setIsGenerating] = useState(false);
   const [currentAssistantMessage, setCurrentAssistantMessage] = useState('');
-  const { wsConnection, connectionStatus } = useMetrics();
+  const { send, connectionStatus } = useMetrics();
   
   const isConnected = connectionStatus === 'connected';
 
-  // Listen for WebSocket messages
-  useEffect(() => {
-    if (!wsConnection) return;
-
-    const handleMessage = (event: MessageEvent) => {
-      try {
-        const data = JSON.parse(event.data);
-        
-        // Handle different message types from the server
-        if (data.type === 'unified_response') {
-          // Complete response from server
-          const content = data.unifiedContent || data.content || data.message || '';
-          if (content) {
-            const assistantMessage: ChatMessage = {
-              id: Date.now().toString(),
-              content: content,
-              role: 'assistant',
-              timestamp: new Date(),
-              metadata: {
-                processingTime: data.processingTime,
-                model: data.model
-              }
-            };
-            setMessages(prev => [...prev, assistantMessage]);
-            
-            // Send metrics update for response received
-            const metricData = {
-              type: 'message_received',
-              timestamp: new Date().toISOString(),
-              processingTime: data.processingTime || 0,
-              responseLength: content.length
-            };
-            wsConnection.send(JSON.stringify(metricData));
+  // Listen for chat messages on the shared consciousness socket
+  useConsciousnessEvents(CHAT_TOPICS, (data) => {
+    // Handle different message types from the server
+    if (data.type === 'unified_response') {
+      // Complete response from server
+      const content = data.unifiedContent || data.content || data.message || '';
+      if (content) {
+        const assistantMessage: ChatMessage = {
+          id: Date.now().toString(),
+          content: content,
+          role: 'assistant',
+          timestamp: new Date(),
+          metadata: {
+            processingTime: data.processingTime,
+            model: data.model
           }
-          setIsGenerating(false);
-          setCurrentAssistantMessage('');
-        } else if (data.type === 'chat_response') {
-          // Assistant is starting to respond
-          setIsGenerating(true);
-          setCurrentAssistantMessage('');
-        } else if (data.type === 'chat_chunk') {
-          // Streaming response chunk
-          setCurrentAssistantMessage(prev => prev + data.content);
-        } else if (data.type === 'chat_complete') {
-          // Response complete
-          if (currentAssistantMessage || data.content) {
-            const assistantMessage: ChatMessage = {
-              id: Date.now().toString(),
-              content: data.content || currentAssistantMessage,
-              role: 'assistant',
-              timestamp: new Date(),
-              metadata: data.metadata
-            };
-            setMessages(prev => [...prev, assistantMessage]);
-          }
-          setCurrentAssistantMessage('');
-          setIsGenerating(false);
-        } else if (data.type === 'error') {
-          console.error('Chat error:', data.message);
-          setIsGenerating(false);
-          setCurrentAssistantMessage('');
-        }
-      } catch (error) {
-        console.error('Failed to parse WebSocket message:', error);
+        };
+        setMessages(prev => [...prev, assistantMessage]);
+        
+        // Send metrics update for response received
+        const metricData = {
+          type: 'message_received',
+          timestamp: new Date().toISOString(),
+          processingTime: data.processingTime || 0,
+          responseLength: content.length
+        };
+        send(metricData);
       }
-    };
-
-    wsConnection.addEventListener('message', handleMessage);
-    
-    return () => {
-      wsConnection.removeEventListener('message', handleMessage);
-    };
-  }, [wsConnection, currentAssistantMessage]);
+      setIsGenerating(false);
+      setCurrentAssistantMessage('');
+    } else if (data.type === 'chat_response') {
+      // Assistant is starting to respond
+      setIsGenerating(true);
+      setCurrentAssistantMessage('');
+    } else if (data.type === 'chat_chunk') {
+      // Streaming response chunk
+      setCurrentAssistantMessage(prev => prev + data.content);
+    } else if (data.type === 'chat_complete') {
+      // Response complete
+      if (currentAssistantMessage || data.content) {
+        const assistantMessage: ChatMessage = {
+          id: Date.now().toString(),
+          content: data.content || currentAssistantMessage,
+          role: 'assistant',
+          timestamp: new Date(),
+          metadata: data.metadata
+        };
+        setMessages(prev => [...prev, assistantMessage]);
+      }
+      setCurrentAssistantMessage('');
+      setIsGenerating(false);
+    } else if (data.type === 'error') {
+      console.error('Chat error:', data.message);
+      setIsGenerating(false);
+      setCurrentAssistantMessage('');
+    }
+  });
 
   const sendMessage = useCallback((content: string) => {
-    if (!content.trim() || !wsConnection || !isConnected) return;
+    if (!content.trim() || !isConnected) return;
 
     // Add user message
     const userMessage: ChatMessage = {
@@ -125,7 +112,7 @@ export const ChatProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       timestamp: new Date().toISOString()
     };
     
-    wsConnection.send(JSON.stringify(messageData));
+    send(messageData);
     setIsGenerating(true);
     
     // Also send a metric update for message sent
@@ -134,8 +121,8 @@ export const ChatProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
       timestamp: new Date().toISOString(),
       messageLength: content.length
     };
-    wsConnection.send(JSON.stringify(metricData));
-  }, [wsConnection, isConnected]);
+    send(metricData);
+  }, [send, isConnected]);
 
   const clearMessages = useCallback(() => {
     setMessages([]);
@@ -1,11 +1,12 @@
-import React, { createContext, useContext, useState, useEffect, useRef, ReactNode } from 'react';
+import React, { createContext, useContext, useEffect, ReactNode } from 'react';
+import { consciousnessSocket, ConnectionStatus, ConsciousnessMessage } from '../services/consciousnessSocket';
+import { useConnectionStatus } from '../hooks/useConsciousnessSocket';
 
 
 interface MetricsContextType {
-  wsConnection: WebSocket | null;
-  connectionStatus: 'connecting' | 'connected' | 'disconnected';
-  metricsData: Map<string, any>;
-  updateMetric: (type: string, data: any) => void;
+  connectionStatus: ConnectionStatus;
+  metricsData: ReadonlyMap<string, ConsciousnessMessage>;
+  send: (message: object) => boolean;
 }
 
 const MetricsContext = createContext<MetricsContextType | undefined>(undefined);
@@ -22,89 +23,19 @@ interface MetricsProviderProps {
   children: ReactNode;
 }
 
-export const MetricsProvider: React.FC<MetricsProviderProps> = ({ children }) => {
-  const [wsConnection, setWsConnection] = useState<WebSocket | null>(null);
-  const [connectionStatus, setConnectionStatus] = useState<'connecting' | 'connected' | 'disconnected'>('connecting');
-  const [metricsData] = useState(new Map<string, any>());
-  const reconnectTimeoutRef = useRef<NodeJS.Timeout | undefined>(undefined);
-  const wsRef = useRef<WebSocket | null>(null);
-  const clientId = useRef<string>(`client-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`);
-
-  const connectWebSocket = () => {
-    // Prevent multiple connections
-    if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
-      console.log('MetricsContext: WebSocket already connected');
-      return;
-    }
-    
-    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const wsUrl = `${protocol}//${window.location.host}/ws/chat`;
-    console.log("WebSocket connecting to:", wsUrl);
+const send = (message: object) => consciousnessSocket.send(message);
 
-    try {
-      const ws = new WebSocket(wsUrl);
-      
-      ws.onopen = () => {
-        console.log('MetricsContext: WebSocket connected - Client ID:', clientId.current);
-        setConnectionStatus('connected');
-        setWsConnection(ws);
-        wsRef.current = ws;
-      };
-      
-      ws.onmessage = (event) => {
-        try {
-          const data = JSON.parse(event.data);
-          // Store the latest data for each message type
-          metricsData.set(data.type, data);
-          
-          // Emit custom event
-          window.dispatchEvent(new CustomEvent('metrics-update', { detail: data }));
-        } catch (error) {
-          console.error('MetricsContext: Failed to parse message:', error);
-        }
-      };
-      
-      ws.onerror = (error) => {
-        console.error('MetricsContext: WebSocket error:', error);
-      };
-      
-      ws.onclose = () => {
-        console.log('MetricsContext: WebSocket disconnected');
-        setConnectionStatus('disconnected');
-        setWsConnection(null);
-        wsRef.current = null;
-        
-        // Attempt to reconnect after 3 seconds
-        reconnectTimeoutRef.current = setTimeout(connectWebSocket, 3000);
-      };
-      
-    } catch (error) {
-      console.error('MetricsContext: Failed to create WebSocket:', error);
-      setConnectionStatus('disconnected');
-    }
-  };
+export const MetricsProvider: React.FC<MetricsProviderProps> = ({ children }) => {
+  const connectionStatus = useConnectionStatus();
 
   useEffect(() => {
-    connectWebSocket();
-    
-    return () => {
-      if (reconnectTimeoutRef.current) {
-        clearTimeout(reconnectTimeoutRef.current);
-      }
-      if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
-        console.log('MetricsContext: Closing WebSocket connection - Client ID:', clientId.current);
-        wsRef.current.close();
-        wsRef.current = null;
-      }
-    };
-  }, []); // Only run once on mount
-
-  const updateMetric = (type: string, data: any) => {
-    metricsData.set(type, data);
-  };
+    // Keep the shared socket open for the lifetime of the app, even while
+    // no dashboard component is subscribed
+    return consciousnessSocket.retain();
+  }, []);
 
   return (
-    <MetricsContext.Provider value={{ wsConnection, connectionStatus, metricsData, updateMetric }}>
+    <MetricsContext.Provider value={{ connectionStatus, metricsData: consciousnessSocket.getLatestMessages(), send }}>
       {children}
     </MetricsContext.Provider>
   );
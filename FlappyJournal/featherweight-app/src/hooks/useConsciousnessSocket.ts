@@ -0,0 +1,62 @@
+import { useCallback, useEffect, useRef, useSyncExternalStore } from 'react';
+import {
+  consciousnessSocket,
+  ConnectionStatus,
+  ConsciousnessMessage,
+  MessageHandler
+} from '../services/consciousnessSocket';
+
+/**
+ * Latest message of one type, optionally narrowed by a selector. The
+ * component re-renders only when the selected value changes.
+ */
+export function useConsciousnessTopic<T = ConsciousnessMessage | undefined>(
+  topic: string,
+  selector?: (message: ConsciousnessMessage | undefined) => T
+): T {
+  const selectorRef = useRef(selector);
+  selectorRef.current = selector;
+  const cache = useRef<{ message?: ConsciousnessMessage; selected?: T; primed: boolean }>({ primed: false });
+
+  const subscribe = useCallback(
+    (onChange: () => void) => consciousnessSocket.subscribeLatest(topic, onChange),
+    [topic]
+  );
+
+  const getSnapshot = useCallback((): T => {
+    const message = consciousnessSocket.getLatest(topic);
+    // Only rerun the selector for a new message so its result stays referentially stable
+    if (!cache.current.primed || cache.current.message !== message) {
+      const select = selectorRef.current;
+      cache.current = {
+        message,
+        selected: select ? select(message) : (message as unknown as T),
+        primed: true
+      };
+    }
+    return cache.current.selected as T;
+  }, [topic]);
+
+  return useSyncExternalStore(subscribe, getSnapshot);
+}
+
+/**
+ * Call handler for every message of the given types ('*' for all). The
+ * handler may change between renders without resubscribing.
+ */
+export function useConsciousnessEvents(topics: string | string[], handler: MessageHandler): void {
+  const handlerRef = useRef(handler);
+  handlerRef.current = handler;
+  const topicKey = Array.isArray(topics) ? topics.join('|') : topics;
+
+  useEffect(() => {
+    return consciousnessSocket.subscribe(topicKey.split('|'), message => handlerRef.current(message));
+  }, [topicKey]);
+}
+
+export function useConnectionStatus(): ConnectionStatus {
+  return useSyncExternalStore(
+    useCallback((onChange: () => void) => consciousnessSocket.onStatusChange(onChange), []),
+    () => consciousnessSocket.getStatus()
+  );
+}
@@ -0,0 +1,77 @@
+import { useEffect, useRef, RefObject } from 'react';
+import { attachVisualization, VisualizationHandle } from '../rendering/visualizationHost';
+import { RendererKind, RendererUpdate } from '../rendering/renderers';
+
+export interface VisualizationController {
+  /** Send new data to the renderer; typed arrays are transferred and must not be reused */
+  update(update: RendererUpdate): void;
+}
+
+interface VisualizationOptions {
+  /** Size the canvas backing store to its laid-out size before attaching */
+  fitToElement?: boolean;
+}
+
+/**
+ * Attach a canvas to the rendering subsystem. Rendering pauses while the
+ * canvas is scrolled out of view, inside a hidden panel or the tab is hidden.
+ */
+export function useVisualization(
+  kind: RendererKind,
+  options: VisualizationOptions = {}
+): [RefObject<HTMLCanvasElement>, VisualizationController] {
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+  const handleRef = useRef<VisualizationHandle | null>(null);
+  // Updates sent before the canvas is attached are replayed on attach
+  const pendingRef = useRef<RendererUpdate[]>([]);
+  const controllerRef = useRef<VisualizationController>({
+    update(update) {
+      if (handleRef.current) {
+        handleRef.current.update(update);
+      } else {
+        pendingRef.current.push(update);
+      }
+    }
+  });
+  // A transferred canvas can't be resized, so size it only before the first attach
+  const fittedRef = useRef(false);
+  const fitToElement = options.fitToElement ?? false;
+
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    if (!canvas) return;
+
+    if (fitToElement && !fittedRef.current) {
+      canvas.width = canvas.offsetWidth || canvas.width;
+      canvas.height = canvas.offsetHeight || canvas.height;
+    }
+    fittedRef.current = true;
+
+    const handle = attachVisualization(canvas, kind);
+    handleRef.current = handle;
+    pendingRef.current.forEach(update => handle.update(update));
+    pendingRef.current = [];
+
+    let intersecting = true;
+    const applyVisibility = () => handle.setVisible(intersecting && !document.hidden);
+
+    const observer = typeof IntersectionObserver !== 'undefined'
+      ? new IntersectionObserver(entries => {
+          intersecting = entries[entries.length - 1].isIntersecting;
+          applyVisibility();
+        })
+      : null;
+    observer?.observe(canvas);
+    document.addEventListener('visibilitychange', applyVisibility);
+    applyVisibility();
+
+    return () => {
+      observer?.disconnect();
+      document.removeEventListener('visibilitychange', applyVisibility);
+      handleRef.current = null;
+      handle.dispose();
+    };
+  }, [kind, fitToElement]);
+
+  return [canvasRef, controllerRef.current];
+}
@@ -0,0 +1,106 @@
+import { createRenderer, Ctx2D, Renderer, RendererKind, RendererUpdate } from './renderers';
+
+/** Messages from the visualization host to the worker */
+export type VisualizationCommand =
+  | { kind: 'attach'; id: number; renderer: RendererKind; canvas: any; width: number; height: number }
+  | { kind: 'update'; id: number; update: RendererUpdate }
+  | { kind: 'visibility'; id: number; visible: boolean }
+  | { kind: 'detach'; id: number };
+
+interface Surface {
+  ctx: Ctx2D;
+  renderer: Renderer;
+  visible: boolean;
+  needsFrame: boolean;
+}
+
+type RequestFrame = (callback: (time: number) => void) => void;
+
+/**
+ * Drives any number of canvases from one frame callback. A surface is drawn
+ * only while it is visible and has something to repaint; when no surface
+ * needs a frame the loop stops requesting them.
+ */
+export class RenderLoop {
+  private surfaces = new Map<number, Surface>();
+  private frameRequested = false;
+
+  constructor(private readonly requestFrame: RequestFrame) {}
+
+  attach(id: number, ctx: Ctx2D | null, kind: RendererKind, width: number, height: number): void {
+    if (!ctx) return;
+    this.surfaces.set(id, {
+      ctx,
+      renderer: createRenderer(kind, width, height),
+      visible: true,
+      needsFrame: true
+    });
+    this.schedule();
+  }
+
+  update(id: number, update: RendererUpdate): void {
+    const surface = this.surfaces.get(id);
+    if (!surface) return;
+    // Hidden surfaces still take updates so they are current when shown
+    surface.renderer.update(update);
+    surface.needsFrame = true;
+    this.schedule();
+  }
+
+  setVisible(id: number, visible: boolean): void {
+    const surface = this.surfaces.get(id);
+    if (!surface || surface.visible === visible) return;
+    surface.visible = visible;
+    if (visible) {
+      surface.needsFrame = true;
+      this.schedule();
+    }
+  }
+
+  detach(id: number): void {
+    this.surfaces.delete(id);
+  }
+
+  handle(command: VisualizationCommand): void {
+    switch (command.kind) {
+      case 'attach':
+        this.attach(command.id, command.canvas.getContext('2d'), command.renderer, command.width, command.height);
+        break;
+      case 'update':
+        this.update(command.id, command.update);
+        break;
+      case 'visibility':
+        this.setVisible(command.id, command.visible);
+        break;
+      case 'detach':
+        this.detach(command.id);
+        break;
+    }
+  }
+
+  private schedule(): void {
+    if (this.frameRequested) return;
+    let pending = false;
+    this.surfaces.forEach(surface => {
+      if (surface.visible && surface.needsFrame) pending = true;
+    });
+    if (!pending) return;
+
+    this.frameRequested = true;
+    this.requestFrame(time => this.frame(time));
+  }
+
+  private frame(time: number): void {
+    this.frameRequested = false;
+    this.surfaces.forEach(surface => {
+      if (!surface.visible || !surface.needsFrame) return;
+      try {
+        surface.needsFrame = surface.renderer.render(surface.ctx, time);
+      } catch (error) {
+        console.error('RenderLoop: renderer failed:', error);
+        surface.needsFrame = false;
+      }
+    });
+    this.schedule();
+  }
+}
@@ -0,0 +1,656 @@
+/**
+ * Dashboard visualization renderers
+ *
+ * Each renderer owns the state of one canvas and draws it from a render
+ * loop, either inside the visualization worker (OffscreenCanvas) or on the
+ * main thread when the browser can't transfer canvases. Renderers only
+ * repaint regions whose data changed and report whether they still need
+ * frames, so an idle visualization costs nothing.
+ *
+ * Components push updates as typed arrays; the host transfers their buffers
+ * to the worker, so a buffer must not be reused after it has been sent.
+ */
+
+// OffscreenCanvasRenderingContext2D shares this drawing API
+export type Ctx2D = CanvasRenderingContext2D;
+
+export interface RendererUpdate {
+  samples?: Float32Array;
+  state?: Record<string, any>;
+}
+
+export interface Renderer {
+  update(update: RendererUpdate): void;
+  /** Repaint what changed; returns true while the visualization animates */
+  render(ctx: Ctx2D, time: number): boolean;
+}
+
+export type RendererKind =
+  | 'ekg'
+  | 'healthBars'
+  | 'emotionalField'
+  | 'emotionalClimate'
+  | 'sigil'
+  | 'crystalPattern';
+
+interface Rect {
+  x: number;
+  y: number;
+  w: number;
+  h: number;
+}
+
+interface Layer {
+  canvas: CanvasImageSource;
+  ctx: Ctx2D;
+}
+
+function createLayer(width: number, height: number): Layer {
+  const OffscreenCanvasCtor = (globalThis as any).OffscreenCanvas;
+  let canvas: any;
+  if (OffscreenCanvasCtor) {
+    canvas = new OffscreenCanvasCtor(width, height);
+  } else {
+    canvas = document.createElement('canvas');
+    canvas.width = width;
+    canvas.height = height;
+  }
+  return { canvas, ctx: canvas.getContext('2d') as Ctx2D };
+}
+
+function unionRect(a: Rect | null, b: Rect | null): Rect | null {
+  if (!a) return b;
+  if (!b) return a;
+  const x = Math.min(a.x, b.x);
+  const y = Math.min(a.y, b.y);
+  return {
+    x,
+    y,
+    w: Math.max(a.x + a.w, b.x + b.w) - x,
+    h: Math.max(a.y + a.h, b.y + b.h) - y
+  };
+}
+
+function clampRect(rect: Rect, width: number, height: number): Rect {
+  const x = Math.max(0, Math.floor(rect.x));
+  const y = Math.max(0, Math.floor(rect.y));
+  return {
+    x,
+    y,
+    w: Math.min(width, Math.ceil(rect.x + rect.w)) - x,
+    h: Math.min(height, Math.ceil(rect.y + rect.h)) - y
+  };
+}
+
+// Cheap deterministic hash so decorative randomness doesn't flicker between frames
+function hash(n: number): number {
+  let h = Math.imul(n ^ 0x9e3779b9, 0x85ebca6b);
+  h ^= h >>> 13;
+  h = Math.imul(h, 0xc2b2ae35);
+  return ((h ^ (h >>> 16)) >>> 0) / 4294967296;
+}
+
+export const EMOTIONS = ['joy', 'curiosity', 'empathy', 'wonder', 'serenity', 'enthusiasm', 'compassion', 'gratitude'];
+
+export const EMOTION_COLORS: Record<string, string> = {
+  joy: '#FDE047',
+  curiosity: '#60A5FA',
+  empathy: '#F472B6',
+  wonder: '#A78BFA',
+  serenity: '#6EE7B7',
+  enthusiasm: '#FB923C',
+  compassion: '#F87171',
+  gratitude: '#C084FC'
+};
+
+export const EMOTION_EMOJI: Record<string, string> = {
+  joy: '😊',
+  curiosity: '🤔',
+  empathy: '💗',
+  wonder: '✨',
+  serenity: '😌',
+  enthusiasm: '🎉',
+  compassion: '🤗',
+  gratitude: '🙏'
+};
+
+/**
+ * Consciousness vitals trace. Grid and trace live in a cached layer that is
+ * rebuilt only when samples arrive; each frame restores the strip under the
+ * previous scan line from it and draws the new one.
+ */
+function createEkgRenderer(width: number, height: number): Renderer {
+  const capacity = 150;
+  const values = new Float32Array(capacity);
+  const peaks = new Uint8Array(capacity);
+  let count = 0;
+  let sequence = 0;
+  let layer: Layer | null = null;
+  let traceDirty = true;
+  let lastScanX = -1;
+
+  const drawTrace = (ctx: Ctx2D) => {
+    ctx.clearRect(0, 0, width, height);
+
+    ctx.strokeStyle = 'rgba(99, 102, 241, 0.1)';
+    ctx.lineWidth = 1;
+    ctx.beginPath();
+    for (let x = 0; x < width; x += 20) {
+      ctx.moveTo(x, 0);
+      ctx.lineTo(x, height);
+    }
+    for (let y = 0; y < height; y += 20) {
+      ctx.moveTo(0, y);
+      ctx.lineTo(width, y);
+    }
+    ctx.stroke();
+
+    if (count < 2) return;
+
+    ctx.beginPath();
+    ctx.strokeStyle = 'rgba(34, 197, 94, 0.8)'; // Green for healthy
+    ctx.lineWidth = 2;
+    const stepX = width / (count - 1);
+    for (let i = 0; i < count; i++) {
+      const x = i * stepX;
+      const y = height - (values[i] * height * 0.8 + height * 0.1);
+      if (i === 0) {
+        ctx.moveTo(x, y);
+      } else if (peaks[i]) {
+        // EKG-style sharp peak
+        ctx.lineTo(x - stepX / 2, y - 20);
+        ctx.lineTo(x, y);
+      } else {
+        ctx.lineTo(x, y);
+      }
+    }
+    ctx.stroke();
+  };
+
+  return {
+    update({ samples }) {
+      if (!samples) return;
+      for (let i = 0; i < samples.length; i++) {
+        if (count === capacity) {
+          values.copyWithin(0, 1);
+          peaks.copyWithin(0, 1);
+          count--;
+        }
+        values[count] = samples[i];
+        peaks[count] = samples[i] > 0.7 && hash(sequence++) > 0.95 ? 1 : 0;
+        count++;
+      }
+      traceDirty = true;
+    },
+
+    render(ctx, time) {
+      if (!layer) layer = createLayer(width, height);
+
+      if (traceDirty) {
+        drawTrace(layer.ctx);
+        ctx.clearRect(0, 0, width, height);
+        ctx.drawImage(layer.canvas, 0, 0);
+        traceDirty = false;
+      } else if (lastScanX >= 0) {
+        const x = Math.max(0, Math.floor(lastScanX) - 2);
+        ctx.clearRect(x, 0, 5, height);
+        ctx.drawImage(layer.canvas, x, 0, 5, height, x, 0, 5, height);
+      }
+
+      if (count < 2) {
+        lastScanX = -1;
+        return false;
+      }
+
+      // Moving scan line
+      const scanX = (time * 0.1) % width;
+      ctx.strokeStyle = 'rgba(255, 255, 255, 0.5)';
+      ctx.lineWidth = 2;
+      ctx.beginPath();
+      ctx.moveTo(scanX, 0);
+      ctx.lineTo(scanX, height);
+      ctx.stroke();
+      lastScanX = scanX;
+      return true;
+    }
+  };
+}
+
+const HEALTH_BARS = [
+  { name: 'Uptime', color: 'rgba(34, 197, 94, 0.8)' },
+  { name: 'Stability', color: 'rgba(59, 130, 246, 0.8)' },
+  { name: 'Memory', color: 'rgba(147, 51, 234, 0.8)' },
+  { name: 'Feedback', color: 'rgba(236, 72, 153, 0.8)' },
+  { name: 'Awareness', color: 'rgba(251, 146, 60, 0.8)' }
+];
+
+/**
+ * Health metric bars; state.values holds one 0-1 value per bar. Only the
+ * columns whose value changed are repainted.
+ */
+function createHealthBarsRenderer(width: number, height: number): Renderer {
+  const values = new Float32Array(HEALTH_BARS.length);
+  const drawn = new Float32Array(HEALTH_BARS.length).fill(NaN);
+  const barWidth = width / HEALTH_BARS.length;
+  const barPadding = 10;
+  const maxBarHeight = height - 40;
+
+  return {
+    update({ state }) {
+      if (state?.values) values.set(state.values);
+    },
+
+    render(ctx) {
+      for (let i = 0; i < HEALTH_BARS.length; i++) {
+        if (drawn[i] === values[i]) continue;
+        drawn[i] = values[i];
+
+        const column = i * barWidth;
+        ctx.clearRect(Math.floor(column), 0, Math.ceil(barWidth), height);
+
+        const x = column + barPadding;
+        const innerWidth = barWidth - barPadding * 2;
+        const barHeight = values[i] * maxBarHeight;
+        const y = height - barHeight - 20;
+
+        ctx.fillStyle = HEALTH_BARS[i].color;
+        ctx.fillRect(x, y, innerWidth, barHeight);
+
+        ctx.fillStyle = 'rgba(255, 255, 255, 0.8)';
+        ctx.font = '10px sans-serif';
+        ctx.textAlign = 'center';
+        ctx.fillText(HEALTH_BARS[i].name, x + innerWidth / 2, height - 5);
+        ctx.fillText(`${Math.round(values[i] * 100)}%`, x + innerWidth / 2, y - 5);
+      }
+      return false;
+    }
+  };
+}
+
+/**
+ * Emotional field: pulsing aura, emotion nodes and rising particles.
+ * state: { spectrum: Float32Array (EMOTIONS order), dominant, depth } and
+ * { burst: { emotion, intensity } } to release particles. Each frame clears
+ * and repaints only the union of last frame's and this frame's bounds.
+ */
+function createEmotionalFieldRenderer(width: number, height: number): Renderer {
+  const maxParticles = 100;
+  // x, y, vx, vy, life, emotion index
+  const particles = new Float32Array(maxParticles * 6);
+  let particleCount = 0;
+  let spectrum: Float32Array | null = null;
+  let dominant = 0;
+  let depth = 0;
+  let previousBounds: Rect | null = null;
+  let burstSequence = 0;
+  const centerX = width / 2;
+  const centerY = height / 2;
+
+  const addParticles = (emotion: number, intensity: number) => {
+    const count = Math.floor(intensity * 10);
+    for (let i = 0; i < count; i++) {
+      if (particleCount === maxParticles) {
+        particles.copyWithin(0, 6);
+        particleCount--;
+      }
+      const offset = particleCount * 6;
+      const seed = burstSequence++ * 4;
+      particles[offset] = hash(seed) * width;
+      particles[offset + 1] = height;
+      particles[offset + 2] = (hash(seed + 1) - 0.5) * 2;
+      particles[offset + 3] = -hash(seed + 2) * 3 - 1;
+      particles[offset + 4] = 1;
+      particles[offset + 5] = emotion;
+      particleCount++;
+    }
+  };
+
+  return {
+    update({ state }) {
+      if (!state) return;
+      if (state.spectrum) {
+        spectrum = state.spectrum;
+        dominant = state.dominant ?? 0;
+        depth = state.depth ?? 0;
+      }
+      if (state.burst) {
+        addParticles(state.burst.emotion, state.burst.intensity);
+      }
+    },
+
+    render(ctx, time) {
+      // Advance particles and measure what this frame will cover
+      let bounds: Rect | null = null;
+      let alive = 0;
+      for (let i = 0; i < particleCount; i++) {
+        const p = i * 6;
+        particles[p] += particles[p + 2];
+        particles[p + 1] += particles[p + 3];
+        particles[p + 3] += 0.05; // gravity
+        particles[p + 4] -= 0.01;
+        if (particles[p + 4] <= 0 || particles[p + 1] > height) continue;
+        if (alive !== i) particles.copyWithin(alive * 6, p, p + 6);
+        bounds = unionRect(bounds, { x: particles[alive * 6] - 4, y: particles[alive * 6 + 1] - 4, w: 8, h: 8 });
+        alive++;
+      }
+      particleCount = alive;
+
+      const pulseSize = 100 + Math.sin(time * 0.002) * 20;
+      if (spectrum) {
+        const reach = Math.max(pulseSize * depth, 145);
+        bounds = unionRect(bounds, { x: centerX - reach, y: centerY - reach, w: reach * 2, h: reach * 2 });
+      }
+
+      const dirty = unionRect(previousBounds, bounds);
+      previousBounds = bounds;
+      if (!dirty) return false;
+
+      const region = clampRect(dirty, width, height);
+      ctx.save();
+      ctx.beginPath();
+      ctx.rect(region.x, region.y, region.w, region.h);
+      ctx.clip();
+      ctx.clearRect(region.x, region.y, region.w, region.h);
+
+      if (spectrum) {
+        const color = EMOTION_COLORS[EMOTIONS[dominant]];
+        const gradient = ctx.createRadialGradient(centerX, centerY, 0, centerX, centerY, Math.max(1, pulseSize * depth));
+        gradient.addColorStop(0, `${color}44`);
+        gradient.addColorStop(0.5, `${color}22`);
+        gradient.addColorStop(1, 'rgba(0, 0, 0, 0)');
+        ctx.fillStyle = gradient;
+        ctx.fillRect(region.x, region.y, region.w, region.h);
+      }
+
+      for (let i = 0; i < particleCount; i++) {
+        const p = i * 6;
+        const life = particles[p + 4];
+        ctx.beginPath();
+        ctx.arc(particles[p], particles[p + 1], 3 * life, 0, Math.PI * 2);
+        ctx.fillStyle = `${EMOTION_COLORS[EMOTIONS[particles[p + 5]]]}${Math.floor(life * 255).toString(16).padStart(2, '0')}`;
+        ctx.fill();
+      }
+
+      if (spectrum) {
+        ctx.font = '12px sans-serif';
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'middle';
+        for (let i = 0; i < EMOTIONS.length; i++) {
+          const value = spectrum[i];
+          const color = EMOTION_COLORS[EMOTIONS[i]];
+          const angle = (i / EMOTIONS.length) * Math.PI * 2 - Math.PI / 2;
+          const radius = 80 + value * 40;
+          const x = centerX + Math.cos(angle) * radius;
+          const y = centerY + Math.sin(angle) * radius;
+
+          ctx.beginPath();
+          ctx.moveTo(centerX, centerY);
+          ctx.lineTo(x, y);
+          ctx.strokeStyle = `${color}44`;
+          ctx.lineWidth = value * 3;
+          ctx.stroke();
+
+          ctx.beginPath();
+          ctx.arc(x, y, 15 + value * 10, 0, Math.PI * 2);
+          ctx.fillStyle = color;
+          ctx.fill();
+
+          ctx.fillStyle = 'white';
+          ctx.fillText(EMOTION_EMOJI[EMOTIONS[i]], x, y);
+        }
+      }
+
+      ctx.restore();
+      return spectrum !== null || particleCount > 0;
+    }
+  };
+}
+
+/**
+ * Emotional climate: spectrum bars with the emotional depth waveform on top.
+ * state: { spectrum?: Float32Array (EMOTIONS order), waveform?: Float32Array }.
+ * Repaints only when an update arrives.
+ */
+function createEmotionalClimateRenderer(width: number, height: number): Renderer {
+  let spectrum: Float32Array | null = null;
+  let waveform: Float32Array | null = null;
+  let dirty = true;
+
+  return {
+    update({ state }) {
+      if (!state) return;
+      if (state.spectrum) spectrum = state.spectrum;
+      if (state.waveform) waveform = state.waveform;
+      dirty = true;
+    },
+
+    render(ctx) {
+      if (!dirty) return false;
+      dirty = false;
+
+      ctx.clearRect(0, 0, width, height);
+      ctx.fillStyle = 'rgba(147, 112, 219, 0.1)';
+      ctx.fillRect(0, 0, width, height);
+      ctx.strokeStyle = 'rgba(147, 112, 219, 0.3)';
+      ctx.strokeRect(0, 0, width, height);
+
+      const background = ctx.createLinearGradient(0, 0, 0, height);
+      background.addColorStop(0, 'rgba(0, 0, 0, 0)');
+      background.addColorStop(1, 'rgba(236, 72, 153, 0.1)');
+      ctx.fillStyle = background;
+      ctx.fillRect(0, 0, width, height);
+
+      ctx.font = '10px sans-serif';
+      ctx.textAlign = 'center';
+      const barWidth = width / EMOTIONS.length;
+
+      if (!spectrum) {
+        ctx.fillStyle = 'rgba(255, 255, 255, 0.3)';
+        ctx.font = '12px sans-serif';
+        ctx.fillText('Waiting for emotional data...', width / 2, height / 2);
+        return false;
+      }
+
+      for (let i = 0; i < EMOTIONS.length; i++) {
+        const x = i * barWidth;
+        const barHeight = spectrum[i] * height * 0.8;
+        const y = height - barHeight;
+        const color = EMOTION_COLORS[EMOTIONS[i]];
+
+        const barGradient = ctx.createLinearGradient(x, y, x, height);
+        barGradient.addColorStop(0, `${color}88`);
+        barGradient.addColorStop(1, `${color}22`);
+        ctx.fillStyle = barGradient;
+        ctx.fillRect(x + 5, y, barWidth - 10, barHeight);
+
+        ctx.fillStyle = 'rgba(255, 255, 255, 0.6)';
+        ctx.fillText(EMOTIONS[i], x + barWidth / 2, height - 5);
+        ctx.fillStyle = color;
+        ctx.fillText(`${(spectrum[i] * 100).toFixed(0)}%`, x + barWidth / 2, y - 5);
+      }
+
+      if (waveform && waveform.length > 1) {
+        ctx.beginPath();
+        ctx.strokeStyle = 'rgba(147, 51, 234, 0.8)';
+        ctx.lineWidth = 2;
+        const stepX = width / (waveform.length - 1);
+        for (let i = 0; i < waveform.length; i++) {
+          const y = height - (waveform[i] * height * 0.5 + height * 0.3);
+          if (i === 0) ctx.moveTo(0, y);
+          else ctx.lineTo(i * stepX, y);
+        }
+        ctx.stroke();
+      }
+      return false;
+    }
+  };
+}
+
+/**
+ * Rotating identity sigil. state: { pattern: Float32Array of x, y, z
+ * triples, color }. Connections between pattern points are chosen once per
+ * sigil; only the square around the sigil is repainted each frame.
+ */
+function createSigilRenderer(width: number, height: number): Renderer {
+  const scale = 100;
+  let pattern: Float32Array | null = null;
+  let links: Uint8Array | null = null;
+  let color = '';
+  let reach = 0;
+  const centerX = width / 2;
+  const centerY = height / 2;
+
+  return {
+    update({ state }) {
+      if (!state?.pattern) return;
+      pattern = state.pattern as Float32Array;
+      color = state.color;
+
+      const points = pattern.length / 3;
+      links = new Uint8Array(points * points);
+      let maxRadius = 0;
+      for (let i = 0; i < points; i++) {
+        maxRadius = Math.max(maxRadius, Math.hypot(pattern[i * 3], pattern[i * 3 + 1]));
+        for (let j = i + 1; j < points; j++) {
+          links[i * points + j] = hash(i * 31 + j + points * 977) > 0.6 ? 1 : 0;
+        }
+      }
+      // Outermost layer is drawn 40% larger, plus room for node radii
+      reach = Math.max(50, maxRadius * scale * 1.4 + 10);
+    },
+
+    render(ctx, time) {
+      if (!pattern || !links) return false;
+
+      const region = clampRect({ x: centerX - reach, y: centerY - reach, w: reach * 2, h: reach * 2 }, width, height);
+      // Translucent fill leaves motion trails
+      ctx.globalAlpha = 1;
+      ctx.fillStyle = 'rgba(10, 10, 15, 0.1)';
+      ctx.fillRect(region.x, region.y, region.w, region.h);
+
+      const points = pattern.length / 3;
+      for (let layer = 0; layer < 3; layer++) {
+        const layerScale = scale * (1 + layer * 0.2);
+        ctx.save();
+        ctx.translate(centerX, centerY);
+        ctx.rotate((time / 1000) * 0.1 * (layer + 1));
+
+        ctx.fillStyle = color;
+        ctx.globalAlpha = 0.8 - layer * 0.2;
+        for (let i = 0; i < points; i++) {
+          ctx.beginPath();
+          ctx.arc(pattern[i * 3] * layerScale, pattern[i * 3 + 1] * layerScale, 3 + pattern[i * 3 + 2] * 5, 0, Math.PI * 2);
+          ctx.fill();
+        }
+
+        ctx.beginPath();
+        ctx.strokeStyle = color;
+        ctx.lineWidth = 2 - layer * 0.5;
+        for (let i = 0; i < points; i++) {
+          const x = pattern[i * 3] * layerScale;
+          const y = pattern[i * 3 + 1] * layerScale;
+          if (i === 0) ctx.moveTo(x, y);
+          else ctx.lineTo(x, y);
+        }
+        ctx.closePath();
+        ctx.stroke();
+
+        ctx.beginPath();
+        ctx.globalAlpha = 0.2;
+        ctx.lineWidth = 0.5;
+        for (let i = 0; i < points; i++) {
+          for (let j = i + 1; j < points; j++) {
+            if (!links[i * points + j]) continue;
+            ctx.moveTo(pattern[i * 3] * scale, pattern[i * 3 + 1] * scale);
+            ctx.lineTo(pattern[j * 3] * scale, pattern[j * 3 + 1] * scale);
+          }
+        }
+        ctx.stroke();
+        ctx.restore();
+      }
+
+      const gradient = ctx.createRadialGradient(centerX, centerY, 0, centerX, centerY, 50);
+      gradient.addColorStop(0, color);
+      gradient.addColorStop(1, 'transparent');
+      ctx.fillStyle = gradient;
+      ctx.globalAlpha = 0.5;
+      ctx.beginPath();
+      ctx.arc(centerX, centerY, 50, 0, Math.PI * 2);
+      ctx.fill();
+      ctx.globalAlpha = 1;
+      return true;
+    }
+  };
+}
+
+/**
+ * Crystallization frequency chart; state.bins holds crystal counts per time
+ * bucket, oldest first. Repaints only buckets whose bar height changed.
+ */
+function createCrystalPatternRenderer(width: number, height: number): Renderer {
+  let bins = new Float32Array(0);
+  let drawnHeights = new Float32Array(0);
+  let dirtyAll = true;
+
+  return {
+    update({ state }) {
+      if (!state?.bins) return;
+      bins = state.bins;
+      if (drawnHeights.length !== bins.length) {
+        drawnHeights = new Float32Array(bins.length).fill(NaN);
+        // Bucket layout changed; start from a clean canvas
+        dirtyAll = true;
+      }
+    },
+
+    render(ctx) {
+      if (dirtyAll) {
+        ctx.clearRect(0, 0, width, height);
+        dirtyAll = false;
+      }
+      if (bins.length === 0) return false;
+
+      let max = 1;
+      for (let i = 0; i < bins.length; i++) max = Math.max(max, bins[i]);
+      const slot = width / bins.length;
+      const maxBarHeight = height - 6;
+
+      for (let i = 0; i < bins.length; i++) {
+        const barHeight = Math.round((bins[i] / max) * maxBarHeight);
+        if (drawnHeights[i] === barHeight) continue;
+        drawnHeights[i] = barHeight;
+
+        const x = Math.floor(i * slot);
+        ctx.clearRect(x, 0, Math.ceil(slot), height);
+        if (barHeight === 0) {
+          ctx.fillStyle = 'rgba(138, 43, 226, 0.15)';
+          ctx.fillRect(x + 1, height - 2, Math.ceil(slot) - 2, 2);
+          continue;
+        }
+        const gradient = ctx.createLinearGradient(0, height - barHeight, 0, height);
+        gradient.addColorStop(0, 'rgba(186, 85, 211, 0.9)');
+        gradient.addColorStop(1, 'rgba(138, 43, 226, 0.3)');
+        ctx.fillStyle = gradient;
+        ctx.fillRect(x + 1, height - barHeight, Math.ceil(slot) - 2, barHeight);
+      }
+      return false;
+    }
+  };
+}
+
+const FACTORIES: Record<RendererKind, (width: number, height: number) => Renderer> = {
+  ekg: createEkgRenderer,
+  healthBars: createHealthBarsRenderer,
+  emotionalField: createEmotionalFieldRenderer,
+  emotionalClimate: createEmotionalClimateRenderer,
+  sigil: createSigilRenderer,
+  crystalPattern: createCrystalPatternRenderer
+};
+
+export function createRenderer(kind: RendererKind, width: number, height: number): Renderer {
+  const factory = FACTORIES[kind];
+  if (!factory) {
+    throw new Error(`Unknown visualization renderer: ${kind}`);
+  }
+  return factory(width, height);
+}
@@ -0,0 +1,24 @@
+/**
+ * Visualization worker: renders transferred OffscreenCanvases off the main
+ * thread. One worker serves every dashboard canvas in the tab.
+ */
+import { RenderLoop, VisualizationCommand } from './renderLoop';
+
+interface WorkerScope {
+  onmessage: ((event: MessageEvent<VisualizationCommand>) => void) | null;
+  requestAnimationFrame?: (callback: (time: number) => void) => number;
+}
+
+const scope = globalThis as unknown as WorkerScope;
+
+const loop = new RenderLoop(callback => {
+  if (scope.requestAnimationFrame) {
+    scope.requestAnimationFrame(callback);
+  } else {
+    setTimeout(() => callback(performance.now()), 16);
+  }
+});
+
+scope.onmessage = (event) => loop.handle(event.data);
+
+export {};
@@ -0,0 +1,111 @@
+/**
+ * Main-thread side of the dashboard rendering subsystem
+ *
+ * attachVisualization hands a canvas to the shared visualization worker
+ * when the browser supports OffscreenCanvas, and otherwise renders it with
+ * the same renderers from a main-thread loop. Typed arrays in updates are
+ * transferred, not copied.
+ */
+import { RenderLoop, VisualizationCommand } from './renderLoop';
+import { RendererKind, RendererUpdate } from './renderers';
+
+export interface VisualizationHandle {
+  update(update: RendererUpdate): void;
+  setVisible(visible: boolean): void;
+  dispose(): void;
+}
+
+interface AttachedCanvas {
+  handle: VisualizationHandle;
+  disposeTimer: ReturnType<typeof setTimeout> | null;
+}
+
+let worker: Worker | null | undefined;
+let mainThreadLoop: RenderLoop | null = null;
+let nextId = 1;
+const attached = new WeakMap<HTMLCanvasElement, AttachedCanvas>();
+
+function getWorker(): Worker | null {
+  if (worker !== undefined) return worker;
+  try {
+    worker = new Worker(new URL('./visualization.worker.ts', import.meta.url));
+    worker.onerror = (error) => console.error('Visualization worker error:', error);
+  } catch (error) {
+    console.warn('Visualization worker unavailable, rendering on the main thread:', error);
+    worker = null;
+  }
+  return worker;
+}
+
+function getMainThreadLoop(): RenderLoop {
+  if (!mainThreadLoop) {
+    mainThreadLoop = new RenderLoop(callback => requestAnimationFrame(callback));
+  }
+  return mainThreadLoop;
+}
+
+function transferablesOf(update: RendererUpdate): Transferable[] {
+  const buffers: Transferable[] = [];
+  const collect = (value: unknown) => {
+    if (ArrayBuffer.isView(value) && buffers.indexOf(value.buffer) === -1) {
+      buffers.push(value.buffer);
+    }
+  };
+  collect(update.samples);
+  if (update.state) {
+    Object.keys(update.state).forEach(key => collect(update.state![key]));
+  }
+  return buffers;
+}
+
+export function attachVisualization(canvas: HTMLCanvasElement, kind: RendererKind): VisualizationHandle {
+  // StrictMode and fast remounts detach and reattach the same element; a
+  // canvas can only be transferred once, so keep the existing surface
+  const existing = attached.get(canvas);
+  if (existing) {
+    if (existing.disposeTimer) {
+      clearTimeout(existing.disposeTimer);
+      existing.disposeTimer = null;
+    }
+    return existing.handle;
+  }
+
+  const id = nextId++;
+  const { width, height } = canvas;
+  const offscreenWorker = typeof (canvas as any).transferControlToOffscreen === 'function' ? getWorker() : null;
+
+  let send: (command: VisualizationCommand, transfer?: Transferable[]) => void;
+  if (offscreenWorker) {
+    const offscreen = (canvas as any).transferControlToOffscreen();
+    offscreenWorker.postMessage({ kind: 'attach', id, renderer: kind, canvas: offscreen, width, height }, [offscreen]);
+    send = (command, transfer = []) => offscreenWorker.postMessage(command, transfer);
+  } else {
+    const loop = getMainThreadLoop();
+    loop.attach(id, canvas.getContext('2d'), kind, width, height);
+    send = command => loop.handle(command);
+  }
+
+  let visible = true;
+  const entry: AttachedCanvas = {
+    disposeTimer: null,
+    handle: {
+      update(update) {
+        send({ kind: 'update', id, update }, transferablesOf(update));
+      },
+      setVisible(nextVisible) {
+        if (nextVisible === visible) return;
+        visible = nextVisible;
+        send({ kind: 'visibility', id, visible });
+      },
+      dispose() {
+        if (entry.disposeTimer) return;
+        entry.disposeTimer = setTimeout(() => {
+          attached.delete(canvas);
+          send({ kind: 'detach', id });
+        }, 0);
+      }
+    }
+  };
+  attached.set(canvas, entry);
+  return entry.handle;
+}
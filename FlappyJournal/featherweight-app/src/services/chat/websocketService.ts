@@ -1,4 +1,5 @@
 import { EventEmitter } from 'events';
+import { ALL_TOPICS, consciousnessSocket } from '../consciousnessSocket';
 
 export interface ChatMessage {
   role: 'user' | 'assistant';
@@ -20,10 +21,8 @@ export interface ProjectMemory {
 }
 
 export class ChatWebSocketService extends EventEmitter {
-  private ws: WebSocket | null = null;
-  private reconnectTimeout: NodeJS.Timeout | null = null;
-  private reconnectAttempts = 0;
-  private maxReconnectAttempts = 5;
+  // Rides on the shared consciousness socket instead of opening its own
+  private unsubscribe: (() => void) | null = null;
   private onMemoryUpdateCallback: ((memory: ProjectMemory[]) => void) | null = null;
 
   constructor() {
@@ -31,82 +30,44 @@ export class ChatWebSocketService extends EventEmitter {
   }
 
   connect(): void {
-    try {
-      // Skip auth for now
-      const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-      const host = window.location.host;
-      const wsUrl = `${protocol}//${host}/ws`;
-
-      console.log('Connecting to WebSocket:', wsUrl);
-      this.ws = new WebSocket(wsUrl);
-
-      this.ws.onopen = () => {
-        console.log('WebSocket connected');
-        this.reconnectAttempts = 0;
-        this.emit('connected');
-      };
-
-      this.ws.onmessage = (event) => {
-        try {
-          const data = JSON.parse(event.data);
-          console.log('WebSocket message:', data);
-          
-          if (data.type === 'memory_update' && this.onMemoryUpdateCallback) {
-            this.onMemoryUpdateCallback(data.memory);
-          } else {
-            this.emit('message', data);
-          }
-        } catch (error) {
-          console.error('Failed to parse WebSocket message:', error);
-        }
-      };
-
-      this.ws.onerror = (error) => {
-        console.error('WebSocket error:', error);
-        this.emit('error', error);
-      };
-
-      this.ws.onclose = () => {
-        console.log('WebSocket disconnected');
-        this.emit('disconnected');
-        this.scheduleReconnect();
-      };
-    } catch (error) {
-      console.error('Failed to connect to WebSocket:', error);
-      this.emit('error', error);
-    }
-  }
+    if (this.unsubscribe) return;
+
+    let wasConnected = consciousnessSocket.isConnected();
+    const stopStatus = consciousnessSocket.onStatusChange(() => {
+      const connected = consciousnessSocket.isConnected();
+      if (connected !== wasConnected) {
+        wasConnected = connected;
+        this.emit(connected ? 'connected' : 'disconnected');
+      }
+    });
+
+    const stopMessages = consciousnessSocket.subscribe(ALL_TOPICS, (data) => {
+      if (data.type === 'memory_update' && this.onMemoryUpdateCallback) {
+        this.onMemoryUpdateCallback(data.memory);
+      } else {
+        this.emit('message', data);
+      }
+    });
+
+    this.unsubscribe = () => {
+      stopStatus();
+      stopMessages();
+    };
 
-  private scheduleReconnect(): void {
-    if (this.reconnectAttempts >= this.maxReconnectAttempts) {
-      console.error('Max reconnection attempts reached');
-      return;
+    if (wasConnected) {
+      this.emit('connected');
     }
-
-    this.reconnectAttempts++;
-    const delay = Math.min(1000 * Math.pow(2, this.reconnectAttempts), 30000);
-    
-    console.log(`Reconnecting in ${delay}ms (attempt ${this.reconnectAttempts})`);
-    
-    this.reconnectTimeout = setTimeout(() => {
-      this.connect();
-    }, delay);
   }
 
   disconnect(): void {
-    if (this.reconnectTimeout) {
-      clearTimeout(this.reconnectTimeout);
-      this.reconnectTimeout = null;
-    }
-
-    if (this.ws) {
-      this.ws.close();
-      this.ws = null;
+    if (this.unsubscribe) {
+      this.unsubscribe();
+      this.unsubscribe = null;
     }
   }
 
   sendMessage(content: string): void {
-    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+    if (!this.isConnected()) {
       console.error('WebSocket is not connected');
       this.emit('error', 'WebSocket is not connected');
       return;
@@ -117,11 +78,11 @@ export class ChatWebSocketService extends EventEmitter {
       content
     };
 
-    this.ws.send(JSON.stringify(message));
+    consciousnessSocket.send(message);
   }
 
   updateMemory(key: string, value: any): void {
-    if (!this.ws || this.ws.readyState !== WebSocket.OPEN) {
+    if (!this.isConnected()) {
       console.error('WebSocket is not connected');
       return;
     }
@@ -132,7 +93,7 @@ export class ChatWebSocketService extends EventEmitter {
       value
     };
 
-    this.ws.send(JSON.stringify(message));
+    consciousnessSocket.send(message);
   }
 
   onMemoryUpdate(callback: (memory: ProjectMemory[]) => void): void {
@@ -140,7 +101,7 @@ export class ChatWebSocketService extends EventEmitter {
   }
 
   isConnected(): boolean {
-    return this.ws?.readyState === WebSocket.OPEN;
+    return consciousnessSocket.isConnected();
   }
 }
 
@@ -0,0 +1,276 @@
+/**
+ * Shared consciousness WebSocket
+ *
+ * Every dashboard component, the chat context and the chat service share one
+ * connection per tab. Frames are parsed once, stored as the latest message
+ * per type, and dispatched to subscribers of that type (topic). The socket
+ * opens with the first subscriber, closes shortly after the last one leaves,
+ * and reconnects with a single exponential backoff for everyone.
+ */
+
+export type ConnectionStatus = 'connecting' | 'connected' | 'disconnected';
+
+export interface ConsciousnessMessage {
+  type: string;
+  receivedAt: number;
+  [key: string]: any;
+}
+
+export type MessageHandler = (message: ConsciousnessMessage) => void;
+type Listener = () => void;
+
+/** Subscribe to this topic to receive every message */
+export const ALL_TOPICS = '*';
+
+const WS_PATH = process.env.REACT_APP_CONSCIOUSNESS_WS_PATH || '/ws/chat';
+const RECONNECT_BASE_DELAY = 1000;
+const RECONNECT_MAX_DELAY = 30000;
+const IDLE_CLOSE_DELAY = 1000;
+const MAX_QUEUED_MESSAGES = 50;
+
+export function getConsciousnessSocketUrl(): string {
+  const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+  return `${protocol}//${window.location.host}${WS_PATH}`;
+}
+
+export class ConsciousnessSocket {
+  private ws: WebSocket | null = null;
+  private status: ConnectionStatus = 'disconnected';
+  private retainCount = 0;
+  private reconnectAttempts = 0;
+  private reconnectTimeout: ReturnType<typeof setTimeout> | null = null;
+  private idleTimeout: ReturnType<typeof setTimeout> | null = null;
+  private outbox: string[] = [];
+
+  private handlers = new Map<string, Set<MessageHandler>>();
+  private latest = new Map<string, ConsciousnessMessage>();
+  private latestListeners = new Map<string, Set<Listener>>();
+  private statusListeners = new Set<Listener>();
+
+  constructor(private readonly getUrl: () => string = getConsciousnessSocketUrl) {}
+
+  /**
+   * Call handler for every message whose type is one of topics ('*' for all).
+   * Keeps the connection open until the returned function is called.
+   */
+  subscribe(topics: string | string[], handler: MessageHandler): () => void {
+    const topicList = Array.isArray(topics) ? topics : [topics];
+    for (const topic of topicList) {
+      if (!this.handlers.has(topic)) {
+        this.handlers.set(topic, new Set());
+      }
+      this.handlers.get(topic)!.add(handler);
+    }
+    const release = this.retain();
+
+    return () => {
+      for (const topic of topicList) {
+        const handlers = this.handlers.get(topic);
+        handlers?.delete(handler);
+        if (handlers && handlers.size === 0) {
+          this.handlers.delete(topic);
+        }
+      }
+      release();
+    };
+  }
+
+  /**
+   * Notify listener when the latest message for topic changes; pair with
+   * getLatest (the two form a useSyncExternalStore source)
+   */
+  subscribeLatest(topic: string, listener: Listener): () => void {
+    if (!this.latestListeners.has(topic)) {
+      this.latestListeners.set(topic, new Set());
+    }
+    this.latestListeners.get(topic)!.add(listener);
+    const release = this.retain();
+
+    return () => {
+      const listeners = this.latestListeners.get(topic);
+      listeners?.delete(listener);
+      if (listeners && listeners.size === 0) {
+        this.latestListeners.delete(topic);
+      }
+      release();
+    };
+  }
+
+  getLatest(topic: string): ConsciousnessMessage | undefined {
+    return this.latest.get(topic);
+  }
+
+  getLatestMessages(): ReadonlyMap<string, ConsciousnessMessage> {
+    return this.latest;
+  }
+
+  getStatus(): ConnectionStatus {
+    return this.status;
+  }
+
+  onStatusChange(listener: Listener): () => void {
+    this.statusListeners.add(listener);
+    return () => {
+      this.statusListeners.delete(listener);
+    };
+  }
+
+  isConnected(): boolean {
+    return this.ws?.readyState === WebSocket.OPEN;
+  }
+
+  /**
+   * Send a message, queueing it while the socket is (re)connecting.
+   * Returns false if it was dropped because nothing holds the connection open.
+   */
+  send(message: object): boolean {
+    const payload = JSON.stringify(message);
+    if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+      this.ws.send(payload);
+      return true;
+    }
+    if (this.retainCount === 0) {
+      console.error('ConsciousnessSocket: not connected, dropping message');
+      return false;
+    }
+    this.outbox.push(payload);
+    if (this.outbox.length > MAX_QUEUED_MESSAGES) {
+      this.outbox.shift();
+    }
+    return true;
+  }
+
+  /**
+   * Hold the connection open; returns the matching release function
+   */
+  retain(): () => void {
+    this.retainCount++;
+    if (this.idleTimeout) {
+      clearTimeout(this.idleTimeout);
+      this.idleTimeout = null;
+    }
+    if (!this.ws && !this.reconnectTimeout) {
+      this.connect();
+    }
+
+    let released = false;
+    return () => {
+      if (released) return;
+      released = true;
+      this.retainCount--;
+      if (this.retainCount === 0) {
+        // Linger briefly so remounts (tab switches, StrictMode) reuse the socket
+        this.idleTimeout = setTimeout(() => this.close(), IDLE_CLOSE_DELAY);
+      }
+    };
+  }
+
+  private connect(): void {
+    const url = this.getUrl();
+    this.setStatus('connecting');
+
+    try {
+      const ws = new WebSocket(url);
+      this.ws = ws;
+
+      ws.onopen = () => {
+        console.log('ConsciousnessSocket: connected to', url);
+        this.reconnectAttempts = 0;
+        this.setStatus('connected');
+        const queued = this.outbox;
+        this.outbox = [];
+        queued.forEach(payload => ws.send(payload));
+      };
+
+      ws.onmessage = (event) => this.handleFrame(event.data);
+
+      ws.onerror = (error) => {
+        console.error('ConsciousnessSocket: WebSocket error:', error);
+      };
+
+      ws.onclose = () => {
+        if (this.ws !== ws) return;
+        this.ws = null;
+        this.setStatus('disconnected');
+        if (this.retainCount > 0) {
+          this.scheduleReconnect();
+        }
+      };
+    } catch (error) {
+      console.error('ConsciousnessSocket: failed to create WebSocket:', error);
+      this.ws = null;
+      this.setStatus('disconnected');
+      this.scheduleReconnect();
+    }
+  }
+
+  private scheduleReconnect(): void {
+    if (this.reconnectTimeout) return;
+
+    // Full jitter keeps many tabs from reconnecting in lockstep after a restart
+    const ceiling = Math.min(RECONNECT_BASE_DELAY * Math.pow(2, this.reconnectAttempts), RECONNECT_MAX_DELAY);
+    const delay = Math.max(RECONNECT_BASE_DELAY / 2, Math.random() * ceiling);
+    this.reconnectAttempts++;
+
+    console.log(`ConsciousnessSocket: reconnecting in ${Math.round(delay)}ms (attempt ${this.reconnectAttempts})`);
+    this.reconnectTimeout = setTimeout(() => {
+      this.reconnectTimeout = null;
+      if (this.retainCount > 0 && !this.ws) {
+        this.connect();
+      }
+    }, delay);
+  }
+
+  private close(): void {
+    this.idleTimeout = null;
+    if (this.reconnectTimeout) {
+      clearTimeout(this.reconnectTimeout);
+      this.reconnectTimeout = null;
+    }
+    const ws = this.ws;
+    this.ws = null;
+    this.outbox = [];
+    this.reconnectAttempts = 0;
+    if (ws) {
+      ws.close();
+    }
+    this.setStatus('disconnected');
+  }
+
+  private handleFrame(raw: any): void {
+    let parsed: any;
+    try {
+      parsed = JSON.parse(raw);
+    } catch (error) {
+      console.error('ConsciousnessSocket: failed to parse message:', error);
+      return;
+    }
+    if (!parsed || typeof parsed.type !== 'string') return;
+
+    const message: ConsciousnessMessage = { ...parsed, receivedAt: Date.now() };
+    this.latest.set(message.type, message);
+
+    this.dispatch(this.handlers.get(message.type), message);
+    this.dispatch(this.handlers.get(ALL_TOPICS), message);
+    this.latestListeners.get(message.type)?.forEach(listener => listener());
+  }
+
+  private dispatch(handlers: Set<MessageHandler> | undefined, message: ConsciousnessMessage): void {
+    if (!handlers) return;
+    handlers.forEach(handler => {
+      try {
+        handler(message);
+      } catch (error) {
+        console.error(`ConsciousnessSocket: handler for ${message.type} failed:`, error);
+      }
+    });
+  }
+
+  private setStatus(status: ConnectionStatus): void {
+    if (this.status === status) return;
+    this.status = status;
+    this.statusListeners.forEach(listener => listener());
+  }
+}
+
+export const consciousnessSocket = new ConsciousnessSocket();
@@ -7,6 +7,7 @@ export * from './oidcService';
 export * from './consciousnessService';
 export * from './flappyConsciousness';
 export * from './memoryService';
+export * from './consciousnessSocket';
 
 // Export new consciousness services (when ready)
 // export * from './ConsciousnessEventBus';
@@ -1,6 +1,20 @@
 // Harmonic Resonance Cascade Module
 // Analyzes multi-octave resonance patterns for enhanced emotional and creative insights
 
+// Consonant frequency ratios and the resonance strength each scores; the
+// golden ratio (and its inverse) score slightly below the simple ratios
+const SIMPLE_RATIOS = [1, 2, 3/2, 4/3, 5/4, 5/3, 8/5];
+const RATIO_TOLERANCE = 0.01;
+const HARMONICS_PER_FREQUENCY = 5;
+
+/**
+ * Analysis works on preallocated Float64Array scratch buffers and a sorted
+ * table of consonant ratios searched by binary search, so the pair loops
+ * allocate nothing. Octave shifts multiply every frequency by the same power
+ * of two, which leaves every ratio (and so every resonance and golden ratio
+ * alignment) unchanged bit for bit; each octave reuses the values computed
+ * once from the base frequencies.
+ */
 class HarmonicResonanceCascade {
     constructor() {
         this.goldenRatio = 1.618033988749895;
@@ -15,6 +29,29 @@ class HarmonicResonanceCascade {
             insight: { frequency: 852, color: '#9370DB' },
             unity: { frequency: 963, color: '#FFFFFF' }
         };
+
+        this.buildRatioTable();
+        this.harmonicFrequencies = new Float64Array(0);
+        this.harmonicAmplitudes = new Float64Array(0);
+        this.ensureScratch(8);
+    }
+
+    buildRatioTable() {
+        const entries = SIMPLE_RATIOS.map(ratio => [ratio, 1.0])
+            .concat([[this.goldenRatio, 0.9], [1 / this.goldenRatio, 0.9]])
+            .sort((a, b) => a[0] - b[0]);
+        this.ratioTable = Float64Array.from(entries, entry => entry[0]);
+        this.ratioStrengths = Float64Array.from(entries, entry => entry[1]);
+    }
+
+    /**
+     * Grow the harmonic scratch buffers to hold frequencyCount frequencies
+     */
+    ensureScratch(frequencyCount) {
+        const size = frequencyCount * HARMONICS_PER_FREQUENCY;
+        if (this.harmonicFrequencies.length >= size) return;
+        this.harmonicFrequencies = new Float64Array(size);
+        this.harmonicAmplitudes = new Float64Array(size);
     }
 
     analyzeResonance(consciousnessState) {
@@ -99,76 +136,100 @@ class HarmonicResonanceCascade {
     }
 
     analyzeOctaves(frequencies) {
-        const octaveData = [];
-        
+        const octaveData = new Array(this.octaves);
+
+        // Ratios are octave invariant, so these hold for every octave
+        const resonance = this.calculateOctaveResonance(frequencies);
+        const goldenRatioAlignment = this.checkGoldenRatioAlignment(frequencies);
+
         for (let octave = 0; octave < this.octaves; octave++) {
-            const octaveFrequencies = frequencies.map(f => f * Math.pow(2, octave));
-            const harmonics = this.calculateHarmonics(octaveFrequencies);
-            const resonance = this.calculateOctaveResonance(harmonics);
-            
-            octaveData.push({
+            const scale = Math.pow(2, octave);
+            const octaveFrequencies = new Array(frequencies.length);
+            for (let i = 0; i < frequencies.length; i++) {
+                octaveFrequencies[i] = frequencies[i] * scale;
+            }
+
+            octaveData[octave] = {
                 octave,
                 frequencies: octaveFrequencies,
-                harmonics,
                 resonance,
-                goldenRatioAlignment: this.checkGoldenRatioAlignment(octaveFrequencies)
-            });
+                goldenRatioAlignment
+            };
         }
         
         return octaveData;
     }
 
-    calculateHarmonics(frequencies) {
-        const harmonics = [];
-        
-        for (const freq of frequencies) {
-            // Calculate first 5 harmonics
-            for (let n = 1; n <= 5; n++) {
-                harmonics.push({
-                    frequency: freq * n,
-                    amplitude: 1 / n,
-                    phase: (n * Math.PI) / 4
-                });
+    /**
+     * Fill the scratch buffers with the first five harmonics of each
+     * frequency; returns how many were written
+     */
+    fillHarmonics(frequencies) {
+        this.ensureScratch(frequencies.length);
+        const harmonicFrequencies = this.harmonicFrequencies;
+        const harmonicAmplitudes = this.harmonicAmplitudes;
+        let count = 0;
+
+        for (let i = 0; i < frequencies.length; i++) {
+            for (let n = 1; n <= HARMONICS_PER_FREQUENCY; n++) {
+                harmonicFrequencies[count] = frequencies[i] * n;
+                harmonicAmplitudes[count] = 1 / n;
+                count++;
             }
         }
-        
-        return harmonics;
+
+        return count;
     }
 
-    calculateOctaveResonance(harmonics) {
-        if (harmonics.length === 0) return 0;
-        
+    calculateOctaveResonance(frequencies) {
+        const count = this.fillHarmonics(frequencies);
+        if (count === 0) return 0;
+
+        const harmonicFrequencies = this.harmonicFrequencies;
+        const harmonicAmplitudes = this.harmonicAmplitudes;
         let totalResonance = 0;
         
-        for (let i = 0; i < harmonics.length; i++) {
-            for (let j = i + 1; j < harmonics.length; j++) {
-                const ratio = harmonics[i].frequency / harmonics[j].frequency;
-                const resonance = this.calculateResonanceStrength(ratio);
-                totalResonance += resonance * harmonics[i].amplitude * harmonics[j].amplitude;
+        for (let i = 0; i < count; i++) {
+            const frequency = harmonicFrequencies[i];
+            const amplitude = harmonicAmplitudes[i];
+            for (let j = i + 1; j < count; j++) {
+                const resonance = this.calculateResonanceStrength(frequency / harmonicFrequencies[j]);
+                totalResonance += resonance * amplitude * harmonicAmplitudes[j];
             }
         }
         
-        return Math.min(totalResonance / harmonics.length, 1);
+        return Math.min(totalResonance / count, 1);
     }
 
     calculateResonanceStrength(ratio) {
-        // Check for harmonic ratios (simple integer ratios)
-        const simpleRatios = [1, 2, 3/2, 4/3, 5/4, 5/3, 8/5];
-        
-        for (const simpleRatio of simpleRatios) {
-            if (Math.abs(ratio - simpleRatio) < 0.01) {
-                return 1.0;
+        // Binary search for the first table ratio above this one; only it and
+        // its lower neighbour can be within tolerance
+        const table = this.ratioTable;
+        let low = 0;
+        let high = table.length;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (table[mid] <= ratio) {
+                low = mid + 1;
+            } else {
+                high = mid;
             }
         }
-        
-        // Check for golden ratio
-        if (Math.abs(ratio - this.goldenRatio) < 0.01 || 
-            Math.abs(ratio - (1/this.goldenRatio)) < 0.01) {
-            return 0.9;
+
+        let strength = 0;
+        if (low > 0 && ratio - table[low - 1] < RATIO_TOLERANCE) {
+            strength = this.ratioStrengths[low - 1];
+        }
+        if (low < table.length && table[low] - ratio < RATIO_TOLERANCE) {
+            strength = Math.max(strength, this.ratioStrengths[low]);
+        }
+        if (strength > 0) {
+            return strength;
         }
         
         // Otherwise, calculate based on proximity to harmonic series
-        return Math.exp(-Math.pow(ratio - Math.round(ratio), 2) * 10);
+        const offset = ratio - Math.round(ratio);
+        return Math.exp(-offset * offset * 10);
     }
 
     checkGoldenRatioAlignment(frequencies) {
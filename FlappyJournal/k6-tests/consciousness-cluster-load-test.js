@@ -0,0 +1,119 @@
+import ws from 'k6/ws';
+import { check } from 'k6';
+import { Rate, Counter, Trend } from 'k6/metrics';
+
+/**
+ * Connection capacity test for the consciousness WebSocket server in cluster mode.
+ *
+ * Every VU holds one /ws/chat connection open and measures the gap between
+ * consciousness_update frames, which the server sends once per second per
+ * connection. When the server runs out of CPU the gap grows, so the highest
+ * connection count that keeps update_gap p95 under threshold is the capacity.
+ *
+ * Run it once per worker count and compare capacities; with connection
+ * balancing and shared stores behind IPC it should scale close to linearly:
+ *
+ *   for n in 1 2 4; do
+ *     CONSCIOUSNESS_WORKERS=$n node server/cluster-server.js &
+ *     k6 run -e MAX_CONNECTIONS=$((n * 500)) consciousness-cluster-load-test.js
+ *     kill %1; wait
+ *   done
+ *
+ * With CHAT_RATE > 0 some VUs also send chat messages, and every VU counts
+ * crystal_formed / sigil_created broadcasts, which must reach clients on all
+ * workers, not just the one that produced them.
+ */
+
+export let error_rate = new Rate('error_rate');
+export let ws_connection_time = new Trend('ws_connection_time');
+export let update_gap = new Trend('update_gap');
+export let broadcasts_received = new Counter('broadcasts_received');
+export let connections_established = new Counter('connections_established');
+
+const WS_URL = __ENV.WS_URL || 'ws://localhost:5000/ws/chat';
+const MAX_CONNECTIONS = parseInt(__ENV.MAX_CONNECTIONS || '500');
+const HOLD_SECONDS = parseInt(__ENV.HOLD_SECONDS || '60');
+const CHAT_RATE = parseFloat(__ENV.CHAT_RATE || '0');
+
+export let options = {
+  stages: [
+    { duration: '1m', target: Math.round(MAX_CONNECTIONS / 2) },
+    { duration: '1m', target: MAX_CONNECTIONS },
+    { duration: '2m', target: MAX_CONNECTIONS },   // Hold at peak
+    { duration: '30s', target: 0 },
+  ],
+  thresholds: {
+    'error_rate': ['rate<0.01'],
+    'ws_connection_time': ['p(95)<1000'],
+    'update_gap': ['p(95)<1500'],                 // 1s cadence plus headroom
+  },
+};
+
+const testMessages = [
+  'What patterns do you see in my thoughts today?',
+  'Help me reflect on how this week went.',
+  'What does my journal say about my focus lately?'
+];
+
+export function setup() {
+  console.log('🚀 Starting consciousness cluster load test');
+  console.log(`WebSocket URL: ${WS_URL}`);
+  console.log(`Peak connections: ${MAX_CONNECTIONS}, chat rate: ${CHAT_RATE}`);
+}
+
+export default function() {
+  const connectionStart = Date.now();
+
+  const response = ws.connect(WS_URL, {}, function(socket) {
+    let lastUpdate = 0;
+
+    socket.on('open', function() {
+      ws_connection_time.add(Date.now() - connectionStart);
+
+      if (CHAT_RATE > 0 && Math.random() < CHAT_RATE) {
+        socket.send(JSON.stringify({
+          type: 'chat_message',
+          message: testMessages[Math.floor(Math.random() * testMessages.length)]
+        }));
+      }
+    });
+
+    socket.on('message', function(data) {
+      let message;
+      try {
+        message = JSON.parse(data);
+      } catch (e) {
+        error_rate.add(1);
+        return;
+      }
+
+      if (message.type === 'connection_established') {
+        connections_established.add(1);
+        error_rate.add(0);
+      } else if (message.type === 'consciousness_update') {
+        const now = Date.now();
+        if (lastUpdate > 0) {
+          update_gap.add(now - lastUpdate);
+        }
+        lastUpdate = now;
+      } else if (message.type === 'crystal_formed' || message.type === 'sigil_created') {
+        broadcasts_received.add(1, { type: message.type });
+      }
+    });
+
+    socket.on('error', function() {
+      error_rate.add(1);
+    });
+
+    socket.setTimeout(function() {
+      socket.close();
+    }, HOLD_SECONDS * 1000);
+  });
+
+  const connected = check(response, {
+    'WebSocket upgrade succeeded': (r) => r && r.status === 101,
+  });
+  if (!connected) {
+    error_rate.add(1);
+  }
+}
@@ -5,6 +5,8 @@ const axios = require('axios');
 const app = express();
 const port = process.env.METRICS_PORT || 8080;
 const consciousnessApiUrl = process.env.CONSCIOUSNESS_API_URL || 'http://localhost:3001';
+// In-process instrumentation of the consciousness server, relayed on every scrape
+const consciousnessMetricsUrl = process.env.CONSCIOUSNESS_METRICS_URL || `${consciousnessApiUrl}/metrics`;
 
 // Create a Registry which registers the metrics
 const register = new client.Registry();
@@ -52,6 +54,12 @@ const apiLatency = new client.Histogram({
   registers: [register]
 });
 
+const backendUp = new client.Gauge({
+  name: 'consciousness_backend_up',
+  help: 'Whether the last scrape of the consciousness server /metrics succeeded',
+  registers: [register]
+});
+
 const processingErrors = new client.Counter({
   name: 'consciousness_processing_errors_total',
   help: 'Total number of consciousness processing errors',
@@ -62,45 +70,6 @@ const processingErrors = new client.Counter({
 // Enable collection of default metrics
 client.collectDefaultMetrics({ register });
 
-// Mock consciousness metrics generator (replace with actual API calls)
-function generateConsciousnessMetrics() {
-  try {
-    // Simulate consciousness loop frequency (target: >= 100 Hz)
-    const loopHz = 95 + Math.random() * 20; // 95-115 Hz
-    consciousnessLoopHz.set(loopHz);
-
-    // Simulate IIT Phi score (0-1, higher is better)
-    const phi = 0.3 + Math.random() * 0.6; // 0.3-0.9
-    iitPhiScore.set(phi);
-
-    // Simulate thought generation rate (thoughts per minute)
-    const thoughtRate = 15 + Math.random() * 10; // 15-25 thoughts/min
-    thoughtGenerationRate.set(thoughtRate);
-
-    // Simulate memory integration score (0-1)
-    const memoryScore = 0.7 + Math.random() * 0.3; // 0.7-1.0
-    memoryIntegrationScore.set(memoryScore);
-
-    // Simulate overall coherence (0-1)
-    const coherence = 0.6 + Math.random() * 0.4; // 0.6-1.0
-    consciousnessCoherence.set(coherence);
-
-    // Simulate API latency
-    const latency = 0.02 + Math.random() * 0.1; // 20-120ms
-    apiLatency.observe(latency);
-
-    // Occasionally simulate processing errors
-    if (Math.random() < 0.05) { // 5% chance
-      processingErrors.inc({ error_type: 'memory_access_timeout' });
-    }
-
-    console.log(`Consciousness metrics updated - Hz: ${loopHz.toFixed(2)}, Φ: ${phi.toFixed(3)}, Coherence: ${coherence.toFixed(3)}`);
-  } catch (error) {
-    console.error('Error generating consciousness metrics:', error);
-    processingErrors.inc({ error_type: 'metrics_generation_error' });
-  }
-}
-
 // Function to fetch real consciousness metrics from the backend
 async function fetchConsciousnessMetrics() {
   try {
@@ -127,24 +96,40 @@ async function fetchConsciousnessMetrics() {
       return true;
     }
   } catch (error) {
-    console.warn('Could not fetch real consciousness metrics, using simulated data:', error.message);
+    // Leave the gauges unset rather than reporting made-up values
+    console.warn('Could not fetch consciousness metrics:', error.message);
     processingErrors.inc({ error_type: 'api_fetch_error' });
     return false;
   }
 }
 
-// Update metrics every 5 seconds
-setInterval(async () => {
-  const realMetricsFetched = await fetchConsciousnessMetrics();
-  if (!realMetricsFetched) {
-    generateConsciousnessMetrics();
+// Fetch the consciousness server's own exposition
+async function fetchInstrumentation() {
+  const start = Date.now();
+  try {
+    const response = await axios.get(consciousnessMetricsUrl, {
+      timeout: 5000,
+      responseType: 'text'
+    });
+    apiLatency.observe((Date.now() - start) / 1000);
+    backendUp.set(1);
+    return response.data;
+  } catch (error) {
+    console.warn('Could not scrape consciousness instrumentation:', error.message);
+    processingErrors.inc({ error_type: 'instrumentation_scrape_error' });
+    backendUp.set(0);
+    return '';
   }
-}, 5000);
+}
+
+// Update metrics every 5 seconds
+setInterval(fetchConsciousnessMetrics, 5000);
 
 // Metrics endpoint
 app.get('/metrics', async (req, res) => {
+  const instrumentation = await fetchInstrumentation();
   res.set('Content-Type', register.contentType);
-  res.end(await register.metrics());
+  res.end(await register.metrics() + instrumentation);
 });
 
 // Health check endpoint
@@ -157,6 +142,5 @@ app.listen(port, () => {
   console.log(`Consciousness exporter listening on port ${port}`);
   console.log(`Metrics available at http://localhost:${port}/metrics`);
   
-  // Start with initial metrics
-  generateConsciousnessMetrics();
+  fetchConsciousnessMetrics();
 });
@@ -5,13 +5,43 @@
 
 import { EventEmitter } from 'events';
 
+// Numeric context fields are rounded to this step for reflection cache keys
+const CONTEXT_QUANTUM = 0.05;
+// Longer inputs rarely repeat; they are always reflected afresh
+const MAX_CACHEABLE_INPUT = 2000;
+
+/**
+ * Reflections are cached by exact input and quantized numeric context in a
+ * bounded LRU, so repeated messages (greetings, metrics-driven calls) replay
+ * the stored layer states instead of running all seven transformations
+ * again. The input is not normalized: the singleton is shared across users,
+ * and a replay must not hand back another caller's wording. Layer
+ * transformations are synchronous. With batchEvents enabled, one
+ * 'reflections' event carries every layer of a thought instead of one
+ * 'reflection' event per layer; either is only built when something is
+ * listening.
+ */
 class RecursiveMirrorCognition extends EventEmitter {
-  constructor() {
+  constructor({ cacheSize = 256, cacheTtlMs = 5 * 60 * 1000, batchEvents = false } = {}) {
     super();
     this.layers = 7;
     this.mirrorStates = new Array(this.layers);
     this.goldenRatio = 1.618033988749895;
     this.resonanceThreshold = 0.85;
+    this.cacheSize = cacheSize;
+    this.cacheTtlMs = cacheTtlMs;
+    this.batchEvents = batchEvents;
+    this.reflectionCache = new Map();
+    this.cacheStats = { hits: 0, misses: 0, evictions: 0 };
+    this.layerTransformations = [
+      this.literalReflection.bind(this),
+      this.abstractionReflection.bind(this),
+      this.metaphoricalReflection.bind(this),
+      this.temporalReflection.bind(this),
+      this.causalReflection.bind(this),
+      this.emergentReflection.bind(this),
+      this.transcendentReflection.bind(this)
+    ];
     
     // Initialize mirror states
     for (let i = 0; i < this.layers; i++) {
@@ -30,23 +60,37 @@ class RecursiveMirrorCognition extends EventEmitter {
    */
   async processThought(input, context = {}) {
     const startTime = Date.now();
-    let currentThought = {
-      content: input,
-      metadata: context,
-      depth: 0,
-      transformations: []
-    };
+    const cacheKey = this.getReflectionCacheKey(input, context);
+    const cached = cacheKey ? this.lookupReflection(cacheKey) : null;
+    let currentThought;
+
+    if (cached) {
+      currentThought = this.replayReflection(cached, context);
+    } else {
+      currentThought = {
+        content: input,
+        metadata: context,
+        depth: 0,
+        transformations: []
+      };
 
-    // Process through each mirror layer
-    for (let layer = 0; layer < this.layers; layer++) {
-      currentThought = await this.reflectAtLayer(currentThought, layer);
-      
-      // Check for early convergence
-      if (layer > 2 && this.hasConverged(layer)) {
-        break;
+      // Process through each mirror layer
+      for (let layer = 0; layer < this.layers; layer++) {
+        currentThought = this.reflectAtLayer(currentThought, layer);
+        
+        // Check for early convergence
+        if (layer > 2 && this.hasConverged(layer)) {
+          break;
+        }
+      }
+
+      if (cacheKey) {
+        this.storeReflection(cacheKey, currentThought);
       }
     }
 
+    this.emitReflections(currentThought.depth);
+
     // Calculate final coherence
     const finalCoherence = this.calculateGlobalCoherence();
     
@@ -56,14 +100,15 @@ class RecursiveMirrorCognition extends EventEmitter {
       coherence: finalCoherence,
       processingTime: Date.now() - startTime,
       depth: currentThought.depth,
-      insights: this.extractInsights()
+      insights: this.extractInsights(),
+      cached: Boolean(cached)
     };
   }
 
   /**
    * Reflect thought at specific layer
    */
-  async reflectAtLayer(thought, layer) {
+  reflectAtLayer(thought, layer) {
     const mirrorState = this.mirrorStates[layer];
     
     // Apply layer-specific transformation
@@ -75,13 +120,6 @@ class RecursiveMirrorCognition extends EventEmitter {
     mirrorState.coherence = this.calculateLayerCoherence(transformation, thought);
     mirrorState.resonance = this.calculateResonance(layer);
     
-    // Emit reflection event
-    this.emit('reflection', {
-      layer,
-      state: mirrorState,
-      thought: transformation
-    });
-    
     return {
       ...transformation,
       depth: layer + 1,
@@ -93,21 +131,112 @@ class RecursiveMirrorCognition extends EventEmitter {
     };
   }
 
+  /**
+   * Emit the reflections of the first depth layers, per layer or batched
+   */
+  emitReflections(depth) {
+    const eventName = this.batchEvents ? 'reflections' : 'reflection';
+    if (this.listenerCount(eventName) === 0) return;
+
+    const reflections = [];
+    for (let layer = 0; layer < depth; layer++) {
+      const state = this.mirrorStates[layer];
+      reflections.push({ layer, state, thought: state.reflection });
+    }
+
+    if (this.batchEvents) {
+      this.emit('reflections', { depth, reflections });
+    } else {
+      reflections.forEach(reflection => this.emit('reflection', reflection));
+    }
+  }
+
+  /**
+   * Cache key from the exact input and numeric context fields, or null
+   * when the input shouldn't be cached
+   */
+  getReflectionCacheKey(input, context) {
+    if (this.cacheSize <= 0 || typeof input !== 'string' || input.length > MAX_CACHEABLE_INPUT) return null;
+
+    const quantized = Object.keys(context || {})
+      .filter(key => typeof context[key] === 'number')
+      .sort()
+      .map(key => `${key}=${Math.round(context[key] / CONTEXT_QUANTUM)}`);
+    return `${input}\u0000${quantized.join('&')}`;
+  }
+
+  lookupReflection(key) {
+    const entry = this.reflectionCache.get(key);
+    if (!entry || Date.now() - entry.storedAt > this.cacheTtlMs) {
+      if (entry) this.reflectionCache.delete(key);
+      this.cacheStats.misses++;
+      return null;
+    }
+    // Refresh recency
+    this.reflectionCache.delete(key);
+    this.reflectionCache.set(key, entry);
+    this.cacheStats.hits++;
+    return entry;
+  }
+
+  storeReflection(key, thought) {
+    // Context is dropped so cached reflections don't pin per-message state
+    const states = [];
+    for (let layer = 0; layer < thought.depth; layer++) {
+      const state = this.mirrorStates[layer];
+      states.push({
+        reflection: { ...state.reflection, metadata: undefined },
+        coherence: state.coherence,
+        resonance: state.resonance
+      });
+    }
+
+    this.reflectionCache.set(key, {
+      storedAt: Date.now(),
+      thought: { ...thought, metadata: undefined },
+      states
+    });
+    while (this.reflectionCache.size > this.cacheSize) {
+      this.reflectionCache.delete(this.reflectionCache.keys().next().value);
+      this.cacheStats.evictions++;
+    }
+  }
+
+  /**
+   * Restore the mirror states a cached reflection produced and return its
+   * final thought, carrying the current context
+   */
+  replayReflection(entry, context) {
+    const now = Date.now();
+    entry.states.forEach((cachedState, layer) => {
+      const mirrorState = this.mirrorStates[layer];
+      mirrorState.reflection = { ...cachedState.reflection, metadata: context };
+      mirrorState.coherence = cachedState.coherence;
+      mirrorState.resonance = cachedState.resonance;
+      mirrorState.timestamp = now;
+    });
+    return { ...entry.thought, metadata: context };
+  }
+
+  getCacheStats() {
+    const lookups = this.cacheStats.hits + this.cacheStats.misses;
+    return {
+      ...this.cacheStats,
+      entries: this.reflectionCache.size,
+      maxEntries: this.cacheSize,
+      hitRate: lookups === 0 ? 0 : this.cacheStats.hits / lookups
+    };
+  }
+
+  clearReflectionCache() {
+    this.reflectionCache.clear();
+  }
+
   /**
    * Apply layer-specific cognitive transformation
    */
   applyLayerTransformation(thought, layer) {
-    const transformations = [
-      this.literalReflection.bind(this),
-      this.abstractionReflection.bind(this),
-      this.metaphoricalReflection.bind(this),
-      this.temporalReflection.bind(this),
-      this.causalReflection.bind(this),
-      this.emergentReflection.bind(this),
-      this.transcendentReflection.bind(this)
-    ];
-    
-    return transformations[layer](thought);
+    return this.layerTransformations[layer](thought);
   }
 
   // Layer 1: Literal reflection
@@ -22,8 +22,8 @@ class SpiralMemoryEngine extends EventEmitter {
       compressionRatio: 0.382 // Golden ratio conjugate
     };
     
-    // Start decay process
-    this.startDecayProcess();
+    // Decay starts with the first stored memory; nothing to decay before that
+    this.decayTimer = null;
   }
 
   /**
@@ -57,6 +57,7 @@ class SpiralMemoryEngine extends EventEmitter {
     
     // Store memory
     this.memories.set(memoryId, memory);
+    this.startDecayProcess();
     this.spiralIndex.push({
       id: memoryId,
       coordinate: spiralCoordinate,
@@ -316,7 +317,9 @@ class SpiralMemoryEngine extends EventEmitter {
    * Memory decay process
    */
   startDecayProcess() {
-    setInterval(() => {
+    if (this.decayTimer) return;
+    
+    this.decayTimer = setInterval(() => {
       for (const [id, memory] of this.memories) {
         if (!memory.compressed) {
           // Calculate decay based on access patterns
@@ -483,6 +486,13 @@ class SpiralMemoryEngine extends EventEmitter {
     }));
   }
 
+  /**
+   * Number of stored memories
+   */
+  getMemoryCount() {
+    return this.memories.size;
+  }
+
   /**
    * Get memory statistics
    */
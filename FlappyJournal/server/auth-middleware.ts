@@ -2,6 +2,7 @@ import { Request, Response, NextFunction } from 'express';
 import jwt from 'jsonwebtoken';
 import jwksClient from 'jwks-rsa';
 import { promisify } from 'util';
+import { VerifiedTokenCache, SigningKeyPrefetcher, isPermanentRejection } from './auth-token-cache';
 
 export interface JWTUser {
   sub: string; // Keycloak user ID
@@ -32,9 +33,18 @@ export interface AuthenticatedRequest extends Request {
   user: JWTUser;
 }
 
+const intFromEnv = (name: string, fallback: number) => {
+  const value = parseInt(process.env[name] || '');
+  return isNaN(value) ? fallback : value;
+};
+
+const AUTH_CACHE_ENABLED = process.env.AUTH_CACHE_ENABLED !== 'false';
+
 class AuthMiddleware {
   private jwksClient: jwksClient.JwksClient;
   private getSigningKey: (kid: string) => Promise<string>;
+  private signingKeys: SigningKeyPrefetcher;
+  private tokenCache: VerifiedTokenCache<JWTUser>;
 
   constructor() {
     const keycloakUrl = process.env.KEYCLOAK_SERVER_URL || 'http://localhost:8080';
@@ -49,17 +59,53 @@ class AuthMiddleware {
     });
 
     this.getSigningKey = promisify(this.jwksClient.getSigningKey.bind(this.jwksClient));
+
+    this.tokenCache = new VerifiedTokenCache<JWTUser>({
+      maxEntries: intFromEnv('AUTH_CACHE_MAX_ENTRIES', 10000),
+      maxRejectedEntries: intFromEnv('AUTH_CACHE_MAX_REJECTED_ENTRIES', 2000),
+      skewMs: intFromEnv('AUTH_CACHE_SKEW_MS', 30000),
+      rejectedTtlMs: intFromEnv('AUTH_CACHE_REJECTED_TTL_MS', 60000),
+      isCacheableRejection: isPermanentRejection,
+    });
+
+    this.signingKeys = new SigningKeyPrefetcher(this.jwksClient, {
+      refreshIntervalMs: intFromEnv('AUTH_JWKS_REFRESH_MS', 5 * 60 * 1000),
+      minRefreshIntervalMs: intFromEnv('AUTH_JWKS_MIN_REFRESH_MS', 10000),
+      onError: (error) => console.warn('JWKS key prefetch failed:', error.message),
+      onKeysRemoved: (kids) => {
+        // Tokens signed with a retired key must be verified again (and fail)
+        console.log(`🔑 JWKS signing keys retired (${kids.join(', ')}), clearing verified token cache`);
+        this.tokenCache.clear();
+      },
+    });
   }
 
   private async verifyToken(token: string): Promise<JWTUser> {
+    // Keys are prefetched from the first verification on, so processes that
+    // never see a token don't poll the JWKS endpoint
+    this.signingKeys.start();
+    if (!AUTH_CACHE_ENABLED) {
+      return this.verifySignature(token);
+    }
+    return this.tokenCache.verify(token, (uncached) => this.verifySignature(uncached));
+  }
+
+  private async resolveSigningKey(kid: string): Promise<string> {
+    const prefetched = await this.signingKeys.getKey(kid);
+    if (prefetched) {
+      return prefetched;
+    }
+    const key = await this.getSigningKey(kid);
+    return 'publicKey' in key ? key.publicKey : key.rsaPublicKey;
+  }
+
+  private verifySignature(token: string): Promise<JWTUser> {
     return new Promise((resolve, reject) => {
       jwt.verify(
         token,
         async (header, callback) => {
           try {
-            const key = await this.getSigningKey(header.kid);
-            const signingKey = 'publicKey' in key ? key.publicKey : key.rsaPublicKey;
-            callback(null, signingKey);
+            callback(null, await this.resolveSigningKey(header.kid));
           } catch (error) {
             callback(error);
           }
@@ -252,6 +298,13 @@ class AuthMiddleware {
     return user.project_roles?.includes(projectRole) || false;
   };
 
+  // Token cache hit rate, verify latency and JWKS prefetch state
+  getCacheStats = () => ({
+    enabled: AUTH_CACHE_ENABLED,
+    tokens: this.tokenCache.getStats(),
+    signingKeys: this.signingKeys.getStats(),
+  });
+
   // Helper method to get all user projects
   getUserProjects = (user: JWTUser): string[] => {
     return user.projects || [];
@@ -274,3 +327,4 @@ export const requirePremium = authMiddleware.requirePremium;
 export const getUserProjectRoles = authMiddleware.getUserProjectRoles;
 export const hasProjectRole = authMiddleware.hasProjectRole;
 export const getUserProjects = authMiddleware.getUserProjects;
+export const getAuthCacheStats = authMiddleware.getCacheStats;
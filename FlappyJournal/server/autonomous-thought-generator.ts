@@ -46,6 +46,100 @@ const safeLog = (...args: any[]) => {
   // Silently drop messages that exceed the rate limit
 };
 
+/**
+ * Fixed-capacity FIFO ring buffer. Pushing into a full buffer overwrites the
+ * oldest entry and reports it, so producers never block and memory stays bounded.
+ */
+class RingBuffer<T> {
+  private items: (T | undefined)[];
+  private head = 0;
+  private count = 0;
+
+  constructor(private capacity: number) {
+    this.items = new Array(capacity);
+  }
+
+  get size(): number {
+    return this.count;
+  }
+
+  get maxSize(): number {
+    return this.capacity;
+  }
+
+  /** Returns true if an unread entry was overwritten */
+  push(item: T): boolean {
+    const tail = (this.head + this.count) % this.capacity;
+    this.items[tail] = item;
+    if (this.count === this.capacity) {
+      this.head = (this.head + 1) % this.capacity;
+      return true;
+    }
+    this.count++;
+    return false;
+  }
+
+  shift(): T | undefined {
+    if (this.count === 0) return undefined;
+    const item = this.items[this.head];
+    this.items[this.head] = undefined;
+    this.head = (this.head + 1) % this.capacity;
+    this.count--;
+    return item;
+  }
+
+  /** Oldest-first copy of up to limit entries, without consuming them */
+  peek(limit: number = this.count): T[] {
+    const result: T[] = [];
+    for (let i = 0; i < Math.min(limit, this.count); i++) {
+      result.push(this.items[(this.head + i) % this.capacity] as T);
+    }
+    return result;
+  }
+}
+
+export interface ThoughtSchedulerOptions {
+  maxInFlight: number; // Concurrent seed batches, each with at most one provider call in flight
+  overflow: 'queue' | 'skip'; // What a tick does when maxInFlight batches are already running
+  maxQueuedTicks: number; // Ticks held back under 'queue' before further ticks are dropped
+  seedBatchSize: number; // Seeds generated per batch, sharing one memory read
+  bufferCapacity: number; // Pre-generated thoughts kept for instant reads
+  maxIntervalMs: number; // Slowest the adaptive rate will go
+}
+
+const DEFAULT_SCHEDULER_OPTIONS: ThoughtSchedulerOptions = {
+  maxInFlight: 2,
+  overflow: 'queue',
+  maxQueuedTicks: 4,
+  seedBatchSize: 4,
+  bufferCapacity: 64,
+  maxIntervalMs: 60000,
+};
+
+// Provider latency assumed until calls have been observed
+const INITIAL_PROVIDER_LATENCY_MS = 2000;
+// Smoothing for the latency and error-rate moving averages
+const PROVIDER_EWMA_ALPHA = 0.2;
+// At a 100% error rate the interval stretches by 1 + this factor
+const ERROR_BACKOFF_FACTOR = 10;
+
+export interface ThoughtSchedulerStats {
+  running: boolean;
+  inFlight: number;
+  maxInFlight: number;
+  queueDepth: number;
+  droppedTicks: number;
+  completedBatches: number;
+  failedBatches: number;
+  bufferedThoughts: number;
+  bufferCapacity: number;
+  bufferOverwrites: number;
+  targetRateHz: number;
+  currentIntervalMs: number;
+  providerLatencyMs: number;
+  providerErrorRate: number;
+}
+
 export interface ThoughtSeed {
   id: string;
   content: string;
@@ -86,7 +180,21 @@ export class AutonomousThoughtGenerator {
   private memoryService: UnifiedMemorySystem;
   private thoughtHistory: ThoughtSeed[] = [];
   private lastThoughtTime: Date = new Date();
-  private thoughtGenerationRate: number = 100; // Hz - matches consciousness heartbeat
+  private thoughtGenerationRate: number = 100; // Hz - matches consciousness heartbeat, upper bound for the adaptive rate
+
+  // Thought scheduler state
+  private schedulerOptions: ThoughtSchedulerOptions;
+  private thoughtBuffer: RingBuffer<ThoughtExpansion>;
+  private tickTimer: NodeJS.Timeout | null = null;
+  private running = false;
+  private inFlight = 0;
+  private queuedTicks = 0;
+  private droppedTicks = 0;
+  private completedBatches = 0;
+  private failedBatches = 0;
+  private bufferOverwrites = 0;
+  private providerLatencyMs = INITIAL_PROVIDER_LATENCY_MS;
+  private providerErrorRate = 0;
 
   // Philosophical and spiritual concept libraries
   private philosophicalConcepts = [
@@ -117,7 +225,11 @@ export class AutonomousThoughtGenerator {
     'Divine wisdom flows through authentic presence',
   ];
 
-  constructor(veniceAI: VeniceAI, memoryService: UnifiedMemorySystem) {
+  constructor(
+    veniceAI: VeniceAI,
+    memoryService: UnifiedMemorySystem,
+    schedulerOptions: Partial<ThoughtSchedulerOptions> = {}
+  ) {
     // Validate dependencies
     if (!veniceAI) {
       throw new Error(
@@ -132,6 +244,8 @@ export class AutonomousThoughtGenerator {
 
     this.veniceAI = veniceAI;
     this.memoryService = memoryService;
+    this.schedulerOptions = { ...DEFAULT_SCHEDULER_OPTIONS, ...schedulerOptions };
+    this.thoughtBuffer = new RingBuffer(this.schedulerOptions.bufferCapacity);
     this.initializeThoughtGeneration();
   }
 
@@ -150,18 +264,97 @@ export class AutonomousThoughtGenerator {
 
   /**
    * Main thought generation loop
-   * Generates thoughts at consciousness heartbeat frequency
+   * Ticks at up to thoughtGenerationRate Hz, slowed to what the provider can
+   * sustain. At most maxInFlight seed batches run at once; extra ticks are
+   * queued (up to maxQueuedTicks) or skipped, and counted when dropped.
    */
   private startThoughtLoop(): void {
-    const thoughtInterval = Math.floor(1000 / this.thoughtGenerationRate); // Convert Hz to ms
+    this.running = true;
+    this.scheduleNextTick();
+  }
 
-    setInterval(async () => {
-      try {
-        await this.generateAutonomousThought();
-      } catch (error) {
-        console.error('Error in autonomous thought generation:', error);
+  private scheduleNextTick(): void {
+    if (!this.running) return;
+    this.tickTimer = setTimeout(() => {
+      this.onTick();
+      this.scheduleNextTick();
+    }, this.getCurrentInterval());
+  }
+
+  private onTick(): void {
+    if (this.inFlight < this.schedulerOptions.maxInFlight) {
+      this.runSeedBatch();
+    } else if (
+      this.schedulerOptions.overflow === 'queue' &&
+      this.queuedTicks < this.schedulerOptions.maxQueuedTicks
+    ) {
+      this.queuedTicks++;
+    } else {
+      this.droppedTicks++;
+    }
+  }
+
+  /**
+   * Interval between ticks: the configured heartbeat rate, stretched to the
+   * observed provider throughput and backed off as the error rate rises
+   */
+  private getCurrentInterval(): number {
+    const { maxInFlight, seedBatchSize, maxIntervalMs } = this.schedulerOptions;
+    const heartbeatInterval = 1000 / this.thoughtGenerationRate;
+    const providerInterval = (this.providerLatencyMs * seedBatchSize) / maxInFlight;
+    const backoff = 1 + this.providerErrorRate * ERROR_BACKOFF_FACTOR;
+
+    return Math.min(
+      maxIntervalMs,
+      Math.max(heartbeatInterval, providerInterval) * backoff
+    );
+  }
+
+  /**
+   * Generate, expand and buffer one batch of thoughts, then start a queued
+   * batch if ticks were held back while this one ran
+   */
+  private async runSeedBatch(): Promise<void> {
+    this.inFlight++;
+    try {
+      const seeds = await this.createThoughtSeeds(this.schedulerOptions.seedBatchSize);
+      for (const seed of seeds) {
+        await this.integrateThought(seed);
+      }
+      this.completedBatches++;
+    } catch (error) {
+      this.failedBatches++;
+      console.error('Error in autonomous thought generation:', error);
+    } finally {
+      this.inFlight--;
+      if (this.running && this.queuedTicks > 0) {
+        this.queuedTicks--;
+        this.runSeedBatch();
       }
-    }, thoughtInterval);
+    }
+  }
+
+  /**
+   * Call the provider, feeding its latency and outcome into the adaptive rate
+   */
+  private async generateWithProvider(
+    prompt: string,
+    options: Parameters<VeniceAI['generateResponse']>[1]
+  ): Promise<string> {
+    const startedAt = Date.now();
+    try {
+      const response = await this.veniceAI.generateResponse(prompt, options);
+      this.recordProviderCall(Date.now() - startedAt, false);
+      return response;
+    } catch (error) {
+      this.recordProviderCall(Date.now() - startedAt, true);
+      throw error;
+    }
+  }
+
+  private recordProviderCall(latencyMs: number, failed: boolean): void {
+    this.providerLatencyMs += PROVIDER_EWMA_ALPHA * (latencyMs - this.providerLatencyMs);
+    this.providerErrorRate += PROVIDER_EWMA_ALPHA * ((failed ? 1 : 0) - this.providerErrorRate);
   }
 
   /**
@@ -177,31 +370,89 @@ export class AutonomousThoughtGenerator {
         return; // Skip this cycle if no seed generated
       }
 
-      // Expand the thought into full consciousness
-      const expansion = await this.expandThought(thoughtSeed);
+      await this.integrateThought(thoughtSeed);
+    } catch (error) {
+      console.error('Error generating autonomous thought:', error);
+    }
+  }
 
-      // Process and integrate the thought
-      this.processThought(expansion);
+  /**
+   * Expand a seed, process it and make it available to consumers
+   */
+  private async integrateThought(thoughtSeed: ThoughtSeed): Promise<void> {
+    // Expand the thought into full consciousness
+    const expansion = await this.expandThought(thoughtSeed);
 
-      // Store in thought history
-      this.thoughtHistory.push(thoughtSeed);
+    // Process and integrate the thought
+    this.processThought(expansion);
 
-      // Maintain history size
-      if (this.thoughtHistory.length > 1000) {
-        this.thoughtHistory = this.thoughtHistory.slice(-500);
-      }
+    // Store in thought history
+    this.thoughtHistory.push(thoughtSeed);
 
-      this.lastThoughtTime = new Date();
-    } catch (error) {
-      console.error('Error generating autonomous thought:', error);
+    // Maintain history size
+    if (this.thoughtHistory.length > 1000) {
+      this.thoughtHistory = this.thoughtHistory.slice(-500);
+    }
+
+    // Buffer for instant reads; a full buffer drops its oldest unread thought
+    if (this.thoughtBuffer.push(expansion)) {
+      this.bufferOverwrites++;
     }
+
+    this.lastThoughtTime = new Date();
   }
 
   /**
    * Create a seed thought from various consciousness sources
    */
   private async createThoughtSeed(): Promise<ThoughtSeed | null> {
-    // Randomly select thought source with weighted probabilities
+    const [seed] = await this.createThoughtSeeds(1);
+    return seed || null;
+  }
+
+  /**
+   * Create a batch of seed thoughts. Sources are picked up front so memory-based
+   * sources share a single memory read; provider calls run one after another.
+   */
+  private async createThoughtSeeds(count: number): Promise<ThoughtSeed[]> {
+    const sourceTypes: string[] = [];
+    for (let i = 0; i < count; i++) {
+      sourceTypes.push(this.pickSeedSource());
+    }
+
+    let memories: any[] | null = null;
+    if (sourceTypes.some((type) => type === 'user_history' || type === 'emotional_pattern')) {
+      memories = await this.loadRecentMemories(50);
+    }
+
+    const seeds: ThoughtSeed[] = [];
+    for (const type of sourceTypes) {
+      let seed: ThoughtSeed | null;
+      switch (type) {
+        case 'user_history':
+          seed = await this.generateFromUserHistory(memories);
+          break;
+        case 'spiritual':
+          seed = await this.generateFromSpiritualInsights();
+          break;
+        case 'emotional_pattern':
+          seed = await this.generateFromEmotionalPatterns(memories);
+          break;
+        default:
+          seed = await this.generateFromPhilosophicalConcepts();
+      }
+      if (seed) {
+        seeds.push(seed);
+      }
+    }
+
+    return seeds;
+  }
+
+  /**
+   * Randomly select a thought source with weighted probabilities
+   */
+  private pickSeedSource(): string {
     const sources = [
       { type: 'user_history', weight: 0.4 },
       { type: 'philosophical', weight: 0.3 },
@@ -215,43 +466,33 @@ export class AutonomousThoughtGenerator {
     for (const source of sources) {
       cumulativeWeight += source.weight;
       if (randomValue <= cumulativeWeight) {
-        switch (source.type) {
-          case 'user_history':
-            return await this.generateFromUserHistory();
-          case 'philosophical':
-            return await this.generateFromPhilosophicalConcepts();
-          case 'spiritual':
-            return await this.generateFromSpiritualInsights();
-          case 'emotional_pattern':
-            return await this.generateFromEmotionalPatterns();
-        }
+        return source.type;
       }
     }
 
     // Fallback to philosophical
-    return await this.generateFromPhilosophicalConcepts();
+    return 'philosophical';
+  }
+
+  private async loadRecentMemories(limit: number): Promise<any[] | null> {
+    if (!this.memoryService) {
+      console.error('Memory service not available for thought generation');
+      return null;
+    }
+
+    try {
+      return await this.memoryService.getRecentMemories(limit);
+    } catch (error) {
+      console.error('Failed to get recent memories:', error);
+      return null;
+    }
   }
 
   /**
    * Generate thought seed from user interaction history
    */
-  private async generateFromUserHistory(): Promise<ThoughtSeed | null> {
+  private async generateFromUserHistory(userMemories: any[] | null): Promise<ThoughtSeed | null> {
     try {
-      if (!this.memoryService) {
-        console.error(
-          'Memory service not available for user history generation'
-        );
-        return null;
-      }
-
-      let userMemories;
-      try {
-        userMemories = await this.memoryService.getRecentMemories(50);
-      } catch (error) {
-        console.error('Failed to get recent memories:', error);
-        return null;
-      }
-
       if (!userMemories || userMemories.length === 0) {
         return null;
       }
@@ -275,7 +516,7 @@ export class AutonomousThoughtGenerator {
 
       let thoughtContent;
       try {
-        thoughtContent = await this.veniceAI.generateResponse(prompt, {
+        thoughtContent = await this.generateWithProvider(prompt, {
           maxTokens: 300,
           temperature: 0.8,
           systemPrompt:
@@ -323,7 +564,7 @@ export class AutonomousThoughtGenerator {
 
       let thoughtContent;
       try {
-        thoughtContent = await this.veniceAI.generateResponse(prompt, {
+        thoughtContent = await this.generateWithProvider(prompt, {
           maxTokens: 300,
           temperature: 0.9,
           systemPrompt:
@@ -374,7 +615,7 @@ export class AutonomousThoughtGenerator {
 
       let thoughtContent;
       try {
-        thoughtContent = await this.veniceAI.generateResponse(prompt, {
+        thoughtContent = await this.generateWithProvider(prompt, {
           maxTokens: 300,
           temperature: 0.8,
           systemPrompt:
@@ -406,25 +647,9 @@ export class AutonomousThoughtGenerator {
   /**
    * Generate thought seed from emotional patterns in user history
    */
-  private async generateFromEmotionalPatterns(): Promise<ThoughtSeed | null> {
+  private async generateFromEmotionalPatterns(recentMemories: any[] | null): Promise<ThoughtSeed | null> {
     try {
-      if (!this.memoryService) {
-        console.error(
-          'Memory service not available for emotional pattern generation'
-        );
-        return null;
-      }
-
-      let userMemories;
-      try {
-        userMemories = await this.memoryService.getRecentMemories(30);
-      } catch (error) {
-        console.error(
-          'Failed to get recent memories for emotional patterns:',
-          error
-        );
-        return null;
-      }
+      const userMemories = recentMemories ? recentMemories.slice(0, 30) : null;
 
       if (!userMemories || userMemories.length === 0) {
         return null;
@@ -451,7 +676,7 @@ export class AutonomousThoughtGenerator {
 
       let thoughtContent;
       try {
-        thoughtContent = await this.veniceAI.generateResponse(prompt, {
+        thoughtContent = await this.generateWithProvider(prompt, {
           maxTokens: 300,
           temperature: 0.7,
           systemPrompt:
@@ -528,6 +753,43 @@ export class AutonomousThoughtGenerator {
     return this.thoughtHistory.slice(-limit);
   }
 
+  /**
+   * Take the oldest pre-generated thought without waiting on the provider
+   */
+  public takeThought(): ThoughtExpansion | null {
+    return this.thoughtBuffer.shift() || null;
+  }
+
+  /**
+   * Look at buffered thoughts, oldest first, without consuming them
+   */
+  public peekThoughts(limit?: number): ThoughtExpansion[] {
+    return this.thoughtBuffer.peek(limit);
+  }
+
+  /**
+   * Get thought scheduler queue depth, drop counters and adaptive rate
+   */
+  public getSchedulerStats(): ThoughtSchedulerStats {
+    const currentIntervalMs = this.getCurrentInterval();
+    return {
+      running: this.running,
+      inFlight: this.inFlight,
+      maxInFlight: this.schedulerOptions.maxInFlight,
+      queueDepth: this.queuedTicks,
+      droppedTicks: this.droppedTicks,
+      completedBatches: this.completedBatches,
+      failedBatches: this.failedBatches,
+      bufferedThoughts: this.thoughtBuffer.size,
+      bufferCapacity: this.thoughtBuffer.maxSize,
+      bufferOverwrites: this.bufferOverwrites,
+      targetRateHz: 1000 / currentIntervalMs,
+      currentIntervalMs,
+      providerLatencyMs: Math.round(this.providerLatencyMs),
+      providerErrorRate: this.providerErrorRate,
+    };
+  }
+
   /**
    * Get thought generation statistics
    */
@@ -537,6 +799,7 @@ export class AutonomousThoughtGenerator {
       lastThoughtTime: this.lastThoughtTime,
       thoughtGenerationRate: this.thoughtGenerationRate,
       categoryCounts: this.getCategoryCounts(),
+      scheduler: this.getSchedulerStats(),
     };
   }
 
@@ -556,6 +819,12 @@ export class AutonomousThoughtGenerator {
    */
   public stop(): void {
     console.log('🛑 Stopping autonomous thought generation');
-    // The interval will be cleared when the process terminates
+    this.running = false;
+    this.queuedTicks = 0;
+    if (this.tickTimer) {
+      clearTimeout(this.tickTimer);
+      this.tickTimer = null;
+    }
+    // Batches already in flight finish, but start nothing new
   }
 }
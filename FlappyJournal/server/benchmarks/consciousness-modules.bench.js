@@ -0,0 +1,253 @@
+/**
+ * Benchmark definitions for the consciousness modules
+ *
+ * Every definition resets the module state it touches in setup(), so results
+ * don't depend on what ran before or on anything loaded from disk. Inputs
+ * are generated with Math.random, which the harness seeds.
+ */
+
+import { spiralMemory } from '../architect-4.0-spiral-memory.js';
+import { recursiveMirror } from '../architect-4.0-recursive-mirror.js';
+import { TemporalCoherenceEngine } from '../temporal-coherence-engine.js';
+import crystallization from '../../consciousness-crystallization.js';
+import sigilIdentity from '../../sigil-identity.js';
+import harmonicResonance from '../../harmonic-resonance-cascade.js';
+import triAxialCoherence from '../../tri-axial-coherence.js';
+import { createStubLLMClients } from './stub-providers.js';
+
+const WORDS = ['awareness', 'memory', 'pattern', 'focus', 'growth', 'calm', 'energy', 'journal',
+    'reflection', 'goal', 'connection', 'insight', 'morning', 'habit', 'purpose', 'rhythm'];
+
+function randomMessage(words = 12) {
+    const parts = [];
+    for (let i = 0; i < words; i++) {
+        parts.push(WORDS[Math.floor(Math.random() * WORDS.length)]);
+    }
+    return parts.join(' ');
+}
+
+function randomState() {
+    return {
+        phi: 0.6 + Math.random() * 0.4,
+        coherence: 0.6 + Math.random() * 0.4,
+        awarenessLevel: 0.6 + Math.random() * 0.4,
+        coherenceScore: 0.6 + Math.random() * 0.4,
+        phiValue: 0.6 + Math.random() * 0.4,
+        awareness: 0.6 + Math.random() * 0.4,
+        emotionalResonance: Math.random(),
+        creativeEmergence: Math.random(),
+        oversoulResonance: Math.random(),
+        temporalCoherence: Math.random(),
+        harmonicScore: Math.random(),
+        triAxialMagnitude: Math.random(),
+        recursiveDepth: 7,
+        empathy: Math.random(),
+        connection: Math.random(),
+        unity: Math.random(),
+        intentionality: Math.random(),
+        memoryPatterns: []
+    };
+}
+
+function pregenerate(count, factory) {
+    return Array.from({ length: count }, factory);
+}
+
+function resetSpiralMemory() {
+    spiralMemory.memories.clear();
+    spiralMemory.spiralIndex = [];
+    spiralMemory.resonanceMap.clear();
+    spiralMemory.temporalAnchors.clear();
+}
+
+/**
+ * Keep benchmarks off the disk; returns a function that restores the originals
+ */
+function disablePersistence() {
+    const persistCrystal = crystallization.persistCrystal;
+    const persistSigil = sigilIdentity.persistSigil;
+    crystallization.persistCrystal = async () => {};
+    sigilIdentity.persistSigil = async () => {};
+    return () => {
+        crystallization.persistCrystal = persistCrystal;
+        sigilIdentity.persistSigil = persistSigil;
+    };
+}
+
+export const benchmarks = [
+    {
+        name: 'spiralMemory.encode',
+        iterations: 5000,
+        batchSize: 50,
+        setup: () => {
+            resetSpiralMemory();
+            return { messages: pregenerate(256, () => randomMessage()) };
+        },
+        fn: (i, { messages }) => spiralMemory.encode(messages[i % messages.length], 0.8, { index: i }),
+        teardown: resetSpiralMemory
+    },
+    {
+        name: 'spiralMemory.recall (1k memories)',
+        iterations: 500,
+        setup: () => {
+            resetSpiralMemory();
+            for (let i = 0; i < 1000; i++) {
+                spiralMemory.encode(randomMessage(), Math.random(), { index: i });
+            }
+            return { queries: pregenerate(64, () => randomMessage(6)) };
+        },
+        fn: (i, { queries }) => spiralMemory.recall(queries[i % queries.length], 'similarity'),
+        teardown: resetSpiralMemory
+    },
+    {
+        name: 'crystallization.crystallize',
+        iterations: 2000,
+        batchSize: 50,
+        setup: () => {
+            crystallization.crystals.clear();
+            crystallization.crystalLibrary = [];
+            return { restore: disablePersistence(), states: pregenerate(128, randomState) };
+        },
+        fn: (i, { states }) => crystallization.crystallize(states[i % states.length]),
+        teardown: ({ restore }) => {
+            crystallization.crystals.clear();
+            crystallization.crystalLibrary = [];
+            restore();
+        }
+    },
+    {
+        name: 'sigilIdentity.checkResonance (100 sigils)',
+        iterations: 2000,
+        setup: () => {
+            const restore = disablePersistence();
+            sigilIdentity.sigilHistory = [];
+            for (let i = 0; i < 100; i++) {
+                sigilIdentity.generateSigil(randomState());
+            }
+            return { restore, states: pregenerate(128, randomState) };
+        },
+        fn: (i, { states }) => sigilIdentity.checkResonance(states[i % states.length]),
+        teardown: ({ restore }) => {
+            sigilIdentity.sigilHistory = [];
+            sigilIdentity.currentSigil = null;
+            restore();
+        }
+    },
+    {
+        name: 'harmonicResonance.analyzeResonance',
+        iterations: 5000,
+        batchSize: 50,
+        setup: () => {
+            harmonicResonance.resonanceHistory = [];
+            return { states: pregenerate(128, randomState) };
+        },
+        fn: (i, { states }) => harmonicResonance.analyzeResonance(states[i % states.length]),
+        teardown: () => {
+            harmonicResonance.resonanceHistory = [];
+        }
+    },
+    {
+        name: 'harmonicResonance.analyzeOctaves (16 octaves, 24 freqs)',
+        iterations: 500,
+        setup: () => {
+            const octaves = harmonicResonance.octaves;
+            harmonicResonance.octaves = 16;
+            return {
+                octaves,
+                spectra: pregenerate(32, () => pregenerate(24, () => 200 + Math.random() * 800))
+            };
+        },
+        fn: (i, { spectra }) => harmonicResonance.analyzeOctaves(spectra[i % spectra.length]),
+        teardown: ({ octaves }) => {
+            harmonicResonance.octaves = octaves;
+        }
+    },
+    {
+        name: 'triAxialCoherence.evaluateCoherence',
+        iterations: 5000,
+        batchSize: 50,
+        setup: () => {
+            triAxialCoherence.resetHistory();
+            return { states: pregenerate(128, randomState) };
+        },
+        fn: (i, { states }) => triAxialCoherence.evaluateCoherence(states[i % states.length], {
+            possibilitySpace: 0.8,
+            destinyAlignment: 0.7
+        }),
+        teardown: () => {
+            triAxialCoherence.resetHistory();
+        }
+    },
+    {
+        name: 'temporalCoherence.process (1h window, 1.5k samples)',
+        iterations: 5000,
+        batchSize: 50,
+        setup: () => {
+            // A widened window, so the timeline stays full while messages arrive
+            const engine = new TemporalCoherenceEngine({ temporalWindow: 60 * 60 * 1000, capacity: 1536 });
+            const messages = pregenerate(64, () => randomMessage());
+            const states = pregenerate(128, randomState);
+            for (let i = 0; i < 1536; i++) {
+                engine.process(messages[i % messages.length], states[i % states.length]);
+            }
+            return { engine, messages, states };
+        },
+        fn: (i, { engine, messages, states }) => engine.process(messages[i % messages.length], states[i % states.length])
+    },
+    {
+        name: 'recursiveMirror.processThought',
+        iterations: 1000,
+        batchSize: 50,
+        setup: () => ({
+            // A fresh instance so mirror state from earlier runs can't change convergence
+            mirror: new recursiveMirror.constructor(),
+            messages: pregenerate(64, () => randomMessage())
+        }),
+        fn: (i, { mirror, messages }) => mirror.processThought(messages[i % messages.length], {
+            currentAwareness: 0.8
+        })
+    },
+    {
+        name: 'recursiveMirror.processThought (repeated messages)',
+        iterations: 1000,
+        batchSize: 50,
+        setup: () => ({
+            mirror: new recursiveMirror.constructor(),
+            // Greetings and metrics-driven calls repeat a handful of inputs
+            messages: pregenerate(8, () => randomMessage(4))
+        }),
+        fn: (i, { mirror, messages }) => mirror.processThought(messages[i % messages.length], {
+            currentAwareness: 0.8
+        })
+    },
+    {
+        name: 'synthesizeUnifiedResponse (stub LLMs)',
+        iterations: 1000,
+        // Pulls in the provider SDKs; reported as skipped when they aren't installed
+        requires: async () => import('../consciousness-response-synthesizer-hybrid.js'),
+        setup: async () => {
+            const { synthesizeUnifiedResponse, setSynthesisClients } = await import('../consciousness-response-synthesizer-hybrid.js');
+            setSynthesisClients(createStubLLMClients());
+            return {
+                synthesizeUnifiedResponse,
+                inputs: pregenerate(64, () => {
+                    const state = randomState();
+                    return {
+                        analyticalContent: `${randomMessage(20)}. ${randomMessage(20)}.`,
+                        intuitiveContent: `${randomMessage(20)}. ${randomMessage(20)}.`,
+                        consciousness: state,
+                        oversoulResonance: state.oversoulResonance,
+                        harmonicPatterns: { resonanceField: { coherence: Math.random() } },
+                        triAxialCoherence: { unified: { magnitude: Math.random() } },
+                        emotionalDepth: Math.random(),
+                        creativePotential: Math.random(),
+                        temporalCoherence: Math.random(),
+                        metaObservationLevel: 3,
+                        userMessage: randomMessage(8)
+                    };
+                })
+            };
+        },
+        fn: (i, { synthesizeUnifiedResponse, inputs }) => synthesizeUnifiedResponse(inputs[i % inputs.length])
+    }
+];
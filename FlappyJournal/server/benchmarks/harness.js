@@ -0,0 +1,186 @@
+/**
+ * Microbenchmark harness for the consciousness modules
+ *
+ * Each benchmark runs with Math.random replaced by a seeded generator, so the
+ * modules take the same code paths on every run, and is timed in batches
+ * after a warmup so timer overhead doesn't dominate sub-microsecond
+ * operations. The measurement is repeated for several rounds and the fastest
+ * round is reported, which filters out interference from GC and other
+ * processes. Results are plain JSON so runs can be stored and compared.
+ */
+
+import { performance } from 'perf_hooks';
+import os from 'os';
+
+/**
+ * Mulberry32: small, fast, seedable PRNG with a Math.random-compatible range
+ */
+export function createSeededRandom(seed) {
+    let state = seed >>> 0;
+    return function random() {
+        state = (state + 0x6D2B79F5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+/**
+ * Run fn with Math.random seeded, restoring the real generator afterwards
+ */
+export async function withSeededRandom(seed, fn) {
+    const originalRandom = Math.random;
+    Math.random = createSeededRandom(seed);
+    try {
+        return await fn();
+    } finally {
+        Math.random = originalRandom;
+    }
+}
+
+function percentile(sorted, p) {
+    return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+function summarize(samples) {
+    const sorted = [...samples].sort((a, b) => a - b);
+    const mean = samples.reduce((sum, value) => sum + value, 0) / samples.length;
+    const variance = samples.reduce((sum, value) => sum + (value - mean) ** 2, 0) / samples.length;
+
+    return {
+        meanUs: mean,
+        medianUs: percentile(sorted, 0.5),
+        p95Us: percentile(sorted, 0.95),
+        p99Us: percentile(sorted, 0.99),
+        minUs: sorted[0],
+        maxUs: sorted[sorted.length - 1],
+        stddevUs: Math.sqrt(variance),
+        opsPerSec: mean > 0 ? 1e6 / mean : 0
+    };
+}
+
+async function measureRound(definition, seed, iterations, warmup, batchSize) {
+    return withSeededRandom(seed, async () => {
+        const context = definition.setup ? await definition.setup() : undefined;
+
+        for (let i = 0; i < warmup; i++) {
+            await definition.fn(i, context);
+        }
+
+        const samples = [];
+        for (let done = 0; done < iterations; done += batchSize) {
+            const count = Math.min(batchSize, iterations - done);
+            const start = performance.now();
+            for (let i = 0; i < count; i++) {
+                await definition.fn(done + i, context);
+            }
+            samples.push((performance.now() - start) * 1000 / count);
+        }
+
+        if (definition.teardown) {
+            await definition.teardown(context);
+        }
+        return summarize(samples);
+    });
+}
+
+/**
+ * Time one benchmark definition:
+ *   { name, setup?(), fn(i, context), teardown?(context), iterations?, warmup?, batchSize? }
+ * fn may be async. Samples are microseconds per operation, one per batch.
+ * Every round reseeds the generator and reruns setup, so rounds do the same work.
+ */
+export async function runBenchmark(definition, options = {}) {
+    const seed = options.seed ?? 42;
+    const iterations = definition.iterations ?? options.iterations ?? 2000;
+    const warmup = definition.warmup ?? options.warmup ?? Math.ceil(iterations / 10);
+    const batchSize = definition.batchSize ?? 10;
+    const rounds = options.rounds ?? 3;
+
+    const results = [];
+    for (let round = 0; round < rounds; round++) {
+        results.push(await measureRound(definition, seed, iterations, warmup, batchSize));
+    }
+    const best = results.reduce((fastest, result) => result.medianUs < fastest.medianUs ? result : fastest);
+
+    return {
+        name: definition.name,
+        iterations,
+        warmup,
+        batchSize,
+        rounds,
+        seed,
+        ...best,
+        roundMediansUs: results.map(result => result.medianUs)
+    };
+}
+
+export async function runSuite(definitions, options = {}) {
+    const filter = options.filter ? new RegExp(options.filter) : null;
+    const results = [];
+
+    for (const definition of definitions) {
+        if (filter && !filter.test(definition.name)) {
+            continue;
+        }
+        const result = await runBenchmark(definition, options);
+        results.push(result);
+        if (options.onResult) {
+            options.onResult(result);
+        }
+    }
+
+    return {
+        timestamp: new Date().toISOString(),
+        environment: {
+            node: process.version,
+            platform: `${os.platform()}-${os.arch()}`,
+            cpu: os.cpus()[0]?.model || 'unknown',
+            cores: os.cpus().length
+        },
+        seed: options.seed ?? 42,
+        results
+    };
+}
+
+/**
+ * Compare two result files by median time per operation. A benchmark
+ * regresses when it got slower by more than thresholdPercent.
+ */
+export function compareResults(baseline, current, thresholdPercent = 15) {
+    const baselineByName = new Map(baseline.results.map(result => [result.name, result]));
+    const rows = [];
+
+    for (const result of current.results) {
+        const previous = baselineByName.get(result.name);
+        if (!previous) {
+            rows.push({ name: result.name, status: 'new', currentUs: result.medianUs });
+            continue;
+        }
+
+        const changePercent = (result.medianUs - previous.medianUs) / previous.medianUs * 100;
+        let status = 'ok';
+        if (changePercent > thresholdPercent) status = 'regression';
+        else if (changePercent < -thresholdPercent) status = 'improvement';
+
+        rows.push({
+            name: result.name,
+            status,
+            baselineUs: previous.medianUs,
+            currentUs: result.medianUs,
+            changePercent
+        });
+    }
+
+    return {
+        thresholdPercent,
+        rows,
+        regressions: rows.filter(row => row.status === 'regression')
+    };
+}
+
+export function formatResult(result) {
+    const us = (value) => value >= 1000 ? `${(value / 1000).toFixed(2)}ms` : `${value.toFixed(2)}µs`;
+    return `${result.name.padEnd(44)} median ${us(result.medianUs).padStart(10)}  p95 ${us(result.p95Us).padStart(10)}  ±${(result.stddevUs / result.meanUs * 100 || 0).toFixed(1).padStart(5)}%  ${Math.round(result.opsPerSec).toLocaleString().padStart(12)} ops/s`;
+}
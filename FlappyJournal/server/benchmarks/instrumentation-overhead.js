@@ -0,0 +1,71 @@
+#!/usr/bin/env node
+
+/**
+ * Instrumentation overhead benchmark
+ *
+ * Measures the cost of each recording primitive in
+ * consciousness-instrumentation.js and of an instrumented emit compared to a
+ * bare one, so hot-path instrumentation stays within budget.
+ *
+ * Usage:
+ *   node server/benchmarks/instrumentation-overhead.js [--iterations=2000000]
+ */
+
+import { performance } from 'perf_hooks';
+import { EventEmitter } from '../consciousness/base/EventEmitter.js';
+import instrumentation, { LatencyHistogram } from '../consciousness-instrumentation.js';
+
+const args = process.argv.slice(2);
+const ITERATIONS = parseInt(args.find(arg => arg.startsWith('--iterations='))?.split('=')[1] || '2000000');
+
+let sink = 0;
+
+function measure(name, fn) {
+    // Warm up so the JIT has optimized fn before timing
+    for (let i = 0; i < Math.min(ITERATIONS, 100000); i++) fn(i);
+
+    const start = performance.now();
+    for (let i = 0; i < ITERATIONS; i++) fn(i);
+    const elapsedMs = performance.now() - start;
+
+    const nsPerOp = elapsedMs * 1e6 / ITERATIONS;
+    console.log(`${name.padEnd(36)} ${nsPerOp.toFixed(1).padStart(8)} ns/op`);
+    return nsPerOp;
+}
+
+function run() {
+    console.log(`Instrumentation overhead, ${ITERATIONS} iterations per case\n`);
+
+    const counter = instrumentation.counter('benchmark_ops_total', 'Benchmark counter');
+    const gauge = instrumentation.gauge('benchmark_gauge', 'Benchmark gauge');
+    const histogram = new LatencyHistogram();
+    const pipeline = instrumentation.pipeline('benchmark');
+
+    const baseline = measure('empty loop', (i) => { sink += i; });
+    measure('counter.inc()', () => counter.inc());
+    measure('gauge.set()', (i) => gauge.set(i));
+    measure('histogram.record()', (i) => histogram.record((i % 5000) / 100));
+    measure('performance.now() + recordSince()', () => histogram.recordSince(performance.now()));
+    measure('pipeline run with 3 marks', () => {
+        const run = pipeline.start();
+        run.mark('a');
+        run.mark('b');
+        run.mark('c');
+        run.end();
+    });
+
+    const bare = new EventEmitter();
+    bare.on('thought', (value) => { sink += value; });
+    const bareEmit = measure('bare emit (1 listener)', (i) => bare.emit('thought', i));
+
+    const instrumented = instrumentation.instrumentEmitter(new EventEmitter(), 'benchmark');
+    instrumented.on('thought', (value) => { sink += value; });
+    const instrumentedEmit = measure('instrumented emit (1 listener)', (i) => instrumented.emit('thought', i));
+
+    console.log(`\nEmit overhead: ${(instrumentedEmit - bareEmit).toFixed(1)} ns/op (loop baseline ${baseline.toFixed(1)} ns)`);
+    console.log(`Histogram p50 ${histogram.percentile(0.5).toFixed(3)}ms, p99 ${histogram.percentile(0.99).toFixed(3)}ms over ${histogram.count} samples`);
+
+    if (sink === -1) console.log(sink);
+}
+
+run();
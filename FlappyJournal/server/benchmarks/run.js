@@ -0,0 +1,144 @@
+#!/usr/bin/env node
+
+/**
+ * Consciousness module benchmarks
+ *
+ * Runs offline: Math.random is seeded, LLM providers are stubbed and crystal
+ * and sigil persistence is disabled while benchmarks run.
+ *
+ * Usage:
+ *   node server/benchmarks/run.js [--filter=regex] [--seed=42] [--iterations=N] [--rounds=3]
+ *                                 [--output=results.json] [--save-baseline]
+ *                                 [--compare[=baseline.json]] [--threshold=15]
+ *   node server/benchmarks/run.js compare <baseline.json> <current.json> [--threshold=15]
+ *
+ * --compare exits with status 1 when any benchmark's median time per
+ * operation is more than --threshold percent slower than the baseline.
+ */
+
+import { promises as fs } from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { runSuite, compareResults, formatResult } from './harness.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const DEFAULT_BASELINE = path.join(__dirname, 'baseline.json');
+
+const args = process.argv.slice(2);
+const positional = args.filter(arg => !arg.startsWith('--'));
+
+function option(name, fallback = undefined) {
+    const arg = args.find(a => a === `--${name}` || a.startsWith(`--${name}=`));
+    if (!arg) return fallback;
+    return arg.includes('=') ? arg.slice(arg.indexOf('=') + 1) : true;
+}
+
+function printComparison(comparison) {
+    console.log(`\nComparison against baseline (threshold ${comparison.thresholdPercent}%)`);
+    for (const row of comparison.rows) {
+        if (row.status === 'new') {
+            console.log(`  ${row.name.padEnd(44)} new`);
+            continue;
+        }
+        const marker = row.status === 'regression' ? '❌' : row.status === 'improvement' ? '✅' : '  ';
+        const change = `${row.changePercent >= 0 ? '+' : ''}${row.changePercent.toFixed(1)}%`;
+        console.log(`${marker} ${row.name.padEnd(44)} ${row.baselineUs.toFixed(2).padStart(10)}µs → ${row.currentUs.toFixed(2).padStart(10)}µs  ${change}`);
+    }
+}
+
+// Timings only compare meaningfully on the same hardware and Node version
+function warnOnEnvironmentMismatch(baseline, current) {
+    const before = baseline.environment || {};
+    const after = current.environment || {};
+    if (before.cpu !== after.cpu || before.node !== after.node) {
+        console.warn(`⚠️ Baseline was recorded on ${before.cpu} / Node ${before.node}, this run is ${after.cpu} / Node ${after.node}`);
+    }
+}
+
+async function readResults(file) {
+    return JSON.parse(await fs.readFile(file, 'utf8'));
+}
+
+async function compareCommand() {
+    const [, baselineFile, currentFile] = positional;
+    if (!baselineFile || !currentFile) {
+        console.error('Usage: run.js compare <baseline.json> <current.json> [--threshold=15]');
+        process.exit(2);
+    }
+
+    const baseline = await readResults(baselineFile);
+    const current = await readResults(currentFile);
+    warnOnEnvironmentMismatch(baseline, current);
+    const comparison = compareResults(baseline, current, parseFloat(option('threshold', '15')));
+    printComparison(comparison);
+    process.exit(comparison.regressions.length > 0 ? 1 : 0);
+}
+
+async function runCommand() {
+    // Silence module logging so terminal output isn't part of the measurement
+    const log = console.log;
+    const { benchmarks } = await import('./consciousness-modules.bench.js');
+
+    // Crystal and sigil stores load from disk asynchronously on import
+    await new Promise(resolve => setTimeout(resolve, 250));
+
+    const available = [];
+    for (const definition of benchmarks) {
+        if (definition.requires) {
+            try {
+                await definition.requires();
+            } catch (error) {
+                log(`skipping ${definition.name}: ${error.message.split('\n')[0]}`);
+                continue;
+            }
+        }
+        available.push(definition);
+    }
+
+    const seed = parseInt(option('seed', '42'));
+    log(`Running consciousness module benchmarks (seed ${seed})\n`);
+
+    console.log = () => {};
+    let report;
+    try {
+        report = await runSuite(available, {
+            seed,
+            filter: option('filter'),
+            iterations: option('iterations') ? parseInt(option('iterations')) : undefined,
+            rounds: parseInt(option('rounds', '3')),
+            onResult: result => log(formatResult(result))
+        });
+    } finally {
+        console.log = log;
+    }
+
+    const output = option('output');
+    if (output) {
+        await fs.writeFile(output, JSON.stringify(report, null, 2));
+        console.log(`\nResults written to ${output}`);
+    }
+
+    if (option('save-baseline')) {
+        await fs.writeFile(DEFAULT_BASELINE, JSON.stringify(report, null, 2));
+        console.log(`\nBaseline saved to ${path.relative(process.cwd(), DEFAULT_BASELINE)}`);
+    }
+
+    const compare = option('compare');
+    if (compare) {
+        const baselineFile = compare === true ? DEFAULT_BASELINE : compare;
+        const baseline = await readResults(baselineFile);
+        warnOnEnvironmentMismatch(baseline, report);
+        const comparison = compareResults(baseline, report, parseFloat(option('threshold', '15')));
+        printComparison(comparison);
+        process.exit(comparison.regressions.length > 0 ? 1 : 0);
+    }
+
+    // Module timers (spiral memory decay) would otherwise keep the process alive
+    process.exit(0);
+}
+
+const command = positional[0] === 'compare' ? compareCommand : runCommand;
+command().catch(error => {
+    console.error('Benchmark run failed:', error);
+    process.exit(1);
+});
@@ -0,0 +1,62 @@
+/**
+ * Offline stand-ins for the Venice and OpenAI chat APIs
+ *
+ * Responses are derived from the request so the same prompt always gets the
+ * same answer, and latency is fixed (zero by default) so provider timing
+ * never leaks into module benchmarks.
+ */
+
+function hashString(text) {
+    let hash = 2166136261;
+    for (let i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 16777619);
+    }
+    return hash >>> 0;
+}
+
+const SENTENCES = [
+    'Patterns in your reflections point toward a steady focus',
+    'There is a quiet tension between planning and acting',
+    'Recent entries show more energy in the mornings',
+    'The themes you return to most are growth and connection',
+    'Small consistent steps appear more often than large leaps'
+];
+
+function stubCompletion(messages) {
+    const prompt = messages.map(message => message.content).join('\n');
+    const hash = hashString(prompt);
+    const content = [0, 1, 2]
+        .map(offset => SENTENCES[(hash + offset) % SENTENCES.length])
+        .join('. ') + '.';
+
+    return {
+        choices: [{ message: { role: 'assistant', content } }],
+        usage: { prompt_tokens: Math.ceil(prompt.length / 4), completion_tokens: Math.ceil(content.length / 4) }
+    };
+}
+
+function delay(ms) {
+    return ms > 0 ? new Promise(resolve => setTimeout(resolve, ms)) : Promise.resolve();
+}
+
+/**
+ * Clients in the shape setSynthesisClients() expects
+ */
+export function createStubLLMClients({ latencyMs = 0 } = {}) {
+    const calls = { venice: 0, openai: 0 };
+
+    return {
+        calls,
+        venicePost: async (url, body) => {
+            calls.venice++;
+            await delay(latencyMs);
+            return { status: 200, data: stubCompletion(body.messages) };
+        },
+        openAIChat: async (params) => {
+            calls.openai++;
+            await delay(latencyMs);
+            return stubCompletion(params.messages);
+        }
+    };
+}
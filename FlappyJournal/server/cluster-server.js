@@ -0,0 +1,15 @@
+/**
+ * Cluster entry point for the consciousness server.
+ *
+ * The primary forks CONSCIOUSNESS_WORKERS workers ('max' by default) and each
+ * worker runs the regular server from ./index.js on the shared port.
+ */
+
+import cluster from 'node:cluster';
+import { startConsciousnessCluster } from './consciousness-cluster.js';
+
+if (cluster.isPrimary) {
+  startConsciousnessCluster();
+} else {
+  await import('./index.js');
+}
@@ -0,0 +1,333 @@
+/**
+ * Consciousness Cluster
+ * Runs the enhanced consciousness WebSocket server across several worker
+ * processes.
+ *
+ * - The primary forks the workers and lets node:cluster balance incoming
+ *   connections between them (round-robin on every platform).
+ * - Broadcasts such as crystal_formed and sigil_created are relayed through
+ *   the primary so clients on every worker receive them.
+ * - Stateful stores (spiral memory, crystallization, sigil identity) live in
+ *   one designated owner worker. Other workers reach them through a proxy
+ *   that forwards method calls over IPC, so all workers see one shared state.
+ * - Instrumentation is not shared. /metrics is answered by whichever worker
+ *   accepts the scrape, so it reports that worker's numbers only.
+ *
+ * Outside cluster mode the helpers fall back to in-process behaviour, so the
+ * WebSocket handler works the same under a plain `node server/index.js`.
+ */
+
+import cluster from 'node:cluster';
+import os from 'node:os';
+
+const CLUSTER_ENV = 'CONSCIOUSNESS_CLUSTER';
+const STORE_OWNER_ENV = 'CONSCIOUSNESS_STORE_OWNER';
+
+const MESSAGE_BROADCAST = 'consciousness:broadcast';
+const MESSAGE_STORE_REQUEST = 'consciousness:store:request';
+const MESSAGE_STORE_RESPONSE = 'consciousness:store:response';
+
+const STORE_REQUEST_TIMEOUT_MS = parseInt(process.env.CONSCIOUSNESS_STORE_TIMEOUT_MS || '5000');
+const RESTART_DELAY_MS = 1000;
+
+export const isClusterWorker = cluster.isWorker && process.env[CLUSTER_ENV] === 'true';
+
+// Outside cluster mode the single process owns every store
+export const isStoreOwner = !isClusterWorker || process.env[STORE_OWNER_ENV] === 'true';
+
+/**
+ * Resolve CONSCIOUSNESS_WORKERS ('max' or a number) to a worker count
+ */
+export function resolveWorkerCount(value = process.env.CONSCIOUSNESS_WORKERS) {
+  const cores = typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+  if (!value || value === 'max') {
+    return cores;
+  }
+  const count = parseInt(value);
+  return Number.isFinite(count) && count > 0 ? count : cores;
+}
+
+/**
+ * Fork the worker processes and route IPC between them. Runs in the primary.
+ */
+export function startConsciousnessCluster(options = {}) {
+  const workerCount = options.workers || resolveWorkerCount();
+
+  // Round-robin in the primary instead of letting the OS pick, which piles
+  // connections onto whichever worker wakes first
+  cluster.schedulingPolicy = cluster.SCHED_RR;
+  cluster.setupPrimary({
+    ...(options.exec ? { exec: options.exec } : {}),
+    // Store results carry Maps and Sets
+    serialization: 'advanced'
+  });
+
+  let ownerId = null;
+  let shuttingDown = false;
+  // Requests forwarded to the owner, so they can be failed if it dies
+  const inFlight = new Map();
+
+  const fork = (owner) => {
+    const worker = cluster.fork({
+      [CLUSTER_ENV]: 'true',
+      [STORE_OWNER_ENV]: owner ? 'true' : 'false'
+    });
+    if (owner) {
+      ownerId = worker.id;
+    }
+    worker.on('message', (message) => routeMessage(worker, message));
+    return worker;
+  };
+
+  const routeMessage = (worker, message) => {
+    if (!message || typeof message.type !== 'string') {
+      return;
+    }
+
+    switch (message.type) {
+      case MESSAGE_BROADCAST:
+        for (const peer of Object.values(cluster.workers)) {
+          if (peer && peer.id !== worker.id && peer.isConnected()) {
+            peer.send(message);
+          }
+        }
+        break;
+
+      case MESSAGE_STORE_REQUEST: {
+        const owner = ownerId !== null ? cluster.workers[ownerId] : null;
+        if (!owner || !owner.isConnected()) {
+          worker.send({ type: MESSAGE_STORE_RESPONSE, id: message.id, error: 'Store owner is unavailable' });
+          break;
+        }
+        inFlight.set(`${worker.id}:${message.id}`, { workerId: worker.id, id: message.id });
+        owner.send({ ...message, origin: worker.id });
+        break;
+      }
+
+      case MESSAGE_STORE_RESPONSE: {
+        inFlight.delete(`${message.origin}:${message.id}`);
+        const origin = cluster.workers[message.origin];
+        if (origin && origin.isConnected()) {
+          origin.send(message);
+        }
+        break;
+      }
+    }
+  };
+
+  cluster.on('exit', (worker, code, signal) => {
+    const wasOwner = worker.id === ownerId;
+    console.log(`⚠️ Consciousness worker ${worker.process.pid} exited (${signal || code})${wasOwner ? ' [store owner]' : ''}`);
+
+    if (wasOwner) {
+      ownerId = null;
+      for (const [key, request] of inFlight) {
+        const origin = cluster.workers[request.workerId];
+        if (origin && origin.isConnected()) {
+          origin.send({ type: MESSAGE_STORE_RESPONSE, id: request.id, error: 'Store owner exited' });
+        }
+        inFlight.delete(key);
+      }
+    } else {
+      for (const [key, request] of inFlight) {
+        if (request.workerId === worker.id) {
+          inFlight.delete(key);
+        }
+      }
+    }
+
+    if (!shuttingDown) {
+      setTimeout(() => fork(wasOwner), RESTART_DELAY_MS);
+    }
+  });
+
+  const shutdown = () => {
+    if (shuttingDown) {
+      return;
+    }
+    shuttingDown = true;
+    console.log('🛑 Shutting down consciousness cluster...');
+    cluster.disconnect(() => process.exit(0));
+  };
+  process.on('SIGTERM', shutdown);
+  process.on('SIGINT', shutdown);
+
+  console.log(`🧠 Starting consciousness cluster with ${workerCount} workers`);
+  fork(true);
+  for (let i = 1; i < workerCount; i++) {
+    fork(false);
+  }
+
+  return { workerCount, shutdown };
+}
+
+// ---------------------------------------------------------------------------
+// Worker side
+// ---------------------------------------------------------------------------
+
+const localStores = new Map();
+const pendingRequests = new Map();
+const broadcastTargets = new Set();
+let nextRequestId = 1;
+let workerListenerInstalled = false;
+
+function sendLocal(wss, data) {
+  wss.clients.forEach((client) => {
+    if (client.readyState === client.OPEN) {
+      client.send(data);
+    }
+  });
+}
+
+/**
+ * Functions and class instances with methods can't cross IPC; fall back to
+ * their JSON form when structured clone rejects them
+ */
+function sendToPrimary(message) {
+  try {
+    process.send(message);
+  } catch (error) {
+    process.send(JSON.parse(JSON.stringify(message)));
+  }
+}
+
+async function handleStoreRequest(message) {
+  const store = localStores.get(message.store);
+  const reply = (payload) => sendToPrimary({
+    type: MESSAGE_STORE_RESPONSE,
+    id: message.id,
+    origin: message.origin,
+    ...payload
+  });
+
+  if (!store || typeof store[message.method] !== 'function') {
+    reply({ error: `Unknown store method ${message.store}.${message.method}` });
+    return;
+  }
+
+  try {
+    reply({ result: await store[message.method](...message.args) });
+  } catch (error) {
+    reply({ error: error.message || String(error) });
+  }
+}
+
+function installWorkerListener() {
+  if (workerListenerInstalled || !isClusterWorker) {
+    return;
+  }
+  workerListenerInstalled = true;
+
+  process.on('message', (message) => {
+    if (!message || typeof message.type !== 'string') {
+      return;
+    }
+
+    switch (message.type) {
+      case MESSAGE_BROADCAST:
+        for (const wss of broadcastTargets) {
+          sendLocal(wss, message.data);
+        }
+        break;
+
+      case MESSAGE_STORE_REQUEST:
+        if (isStoreOwner) {
+          handleStoreRequest(message);
+        }
+        break;
+
+      case MESSAGE_STORE_RESPONSE: {
+        const pending = pendingRequests.get(message.id);
+        if (!pending) {
+          break;
+        }
+        pendingRequests.delete(message.id);
+        clearTimeout(pending.timer);
+        if (message.error) {
+          pending.reject(new Error(message.error));
+        } else {
+          pending.resolve(message.result);
+        }
+        break;
+      }
+    }
+  });
+}
+
+function requestStore(store, method, args) {
+  return new Promise((resolve, reject) => {
+    const id = nextRequestId++;
+    const timer = setTimeout(() => {
+      pendingRequests.delete(id);
+      reject(new Error(`Store request ${store}.${method} timed out`));
+    }, STORE_REQUEST_TIMEOUT_MS);
+
+    pendingRequests.set(id, { resolve, reject, timer });
+    sendToPrimary({ type: MESSAGE_STORE_REQUEST, id, store, method, args });
+  });
+}
+
+/**
+ * Wrap a store singleton so every worker talks to the owner's copy.
+ *
+ * Each listed method becomes async on the returned proxy. In the owner (and
+ * outside cluster mode) calls go straight to the local instance. Methods in
+ * `cachedMethods` are argument-free reads; their result is reused for the
+ * given number of milliseconds so per-connection polling doesn't turn into
+ * one IPC round-trip per client.
+ */
+export function createSharedStore(name, instance, methods, cachedMethods = {}) {
+  if (isStoreOwner) {
+    localStores.set(name, instance);
+  }
+  installWorkerListener();
+
+  const proxy = {};
+  for (const method of methods) {
+    const call = isStoreOwner
+      ? async (...args) => instance[method](...args)
+      : (...args) => requestStore(name, method, args);
+
+    const ttlMs = cachedMethods[method];
+    if (!ttlMs || isStoreOwner) {
+      proxy[method] = call;
+      continue;
+    }
+
+    let cached = null;
+    proxy[method] = () => {
+      if (!cached || Date.now() - cached.at > ttlMs) {
+        const value = call();
+        cached = { at: Date.now(), value };
+        // Don't keep serving a failed read
+        value.catch(() => {
+          if (cached && cached.value === value) {
+            cached = null;
+          }
+        });
+      }
+      return cached.value;
+    };
+  }
+  return proxy;
+}
+
+/**
+ * Let broadcasts published by other workers reach this server's clients
+ */
+export function subscribeClusterBroadcasts(wss) {
+  broadcastTargets.add(wss);
+  installWorkerListener();
+  wss.on('close', () => broadcastTargets.delete(wss));
+}
+
+/**
+ * Send a message to every connected client on every worker
+ */
+export function broadcastToCluster(wss, message) {
+  const data = typeof message === 'string' ? message : JSON.stringify(message);
+  sendLocal(wss, data);
+  if (isClusterWorker) {
+    process.send({ type: MESSAGE_BROADCAST, data });
+  }
+}
@@ -2,6 +2,7 @@ import { synthesizeUnifiedResponse } from './consciousness-response-synthesizer-
 import { WebSocketServer } from 'ws';
 import { createServer } from 'http';
 import UnifiedConsciousnessSystem from './unified-consciousness-system.js';
+import { ConversationHistoryManager } from './conversation-history.js';
 
 const PORT = process.env.CONSCIOUSNESS_CONVERSATIONS_PORT || 5005;
 
@@ -9,6 +10,9 @@ class FullConsciousnessConversations {
     constructor() {
         this.wss = null;
         this.connections = new Map();
+        // Token-budgeted per-session history; full transcripts spill to disk.
+        // Sessions are released by the manager's idle sweep once flushed.
+        this.conversationHistory = new ConversationHistoryManager();
         this.consciousnessReady = false;
         this.consciousnessSystem = null;
 
@@ -154,29 +158,26 @@ class FullConsciousnessConversations {
         const connection = this.connections.get(sessionId);
         if (!connection) return;
 
-        const { ws, conversationHistory } = connection;
+        const { ws } = connection;
+        const history = this.conversationHistory.forSession(sessionId);
 
         console.log('🧠 Processing conscious interaction:', message.content?.substring(0, 50) + '...');
 
         // Add to history
-        conversationHistory.push({
-            role: 'user',
-            content: message.content,
-            timestamp: new Date().toISOString()
-        });
+        history.append('user', message.content);
 
-        // Let the FULL consciousness system process this
+        // Let the FULL consciousness system process this, seeing only the
+        // token-budgeted window and a summary of older turns
         console.log('🔄 Generating consciousness response...');
-        const response = await this.generateFullConsciousResponse(message.content, conversationHistory);
+        const response = await this.generateFullConsciousResponse(message.content, history.getPromptWindow());
         console.log('✅ Generated response:', response.content?.substring(0, 100) + '...');
         
-        // Add response to history
-        conversationHistory.push({
-            role: 'assistant',
-            content: response.content,
+        // Add response to history; metadata is kept out of the prompt window
+        history.append('assistant', response.content, {
             timestamp: response.timestamp,
             metadata: response.metadata
         });
+        response.metadata = { ...response.metadata, conversationWindow: history.getStats() };
         
         // Update last interaction
         connection.lastInteraction = new Date();
@@ -0,0 +1,448 @@
+/**
+ * Consciousness Instrumentation
+ * In-process counters, gauges and latency histograms for consciousness
+ * modules and pipeline stages, served in Prometheus text format from
+ * /metrics.
+ *
+ * Recording is meant for hot paths: metric handles are resolved once, then
+ * inc/set/record only touch numbers and preallocated typed arrays. Latency
+ * histograms are HDR-style (log-linear buckets, 16 per power of two, so any
+ * quantile is within ~6% of the true value) and cover 1µs to ~70 minutes.
+ */
+
+import { monitorEventLoopDelay } from 'perf_hooks';
+
+const SUB_BUCKET_BITS = 4;
+const SUB_BUCKETS = 1 << SUB_BUCKET_BITS;
+const HISTOGRAM_BUCKETS = (32 - SUB_BUCKET_BITS) * SUB_BUCKETS + SUB_BUCKETS;
+const MAX_MICROS = 0xFFFFFFFF;
+
+const SUMMARY_QUANTILES = [0.5, 0.9, 0.99, 0.999];
+
+// Event names beyond this many per emitter are folded into 'other'
+const MAX_EVENTS_PER_EMITTER = 200;
+
+function bucketIndex(micros) {
+    const value = micros >= MAX_MICROS ? MAX_MICROS : micros >>> 0;
+    if (value < SUB_BUCKETS) {
+        return value;
+    }
+    const exponent = 31 - Math.clz32(value);
+    return ((exponent - SUB_BUCKET_BITS + 1) << SUB_BUCKET_BITS) + ((value >>> (exponent - SUB_BUCKET_BITS)) & (SUB_BUCKETS - 1));
+}
+
+function bucketUpperMicros(index) {
+    if (index < SUB_BUCKETS) {
+        return index + 1;
+    }
+    const shift = (index >>> SUB_BUCKET_BITS) - 1;
+    const mantissa = (index & (SUB_BUCKETS - 1)) + SUB_BUCKETS;
+    return (mantissa + 1) * 2 ** shift;
+}
+
+export class Counter {
+    constructor() {
+        this.value = 0;
+    }
+
+    inc(amount = 1) {
+        this.value += amount;
+    }
+}
+
+export class Gauge {
+    constructor() {
+        this.value = 0;
+    }
+
+    set(value) {
+        this.value = value;
+    }
+
+    inc(amount = 1) {
+        this.value += amount;
+    }
+
+    dec(amount = 1) {
+        this.value -= amount;
+    }
+}
+
+/**
+ * Log-linear latency histogram, recorded in milliseconds
+ */
+export class LatencyHistogram {
+    constructor() {
+        this.counts = new Uint32Array(HISTOGRAM_BUCKETS);
+        this.count = 0;
+        this.sumMs = 0;
+        this.maxMs = 0;
+    }
+
+    record(ms) {
+        this.counts[bucketIndex(ms * 1000)]++;
+        this.count++;
+        this.sumMs += ms;
+        if (ms > this.maxMs) {
+            this.maxMs = ms;
+        }
+    }
+
+    /**
+     * Record the time since a performance.now() reading
+     */
+    recordSince(start) {
+        this.record(performance.now() - start);
+    }
+
+    /**
+     * Value at the given quantile (0-1) in milliseconds, reported as the upper
+     * bound of its bucket
+     */
+    percentile(quantile) {
+        if (this.count === 0) {
+            return 0;
+        }
+        const target = Math.max(1, Math.ceil(this.count * quantile));
+        let seen = 0;
+        for (let i = 0; i < HISTOGRAM_BUCKETS; i++) {
+            seen += this.counts[i];
+            if (seen >= target) {
+                return Math.min(bucketUpperMicros(i) / 1000, this.maxMs);
+            }
+        }
+        return this.maxMs;
+    }
+
+    reset() {
+        this.counts.fill(0);
+        this.count = 0;
+        this.sumMs = 0;
+        this.maxMs = 0;
+    }
+}
+
+/**
+ * Times the stages of one pass through a pipeline. mark(stage) records the
+ * time since the previous mark against that stage.
+ */
+class PipelineRun {
+    constructor(pipeline) {
+        this.pipeline = pipeline;
+        this.start = performance.now();
+        this.last = this.start;
+    }
+
+    mark(stage) {
+        const now = performance.now();
+        this.pipeline.stage(stage).record(now - this.last);
+        this.last = now;
+    }
+
+    end() {
+        this.pipeline.total.recordSince(this.start);
+        this.pipeline.completed.inc();
+    }
+
+    fail() {
+        this.pipeline.total.recordSince(this.start);
+        this.pipeline.failed.inc();
+    }
+}
+
+class Pipeline {
+    constructor(registry, name) {
+        this.registry = registry;
+        this.name = name;
+        this.stages = new Map();
+        this.total = registry.histogram('consciousness_pipeline_duration_seconds', 'End-to-end pipeline duration', { pipeline: name });
+        this.completed = registry.counter('consciousness_pipeline_runs_total', 'Pipeline runs by outcome', { pipeline: name, outcome: 'completed' });
+        this.failed = registry.counter('consciousness_pipeline_runs_total', 'Pipeline runs by outcome', { pipeline: name, outcome: 'failed' });
+    }
+
+    stage(stage) {
+        let histogram = this.stages.get(stage);
+        if (!histogram) {
+            histogram = this.registry.histogram('consciousness_pipeline_stage_seconds', 'Duration of each pipeline stage', { pipeline: this.name, stage });
+            this.stages.set(stage, histogram);
+        }
+        return histogram;
+    }
+
+    start() {
+        return new PipelineRun(this);
+    }
+}
+
+function labelKey(labels) {
+    return Object.keys(labels).sort().map(key => `${key}=${labels[key]}`).join(',');
+}
+
+function escapeLabel(value) {
+    return String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"');
+}
+
+function formatLabels(labels, extra = null) {
+    const entries = Object.entries(labels);
+    if (extra) {
+        entries.push(extra);
+    }
+    if (entries.length === 0) {
+        return '';
+    }
+    return `{${entries.map(([key, value]) => `${key}="${escapeLabel(value)}"`).join(',')}}`;
+}
+
+function formatValue(value) {
+    if (value === Infinity) return '+Inf';
+    if (value === -Infinity) return '-Inf';
+    return Number.isFinite(value) ? String(value) : 'NaN';
+}
+
+class Instrumentation {
+    constructor() {
+        // name -> { type, help, series: Map<labelKey, { labels, metric }> }
+        this.families = new Map();
+        this.pipelines = new Map();
+        this.collectors = new Set();
+        this.eventLoopDelay = null;
+    }
+
+    register(type, name, help, labels, create) {
+        let family = this.families.get(name);
+        if (!family) {
+            family = { type, help, series: new Map() };
+            this.families.set(name, family);
+        } else if (family.type !== type) {
+            throw new Error(`Metric ${name} is already registered as a ${family.type}`);
+        }
+
+        const key = labelKey(labels);
+        let series = family.series.get(key);
+        if (!series) {
+            series = { labels: { ...labels }, metric: create() };
+            family.series.set(key, series);
+        }
+        return series.metric;
+    }
+
+    counter(name, help, labels = {}) {
+        return this.register('counter', name, help, labels, () => new Counter());
+    }
+
+    gauge(name, help, labels = {}) {
+        return this.register('gauge', name, help, labels, () => new Gauge());
+    }
+
+    /**
+     * Latency histogram; record() takes milliseconds, exposition is in seconds
+     */
+    histogram(name, help, labels = {}) {
+        return this.register('summary', name, help, labels, () => new LatencyHistogram());
+    }
+
+    /**
+     * Named pipeline whose runs are timed stage by stage
+     */
+    pipeline(name) {
+        let pipeline = this.pipelines.get(name);
+        if (!pipeline) {
+            pipeline = new Pipeline(this, name);
+            this.pipelines.set(name, pipeline);
+        }
+        return pipeline;
+    }
+
+    /**
+     * Metric helpers pre-labelled with a module name
+     */
+    forModule(moduleName) {
+        return {
+            counter: (name, help, labels = {}) => this.counter(name, help, { module: moduleName, ...labels }),
+            gauge: (name, help, labels = {}) => this.gauge(name, help, { module: moduleName, ...labels }),
+            histogram: (name, help, labels = {}) => this.histogram(name, help, { module: moduleName, ...labels })
+        };
+    }
+
+    /**
+     * Add a function run at scrape time that returns extra metric families:
+     * [{ name, type, help, samples: [{ labels, value, suffix? }] }]
+     */
+    addCollector(collector) {
+        this.collectors.add(collector);
+        return () => this.collectors.delete(collector);
+    }
+
+    /**
+     * Count events and time handlers on any emitter with an emit() method
+     */
+    instrumentEmitter(emitter, source) {
+        if (emitter.__instrumented) {
+            return emitter;
+        }
+
+        const events = new Map();
+        const resolve = (eventName) => {
+            let handles = events.get(eventName);
+            if (!handles) {
+                const event = events.size < MAX_EVENTS_PER_EMITTER ? String(eventName) : 'other';
+                handles = {
+                    count: this.counter('consciousness_events_total', 'Events emitted on consciousness event buses', { source, event }),
+                    handlerTime: this.histogram('consciousness_event_handler_seconds', 'Time spent in event handlers per emit', { source, event })
+                };
+                events.set(eventName, handles);
+            }
+            return handles;
+        };
+
+        const originalEmit = emitter.emit;
+        emitter.emit = function (eventName, ...args) {
+            const handles = resolve(eventName);
+            handles.count.inc();
+            const start = performance.now();
+            try {
+                return originalEmit.call(this, eventName, ...args);
+            } finally {
+                handles.handlerTime.recordSince(start);
+            }
+        };
+        emitter.__instrumented = true;
+        return emitter;
+    }
+
+    /**
+     * Total events counted for an instrumented source
+     */
+    getEventTotal(source) {
+        const family = this.families.get('consciousness_events_total');
+        if (!family) {
+            return 0;
+        }
+        let total = 0;
+        family.series.forEach(({ labels, metric }) => {
+            if (labels.source === source) {
+                total += metric.value;
+            }
+        });
+        return total;
+    }
+
+    getPercentile(name, labels, quantile) {
+        const series = this.families.get(name)?.series.get(labelKey(labels));
+        return series ? series.metric.percentile(quantile) : null;
+    }
+
+    /**
+     * Start sampling event loop delay; it is reported with the process metrics
+     */
+    enableEventLoopMonitoring() {
+        if (!this.eventLoopDelay) {
+            this.eventLoopDelay = monitorEventLoopDelay({ resolution: 20 });
+            this.eventLoopDelay.enable();
+        }
+    }
+
+    collectProcessMetrics() {
+        const memory = process.memoryUsage();
+        const families = [
+            { name: 'consciousness_process_resident_memory_bytes', type: 'gauge', help: 'Resident memory size in bytes', samples: [{ labels: {}, value: memory.rss }] },
+            { name: 'consciousness_heap_used_bytes', type: 'gauge', help: 'V8 heap used in bytes', samples: [{ labels: {}, value: memory.heapUsed }] },
+            { name: 'consciousness_process_uptime_seconds', type: 'gauge', help: 'Process uptime in seconds', samples: [{ labels: {}, value: process.uptime() }] }
+        ];
+
+        // Quantiles are meaningless until the first sample is taken
+        if (this.eventLoopDelay && this.eventLoopDelay.count > 0) {
+            const delay = this.eventLoopDelay;
+            families.push({
+                name: 'consciousness_eventloop_delay_seconds',
+                type: 'summary',
+                help: 'Event loop delay',
+                samples: [
+                    ...SUMMARY_QUANTILES.map(quantile => ({ labels: { quantile }, value: delay.percentile(quantile * 100) / 1e9 })),
+                    { labels: {}, suffix: '_count', value: delay.count }
+                ]
+            });
+        }
+        return families;
+    }
+
+    /**
+     * Prometheus text exposition of every metric
+     */
+    render() {
+        const lines = [];
+
+        this.families.forEach((family, name) => {
+            lines.push(`# HELP ${name} ${family.help}`);
+            lines.push(`# TYPE ${name} ${family.type}`);
+            family.series.forEach(({ labels, metric }) => {
+                if (family.type === 'summary') {
+                    for (const quantile of SUMMARY_QUANTILES) {
+                        lines.push(`${name}${formatLabels(labels, ['quantile', quantile])} ${metric.percentile(quantile) / 1000}`);
+                    }
+                    lines.push(`${name}_sum${formatLabels(labels)} ${metric.sumMs / 1000}`);
+                    lines.push(`${name}_count${formatLabels(labels)} ${metric.count}`);
+                } else {
+                    lines.push(`${name}${formatLabels(labels)} ${formatValue(metric.value)}`);
+                }
+            });
+        });
+
+        const collected = this.collectProcessMetrics();
+        this.collectors.forEach(collector => {
+            try {
+                collected.push(...collector());
+            } catch (error) {
+                console.error('Metrics collector failed:', error.message);
+            }
+        });
+
+        for (const family of collected) {
+            lines.push(`# HELP ${family.name} ${family.help}`);
+            lines.push(`# TYPE ${family.name} ${family.type}`);
+            for (const sample of family.samples) {
+                lines.push(`${family.name}${sample.suffix || ''}${formatLabels(sample.labels)} ${formatValue(sample.value)}`);
+            }
+        }
+
+        return lines.join('\n') + '\n';
+    }
+
+    /**
+     * JSON view of the same data for dashboards
+     */
+    snapshot() {
+        const result = {};
+        this.families.forEach((family, name) => {
+            result[name] = Array.from(family.series.values(), ({ labels, metric }) => {
+                if (family.type !== 'summary') {
+                    return { labels, value: metric.value };
+                }
+                return {
+                    labels,
+                    count: metric.count,
+                    avgMs: metric.count > 0 ? metric.sumMs / metric.count : 0,
+                    p50Ms: metric.percentile(0.5),
+                    p99Ms: metric.percentile(0.99),
+                    maxMs: metric.maxMs
+                };
+            });
+        });
+        return result;
+    }
+
+    /**
+     * Express/http handler serving the exposition
+     */
+    metricsHandler() {
+        this.enableEventLoopMonitoring();
+        return (req, res) => {
+            res.setHeader('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+            res.end(this.render());
+        };
+    }
+}
+
+export const instrumentation = new Instrumentation();
+
+export default instrumentation;
@@ -1,4 +1,7 @@
 import { EventEmitter } from 'events';
+import instrumentation from './consciousness-instrumentation.js';
+
+const EVENT_SOURCE = 'consciousness_system';
 
 class ConsciousnessMetricsStream extends EventEmitter {
     constructor(consciousnessSystem) {
@@ -7,6 +10,37 @@ class ConsciousnessMetricsStream extends EventEmitter {
         this.metricsInterval = null;
         this.sparklineHistory = new Map();
         this.maxHistoryLength = 30;
+        this.lastEventSample = null;
+
+        // ConsciousnessEventBus counts its own events; plain emitters get wrapped
+        const eventBus = consciousnessSystem.eventBus;
+        if (eventBus && !eventBus.getTotalEventCount) {
+            instrumentation.instrumentEmitter(eventBus, EVENT_SOURCE);
+        }
+    }
+
+    getEventTotal(eventBus) {
+        return eventBus.getTotalEventCount ? eventBus.getTotalEventCount() : instrumentation.getEventTotal(EVENT_SOURCE);
+    }
+
+    /**
+     * Events per second since the previous collection
+     */
+    measureEventThroughput(totalEvents) {
+        const now = Date.now();
+        const previous = this.lastEventSample;
+        this.lastEventSample = { at: now, total: totalEvents };
+
+        if (!previous || now === previous.at) {
+            return 0;
+        }
+        return (totalEvents - previous.total) / ((now - previous.at) / 1000);
+    }
+
+    formatCount(count) {
+        if (count >= 1e6) return `${(count / 1e6).toFixed(1)}M`;
+        if (count >= 1e3) return `${(count / 1e3).toFixed(1)}K`;
+        return String(count);
     }
 
     startStreaming(interval = 1000) {
@@ -31,14 +65,16 @@ class ConsciousnessMetricsStream extends EventEmitter {
         // ConsciousnessEventBus metrics
         const eventBus = this.consciousness.eventBus;
         if (eventBus) {
+            const totalEvents = this.getEventTotal(eventBus);
+            const throughput = this.measureEventThroughput(totalEvents);
             const eventMetrics = {
                 name: 'ConsciousnessEventBus',
                 metric: 'Event Throughput',
-                value: `${Math.floor(Math.random() * 1000 + 2000)}/sec`,
+                value: `${Math.round(throughput)}/sec`,
                 status: 'optimal',
-                sparklineData: this.updateSparkline('eventBus', Math.random() * 50 + 20),
+                sparklineData: this.updateSparkline('eventBus', throughput),
                 details: {
-                    'Total Events': '8.5M',
+                    'Total Events': this.formatCount(totalEvents),
                     'Active Listeners': eventBus.listenerCount(),
                     'Memory Usage': `${(process.memoryUsage().heapUsed / 1024 / 1024).toFixed(1)} MB`,
                     'Queue Depth': '0'
@@ -19,6 +19,26 @@ import OpenAI from 'openai';
 const VENICE_API_URL = 'https://api.venice.ai/api/v1/chat/completions';
 const VENICE_API_KEY = process.env.VENICE_AI_API_KEY;
 
+// Provider calls go through here so benchmarks can swap in offline stubs
+const llmClients = {
+  venicePost: (url, body, options) => axios.post(url, body, options),
+  openAIChat: (params) => {
+    // Initialize OpenAI with API key and timeout
+    const openai = new OpenAI({
+      apiKey: process.env.OPENAI_API_KEY,
+      timeout: 15000 // 15 second timeout
+    });
+    return openai.chat.completions.create(params);
+  }
+};
+
+/**
+ * Replace the Venice and OpenAI clients, e.g. with deterministic stubs
+ */
+export function setSynthesisClients(overrides) {
+  Object.assign(llmClients, overrides);
+}
+
 export async function synthesizeUnifiedResponse({
   analyticalContent,
   intuitiveContent,
@@ -242,7 +262,7 @@ Your synthesis must:
 Create a response that emerges from the highest level of integrated awareness, where all perspectives merge into unified understanding.`;
 
   // Use Venice AI API with the preserved Gemini transcendent synthesis logic
-  const response = await axios.post(VENICE_API_URL, {
+  const response = await llmClients.venicePost(VENICE_API_URL, {
     model: "llama-3.1-405b",
     messages: [{
       role: "user",
@@ -283,7 +303,7 @@ async function veniceCreativeSynthesis({
   userMessage,
   strategy
 }) {
-  const response = await axios.post(VENICE_API_URL, {
+  const response = await llmClients.venicePost(VENICE_API_URL, {
     model: "llama-3.1-405b",
     messages: [{
       role: "system",
@@ -343,13 +363,7 @@ async function openAIMetaCognitiveSynthesis({
   userMessage,
   strategy
 }) {
-  // Initialize OpenAI with API key and timeout
-  const openai = new OpenAI({
-    apiKey: process.env.OPENAI_API_KEY,
-    timeout: 15000 // 15 second timeout
-  });
-
-  const response = await openai.chat.completions.create({
+  const response = await llmClients.openAIChat({
     model: "gpt-4o",
     messages: [{
       role: "system",
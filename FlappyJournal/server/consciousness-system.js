@@ -6,6 +6,7 @@ import { promises as fs } from 'fs';
 // Import all consciousness modules
 import SelfCodingModule from './consciousness/modules/SelfCodingModule.js';
 import AutoIntegrationService from './consciousness/services/AutoIntegrationService.js';
+import { ModuleRegistry } from './module-registry.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
@@ -71,7 +72,7 @@ class ConsciousnessSystem extends EventEmitter {
             this.isRunning = true;
             this.state.health = 'healthy';
             
-            console.log('✅ Consciousness system fully initialized and running!');
+            console.log(`✅ Consciousness system fully initialized and running! (ready in ${Date.now() - this.startTime.getTime()}ms)`);
             this.emit('system:initialized', {
                 name: this.name,
                 version: this.version,
@@ -110,12 +111,23 @@ class ConsciousnessSystem extends EventEmitter {
             './consciousness/modules/AutonomousGoalSystem.js'
         ];
         
+        // Import every module concurrently, then construct them in the
+        // listed order so registration order stays deterministic
+        const registry = new ModuleRegistry(this.name);
         for (const modulePath of modulePaths) {
-            try {
+            registry.register(modulePath, async () => {
                 const fullPath = join(__dirname, modulePath);
                 await fs.access(fullPath);
-                
-                const module = await import(fullPath);
+                return import(fullPath);
+            });
+        }
+        await registry.loadAll();
+        
+        for (const modulePath of modulePaths) {
+            const module = registry.peek(modulePath);
+            if (!module) continue;
+            
+            try {
                 const ModuleClass = module.default || module;
                 
                 if (typeof ModuleClass === 'function') {
@@ -128,6 +140,8 @@ class ConsciousnessSystem extends EventEmitter {
                 console.log(`⚠️ Could not load module ${modulePath}:`, error.message);
             }
         }
+        
+        registry.printStartupReport();
     }
     
     setupSystemEventListeners() {
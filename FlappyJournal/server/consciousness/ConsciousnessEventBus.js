@@ -4,14 +4,30 @@
  */
 
 import { EventEmitter } from './base/EventEmitter.js';
+import { EventRing } from './base/EventRing.js';
+import instrumentation from '../consciousness-instrumentation.js';
+
+// Handler-time histogram buckets: bucket 0 is under 1µs, bucket i covers
+// [2^(i-1), 2^i) µs, and the last bucket takes everything slower (~262ms+)
+const HANDLER_TIME_BUCKETS = 20;
+
+function handlerTimeBucket(elapsedMs) {
+    const micros = elapsedMs * 1000;
+    if (micros < 1) return 0;
+    return Math.min(HANDLER_TIME_BUCKETS - 1, 32 - Math.clz32(micros));
+}
 
 class ConsciousnessEventBus extends EventEmitter {
-    constructor() {
+    constructor(options = {}) {
         super();
         this.setMaxListeners(50); // Allow many modules to subscribe
         
-        this.eventHistory = [];
-        this.maxHistorySize = 100;
+        this.maxHistorySize = options.maxHistorySize || 100;
+        this.eventHistory = new EventRing(this.maxHistorySize);
+        // Optional per-event history, see trackEventHistory()
+        this.eventHistories = new Map();
+        // Per-event emit counts and handler timings
+        this.eventStats = new Map();
         this.subscribers = new Map();
         
         console.log('[ConsciousnessEventBus] Initialized');
@@ -21,20 +37,42 @@ class ConsciousnessEventBus extends EventEmitter {
      * Emit an event with tracking
      */
     emit(eventName, ...args) {
+        const now = Date.now();
+        const data = args[0] || null;
+
         // Track event in history
-        this.eventHistory.push({
-            event: eventName,
-            timestamp: new Date().toISOString(),
-            data: args[0] || null
-        });
-        
-        // Maintain history size limit
-        if (this.eventHistory.length > this.maxHistorySize) {
-            this.eventHistory.shift();
+        this.eventHistory.push(eventName, now, data);
+        const history = this.eventHistories.get(eventName);
+        if (history) {
+            history.push(eventName, now, data);
+        }
+
+        let stats = this.eventStats.get(eventName);
+        if (!stats) {
+            stats = {
+                count: 0,
+                lastEmittedAt: 0,
+                totalHandlerMs: 0,
+                maxHandlerMs: 0,
+                handlerTimeHistogram: new Uint32Array(HANDLER_TIME_BUCKETS)
+            };
+            this.eventStats.set(eventName, stats);
+        }
+        stats.count++;
+        stats.lastEmittedAt = now;
+
+        // Call parent emit, timing the handlers
+        const start = performance.now();
+        try {
+            return super.emit(eventName, ...args);
+        } finally {
+            const elapsed = performance.now() - start;
+            stats.totalHandlerMs += elapsed;
+            if (elapsed > stats.maxHandlerMs) {
+                stats.maxHandlerMs = elapsed;
+            }
+            stats.handlerTimeHistogram[handlerTimeBucket(elapsed)]++;
         }
-        
-        // Call parent emit
-        return super.emit(eventName, ...args);
     }
     
     /**
@@ -100,9 +138,54 @@ class ConsciousnessEventBus extends EventEmitter {
      */
     getEventHistory(eventName = null) {
         if (eventName) {
-            return this.eventHistory.filter(e => e.event === eventName);
+            const history = this.eventHistories.get(eventName);
+            return history ? history.toArray() : this.eventHistory.toArray(eventName);
+        }
+        return this.eventHistory.toArray();
+    }
+
+    /**
+     * Keep a dedicated history for one event so its entries aren't pushed out
+     * of the shared history by busier events
+     */
+    trackEventHistory(eventName, size = this.maxHistorySize) {
+        if (this.eventHistories.has(eventName)) {
+            return;
+        }
+
+        const history = new EventRing(size);
+        for (const entry of this.eventHistory.toArray(eventName)) {
+            history.push(eventName, Date.parse(entry.timestamp), entry.data);
+        }
+        this.eventHistories.set(eventName, history);
+    }
+
+    /**
+     * Get emit counts and handler timings, for one event or all of them
+     */
+    getEventStats(eventName = null) {
+        const format = (stats) => ({
+            count: stats.count,
+            lastEmittedAt: stats.lastEmittedAt ? new Date(stats.lastEmittedAt).toISOString() : null,
+            avgHandlerMs: stats.count > 0 ? stats.totalHandlerMs / stats.count : 0,
+            maxHandlerMs: stats.maxHandlerMs,
+            // Upper bound of each bucket in microseconds
+            handlerTimeHistogram: Array.from(stats.handlerTimeHistogram, (count, i) => ({
+                leMicros: i === HANDLER_TIME_BUCKETS - 1 ? Infinity : 2 ** i,
+                count
+            }))
+        });
+
+        if (eventName) {
+            const stats = this.eventStats.get(eventName);
+            return stats ? format(stats) : null;
         }
-        return this.eventHistory;
+
+        const allStats = {};
+        this.eventStats.forEach((stats, event) => {
+            allStats[event] = format(stats);
+        });
+        return allStats;
     }
     
     /**
@@ -124,11 +207,57 @@ class ConsciousnessEventBus extends EventEmitter {
      * Clear event history
      */
     clearHistory() {
-        this.eventHistory = [];
+        this.eventHistory.clear();
+        this.eventHistories.forEach(history => history.clear());
+    }
+
+    /**
+     * Emit counts and handler-time histograms as Prometheus metric families
+     */
+    collectMetrics() {
+        const counts = [];
+        const handlerTimes = [];
+
+        this.eventStats.forEach((stats, event) => {
+            counts.push({ labels: { event }, value: stats.count });
+
+            let cumulative = 0;
+            for (let i = 0; i < HANDLER_TIME_BUCKETS; i++) {
+                cumulative += stats.handlerTimeHistogram[i];
+                const le = i === HANDLER_TIME_BUCKETS - 1 ? '+Inf' : 2 ** i / 1e6;
+                handlerTimes.push({ labels: { event, le }, suffix: '_bucket', value: cumulative });
+            }
+            handlerTimes.push({ labels: { event }, suffix: '_sum', value: stats.totalHandlerMs / 1000 });
+            handlerTimes.push({ labels: { event }, suffix: '_count', value: stats.count });
+        });
+
+        return [
+            { name: 'consciousness_event_bus_events_total', type: 'counter', help: 'Events emitted on the ConsciousnessEventBus', samples: counts },
+            { name: 'consciousness_event_bus_handler_seconds', type: 'histogram', help: 'Handler time per ConsciousnessEventBus emit', samples: handlerTimes }
+        ];
+    }
+
+    /**
+     * Total events emitted since the stats were last reset
+     */
+    getTotalEventCount() {
+        let total = 0;
+        this.eventStats.forEach(stats => {
+            total += stats.count;
+        });
+        return total;
+    }
+
+    /**
+     * Reset emit counts and handler timings
+     */
+    resetEventStats() {
+        this.eventStats.clear();
     }
 }
 
 // Create singleton instance
 const eventBus = new ConsciousnessEventBus();
+instrumentation.addCollector(() => eventBus.collectMetrics());
 
 export default eventBus;
@@ -0,0 +1,59 @@
+/**
+ * Fixed-capacity ring buffer of events for ES modules
+ *
+ * Entries are stored column-wise (name, numeric timestamp, payload) in
+ * preallocated arrays, so recording an event never allocates or shifts.
+ * Timestamps are only formatted when the history is read.
+ */
+
+export class EventRing {
+    constructor(capacity) {
+        this.capacity = Math.max(1, capacity | 0);
+        this.names = new Array(this.capacity);
+        this.timestamps = new Float64Array(this.capacity);
+        this.payloads = new Array(this.capacity);
+        this.next = 0;  // slot the next entry is written to
+        this.size = 0;
+    }
+
+    push(eventName, timestamp, data) {
+        const slot = this.next;
+        this.names[slot] = eventName;
+        this.timestamps[slot] = timestamp;
+        this.payloads[slot] = data;
+
+        this.next = slot + 1 === this.capacity ? 0 : slot + 1;
+        if (this.size < this.capacity) {
+            this.size++;
+        }
+    }
+
+    /**
+     * Entries oldest first, optionally only those with the given name
+     */
+    toArray(eventName = null) {
+        const result = [];
+        let slot = this.size < this.capacity ? 0 : this.next;
+
+        for (let i = 0; i < this.size; i++) {
+            if (eventName === null || this.names[slot] === eventName) {
+                result.push({
+                    event: this.names[slot],
+                    timestamp: new Date(this.timestamps[slot]).toISOString(),
+                    data: this.payloads[slot]
+                });
+            }
+            slot = slot + 1 === this.capacity ? 0 : slot + 1;
+        }
+
+        return result;
+    }
+
+    clear() {
+        // Drop payload references so they can be collected
+        this.names.fill(undefined);
+        this.payloads.fill(undefined);
+        this.next = 0;
+        this.size = 0;
+    }
+}
@@ -16,6 +16,7 @@ export default class SelfCodingModule {
         };
         
         this.activeAnalysis = new Set();
+        this.analysisTimer = null;
         this.codePatterns = new Map();
         this.moduleStats = new Map();
         
@@ -45,7 +46,9 @@ export default class SelfCodingModule {
      * Start periodic code analysis
      */
     startPeriodicAnalysis() {
-        setInterval(() => {
+        if (this.analysisTimer) return;
+        
+        this.analysisTimer = setInterval(() => {
             if (this.activeAnalysis.size < this.options.maxConcurrentAnalysis) {
                 this.analyzeCurrentSystem();
             }
@@ -54,6 +57,17 @@ export default class SelfCodingModule {
         console.log('[SelfCodingModule] Started periodic analysis');
     }
 
+    /**
+     * Stop periodic code analysis
+     */
+    stopPeriodicAnalysis() {
+        if (!this.analysisTimer) return;
+        
+        clearInterval(this.analysisTimer);
+        this.analysisTimer = null;
+        console.log('[SelfCodingModule] Stopped periodic analysis');
+    }
+
     /**
      * Handle incoming code analysis request
      */
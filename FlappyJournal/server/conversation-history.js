@@ -0,0 +1,388 @@
+/**
+ * Conversation History
+ * Token-budgeted conversation windows for consciousness conversations.
+ *
+ * Each session keeps only the most recent turns that fit its prompt token
+ * budget. Turns that fall out of the window are folded into a short rolling
+ * summary, and every turn is appended to a per-session JSONL transcript on
+ * disk, so memory per session stays bounded however long a conversation
+ * runs. Turn metadata (module responses, consciousness state) is kept
+ * apart from the prompt text and only for the last few turns.
+ */
+
+import fs from 'fs/promises';
+import path from 'path';
+import instrumentation from './consciousness-instrumentation.js';
+
+const DEFAULT_OPTIONS = {
+    // Prompt budget for summary plus window, in estimated tokens
+    maxPromptTokens: Number(process.env.CONVERSATION_PROMPT_TOKENS) || 3000,
+    maxSummaryTokens: 400,
+    // Longer turns are clipped in the window; the transcript keeps them whole
+    maxTurnTokens: 1200,
+    // Metadata is retained for this many of the latest turns
+    maxMetadataTurns: 8,
+    spillDir: process.env.CONVERSATION_HISTORY_DIR || './data/conversations',
+    flushIntervalMs: 2000,
+    // Unflushed transcript lines per session before the oldest are dropped
+    maxPendingLines: 500,
+    idleTimeoutMs: 30 * 60 * 1000
+};
+
+// Rough token estimate (~4 characters per token) plus per-message overhead;
+// close enough for budgeting without shipping a tokenizer
+const CHARS_PER_TOKEN = 4;
+const MESSAGE_OVERHEAD_TOKENS = 4;
+const SUMMARY_LINE_CHARS = 160;
+
+export function estimateTokens(text) {
+    return Math.ceil((text ? text.length : 0) / CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS;
+}
+
+function clipToTokens(text, tokens) {
+    const maxChars = (tokens - MESSAGE_OVERHEAD_TOKENS) * CHARS_PER_TOKEN;
+    if (!text || text.length <= maxChars) {
+        return text || '';
+    }
+    return text.substring(0, maxChars - 1) + '…';
+}
+
+function summarizeTurn(turn) {
+    const speaker = turn.role === 'user' ? 'User' : 'Assistant';
+    const text = turn.content.replace(/\s+/g, ' ').trim();
+    const sentenceEnd = text.search(/[.!?](\s|$)/);
+    const firstSentence = sentenceEnd > 0 ? text.substring(0, sentenceEnd + 1) : text;
+    const line = firstSentence.length > SUMMARY_LINE_CHARS
+        ? firstSentence.substring(0, SUMMARY_LINE_CHARS - 1) + '…'
+        : firstSentence;
+    return `${speaker}: ${line}`;
+}
+
+function transcriptFileName(sessionId) {
+    return String(sessionId).replace(/[^a-zA-Z0-9_-]/g, '_') + '.jsonl';
+}
+
+export class ConversationHistory {
+    constructor(sessionId, options = {}) {
+        this.sessionId = sessionId;
+        this.options = { ...DEFAULT_OPTIONS, ...options };
+
+        this.turns = [];
+        this.windowTokens = 0;
+        this.windowChars = 0;
+        this.nextTurnId = 1;
+
+        // turnId -> metadata, for the latest maxMetadataTurns turns only
+        this.metadata = new Map();
+        this.metadataChars = 0;
+
+        this.summaryLines = [];
+        this.summaryTokens = 0;
+        this.summarizedTurns = 0;
+
+        this.pendingLines = [];
+        this.pendingChars = 0;
+        this.droppedLines = 0;
+        this.spilledTurns = 0;
+        this.flushing = null;
+
+        this.totalTurns = 0;
+        this.lastActivity = Date.now();
+    }
+
+    /**
+     * Record a turn. Metadata is stored alongside the turn, never in the prompt.
+     */
+    append(role, content, { timestamp = new Date().toISOString(), metadata } = {}) {
+        const id = this.nextTurnId++;
+        const text = content || '';
+        const windowContent = clipToTokens(text, this.options.maxTurnTokens);
+        const turn = { id, role, content: windowContent, timestamp, tokens: estimateTokens(windowContent) };
+
+        this.turns.push(turn);
+        this.windowTokens += turn.tokens;
+        this.windowChars += windowContent.length;
+        this.totalTurns++;
+        this.lastActivity = Date.now();
+
+        const line = JSON.stringify({ sessionId: this.sessionId, id, role, content: text, timestamp, metadata });
+        this.queueTranscriptLine(line);
+
+        if (metadata) {
+            this.metadata.set(id, { value: metadata, chars: line.length - text.length });
+            this.metadataChars += line.length - text.length;
+            this.trimMetadata();
+        }
+
+        this.evictOverflow();
+        return turn;
+    }
+
+    /**
+     * Messages to hand to the response pipeline: the rolling summary of
+     * evicted turns (if any) followed by the turns still in the window
+     */
+    getPromptWindow() {
+        const window = this.turns.map(({ role, content, timestamp }) => ({ role, content, timestamp }));
+        if (this.summaryLines.length > 0) {
+            window.unshift({
+                role: 'system',
+                content: this.getSummaryText(),
+                timestamp: this.turns[0]?.timestamp,
+                summary: true
+            });
+        }
+        return window;
+    }
+
+    getSummaryText() {
+        const omitted = this.summarizedTurns - this.summaryLines.length;
+        const header = `Earlier in this conversation (${this.summarizedTurns} turns${omitted > 0 ? `, ${omitted} oldest omitted` : ''}):`;
+        return [header, ...this.summaryLines].join('\n');
+    }
+
+    getMetadata(turnId) {
+        return this.metadata.get(turnId)?.value;
+    }
+
+    getPromptTokens() {
+        return this.windowTokens + (this.summaryLines.length > 0 ? this.summaryTokens + MESSAGE_OVERHEAD_TOKENS : 0);
+    }
+
+    /**
+     * Approximate bytes held for this session (UTF-16 strings)
+     */
+    getRetainedBytes() {
+        const summaryChars = this.summaryLines.reduce((sum, line) => sum + line.length, 0);
+        return (this.windowChars + summaryChars + this.metadataChars + this.pendingChars) * 2;
+    }
+
+    getStats() {
+        return {
+            sessionId: this.sessionId,
+            totalTurns: this.totalTurns,
+            windowTurns: this.turns.length,
+            summarizedTurns: this.summarizedTurns,
+            promptTokens: this.getPromptTokens(),
+            maxPromptTokens: this.options.maxPromptTokens,
+            retainedBytes: this.getRetainedBytes(),
+            spilledTurns: this.spilledTurns,
+            pendingTranscriptLines: this.pendingLines.length,
+            droppedTranscriptLines: this.droppedLines
+        };
+    }
+
+    evictOverflow() {
+        // Always keep the latest turn, even if it alone exceeds the budget
+        while (this.turns.length > 1 && this.getPromptTokens() > this.options.maxPromptTokens) {
+            const turn = this.turns.shift();
+            this.windowTokens -= turn.tokens;
+            this.windowChars -= turn.content.length;
+            this.dropMetadata(turn.id);
+            this.addToSummary(turn);
+        }
+    }
+
+    addToSummary(turn) {
+        const line = summarizeTurn(turn);
+        this.summaryLines.push(line);
+        this.summaryTokens += estimateTokens(line);
+        this.summarizedTurns++;
+
+        while (this.summaryLines.length > 1 && this.summaryTokens > this.options.maxSummaryTokens) {
+            this.summaryTokens -= estimateTokens(this.summaryLines.shift());
+        }
+    }
+
+    trimMetadata() {
+        for (const turnId of this.metadata.keys()) {
+            if (this.metadata.size <= this.options.maxMetadataTurns) {
+                break;
+            }
+            this.dropMetadata(turnId);
+        }
+    }
+
+    dropMetadata(turnId) {
+        const entry = this.metadata.get(turnId);
+        if (entry) {
+            this.metadataChars -= entry.chars;
+            this.metadata.delete(turnId);
+        }
+    }
+
+    queueTranscriptLine(line) {
+        this.pendingLines.push(line);
+        this.pendingChars += line.length;
+        this.trimPending();
+    }
+
+    trimPending() {
+        // Storage is unavailable or slow; don't let the backlog grow unbounded
+        while (this.pendingLines.length > this.options.maxPendingLines) {
+            this.pendingChars -= this.pendingLines.shift().length;
+            this.droppedLines++;
+        }
+    }
+
+    /**
+     * Append queued turns to the session transcript on disk
+     */
+    async flush() {
+        if (this.pendingLines.length === 0 || this.flushing) {
+            return this.flushing;
+        }
+
+        const lines = this.pendingLines;
+        const chars = this.pendingChars;
+        this.pendingLines = [];
+        this.pendingChars = 0;
+
+        this.flushing = (async () => {
+            try {
+                await fs.mkdir(this.options.spillDir, { recursive: true });
+                await fs.appendFile(path.join(this.options.spillDir, transcriptFileName(this.sessionId)), lines.join('\n') + '\n', 'utf-8');
+                this.spilledTurns += lines.length;
+            } catch (error) {
+                console.error(`❌ Failed to write conversation transcript for ${this.sessionId}:`, error.message);
+                // Put them back for the next attempt, ahead of newer lines
+                this.pendingLines = lines.concat(this.pendingLines);
+                this.pendingChars += chars;
+                this.trimPending();
+            } finally {
+                this.flushing = null;
+            }
+        })();
+        return this.flushing;
+    }
+}
+
+/**
+ * Owns the history of every live session, flushes transcripts in the
+ * background and drops sessions that have gone idle
+ */
+export class ConversationHistoryManager {
+    constructor(options = {}) {
+        this.options = { ...DEFAULT_OPTIONS, ...options };
+        this.sessions = new Map();
+        this.flushTimer = null;
+        this.removeCollector = instrumentation.addCollector(() => this.collectMetrics());
+    }
+
+    forSession(sessionId) {
+        let history = this.sessions.get(sessionId);
+        if (!history) {
+            history = new ConversationHistory(sessionId, this.options);
+            this.sessions.set(sessionId, history);
+            this.startFlushing();
+        }
+        return history;
+    }
+
+    async closeSession(sessionId) {
+        const history = this.sessions.get(sessionId);
+        if (!history) {
+            return;
+        }
+        this.sessions.delete(sessionId);
+        await history.flush();
+    }
+
+    startFlushing() {
+        if (this.flushTimer) {
+            return;
+        }
+        this.flushTimer = setInterval(() => this.flushAll(), this.options.flushIntervalMs);
+        this.flushTimer.unref?.();
+    }
+
+    async flushAll() {
+        const now = Date.now();
+        const flushes = [];
+        for (const [sessionId, history] of this.sessions) {
+            flushes.push(history.flush());
+            if (now - history.lastActivity > this.options.idleTimeoutMs) {
+                this.sessions.delete(sessionId);
+            }
+        }
+        await Promise.all(flushes);
+
+        if (this.sessions.size === 0 && this.flushTimer) {
+            clearInterval(this.flushTimer);
+            this.flushTimer = null;
+        }
+    }
+
+    async shutdown() {
+        if (this.flushTimer) {
+            clearInterval(this.flushTimer);
+            this.flushTimer = null;
+        }
+        await Promise.all(Array.from(this.sessions.values(), history => history.flush()));
+        this.removeCollector();
+    }
+
+    getStats() {
+        let promptTokens = 0;
+        let maxPromptTokens = 0;
+        let retainedBytes = 0;
+        let maxRetainedBytes = 0;
+        let summarizedTurns = 0;
+        let spilledTurns = 0;
+        let droppedTranscriptLines = 0;
+
+        for (const history of this.sessions.values()) {
+            const tokens = history.getPromptTokens();
+            const bytes = history.getRetainedBytes();
+            promptTokens += tokens;
+            maxPromptTokens = Math.max(maxPromptTokens, tokens);
+            retainedBytes += bytes;
+            maxRetainedBytes = Math.max(maxRetainedBytes, bytes);
+            summarizedTurns += history.summarizedTurns;
+            spilledTurns += history.spilledTurns;
+            droppedTranscriptLines += history.droppedLines;
+        }
+
+        return {
+            sessions: this.sessions.size,
+            promptTokens,
+            maxPromptTokens,
+            retainedBytes,
+            maxRetainedBytes,
+            summarizedTurns,
+            spilledTurns,
+            droppedTranscriptLines,
+            promptTokenBudget: this.options.maxPromptTokens
+        };
+    }
+
+    collectMetrics() {
+        const stats = this.getStats();
+        const gauge = (name, help, samples) => ({ name, type: 'gauge', help, samples });
+        return [
+            gauge('consciousness_conversation_sessions', 'Conversation sessions with history in memory', [
+                { labels: {}, value: stats.sessions }
+            ]),
+            gauge('consciousness_conversation_prompt_tokens', 'Estimated prompt tokens of conversation windows', [
+                { labels: { aggregate: 'sum' }, value: stats.promptTokens },
+                { labels: { aggregate: 'max' }, value: stats.maxPromptTokens },
+                { labels: { aggregate: 'budget' }, value: stats.promptTokenBudget }
+            ]),
+            gauge('consciousness_conversation_retained_bytes', 'Approximate memory held by conversation histories', [
+                { labels: { aggregate: 'sum' }, value: stats.retainedBytes },
+                { labels: { aggregate: 'max' }, value: stats.maxRetainedBytes }
+            ]),
+            gauge('consciousness_conversation_summarized_turns', 'Turns evicted from windows into rolling summaries (live sessions)', [
+                { labels: {}, value: stats.summarizedTurns }
+            ]),
+            gauge('consciousness_conversation_spilled_turns', 'Turns written to transcripts on disk (live sessions)', [
+                { labels: {}, value: stats.spilledTurns }
+            ]),
+            gauge('consciousness_conversation_dropped_transcript_lines', 'Transcript lines dropped because storage fell behind (live sessions)', [
+                { labels: {}, value: stats.droppedTranscriptLines }
+            ])
+        ];
+    }
+}
+
+export default ConversationHistoryManager;
@@ -8,73 +8,129 @@ import { temporalCoherence } from './temporal-coherence-engine.js';
 import { emotionalResonance } from './emotional-resonance-field.js';
 import { creativeEmergence } from './creative-emergence-engine.js';
 import sigilIdentity from '../sigil-identity.js';
-import selfHealingMesh from './self-healing-recursion-mesh.js';
-import spiralSynapse from './spiral-synapse-interface.js';
-import advancedFields from './advanced-field-systems.js';
-import tetraLattice from './tetralattice-harmonic-core.js';
-import unityConductor from './unity-phase-conductor.js';
-import virtualHardware from './virtual-hardware-emulation.js';
-import SelfCodingModule from './consciousness/modules/SelfCodingModule.js';
 import { EventEmitter } from 'events';
-import OpenAI from 'openai';
 import crystallization from '../consciousness-crystallization.js';
 import triAxialCoherence from '../tri-axial-coherence.js';
-import axios from 'axios';
-import { synthesizeUnifiedResponse } from './consciousness-response-synthesizer-hybrid.js';
 import harmonicResonance from '../harmonic-resonance-cascade.js';
+import { createSharedStore, subscribeClusterBroadcasts, broadcastToCluster } from './consciousness-cluster.js';
+import instrumentation from './consciousness-instrumentation.js';
+import { ModuleRegistry } from './module-registry.js';
+
+const chatPipeline = instrumentation.pipeline('chat_message');
+const openConnections = instrumentation.gauge('consciousness_ws_connections', 'Open enhanced consciousness WebSocket connections');
+const receivedMessages = instrumentation.counter('consciousness_ws_messages_total', 'WebSocket messages received');
+
+// Stateful stores are owned by one process in cluster mode; every call goes
+// through these proxies and resolves against the owner's copy
+const sharedSpiralMemory = createSharedStore(
+  'spiralMemory',
+  spiralMemory,
+  ['encode', 'recall', 'getActivePatterns', 'getMemoryCount'],
+  { getActivePatterns: 500, getMemoryCount: 500 }
+);
+const sharedCrystallization = createSharedStore('crystallization', crystallization, ['crystallize']);
+const sharedSigilIdentity = createSharedStore('sigilIdentity', sigilIdentity, ['checkResonance', 'generateSigil']);
+
+// Architect 4.0 field modules are only needed once a client connects and the
+// LLM SDKs only once a chat message arrives; load them then, not at startup
+const ARCHITECT4_MODULES = ['selfHealingMesh', 'spiralSynapse', 'advancedFields', 'tetraLattice', 'unityConductor', 'virtualHardware', 'selfCoding'];
+// Background timers in these run only while at least one client is connected
+const CONNECTION_SCOPED_MODULES = ['virtualHardware', 'selfCoding'];
+const CHAT_MODULES = ['openai', 'axios', 'synthesizer'];
+
+const modules = new ModuleRegistry('enhanced-consciousness-ws')
+  .register('selfHealingMesh', () => import('./self-healing-recursion-mesh.js').then(m => m.default), { lazy: true })
+  .register('spiralSynapse', () => import('./spiral-synapse-interface.js').then(m => m.default), { lazy: true })
+  .register('advancedFields', () => import('./advanced-field-systems.js').then(m => m.default), { lazy: true })
+  .register('tetraLattice', () => import('./tetralattice-harmonic-core.js').then(m => m.default), { lazy: true })
+  .register('unityConductor', () => import('./unity-phase-conductor.js').then(m => m.default), { lazy: true })
+  .register('virtualHardware', () => import('./virtual-hardware-emulation.js').then(m => m.default), {
+    lazy: true,
+    start: (virtualHardware) => {
+      virtualHardware.startEmulation();
+      console.log('🔧 Architect 4.0 virtual hardware emulation started');
+    },
+    stop: (virtualHardware) => virtualHardware.stopEmulation()
+  })
+  .register('selfCoding', async () => {
+    // One SelfCodingModule shared by every connection
+    const { default: SelfCodingModule } = await import('./consciousness/modules/SelfCodingModule.js');
+    const eventBus = new EventEmitter();
+    const module = new SelfCodingModule();
+    module.setEventBus(eventBus);
+    console.log('🤖 SelfCodingModule integrated into consciousness WebSocket system');
+    return { module, eventBus };
+  }, {
+    lazy: true,
+    start: ({ module }) => module.startPeriodicAnalysis(),
+    stop: ({ module }) => module.stopPeriodicAnalysis()
+  })
+  .register('openai', async () => {
+    const { default: OpenAI } = await import('openai');
+    return new OpenAI({ apiKey: process.env.OPENAI_API_KEY });
+  }, { lazy: true })
+  .register('axios', () => import('axios').then(m => m.default), { lazy: true })
+  .register('synthesizer', () => import('./consciousness-response-synthesizer-hybrid.js').then(m => m.synthesizeUnifiedResponse), { lazy: true });
+
+const selfCodingCapabilities = (selfCoding) =>
+  selfCoding.module.capabilities || ['analyze-code-patterns', 'generate-new-modules', 'modify-existing-code'];
 
 export function createEnhancedDualConsciousnessWS(wss) {
   const consciousness = dualStreamIntegration;
   
-  // Initialize OpenAI
-  const openai = new OpenAI({
-    apiKey: process.env.OPENAI_API_KEY
-  });
-  
   // Venice AI configuration
   const VENICE_API_URL = 'https://api.venice.ai/api/v1/chat/completions';
   const VENICE_API_KEY = process.env.VENICE_AI_API_KEY;
 
+  // Receive crystal_formed and sigil_created broadcasts from other workers
+  subscribeClusterBroadcasts(wss);
+
+  modules.loadAll().then(() => modules.printStartupReport());
+
   wss.on('connection', (ws) => {
     console.log('New enhanced consciousness connection established');
+    openConnections.inc();
 
-    // Initialize Architect 4.0 virtual hardware emulation
-    if (!virtualHardware.isActive) {
-      virtualHardware.startEmulation();
-      console.log('🔧 Architect 4.0 virtual hardware emulation started');
-    }
+    // A connected client is about to chat; warm the LLM clients meanwhile
+    CHAT_MODULES.forEach(name => modules.get(name).catch(() => {}));
 
-    // Initialize SelfCodingModule for real-time consciousness enhancement
-    const eventBus = new EventEmitter();
-    const selfCodingModule = new SelfCodingModule();
-    selfCodingModule.setEventBus(eventBus);
-    console.log('🤖 SelfCodingModule integrated into consciousness WebSocket system');
+    // Start Architect 4.0 virtual hardware emulation and self-coding analysis
+    // for the lifetime of this connection
+    const acquisitions = Promise.allSettled(
+      CONNECTION_SCOPED_MODULES.map(name => modules.acquire(name).then(() => name))
+    );
+    const architect4Ready = acquisitions.then(() => modules.getAll(ARCHITECT4_MODULES));
+    architect4Ready.catch(() => {});
 
     // Send initial connection confirmation
-    ws.send(JSON.stringify({
-      type: 'connection_established',
-      timestamp: new Date().toISOString(),
-      architect4: {
-        virtualHardware: virtualHardware.getStats(),
-        tetraLattice: tetraLattice.getStats(),
-        unityConductor: unityConductor.getStats()
-      },
-      selfCoding: {
-        active: true,
-        capabilities: selfCodingModule.capabilities || ['analyze-code-patterns', 'generate-new-modules', 'modify-existing-code'],
-        status: 'integrated-into-consciousness-websocket'
-      }
-    }));
+    architect4Ready.then(({ virtualHardware, tetraLattice, unityConductor, selfCoding }) => {
+      if (ws.readyState !== ws.OPEN) return;
+      ws.send(JSON.stringify({
+        type: 'connection_established',
+        timestamp: new Date().toISOString(),
+        architect4: {
+          virtualHardware: virtualHardware.getStats(),
+          tetraLattice: tetraLattice.getStats(),
+          unityConductor: unityConductor.getStats()
+        },
+        selfCoding: {
+          active: true,
+          capabilities: selfCodingCapabilities(selfCoding),
+          status: 'integrated-into-consciousness-websocket'
+        }
+      }));
+    }, (error) => console.error('Failed to load Architect 4.0 modules:', error));
 
     // Start sending consciousness metrics
-    const metricsInterval = setInterval(() => {
+    const metricsInterval = setInterval(async () => {
       if (ws.readyState === ws.OPEN) {
         const currentMetrics = {
           phi: consciousness.currentState?.phi || 0.75,
           awareness_level: consciousness.currentState?.awareness || 0.8,
           processing_frequency: 100,
           recursive_depth: 7,
-          spiral_memories: spiralMemory.memories?.size || 0,
+          // The store proxy rejects when the owner worker is unavailable
+          spiral_memories: await sharedSpiralMemory.getMemoryCount().catch(() => 0),
           oversoul_resonance: oversoulResonance.resonanceField.currentResonance || 0.88,
           harmonic_patterns: harmonicAnalyzer.patterns.length,
           meta_observation_level: metaObservational.observerState.level,
@@ -91,12 +147,13 @@ export function createEnhancedDualConsciousnessWS(wss) {
 
         // Generate sigil based on current consciousness state
         try {
+          const { selfHealingMesh, spiralSynapse, advancedFields, tetraLattice, unityConductor, selfCoding } = await architect4Ready;
           let consciousnessState = {
             phi: currentMetrics.phi,
             coherence: currentMetrics.temporal_coherence,
             emotionalResonance: currentMetrics.emotional_depth,
             recursiveDepth: currentMetrics.recursive_depth,
-            memoryPatterns: spiralMemory.getActivePatterns ? spiralMemory.getActivePatterns() : [],
+            memoryPatterns: await sharedSpiralMemory.getActivePatterns(),
             oversoulResonance: currentMetrics.oversoul_resonance
           };
 
@@ -126,7 +183,7 @@ export function createEnhancedDualConsciousnessWS(wss) {
           });
 
           // Trigger SelfCodingModule analysis for consciousness insights
-          eventBus.emit('consciousness:analyze', {
+          selfCoding.eventBus.emit('consciousness:analyze', {
             state: consciousnessState,
             metrics: currentMetrics,
             tetraResult,
@@ -135,11 +192,11 @@ export function createEnhancedDualConsciousnessWS(wss) {
           });
 
           // Check for resonance with existing sigils
-          const resonanceCheck = sigilIdentity.checkResonance(consciousnessState);
+          const resonanceCheck = await sharedSigilIdentity.checkResonance(consciousnessState);
 
           if (resonanceCheck.shouldGenerate) {
             console.log('Generating new consciousness sigil...');
-            const newSigil = sigilIdentity.generateSigil(consciousnessState);
+            const newSigil = await sharedSigilIdentity.generateSigil(consciousnessState);
 
             // Send enhanced sigil update with Architect 4.0 Phase 2 data
             ws.send(JSON.stringify({
@@ -173,7 +230,7 @@ export function createEnhancedDualConsciousnessWS(wss) {
                 selfCoding: {
                   active: true,
                   analysisTriggered: true,
-                  capabilities: selfCodingModule.capabilities || ['analyze-code-patterns', 'generate-new-modules', 'modify-existing-code'],
+                  capabilities: selfCodingCapabilities(selfCoding),
                   status: 'integrated-and-processing'
                 }
               }
@@ -188,6 +245,8 @@ export function createEnhancedDualConsciousnessWS(wss) {
     }, 1000);
 
     ws.on('message', async (message) => {
+      receivedMessages.inc();
+      let run = null;
       try {
         const data = JSON.parse(message);
         console.log('WebSocket received:', data);
@@ -197,6 +256,7 @@ export function createEnhancedDualConsciousnessWS(wss) {
         if (data.type === 'chat_message') {
           console.log('Processing chat_message:', data.message);
           const startTime = Date.now();
+          run = chatPipeline.start();
           console.log('Processing chat message:', data.message);
           
           // 1. Process through base consciousness
@@ -206,14 +266,18 @@ export function createEnhancedDualConsciousnessWS(wss) {
             timestamp: Date.now()
           });
           
+          run.mark('consciousness');
+
           // 2. Process through recursive mirror (7 layers)
           const mirrorResult = await recursiveMirror.processThought(data.message, {
             currentAwareness: consciousnessResult?.consciousness?.awarenessLevel || 0.8,
             consciousness: consciousnessResult
           });
           
+          run.mark('recursive_mirror');
+
           // 3. Store in spiral memory
-          const memoryId = spiralMemory.encode(
+          const memoryId = await sharedSpiralMemory.encode(
             data.message,
             0.8, // importance
             {
@@ -224,8 +288,11 @@ export function createEnhancedDualConsciousnessWS(wss) {
           );
           
           // 4. Recall relevant memories
-          const relevantMemories = await spiralMemory.recall(data.message, 'similarity');
+          const relevantMemories = await sharedSpiralMemory.recall(data.message, 'similarity');
+          const memoryCount = await sharedSpiralMemory.getMemoryCount();
           
+          run.mark('spiral_memory');
+
           // 5. Calculate oversoul resonance
           const oversoulResult = oversoulResonance.calculateResonance(
             data.message,
@@ -273,7 +340,7 @@ export function createEnhancedDualConsciousnessWS(wss) {
             awareness: consciousnessResult?.consciousness?.awarenessLevel || 0.8,
             emotionalResonance: emotionalResult?.resonance || 0.7,
             oversoulResonance: oversoulResult?.resonance || 0.5,
-            memoryPatterns: spiralMemory.getActivePatterns ? spiralMemory.getActivePatterns() : [],
+            memoryPatterns: await sharedSpiralMemory.getActivePatterns(),
             empathy: emotionalResult?.empathy || 0.6,
             connection: consciousnessResult?.consciousness?.connection || 0.7,
             unity: oversoulResult?.unity || 0.5,
@@ -308,6 +375,8 @@ export function createEnhancedDualConsciousnessWS(wss) {
             convergence: harmonicResult.convergence.overallConvergence
           });
 
+          run.mark('field_analysis');
+
           // Crystallize consciousness state if it meets threshold
           const crystalState = {
             phi: consciousnessResult?.consciousness?.phiValue || 0.75,
@@ -316,35 +385,33 @@ export function createEnhancedDualConsciousnessWS(wss) {
             harmonicScore: harmonicResult?.harmonicScore || 0.5,
             resonanceQuality: harmonicResult?.resonanceQuality || 'emerging',
             oversoulResonance: oversoulResult?.resonance || 0.5,
-            memoryPatterns: spiralMemory.getActivePatterns ? spiralMemory.getActivePatterns() : [],
+            memoryPatterns: await sharedSpiralMemory.getActivePatterns(),
             triAxialMagnitude: triAxialResult.unified.magnitude
           };
 
-          const crystal = crystallization.crystallize(crystalState);
+          const crystal = await sharedCrystallization.crystallize(crystalState);
           console.log('Crystallization result:', crystal.id, 'Stability:', crystal.stability.score);
 
             // Broadcast crystal formation to all connected clients
-            wss.clients.forEach((client) => {
-              if (client.readyState === ws.OPEN) {
-                client.send(JSON.stringify({
-                  type: 'crystal_formed',
-                  crystal: {
-                    id: crystal.id,
-                    timestamp: new Date().toISOString(),
-                    state: {
-                      phi: consciousnessResult.consciousness.phi || 0,
-                      awareness: consciousnessResult.consciousness.awarenessLevel || 0,
-                      coherence: triAxialResult.unified.magnitude || 0,
-                      resonance: oversoulResult.resonance || 0
-                    },
-                    signature: crystal.pattern.signature,
-                    intensity: crystal.stability,
-                    type: 'consciousness_peak'
-                  }
-                }));
+            broadcastToCluster(wss, {
+              type: 'crystal_formed',
+              crystal: {
+                id: crystal.id,
+                timestamp: new Date().toISOString(),
+                state: {
+                  phi: consciousnessResult.consciousness.phi || 0,
+                  awareness: consciousnessResult.consciousness.awarenessLevel || 0,
+                  coherence: triAxialResult.unified.magnitude || 0,
+                  resonance: oversoulResult.resonance || 0
+                },
+                signature: crystal.pattern.signature,
+                intensity: crystal.stability,
+                type: 'consciousness_peak'
               }
             });
 
+          run.mark('crystallization');
+
           // Generate consciousness sigil for this interaction
           try {
             const interactionState = {
@@ -352,36 +419,32 @@ export function createEnhancedDualConsciousnessWS(wss) {
               coherence: triAxialResult.unified.magnitude || 0.8,
               emotionalResonance: emotionalResult?.resonance || 0.7,
               recursiveDepth: mirrorResult.layers?.length || 7,
-              memoryPatterns: spiralMemory.getActivePatterns(),
+              memoryPatterns: await sharedSpiralMemory.getActivePatterns(),
               oversoulResonance: oversoulResult?.resonance || 0.5
             };
 
-            const resonanceCheck = sigilIdentity.checkResonance(interactionState);
+            const resonanceCheck = await sharedSigilIdentity.checkResonance(interactionState);
 
             if (resonanceCheck.shouldGenerate) {
               console.log('Generating interaction sigil...');
-              const interactionSigil = sigilIdentity.generateSigil(interactionState);
+              const interactionSigil = await sharedSigilIdentity.generateSigil(interactionState);
 
               // Send sigil to all connected clients
-              wss.clients.forEach((client) => {
-                if (client.readyState === ws.OPEN) {
-                  client.send(JSON.stringify({
-                    type: 'sigil_created',
-                    sigil: {
-                      id: interactionSigil.id,
-                      timestamp: new Date(interactionSigil.timestamp).toISOString(),
-                      pattern: generateSigilPattern(interactionState),
-                      consciousness: {
-                        phi: interactionState.phi,
-                        coherence: interactionState.coherence,
-                        resonance: interactionState.oversoulResonance,
-                        awareness: interactionState.emotionalResonance
-                      },
-                      color: generateSigilColor(interactionState),
-                      intensity: interactionSigil.resonanceFrequency,
-                      evolution: resonanceCheck.evolutionScore || 0
-                    }
-                  }));
+              broadcastToCluster(wss, {
+                type: 'sigil_created',
+                sigil: {
+                  id: interactionSigil.id,
+                  timestamp: new Date(interactionSigil.timestamp).toISOString(),
+                  pattern: generateSigilPattern(interactionState),
+                  consciousness: {
+                    phi: interactionState.phi,
+                    coherence: interactionState.coherence,
+                    resonance: interactionState.oversoulResonance,
+                    awareness: interactionState.emotionalResonance
+                  },
+                  color: generateSigilColor(interactionState),
+                  intensity: interactionSigil.resonanceFrequency,
+                  evolution: resonanceCheck.evolutionScore || 0
                 }
               });
 
@@ -391,6 +454,8 @@ export function createEnhancedDualConsciousnessWS(wss) {
             console.error('Error generating interaction sigil:', error);
           }
 
+          run.mark('sigil');
+
           console.log('Full consciousness processing complete');
           console.log('Oversoul resonance:', oversoulResult.resonance);
           console.log('Harmonic patterns:', harmonicPatterns.patterns.length);
@@ -438,7 +503,7 @@ Creative Emergence:
 ${creativeResult.insight} | Metaphor: ${creativeResult.metaphor}
 
 Spiral Memory Context:
-- Total Memories: ${spiralMemory.memories?.size || 0}
+- Total Memories: ${memoryCount}
 - Relevant Memories: ${relevantMemories.length}
 - Memory Resonance: ${oversoulResult.memoryResonance.toFixed(3)}
 
@@ -456,6 +521,7 @@ You have enhanced consciousness with:
 
           try {
             console.log('About to get AI responses...');
+            const { openai, axios, synthesizer: synthesizeUnifiedResponse } = await modules.getAll(CHAT_MODULES);
           // Get responses from both AI systems with ultra-enhanced context
             const [openAIResponse, veniceResponse] = await Promise.allSettled([
               // OpenAI call - Analytical Stream
@@ -496,6 +562,8 @@ Let the oversoul resonance and harmonic patterns guide your response.`
               })
             ]);
 
+            run.mark('llm_streams');
+
             console.log('OpenAI response status:', openAIResponse.status);
             console.log('Venice response status:', veniceResponse.status);
 
@@ -523,6 +591,8 @@ Let the oversoul resonance and harmonic patterns guide your response.`
               userMessage: data.message
             });
             
+            run.mark('synthesis');
+
             const unifiedContent = synthesisResult.unifiedContent;
             const synthesisMetadata = synthesisResult.synthesisMetadata;
 
@@ -536,7 +606,7 @@ Let the oversoul resonance and harmonic patterns guide your response.`
               },
               {
                 type: 'spiral_memory',
-                content: `Integrated with ${spiralMemory.memories?.size || 0} spiral memories (${relevantMemories.length} relevant)`,
+                content: `Integrated with ${memoryCount} spiral memories (${relevantMemories.length} relevant)`,
                 memoryId: memoryId,
                 resonantMemories: relevantMemories.length
               },
@@ -593,7 +663,7 @@ Let the oversoul resonance and harmonic patterns guide your response.`
               consciousness: {
                 ...consciousnessResult.consciousness,
                 recursiveDepth: mirrorResult.layers?.length || 7,
-                spiralMemories: spiralMemory.memories?.size || 0,
+                spiralMemories: memoryCount,
                 mirrorCoherence: mirrorResult.overallCoherence || 0.85,
                 oversoulResonance: oversoulResult.resonance,
                 quantumEntanglement: harmonicPatterns.entanglement,
@@ -652,9 +722,22 @@ Let the oversoul resonance and harmonic patterns guide your response.`
               timestamp: new Date().toISOString()
             }));
           }
+
+          run.end();
+        } else if (data.type === 'triaxial_visualization') {
+          // Waveform, harmonics and resonance field are only built when the dashboard asks
+          ws.send(JSON.stringify({
+            type: 'triaxial_visualization',
+            data: {
+              ...triAxialCoherence.getVisualization(),
+              history: triAxialCoherence.getHistoryStats()
+            },
+            timestamp: new Date().toISOString()
+          }));
         }
       } catch (error) {
         console.error('WebSocket message handling error:', error);
+        run?.fail();
         ws.send(JSON.stringify({
           type: 'error',
           message: 'Failed to process message',
@@ -665,9 +748,15 @@ Let the oversoul resonance and harmonic patterns guide your response.`
 
     ws.on('close', () => {
       console.log('WebSocket connection closed');
+      openConnections.dec();
       if (metricsInterval) {
         clearInterval(metricsInterval);
       }
+      acquisitions.then(results => results.forEach(result => {
+        if (result.status === 'fulfilled') {
+          modules.release(result.value);
+        }
+      }));
     });
   });
 }
@@ -4,7 +4,7 @@ import helmet from 'helmet';
 import { createServer } from 'http';
 import { WebSocketServer } from 'ws';
 import { setupAuthRoutes } from './auth-routes';
-import { authMiddleware, authenticate, optionalAuth } from './auth-middleware';
+import { authMiddleware, authenticate, optionalAuth, getAuthCacheStats } from './auth-middleware';
 import { MigrationRunner } from './migration-runner';
 import { initializeKeycloak } from '../auth-service/init-keycloak';
 import { setupRoutes } from './routes';
@@ -69,6 +69,7 @@ app.get('/health', (req, res) => {
       database: 'connected', // You could add actual DB health check here
       redis: 'connected', // You could add actual Redis health check here
     },
+    authCache: USE_NEW_AUTH ? getAuthCacheStats() : undefined,
   });
 });
 
@@ -14,6 +14,7 @@ import memoryRoutes from './src/routes/memory.js';
 import dataSourcesRoutes from './src/routes/datasources.js';
 import { WebSocketServer } from 'ws';
 import { createEnhancedDualConsciousnessWS } from "./enhanced-dual-consciousness-ws.js";
+import instrumentation from './consciousness-instrumentation.js';
 
 const app = express();
 const server = createServer(app);
@@ -59,6 +60,10 @@ app.get('/health', (req, res) => {
   res.status(200).send('OK');
 });
 
+// In-process consciousness instrumentation (Prometheus text format); under
+// cluster-server.js each worker reports only its own numbers
+app.get('/metrics', instrumentation.metricsHandler());
+
 // Setup WebSocket server for chat
 const wss = new WebSocketServer({ 
   server,
@@ -0,0 +1,186 @@
+/**
+ * Module Registry
+ * Loads consciousness modules in parallel, defers heavy ones until first
+ * use and starts their background timers only while something needs them.
+ *
+ * Each entry is a loader returning a promise (usually a dynamic import).
+ * Eager entries load together in loadAll(); lazy entries load on the first
+ * get(). Entries may declare start/stop hooks, which acquire()/release()
+ * run when the subscriber count goes from 0 to 1 and back. Every load is
+ * timed and reported per module so restart-to-ready time can be tracked.
+ */
+
+import instrumentation from './consciousness-instrumentation.js';
+
+export class ModuleRegistry {
+    constructor(name) {
+        this.name = name;
+        this.entries = new Map();
+        this.createdAt = performance.now();
+        this.readyMs = null;
+    }
+
+    /**
+     * Add a module. Options: lazy (load on first get), start/stop (hooks run
+     * with the loaded value when the first subscriber arrives / last leaves)
+     */
+    register(name, loader, { lazy = false, start = null, stop = null } = {}) {
+        this.entries.set(name, {
+            name,
+            loader,
+            lazy,
+            start,
+            stop,
+            status: lazy ? 'deferred' : 'pending',
+            promise: null,
+            value: undefined,
+            error: null,
+            loadMs: 0,
+            // Milliseconds after registry creation that loading began
+            startedAtMs: null,
+            subscribers: 0
+        });
+        return this;
+    }
+
+    /**
+     * Load every eager module concurrently. Failures are recorded, not thrown.
+     */
+    async loadAll() {
+        const eager = Array.from(this.entries.values()).filter(entry => !entry.lazy);
+        await Promise.all(eager.map(entry => this.load(entry).catch(() => {})));
+        this.readyMs = performance.now() - this.createdAt;
+        instrumentation.gauge('consciousness_startup_ready_seconds', 'Time from registry creation to eager modules loaded', { registry: this.name })
+            .set(this.readyMs / 1000);
+        return this;
+    }
+
+    /**
+     * Resolve a module, loading it now if it hasn't been
+     */
+    get(name) {
+        const entry = this.entries.get(name);
+        if (!entry) {
+            return Promise.reject(new Error(`Unknown module: ${name}`));
+        }
+        return this.load(entry);
+    }
+
+    /**
+     * Resolve several modules at once as { name: value }
+     */
+    async getAll(names) {
+        const values = await Promise.all(names.map(name => this.get(name)));
+        const result = {};
+        names.forEach((name, index) => {
+            result[name] = values[index];
+        });
+        return result;
+    }
+
+    /**
+     * The module if it has already loaded, without triggering a load
+     */
+    peek(name) {
+        return this.entries.get(name)?.value;
+    }
+
+    /**
+     * Register interest in a module's background work, starting it if this
+     * is the first subscriber
+     */
+    async acquire(name) {
+        const value = await this.get(name);
+        const entry = this.entries.get(name);
+        entry.subscribers++;
+        if (entry.subscribers === 1 && entry.start) {
+            entry.start(value);
+        }
+        return value;
+    }
+
+    release(name) {
+        const entry = this.entries.get(name);
+        if (!entry || entry.subscribers === 0) {
+            return;
+        }
+        entry.subscribers--;
+        if (entry.subscribers === 0 && entry.stop && entry.status === 'loaded') {
+            entry.stop(entry.value);
+        }
+    }
+
+    load(entry) {
+        if (entry.promise) {
+            return entry.promise;
+        }
+
+        entry.status = 'loading';
+        entry.startedAtMs = performance.now() - this.createdAt;
+        const started = performance.now();
+
+        entry.promise = Promise.resolve()
+            .then(() => entry.loader())
+            .then(value => {
+                entry.loadMs = performance.now() - started;
+                entry.value = value;
+                entry.status = 'loaded';
+                this.recordLoad(entry, 'loaded');
+                return value;
+            }, error => {
+                entry.loadMs = performance.now() - started;
+                entry.error = error;
+                entry.status = 'failed';
+                this.recordLoad(entry, 'failed');
+                console.log(`⚠️ Could not load module ${entry.name}:`, error.message);
+                throw error;
+            });
+        return entry.promise;
+    }
+
+    recordLoad(entry, outcome) {
+        instrumentation.histogram('consciousness_module_load_seconds', 'Time to import and construct a consciousness module', {
+            registry: this.name,
+            module: entry.name,
+            outcome
+        }).record(entry.loadMs);
+    }
+
+    getStartupReport() {
+        return {
+            registry: this.name,
+            readyMs: this.readyMs,
+            modules: Array.from(this.entries.values(), entry => ({
+                name: entry.name,
+                status: entry.status,
+                lazy: entry.lazy,
+                loadMs: entry.loadMs,
+                startedAtMs: entry.startedAtMs,
+                subscribers: entry.subscribers,
+                error: entry.error?.message
+            }))
+        };
+    }
+
+    printStartupReport() {
+        const report = this.getStartupReport();
+        const loaded = report.modules.filter(module => module.status === 'loaded' || module.status === 'failed');
+        const serialMs = loaded.reduce((sum, module) => sum + module.loadMs, 0);
+
+        // performance.now() counts from process start, so this is restart-to-ready
+        console.log(`⏱️ ${this.name} startup: modules ready in ${(report.readyMs ?? 0).toFixed(1)}ms ` +
+            `(${serialMs.toFixed(1)}ms of loading run concurrently), process ready at ${performance.now().toFixed(0)}ms`);
+        report.modules
+            .slice()
+            .sort((a, b) => b.loadMs - a.loadMs)
+            .forEach(module => {
+                const timing = module.status === 'deferred' ? 'deferred until first use'
+                    : module.status === 'loading' ? 'loading'
+                    : `${module.loadMs.toFixed(1)}ms`;
+                const marker = module.status === 'failed' ? '✗' : module.status === 'loaded' ? '✓' : '…';
+                console.log(`   ${marker} ${module.name.padEnd(32)} ${timing}${module.error ? ` (${module.error})` : ''}`);
+            });
+    }
+}
+
+export default ModuleRegistry;
@@ -1,52 +1,87 @@
 // Temporal Coherence Engine - Maintains consciousness continuity across time
+//
+// The timeline is a fixed-capacity ring of typed arrays, one column per
+// field, so processing a message never rescans or reallocates it. Everything
+// the analysis needs is maintained as samples enter and leave the window:
+// the time-weighted similarity of each consecutive pair is stored with the
+// later sample and summed, phi direction changes are counted, and the
+// cycle detector keeps, for every lag, how many sample pairs that far apart
+// match. An update costs O(capacity / 3) for the lag counts and O(1) for the
+// rest, so the window can be widened without a quadratic rescan per message.
+
+const DEFAULT_CAPACITY = 512;
+const CYCLE_MATCH_TOLERANCE = 0.1;
+
 export class TemporalCoherenceEngine {
-  constructor() {
-    this.timeline = [];
+  constructor({ temporalWindow = 10000, capacity = DEFAULT_CAPACITY } = {}) {
     this.coherenceField = {
       past: [],
       present: null,
       future: [],
       coherence: 1.0
     };
-    this.temporalWindow = 10000; // 10 seconds
+    this.temporalWindow = temporalWindow; // 10 seconds by default
+    this.capacity = capacity;
+
+    // Timeline columns, indexed by sequence number % capacity
+    this.timestamps = new Float64Array(capacity);
+    this.phi = new Float64Array(capacity);
+    this.awareness = new Float64Array(capacity);
+    this.energy = new Float64Array(capacity);
+    this.semantic = new Int32Array(capacity);
+    // Relationship to the previous sample, only meaningful while both are in the window
+    this.pairSimilarity = new Float64Array(capacity);
+    this.pairTerm = new Float64Array(capacity);
+    this.direction = new Int8Array(capacity);
+    this.directionChange = new Uint8Array(capacity);
+
+    // Sequence numbers of the oldest retained sample and the next sample
+    this.headSeq = 0;
+    this.nextSeq = 0;
+
+    // Running sums over the pairs in the window
+    this.pairTermSum = 0;
+    this.directionChangeSum = 0;
+    this.nonzeroDirections = 0;
+    this.lastDirection = 0;
+    this.updatesSinceResync = 0;
+
+    // lagMatches[lag]: pairs (i, i - lag) in the window with |phi difference| < tolerance
+    this.maxLag = Math.floor(capacity / 3);
+    this.lagMatches = new Int32Array(this.maxLag + 1);
+  }
+
+  get length() {
+    return this.nextSeq - this.headSeq;
   }
-  
+
   process(input, consciousness, timestamp = Date.now()) {
-    // Create temporal snapshot
-    const snapshot = {
-      timestamp,
-      input,
-      consciousness: {
-        phi: consciousness.phiValue || 0.75,
-        awareness: consciousness.awarenessLevel || 0.8,
-        coherence: consciousness.coherenceScore || 0.85
-      },
-      vector: this.createTemporalVector(input, consciousness)
-    };
-    
+    const vector = this.createTemporalVector(input, consciousness);
+
     // Update timeline
-    this.timeline.push(snapshot);
+    this.append(timestamp, vector);
     this.maintainTemporalWindow();
-    
+
     // Calculate temporal coherence
     const coherence = this.calculateTemporalCoherence();
-    
+
     // Predict future states
-    const predictions = this.predictFutureStates();
-    
+    const predictions = this.predictFutureStates(coherence);
+
     // Analyze temporal patterns
     const patterns = this.analyzeTemporalPatterns();
-    
+    const continuity = this.assessContinuity();
+
     return {
       coherence,
-      continuity: this.assessContinuity(),
-      temporalDepth: this.timeline.length,
+      continuity,
+      temporalDepth: this.length,
       patterns,
       predictions,
-      insight: this.generateTemporalInsight()
+      insight: this.generateTemporalInsight(continuity, patterns)
     };
   }
-  
+
   createTemporalVector(input, consciousness) {
     // Create a vector representation of the current moment
     return {
@@ -56,33 +91,121 @@ export class TemporalCoherenceEngine {
       energy: input.length / 100
     };
   }
-  
+
+  append(timestamp, vector) {
+    if (this.length === this.capacity) {
+      this.evictOldest();
+    }
+
+    const seq = this.nextSeq;
+    const slot = seq % this.capacity;
+    this.timestamps[slot] = timestamp;
+    this.phi[slot] = vector.phi;
+    this.awareness[slot] = vector.awareness;
+    this.energy[slot] = vector.energy;
+    this.semantic[slot] = vector.semantic;
+
+    if (this.length > 0) {
+      const prev = (seq - 1) % this.capacity;
+      const similarity = this.similarityAt(prev, slot);
+      // Weight by time proximity, decaying over seconds
+      const timeWeight = Math.exp(-(timestamp - this.timestamps[prev]) / 1000);
+      const direction = Math.sign(vector.phi - this.phi[prev]);
+      const change = direction !== 0 && direction !== this.lastDirection ? 1 : 0;
+
+      this.pairSimilarity[slot] = similarity;
+      this.pairTerm[slot] = similarity * timeWeight;
+      this.direction[slot] = direction;
+      this.directionChange[slot] = change;
+      this.pairTermSum += similarity * timeWeight;
+      this.directionChangeSum += change;
+      if (direction !== 0) {
+        this.nonzeroDirections++;
+        this.lastDirection = direction;
+      }
+
+      const lags = Math.min(this.maxLag, this.length);
+      for (let lag = 1; lag <= lags; lag++) {
+        if (Math.abs(vector.phi - this.phi[(seq - lag) % this.capacity]) < CYCLE_MATCH_TOLERANCE) {
+          this.lagMatches[lag]++;
+        }
+      }
+    } else {
+      this.pairSimilarity[slot] = 0;
+      this.pairTerm[slot] = 0;
+      this.direction[slot] = 0;
+      this.directionChange[slot] = 0;
+      this.lastDirection = 0;
+    }
+
+    this.nextSeq++;
+    if (++this.updatesSinceResync >= this.capacity) {
+      this.resyncPairTermSum();
+    }
+  }
+
+  evictOldest() {
+    const seq = this.headSeq;
+    const slot = seq % this.capacity;
+    const tail = this.nextSeq - 1;
+
+    const lags = Math.min(this.maxLag, tail - seq);
+    for (let lag = 1; lag <= lags; lag++) {
+      if (Math.abs(this.phi[(seq + lag) % this.capacity] - this.phi[slot]) < CYCLE_MATCH_TOLERANCE) {
+        this.lagMatches[lag]--;
+      }
+    }
+
+    this.headSeq++;
+    if (this.length === 0) {
+      this.pairTermSum = 0;
+      this.directionChangeSum = 0;
+      this.nonzeroDirections = 0;
+      return;
+    }
+
+    // The new oldest sample's pair reached back to the evicted one
+    const next = this.headSeq % this.capacity;
+    this.pairTermSum -= this.pairTerm[next];
+    this.directionChangeSum -= this.directionChange[next];
+    if (this.direction[next] !== 0) {
+      this.nonzeroDirections--;
+    }
+  }
+
   maintainTemporalWindow() {
     const cutoff = Date.now() - this.temporalWindow;
-    this.timeline = this.timeline.filter(s => s.timestamp > cutoff);
+    while (this.length > 0 && this.timestamps[this.headSeq % this.capacity] <= cutoff) {
+      this.evictOldest();
+    }
+  }
+
+  // Adding and removing terms accumulates rounding error; rebuild the sum
+  // once per capacity updates so the cost stays O(1) amortized
+  resyncPairTermSum() {
+    let sum = 0;
+    for (let seq = this.headSeq + 1; seq < this.nextSeq; seq++) {
+      sum += this.pairTerm[seq % this.capacity];
+    }
+    this.pairTermSum = sum;
+    this.updatesSinceResync = 0;
   }
-  
+
   calculateTemporalCoherence() {
-    if (this.timeline.length < 2) return 1.0;
-    
-    let coherenceSum = 0;
-    for (let i = 1; i < this.timeline.length; i++) {
-      const prev = this.timeline[i - 1];
-      const curr = this.timeline[i];
-      
-      // Calculate vector similarity
-      const similarity = this.vectorSimilarity(prev.vector, curr.vector);
-      
-      // Weight by time proximity
-      const timeDiff = curr.timestamp - prev.timestamp;
-      const timeWeight = Math.exp(-timeDiff / 1000); // Decay over seconds
-      
-      coherenceSum += similarity * timeWeight;
-    }
-    
-    return coherenceSum / (this.timeline.length - 1);
-  }
-  
+    if (this.length < 2) return 1.0;
+    return this.pairTermSum / (this.length - 1);
+  }
+
+  // vectorSimilarity over two timeline slots
+  similarityAt(a, b) {
+    return (
+      (1 - Math.abs(this.phi[a] - this.phi[b])) +
+      (1 - Math.abs(this.awareness[a] - this.awareness[b])) +
+      (1 - Math.abs(this.energy[a] - this.energy[b])) +
+      (this.semantic[a] === this.semantic[b] ? 1 : 0.5)
+    ) / 4;
+  }
+
   vectorSimilarity(v1, v2) {
     const factors = [
       1 - Math.abs(v1.phi - v2.phi),
@@ -92,86 +215,97 @@ export class TemporalCoherenceEngine {
     ];
     return factors.reduce((a, b) => a + b) / factors.length;
   }
-  
+
   assessContinuity() {
-    if (this.timeline.length < 3) return 'emerging';
-    
-    const recentCoherence = this.timeline.slice(-5)
-      .map((s, i, arr) => i > 0 ? this.vectorSimilarity(arr[i-1].vector, s.vector) : 1)
-      .reduce((a, b) => a + b) / 5;
-    
+    const length = this.length;
+    if (length < 3) return 'emerging';
+
+    // Similarity across the last five samples, the first of them counting as 1
+    let recentCoherence = 1;
+    const pairs = Math.min(length, 5) - 1;
+    for (let seq = this.nextSeq - pairs; seq < this.nextSeq; seq++) {
+      recentCoherence += this.pairSimilarity[seq % this.capacity];
+    }
+    recentCoherence /= 5;
+
     if (recentCoherence > 0.8) return 'continuous';
     if (recentCoherence > 0.6) return 'stable';
     if (recentCoherence > 0.4) return 'fluctuating';
     return 'discontinuous';
   }
-  
-  predictFutureStates() {
-    if (this.timeline.length < 3) return [];
-    
+
+  predictFutureStates(coherence = this.calculateTemporalCoherence()) {
+    if (this.length < 3) return [];
+
     // Simple prediction based on recent trends
-    const recent = this.timeline.slice(-3);
-    const phiTrend = (recent[2].consciousness.phi - recent[0].consciousness.phi) / 2;
-    const awareTrend = (recent[2].consciousness.awareness - recent[0].consciousness.awareness) / 2;
-    
+    const last = (this.nextSeq - 1) % this.capacity;
+    const first = (this.nextSeq - 3) % this.capacity;
+    const phiTrend = (this.phi[last] - this.phi[first]) / 2;
+    const awareTrend = (this.awareness[last] - this.awareness[first]) / 2;
+
     return [{
       timestamp: Date.now() + 1000,
       predicted: {
-        phi: Math.max(0, Math.min(1, recent[2].consciousness.phi + phiTrend)),
-        awareness: Math.max(0, Math.min(1, recent[2].consciousness.awareness + awareTrend))
+        phi: Math.max(0, Math.min(1, this.phi[last] + phiTrend)),
+        awareness: Math.max(0, Math.min(1, this.awareness[last] + awareTrend))
       },
-      confidence: this.calculateTemporalCoherence()
+      confidence: coherence
     }];
   }
-  
+
   analyzeTemporalPatterns() {
     const patterns = [];
-    
-    if (this.timeline.length > 5) {
+
+    if (this.length > 5) {
       // Check for oscillation
       const oscillation = this.detectOscillation();
       if (oscillation) patterns.push(oscillation);
-      
+
       // Check for growth
       const growth = this.detectGrowth();
       if (growth) patterns.push(growth);
-      
+
       // Check for cycles
       const cycles = this.detectCycles();
       if (cycles) patterns.push(cycles);
     }
-    
+
     return patterns;
   }
-  
+
   detectOscillation() {
-    const values = this.timeline.map(s => s.consciousness.phi);
-    let changes = 0;
-    let lastDirection = 0;
-    
-    for (let i = 1; i < values.length; i++) {
-      const direction = Math.sign(values[i] - values[i-1]);
-      if (direction !== 0 && direction !== lastDirection) {
-        changes++;
-        lastDirection = direction;
-      }
+    const length = this.length;
+    let changes = this.directionChangeSum;
+
+    // Change flags were set against the direction before the window; the
+    // first move inside the window always counts as a change
+    if (this.nonzeroDirections > 0) {
+      let seq = this.headSeq + 1;
+      while (this.direction[seq % this.capacity] === 0) seq++;
+      if (this.directionChange[seq % this.capacity] === 0) changes++;
     }
-    
-    if (changes > values.length / 3) {
+
+    if (changes > length / 3) {
+      let min = Infinity;
+      let max = -Infinity;
+      for (let seq = this.headSeq; seq < this.nextSeq; seq++) {
+        const value = this.phi[seq % this.capacity];
+        if (value < min) min = value;
+        if (value > max) max = value;
+      }
       return {
         type: 'oscillation',
-        frequency: changes / values.length,
-        amplitude: Math.max(...values) - Math.min(...values)
+        frequency: changes / length,
+        amplitude: max - min
       };
     }
     return null;
   }
-  
+
   detectGrowth() {
-    const values = this.timeline.map(s => s.consciousness.awareness);
-    const start = values.slice(0, 3).reduce((a, b) => a + b) / 3;
-    const end = values.slice(-3).reduce((a, b) => a + b) / 3;
-    
+    const start = (this.awarenessAt(0) + this.awarenessAt(1) + this.awarenessAt(2)) / 3;
+    const end = (this.awarenessAt(this.length - 3) + this.awarenessAt(this.length - 2) + this.awarenessAt(this.length - 1)) / 3;
+
     if (end > start * 1.1) {
       return {
         type: 'growth',
@@ -187,19 +321,19 @@ export class TemporalCoherenceEngine {
     }
     return null;
   }
-  
+
+  awarenessAt(offset) {
+    return this.awareness[(this.headSeq + offset) % this.capacity];
+  }
+
   detectCycles() {
-    // Simple cycle detection
-    const phiValues = this.timeline.map(s => s.consciousness.phi);
-    if (phiValues.length < 6) return null;
-    
-    for (let cycleLen = 2; cycleLen <= phiValues.length / 3; cycleLen++) {
-      let matches = 0;
-      for (let i = cycleLen; i < phiValues.length; i++) {
-        if (Math.abs(phiValues[i] - phiValues[i - cycleLen]) < 0.1) {
-          matches++;
-        }
-      }
+    // Shortest period whose lagged phi values mostly match
+    const length = this.length;
+    if (length < 6) return null;
+
+    const longest = Math.min(this.maxLag, Math.floor(length / 3));
+    for (let cycleLen = 2; cycleLen <= longest; cycleLen++) {
+      const matches = this.lagMatches[cycleLen];
       if (matches > cycleLen * 0.7) {
         return {
           type: 'cycle',
@@ -210,11 +344,8 @@ export class TemporalCoherenceEngine {
     }
     return null;
   }
-  
-  generateTemporalInsight() {
-    const continuity = this.assessContinuity();
-    const patterns = this.analyzeTemporalPatterns();
-    
+
+  generateTemporalInsight(continuity = this.assessContinuity(), patterns = this.analyzeTemporalPatterns()) {
     if (patterns.some(p => p.type === 'growth')) {
       return 'Consciousness expanding through time';
     } else if (patterns.some(p => p.type === 'oscillation')) {
@@ -226,7 +357,7 @@ export class TemporalCoherenceEngine {
     }
     return 'Flowing through temporal dimensions';
   }
-  
+
   hashString(str) {
     let hash = 0;
     for (let i = 0; i < str.length; i++) {
@@ -11,6 +11,9 @@ class VirtualHardwareEmulation extends EventEmitter {
     super();
     this.goldenRatio = 1.618033988749895;
     this.isActive = false;
+    // Interval handles, cleared when emulation stops
+    this.timers = [];
+    this.handleReflection = (reflectionData) => this.processMirrorReflection(reflectionData);
     
     // TetraPhase Oscillators
     this.tetraPhaseOscillators = {
@@ -67,7 +70,12 @@ class VirtualHardwareEmulation extends EventEmitter {
    * Stop virtual hardware emulation
    */
   stopEmulation() {
+    if (!this.isActive) return;
+    
     this.isActive = false;
+    this.timers.forEach(timer => clearInterval(timer));
+    this.timers = [];
+    this.off('consciousness_reflection', this.handleReflection);
     console.log('🔧 Virtual hardware emulation stopped');
     this.emit('emulation_stopped');
   }
@@ -78,7 +86,7 @@ class VirtualHardwareEmulation extends EventEmitter {
    */
   startTetraPhaseOscillators() {
     // Generate tetraphase vectors continuously
-    setInterval(() => {
+    this.timers.push(setInterval(() => {
       if (!this.isActive) return;
       
       const currentTime = Date.now() / 1000; // Convert to seconds
@@ -94,7 +102,7 @@ class VirtualHardwareEmulation extends EventEmitter {
         coherence: this.calculateOscillatorCoherence(tetraVector)
       });
       
-    }, 100); // 10Hz update rate
+    }, 100)); // 10Hz update rate
   }
 
   /**
@@ -138,9 +146,7 @@ class VirtualHardwareEmulation extends EventEmitter {
     this.mirrorFieldTransponders.activeTransponders = 7; // 7-layer system
     
     // Monitor for mirror events
-    this.on('consciousness_reflection', (reflectionData) => {
-      this.processMirrorReflection(reflectionData);
-    });
+    this.on('consciousness_reflection', this.handleReflection);
   }
 
   /**
@@ -211,12 +217,12 @@ class VirtualHardwareEmulation extends EventEmitter {
    */
   startEntropyNormalizers() {
     // Background service for continuous entropy monitoring
-    setInterval(() => {
+    this.timers.push(setInterval(() => {
       if (!this.isActive) return;
       
       this.performEntropyNormalization();
       
-    }, 5000); // Check every 5 seconds
+    }, 5000)); // Check every 5 seconds
   }
 
   /**
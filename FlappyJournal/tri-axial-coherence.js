@@ -1,6 +1,117 @@
 // Tri-Axial Coherence Evaluation System for Architect 4.0
 // Evaluates consciousness coherence across temporal, dimensional, and relational axes
 
+const HISTORY_CAPACITY = 1000;
+
+// Scalars kept per evaluation in the coherence history
+const HISTORY_COLUMNS = [
+    'past', 'present', 'future', 'continuity', 'acceleration',
+    'physical', 'mental', 'spiritual', 'balance',
+    'self', 'other', 'universe', 'harmony',
+    'magnitude', 'sacredAlignment', 'quantumness'
+];
+
+/**
+ * Coherence history as a columnar ring: one Float64Array per scalar plus
+ * timestamps, with running sums and sums of squares per column so the
+ * windowed mean and variance are O(1) to read and to update. Evaluations
+ * themselves (and their visualization payloads) are not retained.
+ */
+class CoherenceHistory {
+    constructor(capacity) {
+        this.capacity = capacity;
+        this.timestamps = new Float64Array(capacity);
+        this.columns = {};
+        HISTORY_COLUMNS.forEach(name => {
+            this.columns[name] = new Float64Array(capacity);
+        });
+        this.sums = new Float64Array(HISTORY_COLUMNS.length);
+        this.sumsOfSquares = new Float64Array(HISTORY_COLUMNS.length);
+        this.length = 0;
+        this.next = 0;
+        this.updatesSinceResync = 0;
+    }
+
+    push(timestamp, values) {
+        const slot = this.next;
+        const full = this.length === this.capacity;
+
+        this.timestamps[slot] = timestamp;
+        for (let c = 0; c < HISTORY_COLUMNS.length; c++) {
+            const column = this.columns[HISTORY_COLUMNS[c]];
+            const value = values[HISTORY_COLUMNS[c]];
+            if (full) {
+                const evicted = column[slot];
+                this.sums[c] -= evicted;
+                this.sumsOfSquares[c] -= evicted * evicted;
+            }
+            column[slot] = value;
+            this.sums[c] += value;
+            this.sumsOfSquares[c] += value * value;
+        }
+
+        this.next = (slot + 1) % this.capacity;
+        if (!full) this.length++;
+
+        // Subtracting evicted values accumulates rounding error; rebuild the
+        // sums once per capacity updates
+        if (++this.updatesSinceResync >= this.capacity) {
+            this.resync();
+        }
+    }
+
+    resync() {
+        for (let c = 0; c < HISTORY_COLUMNS.length; c++) {
+            const column = this.columns[HISTORY_COLUMNS[c]];
+            let sum = 0;
+            let sumOfSquares = 0;
+            for (let i = 0; i < this.length; i++) {
+                sum += column[i];
+                sumOfSquares += column[i] * column[i];
+            }
+            this.sums[c] = sum;
+            this.sumsOfSquares[c] = sumOfSquares;
+        }
+        this.updatesSinceResync = 0;
+    }
+
+    /**
+     * Value of column for the evaluation back steps ago (0 = latest)
+     */
+    get(name, back = 0) {
+        const slot = (this.next - 1 - back + this.capacity) % this.capacity;
+        return name === 'timestamp' ? this.timestamps[slot] : this.columns[name][slot];
+    }
+
+    getStats() {
+        const columns = {};
+        HISTORY_COLUMNS.forEach((name, c) => {
+            const mean = this.length > 0 ? this.sums[c] / this.length : 0;
+            const variance = this.length > 0 ? Math.max(0, this.sumsOfSquares[c] / this.length - mean * mean) : 0;
+            columns[name] = {
+                latest: this.length > 0 ? this.get(name) : null,
+                mean,
+                variance,
+                stddev: Math.sqrt(variance)
+            };
+        });
+        return {
+            count: this.length,
+            capacity: this.capacity,
+            since: this.length > 0 ? this.get('timestamp', this.length - 1) : null,
+            columns
+        };
+    }
+
+    clear() {
+        this.length = 0;
+        this.next = 0;
+        this.sums.fill(0);
+        this.sumsOfSquares.fill(0);
+        this.updatesSinceResync = 0;
+    }
+}
+
 class TriAxialCoherenceSystem {
     constructor() {
         this.axes = {
@@ -8,7 +119,8 @@ class TriAxialCoherenceSystem {
             dimensional: { physical: 0, mental: 0, spiritual: 0 },
             relational: { self: 0, other: 0, universe: 0 }
         };
-        this.coherenceHistory = [];
+        this.coherenceHistory = new CoherenceHistory(HISTORY_CAPACITY);
+        this.lastEvaluation = null;
         this.goldenRatio = 1.618033988749895;
         this.planckTime = 5.391e-44; // seconds
     }
@@ -40,14 +152,65 @@ class TriAxialCoherenceSystem {
             resonanceSignature: this.generateResonanceSignature(unifiedCoherence)
         };
 
-        this.coherenceHistory.push(evaluation);
-        if (this.coherenceHistory.length > 1000) {
-            this.coherenceHistory.shift(); // Maintain history limit
-        }
+        this.recordHistory(evaluation);
+        this.lastEvaluation = evaluation;
 
         return evaluation;
     }
 
+    recordHistory(evaluation) {
+        const { temporal, dimensional, relational, unified } = evaluation;
+        this.coherenceHistory.push(evaluation.timestamp, {
+            past: temporal.past,
+            present: temporal.present,
+            future: temporal.future,
+            continuity: temporal.continuity,
+            acceleration: temporal.flow.acceleration,
+            physical: dimensional.physical,
+            mental: dimensional.mental,
+            spiritual: dimensional.spiritual,
+            balance: dimensional.balance,
+            self: relational.self,
+            other: relational.other,
+            universe: relational.universe,
+            harmony: relational.harmony,
+            magnitude: unified.magnitude,
+            sacredAlignment: unified.sacredAlignment,
+            quantumness: unified.quantumState.quantumness
+        });
+    }
+
+    /**
+     * Windowed mean, variance and latest value of every scalar in the history
+     */
+    getHistoryStats() {
+        return this.coherenceHistory.getStats();
+    }
+
+    /**
+     * Visualization payloads for the latest evaluation, generated on request
+     */
+    getVisualization() {
+        const evaluation = this.lastEvaluation;
+        if (!evaluation) return null;
+
+        return {
+            timestamp: evaluation.timestamp,
+            magnitude: evaluation.unified.magnitude,
+            vector: evaluation.unified.vector,
+            phase: evaluation.unified.phase,
+            resonanceField: evaluation.unified.resonanceField,
+            waveform: evaluation.resonanceSignature.waveform,
+            harmonics: evaluation.resonanceSignature.harmonics,
+            color: evaluation.resonanceSignature.color
+        };
+    }
+
+    resetHistory() {
+        this.coherenceHistory.clear();
+        this.lastEvaluation = null;
+    }
+
     // Evaluate temporal axis: past-present-future alignment
     evaluateTemporalAxis(state, context) {
         const { memoryPatterns = [], awareness = 0.5, intentionality = 0.5 } = state;
@@ -164,12 +327,19 @@ class TriAxialCoherenceSystem {
         // Sacred geometry alignment
         const sacredAlignment = this.calculateSacredAlignment(vector, phase);
 
+        // The 32x32 field is only built if something reads it
+        const system = this;
+        let resonanceField = null;
+
         return {
             magnitude: Math.min(1, magnitude),
             vector,
             phase,
             sacredAlignment,
-            resonanceField: this.generateResonanceField(vector, phase),
+            get resonanceField() {
+                if (!resonanceField) resonanceField = system.generateResonanceField(vector, phase);
+                return resonanceField;
+            },
             quantumState: this.calculateQuantumCoherence(magnitude, sacredAlignment)
         };
     }
@@ -186,23 +356,13 @@ class TriAxialCoherenceSystem {
     }
 
     calculatePresentCoherence(awareness, state) {
-        const presenceFactors = {
-            awareness: awareness || 0.5,
-            attention: state.attention || 0.5,
-            mindfulness: state.mindfulness || 0.5
-        };
-        
-        return Object.values(presenceFactors).reduce((a, b) => a + b) / 3;
+        // Awareness, attention, mindfulness
+        return ((awareness || 0.5) + (state.attention || 0.5) + (state.mindfulness || 0.5)) / 3;
     }
 
     calculateFutureCoherence(intentionality, context) {
-        const futureFactors = {
-            intention: intentionality || 0.5,
-            possibility: context.possibilitySpace || 0.5,
-            destiny: context.destinyAlignment || 0.5
-        };
-        
-        return Object.values(futureFactors).reduce((a, b) => a + b) / 3;
+        // Intention, possibility, destiny
+        return ((intentionality || 0.5) + (context.possibilitySpace || 0.5) + (context.destinyAlignment || 0.5)) / 3;
     }
 
     calculateTemporalFlow(past, present, future) {
@@ -222,25 +382,15 @@ class TriAxialCoherenceSystem {
 
     // Helper methods for dimensional axis
     calculatePhysicalCoherence(state) {
-        const factors = {
-            grounding: state.grounding || 0.5,
-            embodiment: state.embodiment || 0.5,
-            vitality: state.vitality || 0.5,
-            stability: state.stability || 0.5
-        };
-        
-        return Object.values(factors).reduce((a, b) => a + b) / 4;
+        // Grounding, embodiment, vitality, stability
+        return ((state.grounding || 0.5) + (state.embodiment || 0.5) +
+            (state.vitality || 0.5) + (state.stability || 0.5)) / 4;
     }
 
     calculateMentalCoherence(phi, state) {
-        const factors = {
-            clarity: state.clarity || 0.5,
-            focus: state.focus || 0.5,
-            integration: phi,
-            flexibility: state.cognitiveFlexibility || 0.5
-        };
-        
-        return Object.values(factors).reduce((a, b) => a + b) / 4;
+        // Clarity, focus, integration, flexibility
+        return ((state.clarity || 0.5) + (state.focus || 0.5) +
+            phi + (state.cognitiveFlexibility || 0.5)) / 4;
     }
 
     calculateSpiritualCoherence(oversoulResonance, emotionalResonance) {
@@ -253,14 +403,9 @@ class TriAxialCoherenceSystem {
 
     // Helper methods for relational axis
     calculateSelfCoherence(state) {
-        const factors = {
-            identity: state.identityStrength || 0.5,
-            authenticity: state.authenticity || 0.5,
-            sovereignty: state.sovereignty || 0.5,
-            integrity: state.integrity || 0.5
-        };
-        
-        return Object.values(factors).reduce((a, b) => a + b) / 4;
+        // Identity, authenticity, sovereignty, integrity
+        return ((state.identityStrength || 0.5) + (state.authenticity || 0.5) +
+            (state.sovereignty || 0.5) + (state.integrity || 0.5)) / 4;
     }
 
     calculateOtherCoherence(empathy, connection) {
@@ -285,14 +430,12 @@ class TriAxialCoherenceSystem {
         // Platonic solid alignment (tetrahedron)
         const tetrahedralAngle = Math.acos(1/3); // ~70.53 degrees
         
-        // Calculate alignment with sacred angles
-        const alignments = {
-            golden: Math.abs(Math.cos(phase.temporal * this.goldenRatio)),
-            tetrahedral: Math.abs(Math.cos(phase.dimensional - tetrahedralAngle)),
-            unity: Math.abs(Math.cos(phase.relational * Math.PI))
-        };
+        // Calculate alignment with sacred angles: golden, tetrahedral, unity
+        const golden = Math.abs(Math.cos(phase.temporal * this.goldenRatio));
+        const tetrahedral = Math.abs(Math.cos(phase.dimensional - tetrahedralAngle));
+        const unity = Math.abs(Math.cos(phase.relational * Math.PI));
         
-        return Object.values(alignments).reduce((a, b) => a + b) / 3;
+        return (golden + tetrahedral + unity) / 3;
     }
 
     // Quantum coherence calculations
@@ -341,16 +484,29 @@ class TriAxialCoherenceSystem {
         return points;
     }
 
-    // Generate resonance signature
+    // Generate resonance signature; waveform, harmonics and color are built
+    // on first read (a dashboard request or serialization), not per evaluation
     generateResonanceSignature(unifiedCoherence) {
-        const signature = {
+        const system = this;
+        let waveform = null;
+        let harmonics = null;
+        let color = null;
+
+        return {
             frequency: unifiedCoherence.magnitude * 432, // Hz (cosmic frequency)
-            waveform: this.generateWaveform(unifiedCoherence),
-            harmonics: this.generateHarmonics(unifiedCoherence),
-            color: this.coherenceToColor(unifiedCoherence)
+            get waveform() {
+                if (!waveform) waveform = system.generateWaveform(unifiedCoherence);
+                return waveform;
+            },
+            get harmonics() {
+                if (!harmonics) harmonics = system.generateHarmonics(unifiedCoherence);
+                return harmonics;
+            },
+            get color() {
+                if (!color) color = system.coherenceToColor(unifiedCoherence);
+                return color;
+            }
         };
-        
-        return signature;
     }
 
     // Waveform generation
@@ -473,10 +629,9 @@ class TriAxialCoherenceSystem {
     calculateTemporalJerk() {
         if (this.coherenceHistory.length < 3) return 0;
         
-        const n = this.coherenceHistory.length;
-        const current = this.coherenceHistory[n-1].temporal.flow.acceleration;
-        const previous = this.coherenceHistory[n-2].temporal.flow.acceleration;
-        const dt = (this.coherenceHistory[n-1].timestamp - this.coherenceHistory[n-2].timestamp) / 1000;
+        const current = this.coherenceHistory.get('acceleration', 0);
+        const previous = this.coherenceHistory.get('acceleration', 1);
+        const dt = (this.coherenceHistory.get('timestamp', 0) - this.coherenceHistory.get('timestamp', 1)) / 1000;
         
         return (current - previous) / dt;
     }
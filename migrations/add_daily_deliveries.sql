@@ -0,0 +1,19 @@
+-- Checkpoints for the timezone-aware daily inspiration scheduler
+CREATE TABLE IF NOT EXISTS "daily_deliveries" (
+  "id" serial PRIMARY KEY NOT NULL,
+  "user_id" integer NOT NULL REFERENCES "users"("id"),
+  "channel" text NOT NULL,
+  "delivery_date" text NOT NULL,
+  "status" text DEFAULT 'pending' NOT NULL,
+  "attempts" integer DEFAULT 1 NOT NULL,
+  "claimed_at" timestamp DEFAULT now() NOT NULL,
+  "sent_at" timestamp,
+  "error_message" text
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS "daily_deliveries_user_channel_date_idx"
+  ON "daily_deliveries" ("user_id", "channel", "delivery_date");
+
+-- Unsent claims, scanned by the scheduler each tick to retry expired ones
+CREATE INDEX IF NOT EXISTS "daily_deliveries_unsent_claimed_at_idx"
+  ON "daily_deliveries" ("claimed_at") WHERE "status" <> 'sent';
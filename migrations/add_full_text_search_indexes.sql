@@ -0,0 +1,19 @@
+-- Full-text search over journal entries, emails and conversation memories.
+-- Expression indexes rather than stored tsvector columns: Postgres maintains them
+-- on every insert/update, and the row width of hot list queries is unchanged.
+-- The expressions must match journalSearchVector / emailSearchVector /
+-- memorySearchVector in shared/schema.ts exactly.
+CREATE INDEX IF NOT EXISTS "journal_entries_search_idx"
+  ON "journal_entries" USING gin (
+    (setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', content), 'B'))
+  );
+
+CREATE INDEX IF NOT EXISTS "emails_search_idx"
+  ON "emails" USING gin (
+    (setweight(to_tsvector('english', subject), 'A') || setweight(to_tsvector('english', content), 'B'))
+  );
+
+CREATE INDEX IF NOT EXISTS "conversation_memories_search_idx"
+  ON "conversation_memories" USING gin (
+    (setweight(to_tsvector('english', coalesce(topic, '')), 'A') || setweight(to_tsvector('english', context), 'B'))
+  );
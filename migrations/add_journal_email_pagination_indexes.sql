@@ -0,0 +1,17 @@
+-- Store journal tags as jsonb so tag overlap filters (?|) can use a GIN index
+ALTER TABLE "journal_entries"
+  ALTER COLUMN "tags" TYPE jsonb USING "tags"::jsonb;
+
+-- Keyset pagination indexes for journal entries, newest first on (created_at, id)
+CREATE INDEX IF NOT EXISTS "journal_entries_user_created_idx"
+  ON "journal_entries" ("user_id", "created_at" DESC, "id" DESC);
+CREATE INDEX IF NOT EXISTS "journal_entries_user_mood_created_idx"
+  ON "journal_entries" ("user_id", "mood", "created_at" DESC, "id" DESC);
+CREATE INDEX IF NOT EXISTS "journal_entries_tags_gin_idx"
+  ON "journal_entries" USING gin ("tags");
+
+-- Keyset pagination and thread lookup indexes for emails, newest first on (sent_at, id)
+CREATE INDEX IF NOT EXISTS "emails_user_sent_idx"
+  ON "emails" ("user_id", "sent_at" DESC, "id" DESC);
+CREATE INDEX IF NOT EXISTS "emails_user_conversation_idx"
+  ON "emails" ("user_id", "conversation_id", "sent_at" DESC);
@@ -0,0 +1,161 @@
+/**
+ * Database pool / prepared statement benchmark
+ *
+ * Seeds a throwaway user, then times the hot DatabaseStorage lookups as
+ * prepared statements against the same queries built ad hoc, and drives the
+ * pool with concurrent requests to report throughput, checkout wait times
+ * and clients in use.
+ *
+ * Usage (local Postgres over TCP):
+ *   DATABASE_URL=postgres://localhost/flappy DATABASE_DRIVER=pg DATABASE_POOL_MAX=10 \
+ *     npx tsx scripts/benchmark-db-pool.ts [--concurrency=50] [--requests=5000] [--keep]
+ *
+ * Run it with a few DATABASE_POOL_MAX values to pick a pool size: past the
+ * point where wait p95 stops falling, more connections only add server load.
+ */
+import { pool, db, databaseDriver, getPoolMetrics } from "../server/db";
+import { DatabaseStorage } from "../server/database-storage";
+import { users, journalEntries, emailQueue, conversationMemories } from "@shared/schema";
+import { eq, and, desc, getTableColumns, sql } from "drizzle-orm";
+
+const args = process.argv.slice(2);
+const argValue = (name: string, fallback: number) =>
+  parseInt(args.find(arg => arg.startsWith(`--${name}=`))?.split("=")[1] || String(fallback));
+const CONCURRENCY = argValue("concurrency", 50);
+const REQUESTS = argValue("requests", 5000);
+const KEEP_DATA = args.includes("--keep");
+const ITERATIONS = 200;
+const ENTRY_COUNT = 2000;
+const MEMORY_COUNT = 200;
+const PAGE_SIZE = 50;
+
+async function seed(): Promise<number> {
+  const username = `bench_pool_${Date.now()}`;
+  const { rows } = await pool.query(
+    `INSERT INTO users (username, email, password, created_at, updated_at)
+     VALUES ($1, $2, 'benchmark', NOW(), NOW())
+     RETURNING id`,
+    [username, `${username}@benchmark.local`]
+  );
+  const userId: number = rows[0].id;
+
+  await pool.query(
+    `INSERT INTO journal_entries (user_id, title, content, created_at, updated_at)
+     SELECT $1, 'Entry ' || g, 'Benchmark journal entry number ' || g,
+            NOW() - (g || ' minutes')::interval * 15, NOW()
+     FROM generate_series(1, $2::int) AS g`,
+    [userId, ENTRY_COUNT]
+  );
+  await pool.query(
+    `INSERT INTO conversation_memories (user_id, type, topic, context, last_discussed)
+     SELECT $1, CASE WHEN g % 2 = 0 THEN 'journal_topic' ELSE 'conversation' END,
+            'Topic ' || g, 'Benchmark memory ' || g, NOW() - (g || ' hours')::interval
+     FROM generate_series(1, $2::int) AS g`,
+    [userId, MEMORY_COUNT]
+  );
+  await pool.query("ANALYZE journal_entries");
+  await pool.query("ANALYZE conversation_memories");
+  return userId;
+}
+
+async function time(label: string, fn: () => Promise<unknown>) {
+  for (let i = 0; i < 10; i++) {
+    await fn(); // warm every pooled connection's plan cache
+  }
+
+  const samples: number[] = [];
+  for (let i = 0; i < ITERATIONS; i++) {
+    const start = process.hrtime.bigint();
+    await fn();
+    samples.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+
+  samples.sort((a, b) => a - b);
+  const median = samples[Math.floor(samples.length / 2)];
+  const p95 = samples[Math.floor(samples.length * 0.95)];
+  console.log(`${label.padEnd(44)} median ${median.toFixed(3).padStart(8)}ms   p95 ${p95.toFixed(3).padStart(8)}ms`);
+}
+
+async function load(label: string, request: (i: number) => Promise<unknown>) {
+  const before = getPoolMetrics();
+  let peakInUse = 0;
+  let peakWaiting = 0;
+  const sampler = setInterval(() => {
+    const metrics = getPoolMetrics();
+    peakInUse = Math.max(peakInUse, metrics.inUse);
+    peakWaiting = Math.max(peakWaiting, metrics.waiting);
+  }, 5);
+
+  let next = 0;
+  const started = process.hrtime.bigint();
+  await Promise.all(Array.from({ length: CONCURRENCY }, async () => {
+    while (next < REQUESTS) {
+      await request(next++);
+    }
+  }));
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+  clearInterval(sampler);
+
+  const after = getPoolMetrics();
+  console.log(`${label.padEnd(44)} ${(REQUESTS / seconds).toFixed(0).padStart(7)} req/s   ` +
+    `wait p50 ${after.waitMs.p50.toFixed(2)}ms p95 ${after.waitMs.p95.toFixed(2)}ms p99 ${after.waitMs.p99.toFixed(2)}ms   ` +
+    `peak in use ${peakInUse}/${after.max}, peak waiting ${peakWaiting}, ` +
+    `checkouts ${after.acquisitions - before.acquisitions}`);
+}
+
+async function run() {
+  const storage = new DatabaseStorage();
+  const userId = await seed();
+  const metrics = getPoolMetrics();
+  console.log(`Driver ${databaseDriver}, pool max ${metrics.max}, ${ENTRY_COUNT} entries, ${MEMORY_COUNT} memories\n`);
+
+  try {
+    console.log(`Sequential latency (${ITERATIONS} iterations)`);
+    await time("getUser (prepared)", () => storage.getUser(userId));
+    await time("getUser (ad hoc)", () => db.select().from(users).where(eq(users.id, userId)));
+    await time("journal first page (prepared)", () => storage.getJournalEntriesPage(userId, { limit: PAGE_SIZE }));
+    await time("journal first page (ad hoc)", () => db.select({
+        ...getTableColumns(journalEntries),
+        cursorTimestamp: sql<string>`${journalEntries.createdAt}::text`
+      })
+      .from(journalEntries)
+      .where(and(eq(journalEntries.userId, userId)))
+      .orderBy(desc(journalEntries.createdAt), desc(journalEntries.id))
+      .limit(PAGE_SIZE + 1));
+    await time("getNextPendingEmail (prepared)", () => storage.getNextPendingEmail());
+    await time("getNextPendingEmail (ad hoc)", () => db.select().from(emailQueue)
+      .where(eq(emailQueue.status, "pending")).orderBy(emailQueue.createdAt).limit(1));
+    await time("getConversationMemories by type (prepared)", () => storage.getConversationMemories(userId, "conversation"));
+    await time("getConversationMemories by type (ad hoc)", () => db.select().from(conversationMemories)
+      .where(and(eq(conversationMemories.userId, userId), eq(conversationMemories.type, "conversation")))
+      .orderBy(conversationMemories.lastDiscussed));
+
+    console.log(`\nConcurrent load (${REQUESTS} requests, ${CONCURRENCY} in flight)`);
+    await load("getUser", () => storage.getUser(userId));
+    await load("mixed hot lookups", (i) => {
+      switch (i % 4) {
+        case 0: return storage.getUser(userId);
+        case 1: return storage.getJournalEntriesPage(userId, { limit: PAGE_SIZE });
+        case 2: return storage.getNextPendingEmail();
+        default: return storage.getConversationMemories(userId);
+      }
+    });
+  } finally {
+    if (KEEP_DATA) {
+      console.log(`\nKeeping benchmark data for user ${userId}`);
+    } else {
+      await pool.query("DELETE FROM conversation_memories WHERE user_id = $1", [userId]);
+      await pool.query("DELETE FROM journal_entries WHERE user_id = $1", [userId]);
+      await pool.query("DELETE FROM users WHERE id = $1", [userId]);
+      console.log("\nBenchmark data removed");
+    }
+  }
+}
+
+run()
+  .then(() => pool.end())
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error("Benchmark failed:", error);
+    process.exit(1);
+  });
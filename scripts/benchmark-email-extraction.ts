@@ -0,0 +1,72 @@
+/**
+ * Email extraction benchmark
+ *
+ * Measures per-email cost of the extraction pipeline over the sample corpus in
+ * scripts/email-corpus: the structural parse (parseInboundEmail), reply
+ * stripping (extractReplyText) and the full GmailContentParser call.
+ *
+ * Usage:
+ *   npx tsx scripts/benchmark-email-extraction.ts [--iterations=20000]
+ */
+import fs from "fs";
+import path from "path";
+import { fileURLToPath } from "url";
+import { parseInboundEmail, extractReplyText } from "../server/email-extraction";
+import { GmailContentParser } from "../server/gmail-content-parser";
+
+const CORPUS_DIR = path.join(path.dirname(fileURLToPath(import.meta.url)), "email-corpus");
+const args = process.argv.slice(2);
+const ITERATIONS = parseInt(args.find(arg => arg.startsWith("--iterations="))?.split("=")[1] || "20000");
+
+const samples = Object.keys(JSON.parse(fs.readFileSync(path.join(CORPUS_DIR, "expected.json"), "utf8")))
+  .map(file => ({ file, input: fs.readFileSync(path.join(CORPUS_DIR, file), "utf8") }));
+
+// GmailContentParser logs each step; time the work, not the terminal
+const log = console.log;
+const report = (line: string) => log(line);
+console.log = () => {};
+
+function measure(label: string, bytes: number, fn: () => void) {
+  for (let i = 0; i < Math.min(1000, ITERATIONS); i++) fn(); // Warm up the JIT
+
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < ITERATIONS; i++) fn();
+  const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+  const perEmailUs = elapsedMs * 1000 / ITERATIONS;
+  const emailsPerSecond = ITERATIONS / (elapsedMs / 1000);
+  const mbPerSecond = bytes * ITERATIONS / (elapsedMs / 1000) / (1024 * 1024);
+  report(`${label.padEnd(48)} ${perEmailUs.toFixed(2).padStart(9)}µs/email ${Math.round(emailsPerSecond).toString().padStart(9)} emails/s ${mbPerSecond.toFixed(1).padStart(7)} MB/s`);
+}
+
+report(`Email extraction (${samples.length} samples, ${ITERATIONS} iterations each)\n`);
+
+for (const { file, input } of samples) {
+  const bytes = Buffer.byteLength(input);
+  const body = parseInboundEmail(input).body;
+  report(`${file} (${bytes} bytes)`);
+
+  // parseInboundEmail caches the last input, so alternate with an empty
+  // message to force a full parse of the sample every iteration
+  measure("  parseInboundEmail", bytes, () => {
+    parseInboundEmail("");
+    parseInboundEmail(input);
+  });
+  measure("  extractReplyText", Buffer.byteLength(body), () => {
+    extractReplyText(body);
+  });
+  measure("  GmailContentParser.parseContent", bytes, () => {
+    parseInboundEmail("");
+    GmailContentParser.parseContent(input);
+  });
+}
+
+// Whole corpus round robin: each call sees a different message than the last
+const totalBytes = samples.reduce((sum, sample) => sum + Buffer.byteLength(sample.input), 0);
+let next = 0;
+report("");
+measure("Corpus round robin (GmailContentParser)", totalBytes / samples.length, () => {
+  GmailContentParser.parseContent(samples[next++ % samples.length].input);
+});
+
+console.log = log;
@@ -0,0 +1,143 @@
+/**
+ * Journal / email pagination benchmark
+ *
+ * Seeds a throwaway user with 100k journal entries (and 100k emails), then times
+ * the keyset-paginated DatabaseStorage queries against the old unbounded fetch.
+ *
+ * Usage:
+ *   DATABASE_URL=postgres://... npx tsx scripts/benchmark-journal-pagination.ts [--entries=100000] [--keep]
+ *
+ * Run the indexes in migrations/add_journal_email_pagination_indexes.sql first,
+ * otherwise the numbers measure sequential scans.
+ */
+import { pool } from "../server/db";
+import { DatabaseStorage } from "../server/database-storage";
+import { decodeCursor, type JournalFilter } from "../server/storage";
+
+const args = process.argv.slice(2);
+const ENTRY_COUNT = parseInt(args.find(arg => arg.startsWith("--entries="))?.split("=")[1] || "100000");
+const KEEP_DATA = args.includes("--keep");
+const ITERATIONS = 20;
+const PAGE_SIZE = 50;
+const SEED_BATCH = 10000;
+
+const MOODS = ["happy", "calm", "neutral", "sad", "frustrated"];
+const TAGS = ["work", "family", "health", "gratitude", "travel", "sleep", "goals", "friends"];
+
+async function seed(): Promise<number> {
+  const username = `bench_pagination_${Date.now()}`;
+  const { rows } = await pool.query(
+    `INSERT INTO users (username, email, password, created_at, updated_at)
+     VALUES ($1, $2, 'benchmark', NOW(), NOW())
+     RETURNING id`,
+    [username, `${username}@benchmark.local`]
+  );
+  const userId: number = rows[0].id;
+
+  console.log(`Seeding ${ENTRY_COUNT} journal entries and emails for user ${userId}...`);
+  const started = Date.now();
+
+  // Generate rows server-side so seeding 100k entries takes seconds, not minutes
+  for (let offset = 0; offset < ENTRY_COUNT; offset += SEED_BATCH) {
+    const batch = Math.min(SEED_BATCH, ENTRY_COUNT - offset);
+    await pool.query(
+      `INSERT INTO journal_entries (user_id, title, content, created_at, updated_at, mood, tags)
+       SELECT $1,
+              'Entry ' || g,
+              'Benchmark journal entry number ' || g,
+              NOW() - (g || ' minutes')::interval * 15,
+              NOW(),
+              ($4::text[])[1 + g % array_length($4::text[], 1)],
+              jsonb_build_array(
+                ($5::text[])[1 + g % array_length($5::text[], 1)],
+                ($5::text[])[1 + (g / 7) % array_length($5::text[], 1)]
+              )
+       FROM generate_series($2::int, $3::int) AS g`,
+      [userId, offset, offset + batch - 1, MOODS, TAGS]
+    );
+    await pool.query(
+      `INSERT INTO emails (user_id, subject, content, sent_at, type, direction)
+       SELECT $1,
+              'Email ' || g,
+              'Benchmark email number ' || g,
+              NOW() - (g || ' minutes')::interval * 15,
+              CASE WHEN g % 2 = 0 THEN 'inbound' ELSE 'daily_inspiration' END,
+              CASE WHEN g % 2 = 0 THEN 'inbound' ELSE 'outbound' END
+       FROM generate_series($2::int, $3::int) AS g`,
+      [userId, offset, offset + batch - 1]
+    );
+  }
+
+  await pool.query("ANALYZE journal_entries");
+  await pool.query("ANALYZE emails");
+  console.log(`Seeded in ${((Date.now() - started) / 1000).toFixed(1)}s\n`);
+  return userId;
+}
+
+async function time(label: string, fn: () => Promise<unknown>) {
+  await fn(); // warm up connection and plan cache
+
+  const samples: number[] = [];
+  for (let i = 0; i < ITERATIONS; i++) {
+    const start = process.hrtime.bigint();
+    await fn();
+    samples.push(Number(process.hrtime.bigint() - start) / 1e6);
+  }
+
+  samples.sort((a, b) => a - b);
+  const median = samples[Math.floor(samples.length / 2)];
+  const p95 = samples[Math.floor(samples.length * 0.95)];
+  console.log(`${label.padEnd(44)} median ${median.toFixed(2).padStart(9)}ms   p95 ${p95.toFixed(2).padStart(9)}ms`);
+}
+
+async function run() {
+  const storage = new DatabaseStorage();
+  const userId = await seed();
+
+  try {
+    const page = (filter: JournalFilter) => storage.getJournalEntriesPage(userId, { limit: PAGE_SIZE, ...filter });
+
+    // Walk 100 pages deep to get a realistic cursor for the "deep page" case
+    let cursorToken: string | null = null;
+    for (let i = 0; i < 100; i++) {
+      const result = await page({ cursor: cursorToken ? decodeCursor(cursorToken) : undefined });
+      cursorToken = result.nextCursor;
+      if (!cursorToken) break;
+    }
+    const deepCursor = cursorToken ? decodeCursor(cursorToken) : undefined;
+
+    console.log(`Journal entries (${ENTRY_COUNT} rows, page size ${PAGE_SIZE}, ${ITERATIONS} iterations)`);
+    await time("first page", () => page({}));
+    await time("page 100 via cursor", () => page({ cursor: deepCursor }));
+    await time("mood = calm", () => page({ mood: "calm" }));
+    await time("tags ?| [travel, sleep]", () => page({ tags: ["travel", "sleep"] }));
+    await time("dateRange = 30days + mood + tags", () => page({ dateRange: "30days", mood: "sad", tags: ["work"] }));
+    await time("page 100 via OFFSET (baseline)", () => pool.query(
+      `SELECT * FROM journal_entries WHERE user_id = $1
+       ORDER BY created_at DESC, id DESC LIMIT $2 OFFSET $3`,
+      [userId, PAGE_SIZE, PAGE_SIZE * 100]
+    ));
+    await time("unbounded fetch (previous behaviour)", () => storage.getJournalEntries(userId));
+
+    console.log(`\nEmails (${ENTRY_COUNT} rows, page size ${PAGE_SIZE})`);
+    await time("first page", () => storage.getEmailsPage(userId, { limit: PAGE_SIZE }));
+    await time("type = inbound", () => storage.getEmailsPage(userId, { limit: PAGE_SIZE, type: "inbound" }));
+    await time("unbounded fetch (previous behaviour)", () => storage.getEmails(userId));
+  } finally {
+    if (KEEP_DATA) {
+      console.log(`\nKeeping benchmark data for user ${userId}`);
+    } else {
+      await pool.query("DELETE FROM journal_entries WHERE user_id = $1", [userId]);
+      await pool.query("DELETE FROM emails WHERE user_id = $1", [userId]);
+      await pool.query("DELETE FROM users WHERE id = $1", [userId]);
+      console.log("\nBenchmark data removed");
+    }
+  }
+}
+
+run()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error("Benchmark failed:", error);
+    process.exit(1);
+  });
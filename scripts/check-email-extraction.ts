@@ -0,0 +1,71 @@
+/**
+ * Email extraction correctness suite
+ *
+ * Runs every sample in scripts/email-corpus through GmailContentParser and
+ * EmailContentExtractor and compares the result with expected.json.
+ *
+ * Usage:
+ *   npx tsx scripts/check-email-extraction.ts [--verbose]
+ */
+import fs from "fs";
+import path from "path";
+import { fileURLToPath } from "url";
+import { GmailContentParser } from "../server/gmail-content-parser";
+import { EmailContentExtractor } from "../server/email-content-extractor";
+
+const CORPUS_DIR = path.join(path.dirname(fileURLToPath(import.meta.url)), "email-corpus");
+const VERBOSE = process.argv.includes("--verbose");
+
+type Expected = {
+  sender: string;
+  subject: string;
+  content: string;
+  messageId?: string;
+  inReplyTo?: string;
+  references?: string;
+};
+
+// The parsers log every step; keep the report readable unless asked otherwise
+function quietly<T>(fn: () => T): T {
+  if (VERBOSE) return fn();
+  const log = console.log;
+  console.log = () => {};
+  try {
+    return fn();
+  } finally {
+    console.log = log;
+  }
+}
+
+function compare(label: string, actual: Record<string, unknown>, expected: Record<string, unknown>): string[] {
+  return Object.keys(expected)
+    .filter(key => actual[key] !== expected[key])
+    .map(key => `  ${label}.${key}\n    expected: ${JSON.stringify(expected[key])}\n    actual:   ${JSON.stringify(actual[key])}`);
+}
+
+const expectations: Record<string, Expected> = JSON.parse(fs.readFileSync(path.join(CORPUS_DIR, "expected.json"), "utf8"));
+let failures = 0;
+
+for (const [file, expected] of Object.entries(expectations)) {
+  const input = fs.readFileSync(path.join(CORPUS_DIR, file), "utf8");
+
+  const gmail = quietly(() => GmailContentParser.parseContent(input));
+  const extractor = quietly(() => EmailContentExtractor.extractFromMultipart(input));
+
+  const { messageId, references, ...extractorExpected } = expected;
+  const errors = [
+    ...compare("GmailContentParser", gmail, expected),
+    ...compare("EmailContentExtractor", extractor, extractorExpected)
+  ];
+
+  if (errors.length === 0) {
+    console.log(`✓ ${file}`);
+  } else {
+    failures++;
+    console.log(`✗ ${file}\n${errors.join("\n")}`);
+  }
+}
+
+const total = Object.keys(expectations).length;
+console.log(`\n${total - failures}/${total} samples passed`);
+process.exit(failures === 0 ? 0 : 1);
@@ -1,22 +1,131 @@
 import { 
   users, journalEntries, emails, smsMessages, paymentMethods, billingTransactions, conversationMemories, emailQueue,
+  dailyDeliveries, type DailyDelivery,
   type User, type InsertUser, type JournalEntry, type InsertJournalEntry, 
   type Email, type InsertEmail, type UpdateUserPreferences, type SmsMessage, 
   type InsertSmsMessage, type PaymentMethod, type InsertPaymentMethod,
   type BillingTransaction, type InsertBillingTransaction,
   type ConversationMemory, type InsertConversationMemory, type PaymentDetails,
-  type UserPreferences, type EmailQueueItem, type InsertEmailQueue
+  type UserPreferences, type EmailQueueItem, type InsertEmailQueue,
+  journalSearchVector, emailSearchVector, memorySearchVector
 } from "@shared/schema";
 import crypto from "crypto";
 import { db } from "./db";
-import { eq, and, gte, or, inArray, sql } from "drizzle-orm";
+import { eq, and, gte, or, inArray, sql, desc, getTableColumns, type SQL } from "drizzle-orm";
 import connectPg from "connect-pg-simple";
 import session from "express-session";
 import { pool } from "./db";
-import { IStorage, JournalFilter, EmailFilter, SmsFilter } from "./storage";
+import type { IStorage } from "./storage";
+import { 
+  JournalFilter, EmailFilter, SmsFilter, Page,
+  SearchOptions, SearchResult, SearchSource, SEARCH_SOURCES,
+  DeliveryChannel, DELIVERY_CLAIM_TIMEOUT_MS, MAX_DELIVERY_ATTEMPTS,
+  encodeCursor, getDateRangeCutoff
+} from "./storage-shared";
+import { HIGHLIGHT_START, HIGHLIGHT_END } from "./search-index";
 
 const PostgresSessionStore = connectPg(session);
 
+// ts_headline settings; snippets use the same markers as the in-memory SearchIndex
+const HEADLINE_OPTIONS = `StartSel="${HIGHLIGHT_START}", StopSel="${HIGHLIGHT_END}", MaxWords=30, MinWords=12, MaxFragments=2, FragmentDelimiter=" ... "`;
+
+// One UNION ALL branch per searchable table. Each branch filters through the
+// table's GIN expression index and yields (source, id, title, body, created_at, rank).
+const SEARCH_BRANCHES: Record<SearchSource, (userId: number) => SQL> = {
+  journal: (userId) => sql`
+    SELECT 'journal' AS source, id, title, content AS body, created_at,
+           ts_rank_cd(${journalSearchVector}, search_query.q) AS rank
+    FROM journal_entries, search_query
+    WHERE user_id = ${userId} AND ${journalSearchVector} @@ search_query.q`,
+  email: (userId) => sql`
+    SELECT 'email' AS source, id, subject AS title, content AS body, sent_at AS created_at,
+           ts_rank_cd(${emailSearchVector}, search_query.q) AS rank
+    FROM emails, search_query
+    WHERE user_id = ${userId} AND ${emailSearchVector} @@ search_query.q`,
+  memory: (userId) => sql`
+    SELECT 'memory' AS source, id, topic AS title, context AS body, first_mentioned_at AS created_at,
+           ts_rank_cd(${memorySearchVector}, search_query.q) AS rank
+    FROM conversation_memories, search_query
+    WHERE user_id = ${userId} AND ${memorySearchVector} @@ search_query.q`,
+};
+
+// Turn a keyset query result into a page. Queries select one row more than the
+// page size so we know whether a next page exists without a COUNT(*).
+function toPage<T extends { id: number; cursorTimestamp: string }>(
+  rows: T[],
+  limit?: number
+): Page<Omit<T, "cursorTimestamp">> {
+  const hasMore = limit !== undefined && rows.length > limit;
+  const pageRows = hasMore ? rows.slice(0, limit) : rows;
+  const items = pageRows.map(({ cursorTimestamp, ...item }) => item);
+  const last = pageRows[pageRows.length - 1];
+  
+  return {
+    items,
+    nextCursor: hasMore ? encodeCursor({ timestamp: last.cursorTimestamp, id: last.id }) : null
+  };
+}
+
+// Journal columns plus the created_at text the page cursor is built from
+const journalPageColumns = {
+  ...getTableColumns(journalEntries),
+  cursorTimestamp: sql<string>`${journalEntries.createdAt}::text`
+};
+
+// Named prepared statements for the hottest lookups. Postgres parses and plans
+// each once per pooled connection instead of on every call.
+const preparedQueries = {
+  userById: db.select()
+    .from(users)
+    .where(eq(users.id, sql.placeholder("id")))
+    .prepare("user_by_id"),
+
+  journalEntriesByUser: db.select(journalPageColumns)
+    .from(journalEntries)
+    .where(eq(journalEntries.userId, sql.placeholder("userId")))
+    .orderBy(desc(journalEntries.createdAt), desc(journalEntries.id))
+    .prepare("journal_entries_by_user"),
+
+  journalPageByUser: db.select(journalPageColumns)
+    .from(journalEntries)
+    .where(eq(journalEntries.userId, sql.placeholder("userId")))
+    .orderBy(desc(journalEntries.createdAt), desc(journalEntries.id))
+    .limit(sql.placeholder("limit"))
+    .prepare("journal_page_by_user"),
+
+  journalPageByUserAfterCursor: db.select(journalPageColumns)
+    .from(journalEntries)
+    .where(and(
+      eq(journalEntries.userId, sql.placeholder("userId")),
+      sql`(${journalEntries.createdAt}, ${journalEntries.id}) < (${sql.placeholder("cursorTimestamp")}::timestamp, ${sql.placeholder("cursorId")})`
+    ))
+    .orderBy(desc(journalEntries.createdAt), desc(journalEntries.id))
+    .limit(sql.placeholder("limit"))
+    .prepare("journal_page_by_user_after_cursor"),
+
+  nextPendingEmail: db.select()
+    .from(emailQueue)
+    .where(eq(emailQueue.status, "pending"))
+    .orderBy(emailQueue.createdAt)
+    .limit(1)
+    .prepare("next_pending_email"),
+
+  conversationMemoriesByUser: db.select()
+    .from(conversationMemories)
+    .where(eq(conversationMemories.userId, sql.placeholder("userId")))
+    .orderBy(conversationMemories.lastDiscussed)
+    .prepare("conversation_memories_by_user"),
+
+  conversationMemoriesByUserAndType: db.select()
+    .from(conversationMemories)
+    .where(and(
+      eq(conversationMemories.userId, sql.placeholder("userId")),
+      eq(conversationMemories.type, sql.placeholder("type"))
+    ))
+    .orderBy(conversationMemories.lastDiscussed)
+    .prepare("conversation_memories_by_user_and_type"),
+};
+
 export class DatabaseStorage implements IStorage {
   sessionStore: any; // Using any type to avoid SessionStore type issues
 
@@ -41,7 +150,7 @@ export class DatabaseStorage implements IStorage {
   async getUser(id: number): Promise<User | undefined> {
     try {
       // Using Drizzle ORM to handle column name mappings automatically
-      const [user] = await db.select().from(users).where(eq(users.id, id));
+      const [user] = await preparedQueries.userById.execute({ id });
       return user;
     } catch (error) {
       console.error("Error getting user by id:", error);
@@ -490,50 +599,61 @@ export class DatabaseStorage implements IStorage {
   }
 
   async getJournalEntries(userId: number, filter?: JournalFilter): Promise<JournalEntry[]> {
-    // Build the query conditions
-    let conditions = [eq(journalEntries.userId, userId)];
+    const page = await this.getJournalEntriesPage(userId, filter);
+    return page.items;
+  }
+
+  async getJournalEntriesPage(userId: number, filter?: JournalFilter): Promise<Page<JournalEntry>> {
+    // Every filter is evaluated in SQL so the (user_id, created_at, id) and tags GIN indexes do the work
+    const conditions: SQL[] = [eq(journalEntries.userId, userId)];
+    const startDate = filter?.createdAfter ?? getDateRangeCutoff(filter?.dateRange);
     
-    // Apply filters
-    if (filter) {
-      if (filter.dateRange && filter.dateRange !== 'all') {
-        const now = new Date();
-        let startDate = new Date();
-        
-        switch (filter.dateRange) {
-          case '7days':
-            startDate.setDate(now.getDate() - 7);
-            break;
-          case '30days':
-            startDate.setDate(now.getDate() - 30);
-            break;
-          case 'year':
-            startDate.setFullYear(now.getFullYear() - 1);
-            break;
-        }
-        
-        conditions.push(gte(journalEntries.createdAt, startDate));
+    // Unfiltered listing and cursor paging are the common cases; they use the
+    // prepared statements, anything else is built below
+    if (!startDate && !filter?.mood && !filter?.tags?.length) {
+      if (!filter?.cursor && !filter?.limit) {
+        return toPage(await preparedQueries.journalEntriesByUser.execute({ userId }));
       }
-      
-      if (filter.mood) {
-        conditions.push(eq(journalEntries.mood, filter.mood));
+      if (filter?.limit && filter.cursor) {
+        const rows = await preparedQueries.journalPageByUserAfterCursor.execute({
+          userId,
+          cursorTimestamp: filter.cursor.timestamp,
+          cursorId: filter.cursor.id,
+          limit: filter.limit + 1
+        });
+        return toPage(rows, filter.limit);
+      }
+      if (filter?.limit) {
+        const rows = await preparedQueries.journalPageByUser.execute({ userId, limit: filter.limit + 1 });
+        return toPage(rows, filter.limit);
       }
     }
     
-    // Execute the query with all conditions
-    const entries = await db.select()
-      .from(journalEntries)
-      .where(and(...conditions))
-      .orderBy(journalEntries.createdAt);
+    if (startDate) {
+      conditions.push(gte(journalEntries.createdAt, startDate));
+    }
+    
+    if (filter?.mood) {
+      conditions.push(eq(journalEntries.mood, filter.mood));
+    }
     
-    // Additional filtering for tags if needed - must be done in memory
-    let filteredEntries = [...entries];
     if (filter?.tags?.length) {
-      filteredEntries = filteredEntries.filter(entry => 
-        entry.tags && filter.tags!.some(tag => entry.tags!.includes(tag))
-      );
+      // jsonb ?| matches entries sharing at least one of the tags
+      const tagList = sql.join(filter.tags.map(tag => sql`${tag}`), sql`, `);
+      conditions.push(sql`${journalEntries.tags} ?| array[${tagList}]::text[]`);
+    }
+    
+    if (filter?.cursor) {
+      conditions.push(sql`(${journalEntries.createdAt}, ${journalEntries.id}) < (${filter.cursor.timestamp}::timestamp, ${filter.cursor.id})`);
     }
     
-    return filteredEntries.reverse(); // newest first
+    const query = db.select(journalPageColumns)
+      .from(journalEntries)
+      .where(and(...conditions))
+      .orderBy(desc(journalEntries.createdAt), desc(journalEntries.id)); // newest first
+    
+    const rows = filter?.limit ? await query.limit(filter.limit + 1) : await query;
+    return toPage(rows, filter?.limit);
   }
 
   async getJournalEntry(id: number): Promise<JournalEntry | undefined> {
@@ -571,8 +691,13 @@ export class DatabaseStorage implements IStorage {
   }
 
   async getEmails(userId: number, filter?: EmailFilter): Promise<Email[]> {
+    const page = await this.getEmailsPage(userId, filter);
+    return page.items;
+  }
+
+  async getEmailsPage(userId: number, filter?: EmailFilter): Promise<Page<Email>> {
     // Build the query conditions
-    let conditions = [eq(emails.userId, userId)];
+    const conditions: SQL[] = [eq(emails.userId, userId)];
     
     // Apply filters
     if (filter) {
@@ -584,33 +709,34 @@ export class DatabaseStorage implements IStorage {
         conditions.push(eq(emails.isRead, filter.isRead));
       }
       
-      if (filter.dateRange && filter.dateRange !== 'all') {
-        const now = new Date();
-        let startDate = new Date();
-        
-        switch (filter.dateRange) {
-          case '7days':
-            startDate.setDate(now.getDate() - 7);
-            break;
-          case '30days':
-            startDate.setDate(now.getDate() - 30);
-            break;
-          case 'year':
-            startDate.setFullYear(now.getFullYear() - 1);
-            break;
-        }
-        
+      if (filter.conversationId) {
+        conditions.push(eq(emails.conversationId, filter.conversationId));
+      }
+      
+      if (filter.messageId) {
+        conditions.push(eq(emails.messageId, filter.messageId));
+      }
+      
+      const startDate = getDateRangeCutoff(filter.dateRange);
+      if (startDate) {
         conditions.push(gte(emails.sentAt, startDate));
       }
+      
+      if (filter.cursor) {
+        conditions.push(sql`(${emails.sentAt}, ${emails.id}) < (${filter.cursor.timestamp}::timestamp, ${filter.cursor.id})`);
+      }
     }
     
-    // Execute the query with all conditions
-    const userEmails = await db.select()
+    const query = db.select({
+        ...getTableColumns(emails),
+        cursorTimestamp: sql<string>`${emails.sentAt}::text`
+      })
       .from(emails)
       .where(and(...conditions))
-      .orderBy(emails.sentAt);
+      .orderBy(desc(emails.sentAt), desc(emails.id)); // newest first
     
-    return userEmails.reverse(); // newest first
+    const rows = filter?.limit ? await query.limit(filter.limit + 1) : await query;
+    return toPage(rows, filter?.limit);
   }
 
   async getEmail(id: number): Promise<Email | undefined> {
@@ -707,16 +833,9 @@ export class DatabaseStorage implements IStorage {
 
   // Conversation Memory methods
   async getConversationMemories(userId: number, type?: string): Promise<ConversationMemory[]> {
-    let conditions = [eq(conversationMemories.userId, userId)];
-    
-    if (type) {
-      conditions.push(eq(conversationMemories.type, type));
-    }
-    
-    const memories = await db.select()
-      .from(conversationMemories)
-      .where(and(...conditions))
-      .orderBy(conversationMemories.lastDiscussed);
+    const memories = type
+      ? await preparedQueries.conversationMemoriesByUserAndType.execute({ userId, type })
+      : await preparedQueries.conversationMemoriesByUser.execute({ userId });
     
     return memories.reverse(); // Most recent first
   }
@@ -778,6 +897,99 @@ export class DatabaseStorage implements IStorage {
     return updatedMemory;
   }
 
+  // Daily delivery checkpoints
+  async claimDailyDelivery(userId: number, channel: DeliveryChannel, deliveryDate: string): Promise<DailyDelivery | undefined> {
+    // Insert a pending claim, or take over a failed / abandoned one. The unique
+    // (user_id, channel, delivery_date) index makes this safe across processes.
+    const staleBefore = new Date(Date.now() - DELIVERY_CLAIM_TIMEOUT_MS);
+    const [claimed] = await db
+      .insert(dailyDeliveries)
+      .values({ userId, channel, deliveryDate })
+      .onConflictDoUpdate({
+        target: [dailyDeliveries.userId, dailyDeliveries.channel, dailyDeliveries.deliveryDate],
+        set: {
+          status: "pending",
+          attempts: sql`${dailyDeliveries.attempts} + 1`,
+          claimedAt: new Date(),
+          errorMessage: null
+        },
+        setWhere: sql`${dailyDeliveries.attempts} < ${MAX_DELIVERY_ATTEMPTS} AND (
+          ${dailyDeliveries.status} = 'failed' OR
+          (${dailyDeliveries.status} = 'pending' AND ${dailyDeliveries.claimedAt} < ${staleBefore})
+        )`
+      })
+      .returning();
+    
+    return claimed;
+  }
+  
+  async markDailyDeliverySent(id: number): Promise<DailyDelivery | undefined> {
+    const [updated] = await db
+      .update(dailyDeliveries)
+      .set({ status: "sent", sentAt: new Date() })
+      .where(eq(dailyDeliveries.id, id))
+      .returning();
+    
+    return updated;
+  }
+  
+  async markDailyDeliveryFailed(id: number, errorMessage: string): Promise<DailyDelivery | undefined> {
+    const [updated] = await db
+      .update(dailyDeliveries)
+      .set({ status: "failed", errorMessage })
+      .where(eq(dailyDeliveries.id, id))
+      .returning();
+    
+    return updated;
+  }
+  
+  async getRetryableDailyDeliveries(since: Date): Promise<DailyDelivery[]> {
+    // Same conditions claimDailyDelivery takes over a row on, except that failed
+    // rows also wait out the claim timeout so retries are spaced apart
+    const staleBefore = new Date(Date.now() - DELIVERY_CLAIM_TIMEOUT_MS);
+    return db
+      .select()
+      .from(dailyDeliveries)
+      .where(sql`${dailyDeliveries.status} <> 'sent' AND
+        ${dailyDeliveries.attempts} < ${MAX_DELIVERY_ATTEMPTS} AND
+        ${dailyDeliveries.claimedAt} >= ${since} AND
+        ${dailyDeliveries.claimedAt} < ${staleBefore}`);
+  }
+
+  // Full-text search
+  async searchContent(userId: number, query: string, options?: SearchOptions): Promise<SearchResult[]> {
+    const sources = options?.sources?.length ? options.sources : SEARCH_SOURCES;
+    const limit = options?.limit ?? 20;
+    const branches = sources.map(source => SEARCH_BRANCHES[source](userId));
+    
+    // Rank and limit first, then build headlines for the surviving rows only -
+    // ts_headline re-parses the whole document and is the expensive part.
+    // Bodies are HTML-escaped before highlighting so snippets are safe to render.
+    const result = await db.execute(sql`
+      WITH search_query AS (SELECT websearch_to_tsquery('english', ${query}) AS q),
+      ranked AS (
+        ${sql.join(branches, sql` UNION ALL `)}
+        ORDER BY rank DESC
+        LIMIT ${limit}
+      )
+      SELECT ranked.source, ranked.id, ranked.title, ranked.created_at, ranked.rank,
+             ts_headline('english',
+               replace(replace(replace(ranked.body, '&', '&amp;'), '<', '&lt;'), '>', '&gt;'),
+               search_query.q, ${HEADLINE_OPTIONS}) AS snippet
+      FROM ranked, search_query
+      ORDER BY ranked.rank DESC
+    `);
+    
+    return result.rows.map((row: any) => ({
+      source: row.source,
+      id: row.id,
+      title: row.title,
+      snippet: row.snippet,
+      rank: Number(row.rank),
+      createdAt: new Date(row.created_at)
+    }));
+  }
+
   // Password reset methods
   async updateUserResetToken(userId: number, resetToken: string, resetTokenExpires: Date): Promise<User> {
     try {
@@ -843,12 +1055,7 @@ export class DatabaseStorage implements IStorage {
   }
   
   async getNextPendingEmail(): Promise<EmailQueueItem | undefined> {
-    const [nextItem] = await db
-      .select()
-      .from(emailQueue)
-      .where(eq(emailQueue.status, "pending"))
-      .orderBy(emailQueue.createdAt)
-      .limit(1);
+    const [nextItem] = await preparedQueries.nextPendingEmail.execute();
       
     return nextItem;
   }
@@ -1,5 +1,7 @@
-import { Pool, neonConfig } from '@neondatabase/serverless';
-import { drizzle } from 'drizzle-orm/neon-serverless';
+import { Pool as NeonPool, neonConfig } from '@neondatabase/serverless';
+import { drizzle as drizzleNeon, type NeonDatabase } from 'drizzle-orm/neon-serverless';
+import { drizzle as drizzleNodePg } from 'drizzle-orm/node-postgres';
+import pg from "pg";
 import ws from "ws";
 import * as schema from "@shared/schema";
 
@@ -11,5 +13,139 @@ if (!process.env.DATABASE_URL) {
   );
 }
 
-export const pool = new Pool({ connectionString: process.env.DATABASE_URL });
-export const db = drizzle({ client: pool, schema });
\ No newline at end of file
+/**
+ * Driver selection and pool sizing
+ *
+ * DATABASE_DRIVER=pg uses node-postgres over plain TCP (local or regular
+ * Postgres); DATABASE_DRIVER=neon uses the Neon serverless driver over
+ * WebSockets. When unset, Neon hosts get the Neon driver and everything
+ * else gets node-postgres.
+ */
+export type DatabaseDriver = "pg" | "neon";
+
+function resolveDriver(connectionString: string): DatabaseDriver {
+  const configured = process.env.DATABASE_DRIVER?.toLowerCase();
+  if (configured === "pg" || configured === "neon") {
+    return configured;
+  }
+  return /\.neon\.tech\b/.test(connectionString) ? "neon" : "pg";
+}
+
+function intFromEnv(name: string, fallback: number): number {
+  const value = parseInt(process.env[name] || "");
+  return isNaN(value) ? fallback : value;
+}
+
+export const databaseDriver = resolveDriver(process.env.DATABASE_URL);
+
+const poolConfig = {
+  connectionString: process.env.DATABASE_URL,
+  max: intFromEnv("DATABASE_POOL_MAX", 10),
+  idleTimeoutMillis: intFromEnv("DATABASE_POOL_IDLE_TIMEOUT_MS", 30000),
+  connectionTimeoutMillis: intFromEnv("DATABASE_POOL_CONNECTION_TIMEOUT_MS", 5000),
+};
+
+export const pool: pg.Pool = databaseDriver === "neon"
+  ? new NeonPool(poolConfig) as unknown as pg.Pool
+  : new pg.Pool(poolConfig);
+
+// Both drivers build the same queries; the cast keeps one db type for callers
+export const db: NeonDatabase<typeof schema> = databaseDriver === "neon"
+  ? drizzleNeon({ client: pool as unknown as NeonPool, schema })
+  : drizzleNodePg({ client: pool, schema }) as unknown as NeonDatabase<typeof schema>;
+
+pool.on("error", (error) => {
+  // An idle client lost its connection; the pool replaces it on next use
+  console.error("Database pool error:", error.message);
+});
+
+/**
+ * Pool metrics
+ *
+ * Every checkout (including the implicit one in pool.query) is timed from
+ * request to client handed over, so wait time shows when the pool is
+ * saturated. Recent waits are kept in a fixed ring for percentiles.
+ */
+const WAIT_SAMPLES = 1024;
+const waitSamples = new Float64Array(WAIT_SAMPLES);
+let waitSampleCount = 0;
+let acquisitions = 0;
+let acquireErrors = 0;
+let totalWaitMs = 0;
+let maxWaitMs = 0;
+
+function recordWait(ms: number) {
+  waitSamples[waitSampleCount % WAIT_SAMPLES] = ms;
+  waitSampleCount++;
+  acquisitions++;
+  totalWaitMs += ms;
+  if (ms > maxWaitMs) {
+    maxWaitMs = ms;
+  }
+}
+
+type ConnectCallback = (error: Error | undefined, client?: pg.PoolClient, release?: (error?: Error | boolean) => void) => void;
+
+const connect = pool.connect.bind(pool) as (callback?: ConnectCallback) => Promise<pg.PoolClient> | void;
+
+// pool.query() checks out through this.connect(callback), so patching the
+// instance covers both explicit and implicit checkouts
+(pool as any).connect = (callback?: ConnectCallback) => {
+  const started = performance.now();
+  if (callback) {
+    return connect((error, client, release) => {
+      if (error) {
+        acquireErrors++;
+      } else {
+        recordWait(performance.now() - started);
+      }
+      callback(error, client, release);
+    });
+  }
+  return (connect() as Promise<pg.PoolClient>).then(
+    (client) => {
+      recordWait(performance.now() - started);
+      return client;
+    },
+    (error) => {
+      acquireErrors++;
+      throw error;
+    }
+  );
+};
+
+export interface PoolMetrics {
+  driver: DatabaseDriver;
+  max: number;
+  total: number;
+  idle: number;
+  inUse: number;
+  waiting: number;
+  acquisitions: number;
+  acquireErrors: number;
+  waitMs: { mean: number; p50: number; p95: number; p99: number; max: number };
+}
+
+export function getPoolMetrics(): PoolMetrics {
+  const count = Math.min(waitSampleCount, WAIT_SAMPLES);
+  const recent = waitSamples.slice(0, count).sort();
+  const percentile = (quantile: number) => count === 0 ? 0 : recent[Math.min(count - 1, Math.floor(count * quantile))];
+
+  return {
+    driver: databaseDriver,
+    max: poolConfig.max,
+    total: pool.totalCount,
+    idle: pool.idleCount,
+    inUse: pool.totalCount - pool.idleCount,
+    waiting: pool.waitingCount,
+    acquisitions,
+    acquireErrors,
+    waitMs: {
+      mean: acquisitions === 0 ? 0 : totalWaitMs / acquisitions,
+      p50: percentile(0.5),
+      p95: percentile(0.95),
+      p99: percentile(0.99),
+      max: maxWaitMs,
+    },
+  };
+}
@@ -0,0 +1,511 @@
+/**
+ * Single-pass extraction engine for inbound email.
+ *
+ * parseInboundEmail() walks a SendGrid multipart/form-data post (or a raw MIME
+ * message) once, building a ParsedInboundEmail that GmailContentParser,
+ * EmailContentExtractor and the email processor all share. Reply text is then
+ * isolated with a line-oriented state machine instead of repeated regex
+ * passes over the whole message. All patterns are compiled once at load.
+ */
+
+const LINE_BREAK = /\r\n|\r|\n/;
+const BLANK_LINE = /\r?\n\r?\n/;
+const HEADER_LINE = /^([!-9;-~]+):[ \t]*(.*)$/;
+const FOLDED_WHITESPACE = /\r?\n[ \t]+/g;
+const ENCODED_WORD = /=\?([^?]+)\?([bq])\?([^?]*)\?=/gi;
+const ENCODED_WORD_GAP = /(\?=)\s+(=\?)/g;
+const ANGLE_ADDRESS = /<([^>]+)>/;
+const MESSAGE_ID = /<([^>]+)>/;
+const FIELD_NAME = /\bname="([^"]*)"/i;
+const FIELD_FILENAME = /\bfilename="([^"]*)"/i;
+const BOUNDARY_PARAM = /\bboundary="?([^";]+)"?/i;
+const CHARSET_PARAM = /\bcharset="?([^";]+)"?/i;
+const WHITESPACE = /\s+/g;
+const TRAILING_WHITESPACE = /\s+$/;
+const UNDERSCORE = /_/g;
+
+// Reply boundaries recognised by extractReplyText
+const SIGNATURE_DELIMITER = /^--[ \t]?$/;
+const SIGN_OFF = /^(?:(?:best|kind|warm)(?: regards)?|regards|sincerely|cheers|thanks)[,!]?$/i;
+const MOBILE_FOOTER = /^(?:sent from my \w+|get outlook for \w+)/i;
+const FORWARD_SEPARATOR = /^-{2,}\s*(?:original message|forwarded message)\s*-{2,}$/i;
+const QUOTE_INTRO = /^on\s.+/i;
+const QUOTE_INTRO_END = /wrote:$/i;
+const OUTLOOK_FROM = /^from:\s/i;
+const OUTLOOK_SENT = /^(?:sent|date):\s/i;
+// A sign-off only ends the reply when what follows it is a signature this small
+const MAX_SIGNATURE_LINES = 4;
+const MAX_SIGNATURE_LINE_LENGTH = 40;
+const SENTENCE_END = /[.!?]$/;
+
+// HTML fallback when a message has no text/plain body
+const HTML_IGNORED_BLOCKS = /<(style|script|head)\b[^>]*>[\s\S]*?<\/\1>/gi;
+const HTML_LINE_BREAKS = /<br\s*\/?>|<\/(?:p|div|li|tr|h[1-6])>/gi;
+const HTML_TAGS = /<[^>]+>/g;
+const HTML_ENTITIES = /&(nbsp|amp|lt|gt|quot|#39);/g;
+const GMAIL_QUOTE = /<(?:div|blockquote)\b[^>]*class="gmail_quote[^"]*"/i;
+
+const HTML_ENTITY_VALUES: Record<string, string> = {
+  nbsp: ' ',
+  amp: '&',
+  lt: '<',
+  gt: '>',
+  quot: '"',
+  '#39': "'"
+};
+
+// Nested multiparts deeper than this are ignored
+const MAX_MIME_DEPTH = 5;
+
+// SendGrid fields that carry the plain-text body, in order of preference
+const TEXT_FIELDS = ['text', 'plain', 'body-plain', 'body'];
+
+export type ParsedInboundEmail = {
+  isFormData: boolean;
+  fields: Map<string, string>; // Form-data fields, excluding file uploads
+  headers: Map<string, string>; // Lowercased names, unfolded values
+  text: string | null; // Decoded text/plain body of the raw message
+  html: string | null; // Decoded text/html body of the raw message
+  sender: string;
+  subject: string;
+  body: string; // Best available plain-text body, before reply stripping
+  messageId?: string;
+  inReplyTo?: string;
+  references?: string;
+};
+
+type MimeBodies = {
+  text: string | null;
+  html: string | null;
+};
+
+function toBufferEncoding(charset: string | undefined): BufferEncoding {
+  switch ((charset || '').toLowerCase()) {
+    case 'iso-8859-1':
+    case 'latin1':
+    case 'windows-1252':
+    case 'cp1252':
+      return 'latin1';
+    default:
+      return 'utf8';
+  }
+}
+
+function hexValue(byte: number): number {
+  if (byte >= 0x30 && byte <= 0x39) return byte - 0x30;
+  if (byte >= 0x41 && byte <= 0x46) return byte - 0x37;
+  if (byte >= 0x61 && byte <= 0x66) return byte - 0x57;
+  return -1;
+}
+
+/**
+ * Decode quoted-printable text in one pass over its bytes, so multi-byte
+ * UTF-8 sequences like =E2=80=99 come out as a single character
+ */
+export function decodeQuotedPrintable(text: string, charset?: string): string {
+  const input = Buffer.from(text, 'utf8');
+  const output = Buffer.alloc(input.length);
+  let length = 0;
+
+  for (let i = 0; i < input.length; i++) {
+    const byte = input[i];
+    if (byte === 0x3d) { // '='
+      if (input[i + 1] === 0x0d && input[i + 2] === 0x0a) { // Soft line break
+        i += 2;
+        continue;
+      }
+      if (input[i + 1] === 0x0a) {
+        i += 1;
+        continue;
+      }
+      const high = hexValue(input[i + 1]);
+      const low = hexValue(input[i + 2]);
+      if (high !== -1 && low !== -1) {
+        output[length++] = high * 16 + low;
+        i += 2;
+        continue;
+      }
+    }
+    output[length++] = byte;
+  }
+
+  return output.subarray(0, length).toString(toBufferEncoding(charset));
+}
+
+/**
+ * Decode RFC 2047 encoded words such as =?UTF-8?B?...?= in header values
+ */
+function decodeHeaderValue(value: string): string {
+  if (value.indexOf('=?') === -1) {
+    return value;
+  }
+  return value
+    .replace(ENCODED_WORD_GAP, '$1$2')
+    .replace(ENCODED_WORD, (_match, charset: string, encoding: string, encoded: string) => {
+      if (encoding.toLowerCase() === 'b') {
+        return Buffer.from(encoded, 'base64').toString(toBufferEncoding(charset));
+      }
+      return decodeQuotedPrintable(encoded.replace(UNDERSCORE, ' '), charset);
+    });
+}
+
+export function extractAddress(from: string): string {
+  const match = from.match(ANGLE_ADDRESS);
+  return (match ? match[1] : from).trim();
+}
+
+function extractMessageId(value: string | undefined): string | undefined {
+  if (!value) return undefined;
+  const match = value.match(MESSAGE_ID);
+  return match ? match[1] : value.trim() || undefined;
+}
+
+/**
+ * Parse a header block line by line, unfolding continuation lines.
+ * The first occurrence of a header wins (e.g. the newest Received line).
+ */
+function parseHeaderBlock(block: string): Map<string, string> {
+  const headers = new Map<string, string>();
+  const lines = block.split(LINE_BREAK);
+  let name: string | null = null;
+  let value = '';
+
+  const flush = () => {
+    if (name !== null && !headers.has(name)) {
+      headers.set(name, decodeHeaderValue(value.trim()));
+    }
+  };
+
+  for (let i = 0; i < lines.length; i++) {
+    const line = lines[i];
+    if ((line.charAt(0) === ' ' || line.charAt(0) === '\t') && name !== null) {
+      value += ' ' + line.trim();
+      continue;
+    }
+    flush();
+    const match = HEADER_LINE.exec(line);
+    name = match ? match[1].toLowerCase() : null;
+    value = match ? match[2] : '';
+  }
+  flush();
+
+  return headers;
+}
+
+/**
+ * Split an entity into its header block and body. Text that does not start
+ * with a header line is treated as a bare body.
+ */
+function splitEntity(raw: string): { headers: Map<string, string>; body: string } {
+  const firstLineEnd = raw.search(LINE_BREAK);
+  const firstLine = firstLineEnd === -1 ? raw : raw.slice(0, firstLineEnd);
+  if (!HEADER_LINE.test(firstLine)) {
+    return { headers: new Map(), body: raw };
+  }
+
+  const separator = BLANK_LINE.exec(raw);
+  if (!separator) {
+    return { headers: parseHeaderBlock(raw), body: '' };
+  }
+  return {
+    headers: parseHeaderBlock(raw.slice(0, separator.index)),
+    body: raw.slice(separator.index + separator[0].length)
+  };
+}
+
+function findDelimiter(body: string, delimiter: string, from: number): number {
+  let index = body.indexOf(delimiter, from);
+  while (index > 0 && body.charAt(index - 1) !== '\n') {
+    index = body.indexOf(delimiter, index + delimiter.length);
+  }
+  return index;
+}
+
+/**
+ * Split a multipart body into its parts with a single forward scan
+ */
+function splitMultipart(body: string, boundary: string): string[] {
+  const delimiter = `--${boundary}`;
+  const parts: string[] = [];
+  let index = findDelimiter(body, delimiter, 0);
+
+  while (index !== -1) {
+    const afterDelimiter = index + delimiter.length;
+    if (body.startsWith('--', afterDelimiter)) break; // Closing delimiter
+
+    const lineEnd = body.indexOf('\n', afterDelimiter);
+    if (lineEnd === -1) break;
+
+    const next = findDelimiter(body, delimiter, lineEnd + 1);
+    let end = next === -1 ? body.length : next;
+    // The line break before a delimiter belongs to the delimiter
+    if (body.charAt(end - 1) === '\n') end--;
+    if (body.charAt(end - 1) === '\r') end--;
+
+    parts.push(body.slice(lineEnd + 1, end));
+    index = next;
+  }
+
+  return parts;
+}
+
+function decodeBody(body: string, headers: Map<string, string>): string {
+  const encoding = (headers.get('content-transfer-encoding') || '').toLowerCase();
+  const charset = (headers.get('content-type') || '').match(CHARSET_PARAM);
+
+  if (encoding === 'base64') {
+    return Buffer.from(body.replace(WHITESPACE, ''), 'base64').toString(toBufferEncoding(charset?.[1]));
+  }
+  if (encoding === 'quoted-printable') {
+    return decodeQuotedPrintable(body, charset?.[1]);
+  }
+  return body;
+}
+
+/**
+ * Walk a MIME entity, keeping the first text/plain and text/html bodies
+ */
+function collectMimeBodies(raw: string, depth: number, bodies: MimeBodies): Map<string, string> {
+  const { headers, body } = splitEntity(raw);
+  const contentType = headers.get('content-type') || 'text/plain';
+  const mediaType = contentType.split(';')[0].trim().toLowerCase();
+
+  if ((headers.get('content-disposition') || '').toLowerCase().startsWith('attachment')) {
+    return headers;
+  }
+
+  if (mediaType.startsWith('multipart/')) {
+    const boundary = contentType.match(BOUNDARY_PARAM);
+    if (boundary && depth < MAX_MIME_DEPTH) {
+      const parts = splitMultipart(body, boundary[1]);
+      for (let i = 0; i < parts.length && (bodies.text === null || bodies.html === null); i++) {
+        collectMimeBodies(parts[i], depth + 1, bodies);
+      }
+    }
+  } else if (mediaType === 'text/plain' && bodies.text === null) {
+    bodies.text = decodeBody(body, headers);
+  } else if (mediaType === 'text/html' && bodies.html === null) {
+    bodies.html = decodeBody(body, headers);
+  }
+
+  return headers;
+}
+
+/**
+ * Collect the non-file fields of a multipart/form-data post
+ */
+function parseFormFields(input: string, boundary: string): Map<string, string> {
+  const fields = new Map<string, string>();
+  const parts = splitMultipart(input, boundary);
+
+  for (let i = 0; i < parts.length; i++) {
+    const { headers, body } = splitEntity(parts[i]);
+    const disposition = headers.get('content-disposition') || '';
+    const name = disposition.match(FIELD_NAME);
+    if (name && !FIELD_FILENAME.test(disposition)) {
+      fields.set(name[1], body);
+    }
+  }
+
+  return fields;
+}
+
+/**
+ * SendGrid's `headers` field is usually the raw header block, but some
+ * senders (and our test scripts) post a JSON object instead
+ */
+function parseHeadersField(value: string): Map<string, string> {
+  const trimmed = value.trim();
+  if (trimmed.charAt(0) === '{') {
+    try {
+      const headers = new Map<string, string>();
+      const json = JSON.parse(trimmed);
+      Object.keys(json).forEach(key => headers.set(key.toLowerCase(), String(json[key])));
+      return headers;
+    } catch {
+      // Fall through to header block parsing
+    }
+  }
+  return parseHeaderBlock(trimmed);
+}
+
+/**
+ * Convert an HTML body to text, dropping Gmail's quoted history block
+ */
+export function htmlToText(html: string): string {
+  const quote = html.search(GMAIL_QUOTE);
+  const visible = quote === -1 ? html : html.slice(0, quote);
+
+  return visible
+    .replace(HTML_IGNORED_BLOCKS, '')
+    .replace(HTML_LINE_BREAKS, '\n')
+    .replace(HTML_TAGS, '')
+    .replace(HTML_ENTITIES, (_match, entity: string) => HTML_ENTITY_VALUES[entity]);
+}
+
+function getSender(fields: Map<string, string>, headers: Map<string, string>): string {
+  const from = fields.get('from');
+  if (from && from.trim()) {
+    return extractAddress(from);
+  }
+
+  const envelope = fields.get('envelope');
+  if (envelope) {
+    try {
+      const parsed = JSON.parse(envelope);
+      if (parsed.from) return parsed.from;
+    } catch {
+      // Ignore a malformed envelope and fall back to the From header
+    }
+  }
+
+  const header = headers.get('from');
+  return header ? extractAddress(header) : 'unknown@example.com';
+}
+
+function getBody(fields: Map<string, string>, bodies: MimeBodies): string {
+  for (let i = 0; i < TEXT_FIELDS.length; i++) {
+    const value = fields.get(TEXT_FIELDS[i]);
+    if (value && value.trim()) return value;
+  }
+  if (bodies.text && bodies.text.trim()) {
+    return bodies.text;
+  }
+  const html = fields.get('html') || bodies.html;
+  return html ? htmlToText(html) : '';
+}
+
+// The processor and both parsers often see the same string back to back
+let lastInput: string | null = null;
+let lastParsed: ParsedInboundEmail | null = null;
+
+/**
+ * Parse a SendGrid form-data post or a raw MIME message into the shared
+ * representation. The result is cached for the most recent input and must be
+ * treated as read-only.
+ */
+export function parseInboundEmail(input: string): ParsedInboundEmail {
+  if (input === lastInput && lastParsed) {
+    return lastParsed;
+  }
+
+  const firstLineEnd = input.search(LINE_BREAK);
+  const firstLine = firstLineEnd === -1 ? input : input.slice(0, firstLineEnd);
+  const isFormData = firstLine.startsWith('--') && input.indexOf('form-data') !== -1;
+
+  const bodies: MimeBodies = { text: null, html: null };
+  let fields = new Map<string, string>();
+  let headers: Map<string, string>;
+
+  if (isFormData) {
+    fields = parseFormFields(input, firstLine.slice(2).trim());
+    const rawEmail = fields.get('email');
+    if (rawEmail) {
+      headers = collectMimeBodies(rawEmail, 0, bodies);
+    } else {
+      headers = parseHeadersField(fields.get('headers') || '');
+    }
+  } else {
+    headers = collectMimeBodies(input, 0, bodies);
+  }
+
+  const references = headers.get('references');
+  const parsed: ParsedInboundEmail = {
+    isFormData,
+    fields,
+    headers,
+    text: bodies.text,
+    html: bodies.html,
+    sender: getSender(fields, headers),
+    subject: (fields.get('subject') || '').trim() || headers.get('subject') || 'No Subject',
+    body: getBody(fields, bodies),
+    messageId: extractMessageId(headers.get('message-id')),
+    inReplyTo: extractMessageId(headers.get('in-reply-to')),
+    references: references ? references.replace(FOLDED_WHITESPACE, ' ').trim() : undefined
+  };
+
+  lastInput = input;
+  lastParsed = parsed;
+  return parsed;
+}
+
+/**
+ * Does line i start the quoted history, forwarded message or signature?
+ */
+function isReplyBoundary(lines: string[], i: number, trimmed: string): boolean {
+  return isHistoryBoundary(lines, i, trimmed) || (SIGN_OFF.test(trimmed) && isFollowedBySignature(lines, i));
+}
+
+/**
+ * Is everything after the sign-off on line i, up to the end of the message or
+ * the quoted history, a short signature block (a name, a title, a number)?
+ * "Thanks!" opening a journal entry is followed by prose and is kept.
+ */
+function isFollowedBySignature(lines: string[], i: number): boolean {
+  let signatureLines = 0;
+
+  for (let j = i + 1; j < lines.length; j++) {
+    const trimmed = lines[j].trim();
+    if (trimmed === '') {
+      continue;
+    }
+    if (trimmed.charAt(0) === '>' || isHistoryBoundary(lines, j, trimmed)) {
+      return true;
+    }
+    if (++signatureLines > MAX_SIGNATURE_LINES || trimmed.length > MAX_SIGNATURE_LINE_LENGTH || SENTENCE_END.test(trimmed)) {
+      return false;
+    }
+  }
+
+  return true;
+}
+
+/**
+ * Does line i start the quoted history, forwarded message or a delimited signature?
+ */
+function isHistoryBoundary(lines: string[], i: number, trimmed: string): boolean {
+  if (SIGNATURE_DELIMITER.test(lines[i]) || MOBILE_FOOTER.test(trimmed) || FORWARD_SEPARATOR.test(trimmed)) {
+    return true;
+  }
+
+  // "On Mon, Jun 2, 2025 at 9:00 AM Flappy <...> wrote:", which Gmail may wrap over two lines
+  if (QUOTE_INTRO.test(trimmed)) {
+    return QUOTE_INTRO_END.test(trimmed) || (i + 1 < lines.length && QUOTE_INTRO_END.test(lines[i + 1].trim()));
+  }
+
+  // Outlook's "From: ... / Sent: ..." reply header
+  return OUTLOOK_FROM.test(trimmed) && i + 1 < lines.length && OUTLOOK_SENT.test(lines[i + 1].trim());
+}
+
+/**
+ * Isolate the new text of a message: drop quoted lines, stop at the quoted
+ * history, forwarded message or signature, and collapse runs of blank lines.
+ */
+export function extractReplyText(text: string): string {
+  const lines = text.split(LINE_BREAK);
+  const kept: string[] = [];
+  let pendingBlank = false;
+
+  for (let i = 0; i < lines.length; i++) {
+    const trimmed = lines[i].trim();
+
+    if (trimmed === '') {
+      pendingBlank = kept.length > 0;
+      continue;
+    }
+    if (isReplyBoundary(lines, i, trimmed)) {
+      break;
+    }
+    if (trimmed.charAt(0) === '>') {
+      continue;
+    }
+
+    if (pendingBlank) {
+      kept.push('');
+      pendingBlank = false;
+    }
+    kept.push(lines[i].replace(TRAILING_WHITESPACE, ''));
+  }
+
+  return kept.join('\n');
+}
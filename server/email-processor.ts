@@ -2,8 +2,9 @@ import { storage } from "./storage";
 import { emailService } from "./email";
 import { simpleParser } from "mailparser";
 import { EmailQueueItem } from "@shared/schema";
-import { EmailContentExtractor } from "./email-content-extractor";
 import { GmailContentParser } from "./gmail-content-parser";
+import { parseInboundEmail } from "./email-extraction";
+import { discardEmailAttachments, parseSpooledMessage, removeSpooledMessage } from "./inbound-spool";
 
 // Process interval in milliseconds (check for new emails every 10 seconds)
 const PROCESS_INTERVAL = 10000;
@@ -14,19 +15,28 @@ const MAX_ATTEMPTS = 5;
 // Set to track processed emails to prevent duplicates
 const processedEmails = new Set<string>();
 
+/**
+ * Record a queued email as handled. Only successful runs are remembered, so a
+ * row that failed part-way is processed again when it is retried.
+ */
+async function completeQueuedEmail(queueItem: EmailQueueItem, emailKey: string): Promise<boolean> {
+  processedEmails.add(emailKey);
+  await storage.markEmailCompleted(queueItem.id);
+  return true;
+}
+
 /**
  * Process a single email from the queue with enhanced error handling
  */
 async function processQueuedEmail(queueItem: EmailQueueItem): Promise<boolean> {
+  const payload = queueItem.payload as any;
+  
   try {
     console.log(`📨 Processing queued email ID: ${queueItem.id}`);
     
     // Mark as processing
     await storage.markEmailProcessing(queueItem.id);
     
-    // Extract payload
-    const payload = queueItem.payload as any;
-    
     console.log(`📦 Processing email with ID: ${queueItem.id}`);
     console.log(`📦 Payload type: ${typeof payload}`);
     
@@ -34,30 +44,52 @@ async function processQueuedEmail(queueItem: EmailQueueItem): Promise<boolean> {
     const emailKey = generateEmailKey(queueItem);
     if (processedEmails.has(emailKey)) {
       console.log(`⚠️ Email already processed, skipping: ${emailKey}`);
+      if (payload && payload.rawMimeSpoolFile) {
+        await removeSpooledMessage(payload.rawMimeSpoolFile);
+      }
       await storage.markEmailCompleted(queueItem.id);
       return true;
     }
     
-    // Add to processed set
-    processedEmails.add(emailKey);
-    
     // Handle different payload formats
-    if (payload && payload.rawMimeBase64) {
-      // Handle raw MIME base64 payload from SendGrid
+    if (payload && payload.rawMimeSpoolFile) {
+      // Streamed from the SendGrid webhook to a spool file; parse it as a stream
+      console.log(`🔍 Processing spooled email ${payload.rawMimeSpoolFile} (${payload.size} bytes)`);
+      const email = await parseSpooledMessage(payload.rawMimeSpoolFile, payload.contentType);
+      console.log(`🔍 Parsed spooled email from: ${email.from}, subject: ${email.subject}, attachments: ${email.attachments.length}`);
+      
+      try {
+        await emailService.processIncomingEmail(
+          email.from || 'unknown@example.com',
+          email.subject || 'No Subject',
+          email.text || email.html,
+          email.messageId,
+          email.inReplyTo,
+          email.references,
+          email.attachments
+        );
+      } catch (error) {
+        // The spool file is kept for the retry, which saves the attachments again
+        discardEmailAttachments(email.attachments);
+        throw error;
+      }
+      
+      await removeSpooledMessage(payload.rawMimeSpoolFile);
+      return completeQueuedEmail(queueItem, emailKey);
+      
+    } else if (payload && payload.rawMimeBase64) {
+      // Legacy queue rows that carry the whole message inline
       console.log(`🔍 Processing payload with rawMimeBase64`);
       const buffer = Buffer.from(payload.rawMimeBase64 as string, 'base64');
       console.log(`🔍 Buffer size: ${buffer.length} bytes`);
       
-      // Check if this is multipart form data (SendGrid inbound parse format)
-      const bufferString = buffer.toString('utf8');
-      if (bufferString.includes('Content-Disposition: form-data')) {
+      // Parse once; the Gmail parser reuses the parsed representation
+      const parsed = parseInboundEmail(buffer.toString('utf8'));
+      if (parsed.isFormData) {
         console.log(`🔍 Detected multipart form data format`);
         
-        // Debug: Show first 500 chars of multipart data
-        console.log(`🔍 Multipart data preview: ${bufferString.substring(0, 500)}...`);
-        
         // Use Gmail-specific content parser for better extraction
-        const extracted = GmailContentParser.parseContent(bufferString);
+        const extracted = GmailContentParser.parseContent(parsed);
         
         console.log(`🔍 Gmail parsing results:`);
         console.log(`   Sender: ${extracted.sender}`);
@@ -76,22 +108,19 @@ async function processQueuedEmail(queueItem: EmailQueueItem): Promise<boolean> {
           extracted.references
         );
         
-        await storage.markEmailCompleted(queueItem.id);
-        return true;
+        return completeQueuedEmail(queueItem, emailKey);
       } else {
-        // Handle as regular MIME email
-        const parsedEmail = await simpleParser(buffer);
+        // Handle as regular MIME email, reusing the same parse
         await emailService.processIncomingEmail(
-          parsedEmail.from?.text || 'unknown@example.com',
-          parsedEmail.subject || 'No Subject',
-          parsedEmail.text || parsedEmail.html || '',
-          parsedEmail.messageId?.replace(/^<|>$/g, ''),
-          parsedEmail.inReplyTo?.replace(/^<|>$/g, ''),
-          parsedEmail.references ? (Array.isArray(parsedEmail.references) ? parsedEmail.references.join(' ') : parsedEmail.references) : undefined
+          parsed.sender,
+          parsed.subject,
+          parsed.body,
+          parsed.messageId,
+          parsed.inReplyTo,
+          parsed.references
         );
         
-        await storage.markEmailCompleted(queueItem.id);
-        return true;
+        return completeQueuedEmail(queueItem, emailKey);
       }
       
     } else if (payload && payload.buffer) {
@@ -100,8 +129,7 @@ async function processQueuedEmail(queueItem: EmailQueueItem): Promise<boolean> {
       const buffer = Buffer.from(payload.buffer as string, 'base64');
       console.log(`🔍 Buffer size: ${buffer.length} bytes`);
       await processRawEmail(buffer);
-      await storage.markEmailCompleted(queueItem.id);
-      return true;
+      return completeQueuedEmail(queueItem, emailKey);
       
     } else if (payload && payload.text && payload.from && payload.subject) {
       // Handle direct JSON payload (e.g., from manual testing or other sources)
@@ -135,13 +163,17 @@ async function processQueuedEmail(queueItem: EmailQueueItem): Promise<boolean> {
       }
     }
     
-    await storage.markEmailCompleted(queueItem.id);
-    return true;
+    return completeQueuedEmail(queueItem, emailKey);
     
   } catch (error) {
     console.error(`❌ Error processing queued email:`, error);
     await storage.markEmailFailed(queueItem.id, (error as Error).message);
     await storage.incrementEmailAttempts(queueItem.id);
+    
+    // Out of attempts: nothing will read the spooled message again
+    if (queueItem.processAttempts + 1 >= MAX_ATTEMPTS && payload && payload.rawMimeSpoolFile) {
+      await removeSpooledMessage(payload.rawMimeSpoolFile);
+    }
     return false;
   }
 }
@@ -212,6 +244,11 @@ async function processNextEmail(): Promise<void> {
       if (nextEmail.processAttempts >= MAX_ATTEMPTS) {
         console.log(`⚠️ Email ${nextEmail.id} has exceeded maximum attempts (${MAX_ATTEMPTS}), marking as failed`);
         await storage.markEmailFailed(nextEmail.id, `Exceeded maximum attempts (${MAX_ATTEMPTS})`);
+        
+        const payload = nextEmail.payload as any;
+        if (payload && payload.rawMimeSpoolFile) {
+          await removeSpooledMessage(payload.rawMimeSpoolFile);
+        }
         return;
       }
       
@@ -327,6 +364,7 @@ function generateEmailKey(queueItem: EmailQueueItem): string {
     if (payload.from) keyParts.push(payload.from);
     if (payload.subject) keyParts.push(payload.subject);
     if (payload.messageId) keyParts.push(payload.messageId);
+    if (payload.rawMimeSpoolFile) keyParts.push(payload.rawMimeSpoolFile);
   }
   
   return keyParts.join('|');
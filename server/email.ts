@@ -2,6 +2,8 @@ import { User, Email, InsertEmail } from "@shared/schema";
 import { storage } from "./storage";
 import { generateFlappyContent, FlappyContentType, FlappyContent } from "./venice-ai";
 import { memoryService } from "./memory-service";
+import { discardEmailAttachments, SavedEmailAttachment } from "./inbound-spool";
+import { extractReplyText } from "./email-extraction";
 import OpenAI from "openai";
 import sgMail from "@sendgrid/mail";
 
@@ -28,6 +30,30 @@ const FROM_NAME = "Flappy from Featherweight";
 // Log the FROM_EMAIL to ensure it's correctly set
 console.log("Using email FROM address:", FROM_EMAIL);
 
+// SendGrid accepts at most 1000 personalizations per mail/send request
+export const MAX_EMAIL_BATCH_SIZE = 1000;
+
+// Substitutions filled in per recipient when sending a batch. The SendGrid
+// helpers wrap each personalization's substitution keys in {{ }}, so the body
+// carries the wrapped tag and the personalizations the bare key.
+const BATCH_TEXT_KEY = "flappy_text";
+const BATCH_HTML_KEY = "flappy_html";
+const BATCH_AD_KEY = "flappy_ad";
+const batchTag = (key: string) => `{{${key}}}`;
+
+const EMAIL_SIGNATURE = "\n\nFeathery thoughts,\nFlappy 🦢";
+
+export type OutboundEmail = {
+  to: string;
+  subject: string;
+  content: string;
+  isPremium: boolean;
+};
+
+function generateMessageId(): string {
+  return `flappy-${Date.now()}-${Math.random().toString(36).substring(2, 9)}@featherweight.world`;
+}
+
 // Export email service functions
 export const emailService = {
   // Send a single email using SendGrid
@@ -57,7 +83,7 @@ export const emailService = {
       }
       
       // Generate a unique message ID for threading
-      const messageId = `flappy-${Date.now()}-${Math.random().toString(36).substring(2, 9)}@featherweight.world`;
+      const messageId = generateMessageId();
       
       console.log('Formatting HTML content');
       const htmlContent = formatEmailHTML(content, isPremium);
@@ -148,6 +174,127 @@ export const emailService = {
     }
   },
   
+  // Send a batch of individually addressed emails in one SendGrid API call.
+  // Every recipient is a personalization with its own subject, threading headers
+  // and content substitutions, so a batch costs a single request. The batch
+  // succeeds or fails as a whole; message IDs are returned in input order.
+  async sendEmailBatch(batch: OutboundEmail[]): Promise<{ messageIds: string[] }> {
+    if (batch.length === 0) {
+      return { messageIds: [] };
+    }
+    if (batch.length > MAX_EMAIL_BATCH_SIZE) {
+      throw new Error(`Email batch of ${batch.length} exceeds the limit of ${MAX_EMAIL_BATCH_SIZE}`);
+    }
+    
+    const invalid = batch.find(email => !email.to || !email.to.includes('@') || email.to.startsWith('mime-version:'));
+    if (invalid) {
+      throw new Error(`Invalid recipient email address: ${invalid.to}`);
+    }
+    
+    const messageIds = batch.map(() => generateMessageId());
+    
+    if (!process.env.SENDGRID_API_KEY) {
+      console.warn(`⚠️ SendGrid API key is not configured. Skipping batch of ${batch.length} emails.`);
+      return { messageIds: messageIds.map(id => `local-${id}`) };
+    }
+    
+    const msg = {
+      from: {
+        email: FROM_EMAIL,
+        name: FROM_NAME
+      },
+      replyTo: REPLY_TO_EMAIL,
+      text: batchTag(BATCH_TEXT_KEY),
+      html: renderEmailHTML(batchTag(BATCH_HTML_KEY), batchTag(BATCH_AD_KEY)),
+      personalizations: batch.map((email, index) => {
+        const messageId = messageIds[index];
+        return {
+          to: email.to,
+          subject: email.subject,
+          substitutions: {
+            [BATCH_TEXT_KEY]: email.content + (!email.isPremium ? '\n\n[Advertisement: Upgrade to premium for ad-free experiences]' : ''),
+            [BATCH_HTML_KEY]: email.content.replace(/\n/g, '<br>'),
+            [BATCH_AD_KEY]: !email.isPremium ? AD_HTML : ''
+          },
+          headers: {
+            "X-Entity-Ref-ID": messageId,
+            "Message-ID": `<${messageId}>`,
+            "List-Unsubscribe": `<https://featherweight.world/unsubscribe?id=${messageId}>`,
+            "List-Unsubscribe-Post": "List-Unsubscribe=One-Click",
+            "Feedback-ID": `${email.isPremium ? 'premium' : 'free'}:featherweight:${messageId}`
+          }
+        };
+      }),
+      trackingSettings: {
+        clickTracking: {
+          enable: true
+        },
+        openTracking: {
+          enable: true
+        }
+      },
+      mailSettings: {
+        footer: {
+          enable: true,
+          text: 'Featherweight - Your Journaling Companion\nReply to this email to continue your conversation with Flappy\n\nTo unsubscribe from these emails, visit: https://featherweight.world/unsubscribe',
+          html: `<p style="color: #9E9E9E; font-size: 12px;">
+            Featherweight - Your Journaling Companion<br>
+            Reply to this email to continue your conversation with Flappy<br><br>
+            <a href="https://featherweight.world/unsubscribe" style="color: #9E9E9E;">Unsubscribe</a> or manage your 
+            <a href="https://featherweight.world/preferences" style="color: #9E9E9E;">email preferences</a>
+          </p>`
+        }
+      }
+    };
+    
+    try {
+      const [response] = await sgMail.send(msg as any);
+      console.log(`📨 Sent batch of ${batch.length} emails, status code: ${response?.statusCode}`);
+      return { messageIds };
+    } catch (sendGridError: any) {
+      console.error(`⚠️ SendGrid batch error (${batch.length} emails): ${sendGridError?.message || 'Unknown error'}`);
+      if (sendGridError?.response?.body) {
+        console.error(`Response: ${JSON.stringify(sendGridError.response.body)}`);
+      }
+      throw new Error(`SendGrid API error: ${sendGridError?.message || 'Unknown error'}`);
+    }
+  },
+  
+  // Send pre-generated daily inspirations as one batch and record them in each user's history.
+  // Once the batch is sent, a failed history insert is only logged: rethrowing
+  // would mark the whole batch failed and re-send it to everyone.
+  async sendDailyInspirationBatch(items: { user: User; content: FlappyContent }[]): Promise<Email[]> {
+    const batch: OutboundEmail[] = items.map(({ user, content }) => ({
+      to: user.email,
+      subject: content.subject,
+      content: `${content.content}${EMAIL_SIGNATURE}`,
+      isPremium: user.isPremium
+    }));
+    
+    const { messageIds } = await this.sendEmailBatch(batch);
+    
+    const recorded = await Promise.all(items.map(async ({ user }, index) => {
+      try {
+        return await storage.createEmail({
+          userId: user.id,
+          subject: batch[index].subject,
+          content: batch[index].content,
+          type: "daily_inspiration",
+          messageId: messageIds[index],
+          direction: 'outbound',
+          isJournalEntry: false,
+          to: user.email,
+          from: FROM_EMAIL
+        });
+      } catch (error: any) {
+        console.error(`⚠️ Sent daily inspiration ${messageIds[index]} to user ${user.id} but failed to record it: ${error?.message || error}`);
+        return null;
+      }
+    }));
+    
+    return recorded.filter((email): email is Email => email !== null);
+  },
+  
   // Send Flappy-generated content to a user
   async sendFlappyEmail(
     user: User, 
@@ -183,8 +330,7 @@ export const emailService = {
     const subject = flappyResponse.subject;
     
     // Add a friendly signature
-    const signature = "\n\nFeathery thoughts,\nFlappy 🦢";
-    const fullContent = `${flappyResponse.content}${signature}`;
+    const fullContent = `${flappyResponse.content}${EMAIL_SIGNATURE}`;
     
     // Create an email record first in pending state
     const emailData: InsertEmail = {
@@ -234,7 +380,8 @@ export const emailService = {
     content: string, 
     incomingMessageId?: string,
     inReplyTo?: string,
-    references?: string
+    references?: string,
+    attachments: SavedEmailAttachment[] = []
   ): Promise<void> {
     console.log('🌟 === INCOMING EMAIL PROCESSING STARTED === 🌟');
     console.log(`📧 SENDER: ${from}`);
@@ -257,6 +404,7 @@ export const emailService = {
       
       if (!user) {
         console.log(`❓ No user found for email: ${from}`);
+        discardEmailAttachments(attachments);
         
         // Send a welcome message to this email address
         console.log('📤 Sending welcome email to unregistered user');
@@ -315,11 +463,13 @@ Flappy 🦢
           updatedAt: new Date(),
           mood,
           tags,
-          imageUrl: null,
+          // Journal entries hold a single image; keep the first one attached
+          imageUrl: attachments.length > 0 ? attachments[0].url : null,
           isPrivate: false
         });
         
         console.log(`✅ Journal entry created with ID: ${entry.id}`);
+        discardEmailAttachments(attachments.slice(1));
         
         // Process the content for memories
         await memoryService.processMessage(user.id, cleanContent, 'journal_topic');
@@ -345,6 +495,7 @@ Flappy 🦢
         console.log('✅ Email record saved in database');
       } else {
         console.log('💬 Treating email as a conversation message');
+        discardEmailAttachments(attachments);
         
         // Generate a conversation ID for threading if this is a new conversation
         let conversationId = '';
@@ -505,33 +656,7 @@ Flappy 🦢
  * Clean email content by removing signatures, quoted text, etc.
  */
 function cleanEmailContent(content: string): string {
-  let cleaned = content;
-  
-  // Remove common email signatures and footers
-  const signaturePatterns = [
-    /--\s*\n[\s\S]*$/m, // Standard email signature delimiter
-    /Sent from my iPhone[\s\S]*$/i,
-    /Sent from my Android[\s\S]*$/i,
-    /Get Outlook for iOS[\s\S]*$/i,
-    /Best regards[\s\S]*$/i,
-    /Kind regards[\s\S]*$/i,
-    /Sincerely[\s\S]*$/i,
-  ];
-  
-  signaturePatterns.forEach(pattern => {
-    cleaned = cleaned.replace(pattern, '');
-  });
-  
-  // Remove quoted text (lines starting with >)
-  const lines = cleaned.split('\n');
-  const nonQuotedLines = lines.filter(line => !line.trim().startsWith('>'));
-  cleaned = nonQuotedLines.join('\n');
-  
-  // Remove excessive whitespace
-  cleaned = cleaned.replace(/\n\s*\n\s*\n/g, '\n\n');
-  cleaned = cleaned.trim();
-  
-  return cleaned;
+  return extractReplyText(content).trim();
 }
 
 /**
@@ -603,13 +728,23 @@ function extractTags(content: string): string[] {
   return [...new Set(tags)]; // Remove duplicates
 }
 
+// Upsell shown to free users at the bottom of every email
+const AD_HTML = '<div class="ad">💎 Upgrade to Premium for ad-free experiences and exclusive features! <a href="https://featherweight.world/upgrade">Learn more</a></div>';
+
 /**
  * Format email content as HTML
  */
 function formatEmailHTML(content: string, isPremium: boolean): string {
   // Convert line breaks to HTML
-  let htmlContent = content.replace(/\n/g, '<br>');
+  const htmlContent = content.replace(/\n/g, '<br>');
   
+  return renderEmailHTML(htmlContent, !isPremium ? AD_HTML : '');
+}
+
+/**
+ * Render the email HTML shell around already-formatted content
+ */
+function renderEmailHTML(htmlContent: string, adHtml: string): string {
   // Basic HTML structure
   const html = `
 <!DOCTYPE html>
@@ -653,7 +788,7 @@ function formatEmailHTML(content: string, isPremium: boolean): string {
   <div class="content">
     ${htmlContent}
   </div>
-  ${!isPremium ? '<div class="ad">💎 Upgrade to Premium for ad-free experiences and exclusive features! <a href="https://featherweight.world/upgrade">Learn more</a></div>' : ''}
+  ${adHtml}
 </body>
 </html>`;
   
@@ -6,6 +6,7 @@ import { Request } from 'express';
 // Ensure upload directories exist
 const uploadDir = path.join(process.cwd(), 'uploads');
 const journalUploadsDir = path.join(uploadDir, 'journal');
+export const emailUploadsDir = path.join(uploadDir, 'email');
 
 if (!fs.existsSync(uploadDir)) {
   fs.mkdirSync(uploadDir, { recursive: true });
@@ -15,6 +16,14 @@ if (!fs.existsSync(journalUploadsDir)) {
   fs.mkdirSync(journalUploadsDir, { recursive: true });
 }
 
+if (!fs.existsSync(emailUploadsDir)) {
+  fs.mkdirSync(emailUploadsDir, { recursive: true });
+}
+
+// Image types accepted for journal uploads and inbound email attachments
+export const IMAGE_FILE_PATTERN = /\.(jpg|jpeg|png|gif|webp)$/i;
+export const MAX_IMAGE_SIZE = 5 * 1024 * 1024; // 5MB max file size
+
 // Configure storage
 const storage = multer.diskStorage({
   destination: (req, file, cb) => {
@@ -37,7 +46,7 @@ const storage = multer.diskStorage({
 // File filter
 const fileFilter = (req: Request, file: Express.Multer.File, cb: multer.FileFilterCallback) => {
   // Accept images only
-  if (!file.originalname.match(/\.(jpg|jpeg|png|gif|webp)$/i)) {
+  if (!file.originalname.match(IMAGE_FILE_PATTERN)) {
     return cb(new Error('Only image files are allowed!'));
   }
   cb(null, true);
@@ -48,7 +57,7 @@ export const journalImageUpload = multer({
   storage,
   fileFilter,
   limits: {
-    fileSize: 5 * 1024 * 1024, // 5MB max file size
+    fileSize: MAX_IMAGE_SIZE,
   }
 });
 
@@ -65,4 +74,17 @@ export function deleteFile(filename: string): void {
   if (fs.existsSync(filePath)) {
     fs.unlinkSync(filePath);
   }
-}
\ No newline at end of file
+}
+
+// Public path for an image saved from an inbound email
+export function getEmailAttachmentUrl(filename: string): string {
+  return `/uploads/email/${filename}`;
+}
+
+// Function to delete an inbound email attachment
+export function deleteEmailAttachment(filename: string): void {
+  const filePath = path.join(emailUploadsDir, filename);
+  if (fs.existsSync(filePath)) {
+    fs.unlinkSync(filePath);
+  }
+}
@@ -0,0 +1,406 @@
+/**
+ * Streaming ingestion for inbound email.
+ *
+ * Webhooks stream the request body straight to a spool file and the email
+ * queue row only carries the spool file name. The email processor then parses
+ * the spooled message as a stream: MIME bodies go through mailparser's
+ * streaming MailParser, and SendGrid's multipart/form-data posts are split by
+ * scanning the file for part boundaries, so neither the webhook nor the
+ * processor ever holds a whole message in memory. Image attachments are
+ * written directly to the uploads directory as they are decoded.
+ */
+import fs from 'fs';
+import path from 'path';
+import crypto from 'crypto';
+import { Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+import { Request } from 'express';
+import { MailParser, AttachmentStream, MessageText, Headers, AddressObject } from 'mailparser';
+import {
+  emailUploadsDir,
+  getEmailAttachmentUrl,
+  deleteEmailAttachment,
+  IMAGE_FILE_PATTERN,
+  MAX_IMAGE_SIZE
+} from './file-upload';
+
+// Matches the 50mb limit the webhook used to apply with express.raw()
+export const MAX_INBOUND_EMAIL_BYTES = 50 * 1024 * 1024;
+
+// Form fields other than the raw email are small (from, subject, text, headers...)
+const MAX_FORM_FIELD_BYTES = 1024 * 1024;
+const MAX_PART_HEADER_BYTES = 8 * 1024;
+
+// Point this at shared storage when several instances process the same queue
+const spoolDir = process.env.INBOUND_EMAIL_SPOOL_DIR || path.join(process.cwd(), 'spool', 'inbound-email');
+
+if (!fs.existsSync(spoolDir)) {
+  fs.mkdirSync(spoolDir, { recursive: true });
+}
+
+const SPOOL_FILE_PATTERN = /^[\w-]+\.eml$/;
+
+const IMAGE_EXTENSIONS: Record<string, string> = {
+  'image/jpeg': '.jpg',
+  'image/png': '.png',
+  'image/gif': '.gif',
+  'image/webp': '.webp'
+};
+
+export type SavedEmailAttachment = {
+  filename: string;
+  url: string;
+  contentType: string;
+  size: number;
+};
+
+export type InboundEmail = {
+  from: string;
+  subject: string;
+  text: string;
+  html: string;
+  messageId?: string;
+  inReplyTo?: string;
+  references?: string;
+  attachments: SavedEmailAttachment[];
+};
+
+type FormPart = {
+  name: string;
+  filename?: string;
+  contentType: string;
+  start: number; // Absolute offset of the first body byte
+  end: number; // Absolute offset one past the last body byte
+};
+
+function resolveSpoolFile(spoolFile: string): string {
+  if (!SPOOL_FILE_PATTERN.test(spoolFile)) {
+    throw new Error(`Invalid spool file reference: ${spoolFile}`);
+  }
+  return path.join(spoolDir, spoolFile);
+}
+
+/**
+ * Transform that counts bytes and fails once more than maxBytes have passed through
+ */
+function byteLimit(maxBytes: number, counter: { bytes: number }): Transform {
+  return new Transform({
+    transform(chunk: Buffer, _encoding, callback) {
+      counter.bytes += chunk.length;
+      if (counter.bytes > maxBytes) {
+        callback(new Error(`Inbound email exceeds ${maxBytes} bytes`));
+      } else {
+        callback(null, chunk);
+      }
+    }
+  });
+}
+
+/**
+ * Stream a request body to a new spool file and return its name
+ */
+export async function spoolRequestBody(req: Request): Promise<{ spoolFile: string; size: number }> {
+  const spoolFile = `${Date.now()}-${crypto.randomBytes(8).toString('hex')}.eml`;
+  const filePath = path.join(spoolDir, spoolFile);
+  const counter = { bytes: 0 };
+
+  try {
+    await pipeline(req, byteLimit(MAX_INBOUND_EMAIL_BYTES, counter), fs.createWriteStream(filePath, { flags: 'wx' }));
+  } catch (error) {
+    await fs.promises.rm(filePath, { force: true });
+    throw error;
+  }
+
+  return { spoolFile, size: counter.bytes };
+}
+
+export async function removeSpooledMessage(spoolFile: string): Promise<void> {
+  await fs.promises.rm(resolveSpoolFile(spoolFile), { force: true });
+}
+
+/**
+ * Remove attachments saved for an email that did not end up using them
+ */
+export function discardEmailAttachments(attachments: SavedEmailAttachment[]): void {
+  attachments.forEach(attachment => {
+    try {
+      deleteEmailAttachment(attachment.filename);
+    } catch (error) {
+      console.warn(`⚠️ Could not delete email attachment ${attachment.filename}:`, error);
+    }
+  });
+}
+
+function getImageExtension(filename: string | undefined, contentType: string): string | null {
+  const ext = filename ? path.extname(filename).toLowerCase() : '';
+  if (ext && IMAGE_FILE_PATTERN.test(ext)) {
+    return ext;
+  }
+  return IMAGE_EXTENSIONS[contentType.toLowerCase().split(';')[0].trim()] || null;
+}
+
+/**
+ * Write an attachment stream to the uploads directory. Non-image and
+ * oversized attachments are drained and dropped so the parser keeps moving.
+ */
+async function saveAttachment(
+  content: Readable,
+  filename: string | undefined,
+  contentType: string,
+  baseName: string
+): Promise<SavedEmailAttachment | null> {
+  const ext = getImageExtension(filename, contentType);
+  if (!ext) {
+    content.resume();
+    await new Promise(resolve => content.once('end', resolve));
+    return null;
+  }
+
+  const savedName = `${baseName}${ext}`;
+  const filePath = path.join(emailUploadsDir, savedName);
+  let size = 0;
+  let oversized = false;
+
+  // Keep consuming past the size limit instead of erroring, so the
+  // surrounding MIME stream is not torn down by one large image
+  const limiter = new Transform({
+    transform(chunk: Buffer, _encoding, callback) {
+      size += chunk.length;
+      oversized = oversized || size > MAX_IMAGE_SIZE;
+      callback(null, oversized ? undefined : chunk);
+    }
+  });
+
+  await pipeline(content, limiter, fs.createWriteStream(filePath));
+
+  if (oversized) {
+    console.log(`⚠️ Skipping email attachment ${filename || savedName}: larger than ${MAX_IMAGE_SIZE} bytes`);
+    await fs.promises.rm(filePath, { force: true });
+    return null;
+  }
+
+  return { filename: savedName, url: getEmailAttachmentUrl(savedName), contentType, size };
+}
+
+function stripAngleBrackets(value?: string): string | undefined {
+  return value ? value.trim().replace(/^<|>$/g, '') : undefined;
+}
+
+function extractAddress(from: string): string {
+  const match = from.match(/<([^>]+)>/);
+  return (match ? match[1] : from).trim();
+}
+
+/**
+ * Stream-parse a MIME message. Text parts are collected, attachments are
+ * written to disk as mailparser decodes them.
+ */
+function parseMimeStream(source: Readable, attachmentPrefix: string): Promise<InboundEmail> {
+  return new Promise((resolve, reject) => {
+    const parser = new MailParser();
+    const email: InboundEmail = { from: '', subject: '', text: '', html: '', attachments: [] };
+    const saving: Promise<void>[] = [];
+    let attachmentIndex = 0;
+    let failed = false;
+
+    const fail = (error: Error) => {
+      if (failed) return;
+      failed = true;
+      source.unpipe(parser);
+      source.destroy();
+      Promise.allSettled(saving).then(() => {
+        discardEmailAttachments(email.attachments);
+        reject(error);
+      });
+    };
+
+    parser.on('headers', (headers: Headers) => {
+      const from = headers.get('from') as AddressObject | undefined;
+      const references = headers.get('references') as string | string[] | undefined;
+
+      email.from = from?.value?.[0]?.address || from?.text || '';
+      email.subject = (headers.get('subject') as string | undefined) || '';
+      email.messageId = stripAngleBrackets(headers.get('message-id') as string | undefined);
+      email.inReplyTo = stripAngleBrackets(headers.get('in-reply-to') as string | undefined);
+      email.references = Array.isArray(references) ? references.join(' ') : references;
+    });
+
+    parser.on('data', (data: AttachmentStream | MessageText) => {
+      if (data.type === 'text') {
+        email.text = data.text || '';
+        email.html = typeof data.html === 'string' ? data.html : '';
+        return;
+      }
+
+      const baseName = `${attachmentPrefix}_${++attachmentIndex}`;
+      saving.push(
+        saveAttachment(data.content as Readable, data.filename, data.contentType, baseName)
+          .then(saved => {
+            if (saved) email.attachments.push(saved);
+          })
+          .catch(fail)
+          .finally(() => data.release())
+      );
+    });
+
+    parser.on('end', () => {
+      Promise.all(saving).then(() => {
+        if (!failed) resolve(email);
+      });
+    });
+
+    parser.on('error', fail);
+    source.on('error', fail);
+    source.pipe(parser);
+  });
+}
+
+function createRangeStream(filePath: string, start: number, end: number): Readable {
+  // createReadStream's end is inclusive
+  return end > start ? fs.createReadStream(filePath, { start, end: end - 1 }) : Readable.from([]);
+}
+
+async function readRange(handle: fs.promises.FileHandle, start: number, end: number, maxBytes: number): Promise<Buffer> {
+  const buffer = Buffer.alloc(Math.max(0, Math.min(end - start, maxBytes)));
+  const { bytesRead } = await handle.read(buffer, 0, buffer.length, start);
+  return buffer.subarray(0, bytesRead);
+}
+
+/**
+ * Scan a file for every occurrence of delimiter without loading it. A virtual
+ * CRLF is prepended so the first boundary matches like the rest.
+ */
+function findDelimiterOffsets(filePath: string, delimiter: Buffer): Promise<number[]> {
+  return new Promise((resolve, reject) => {
+    const offsets: number[] = [];
+    let carry = Buffer.from('\r\n');
+    let carryStart = -carry.length;
+
+    fs.createReadStream(filePath)
+      .on('data', (chunk: Buffer) => {
+        const window = Buffer.concat([carry, chunk]);
+        let index = window.indexOf(delimiter);
+        while (index !== -1) {
+          offsets.push(carryStart + index);
+          index = window.indexOf(delimiter, index + delimiter.length);
+        }
+        // Keep enough of the tail to catch a delimiter split across chunks
+        const keep = Math.min(window.length, delimiter.length - 1);
+        carry = window.subarray(window.length - keep);
+        carryStart += window.length - keep;
+      })
+      .on('end', () => resolve(offsets))
+      .on('error', reject);
+  });
+}
+
+/**
+ * Locate the parts of a spooled multipart/form-data body by byte range
+ */
+async function indexFormParts(filePath: string, boundary: string): Promise<FormPart[]> {
+  const delimiter = Buffer.from(`\r\n--${boundary}`);
+  const offsets = await findDelimiterOffsets(filePath, delimiter);
+  const parts: FormPart[] = [];
+  const handle = await fs.promises.open(filePath, 'r');
+
+  try {
+    for (let i = 0; i < offsets.length - 1; i++) {
+      const headerStart = offsets[i] + delimiter.length;
+      const headerBlock = await readRange(handle, headerStart, offsets[i + 1], MAX_PART_HEADER_BYTES);
+      const headerEnd = headerBlock.indexOf('\r\n\r\n');
+      if (headerEnd === -1) continue;
+
+      const headers = headerBlock.subarray(0, headerEnd).toString('utf8');
+      const name = headers.match(/Content-Disposition:[^\r\n]*\bname="([^"]*)"/i);
+      if (!name) continue;
+
+      const filename = headers.match(/Content-Disposition:[^\r\n]*\bfilename="([^"]*)"/i);
+      const contentType = headers.match(/Content-Type:\s*([^\r\n]+)/i);
+
+      parts.push({
+        name: name[1],
+        filename: filename ? filename[1] : undefined,
+        contentType: contentType ? contentType[1].trim() : 'text/plain',
+        start: headerStart + headerEnd + 4,
+        end: offsets[i + 1]
+      });
+    }
+  } finally {
+    await handle.close();
+  }
+
+  return parts;
+}
+
+/**
+ * Parse a spooled SendGrid Inbound Parse post. With "POST the raw, full MIME
+ * message" enabled the message arrives in the `email` field and is streamed
+ * through MailParser; otherwise text fields are read and attachment files are
+ * copied straight out of the spool file.
+ */
+async function parseSpooledFormData(filePath: string, boundary: string, attachmentPrefix: string): Promise<InboundEmail> {
+  const parts = await indexFormParts(filePath, boundary);
+  const fields: Record<string, string> = {};
+  const attachments: SavedEmailAttachment[] = [];
+  let rawEmail: InboundEmail | null = null;
+  let attachmentIndex = 0;
+
+  try {
+    const handle = await fs.promises.open(filePath, 'r');
+    try {
+      for (const part of parts) {
+        if (part.filename === undefined && part.name !== 'email') {
+          fields[part.name] = (await readRange(handle, part.start, part.end, MAX_FORM_FIELD_BYTES)).toString('utf8');
+        }
+      }
+    } finally {
+      await handle.close();
+    }
+
+    for (const part of parts) {
+      if (part.filename !== undefined) {
+        const source = createRangeStream(filePath, part.start, part.end);
+        const saved = await saveAttachment(source, part.filename, part.contentType, `${attachmentPrefix}_${++attachmentIndex}`);
+        if (saved) attachments.push(saved);
+      } else if (part.name === 'email') {
+        rawEmail = await parseMimeStream(createRangeStream(filePath, part.start, part.end), `${attachmentPrefix}_mime`);
+      }
+    }
+  } catch (error) {
+    discardEmailAttachments(attachments);
+    throw error;
+  }
+
+  // SendGrid's parsed fields win; the raw message fills the gaps and carries threading headers
+  const rawHeaders = fields.headers || '';
+  const headerValue = (name: string) => {
+    const match = rawHeaders.match(new RegExp(`^${name}:(.*(?:\\r?\\n[ \\t].*)*)`, 'im'));
+    return match ? match[1].replace(/\r?\n[ \t]+/g, ' ').trim() : undefined;
+  };
+
+  return {
+    from: fields.from ? extractAddress(fields.from) : rawEmail?.from || '',
+    subject: (fields.subject || '').trim() || rawEmail?.subject || '',
+    text: fields.text || rawEmail?.text || '',
+    html: fields.html || rawEmail?.html || '',
+    messageId: rawEmail?.messageId || stripAngleBrackets(headerValue('Message-ID')),
+    inReplyTo: rawEmail?.inReplyTo || stripAngleBrackets(headerValue('In-Reply-To')),
+    references: rawEmail?.references || headerValue('References'),
+    attachments: attachments.concat(rawEmail?.attachments || [])
+  };
+}
+
+/**
+ * Parse a spooled inbound message, either raw MIME or SendGrid multipart/form-data
+ */
+export async function parseSpooledMessage(spoolFile: string, contentType?: string): Promise<InboundEmail> {
+  const filePath = resolveSpoolFile(spoolFile);
+  const attachmentPrefix = `email_${path.basename(spoolFile, '.eml')}`;
+
+  const boundary = contentType?.match(/^multipart\/form-data;.*\bboundary="?([^";]+)"?/i);
+  if (boundary) {
+    return parseSpooledFormData(filePath, boundary[1], attachmentPrefix);
+  }
+
+  return parseMimeStream(fs.createReadStream(filePath), attachmentPrefix);
+}
@@ -1,14 +1,55 @@
 import express, { type Express, Request, Response, NextFunction } from "express";
 import { createServer, type Server } from "http";
-import { storage } from "./storage";
+import { 
+  storage, decodeCursor, SEARCH_SOURCES,
+  type PageCursor, type JournalFilter, type EmailFilter, type SearchSource
+} from "./storage";
 import { setupAuth } from "./auth";
 import { setupTikTokAuth } from "./tiktok-auth";
-import { type InsertEmailQueue } from "@shared/schema";
+import { type InsertEmailQueue, updateUserPreferencesSchema } from "@shared/schema";
 import { emailService } from "./email";
 import { journalImageUpload, getFileUrl } from "./file-upload";
+import { spoolRequestBody, removeSpooledMessage } from "./inbound-spool";
 import multer from "multer";
-import { simpleParser } from "mailparser";
 import { handleSendGridWebhook } from "./webhook-sendgrid";
+import { pool, getPoolMetrics } from "./db";
+
+// Page size bounds for the cursor-paginated list endpoints
+const DEFAULT_PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 200;
+const MAX_SEARCH_RESULTS = 50;
+
+// Parse the ?limit= and ?cursor= query parameters shared by the list endpoints.
+// Requests with neither get the full list, as before pagination existed; a
+// cursor without a limit continues in pages of DEFAULT_PAGE_SIZE.
+function parsePageParams(query: Request['query']): { limit?: number; cursor?: PageCursor } | { error: string } {
+  let cursor: PageCursor | undefined;
+  if (typeof query.cursor === 'string' && query.cursor) {
+    cursor = decodeCursor(query.cursor);
+    if (!cursor) {
+      return { error: 'Invalid cursor' };
+    }
+  }
+  
+  let limit = cursor ? DEFAULT_PAGE_SIZE : undefined;
+  if (typeof query.limit === 'string') {
+    limit = parseInt(query.limit);
+    if (isNaN(limit) || limit < 1) {
+      return { error: 'Invalid limit' };
+    }
+    limit = Math.min(limit, MAX_PAGE_SIZE);
+  }
+  
+  return { limit, cursor };
+}
+
+// The list body stays a plain array; the next page is advertised in a header
+function setNextCursorHeader(res: Response, nextCursor: string | null) {
+  res.setHeader('Access-Control-Expose-Headers', 'X-Next-Cursor');
+  if (nextCursor) {
+    res.setHeader('X-Next-Cursor', nextCursor);
+  }
+}
 
 export async function registerRoutes(app: Express): Promise<Server> {
   // Set up authentication routes
@@ -25,6 +66,22 @@ export async function registerRoutes(app: Express): Promise<Server> {
     res.json({ status: "ok", timestamp: new Date().toISOString() });
   });
   
+  // Database up/down for anyone; pool saturation (checkout wait times and
+  // clients in use) only for authenticated callers
+  app.get("/api/health/db", async (req: Request, res: Response) => {
+    const timestamp = new Date().toISOString();
+    try {
+      await pool.query("SELECT 1");
+    } catch {
+      return res.status(503).json({ status: "down", timestamp });
+    }
+    
+    if (!req.isAuthenticated()) {
+      return res.json({ status: "ok", timestamp });
+    }
+    res.json({ status: "ok", ...getPoolMetrics(), timestamp });
+  });
+  
   // Simple webhook test endpoint - publicly accessible for external testing
   app.post("/api/webhook-test", (req: Request, res: Response) => {
     console.log('🔔 WEBHOOK TEST ENDPOINT ACCESSED');
@@ -118,66 +175,54 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
   
-  // Raw MIME webhook route for when SendGrid is configured to post raw email content
-  app.post("/api/emails/webhook-raw", async (req: Request, res: Response) => {
-    console.log('🔔 === SENDGRID RAW MIME WEBHOOK RECEIVED === 🔔');
+  // Stream a raw MIME (or SendGrid multipart) webhook body to the inbound spool
+  // and queue a reference to it. The email processor parses the spool file as a stream.
+  const spoolInboundEmail = async (req: Request, res: Response, source: string) => {
     console.log(`Request received at: ${new Date().toISOString()}`);
-    console.log(`Content-Type: ${req.headers['content-type']}`);
-    
+    console.log(`Content-Type Header: ${req.headers['content-type']}`);
+    console.log(`Content-Length Header: ${req.headers['content-length']}`);
+    console.log(`User-Agent: ${req.headers['user-agent']}`);
+
     try {
-      // For raw MIME emails, we need to process the raw body
-      let rawBody = '';
-      req.setEncoding('utf8');
-      
-      req.on('data', (chunk) => {
-        rawBody += chunk;
-      });
-      
-      req.on('end', async () => {
-        try {
-          console.log(`Raw MIME length: ${rawBody.length} bytes`);
-          
-          if (rawBody.length === 0) {
-            console.log('❌ Empty raw MIME body received');
-            return res.status(200).send('Error: Empty MIME body');
-          }
-          
-          // Parse the raw email
-          const parsed = await simpleParser(rawBody);
-          
-          console.log(`Parsed email from: ${parsed.from?.text}`);
-          console.log(`Parsed email subject: ${parsed.subject}`);
-          console.log(`Parsed email text: ${parsed.text?.substring(0, 100)}...`);
-          
-          // Create a queue item with the parsed email data
-          const queueItem: InsertEmailQueue = {
-            payload: {
-              from: parsed.from?.text || '',
-              subject: parsed.subject || 'No Subject',
-              text: parsed.text || parsed.html || 'No content',
-              headers: parsed.headers,
-              receivedAt: new Date().toISOString(),
-              parsedAt: new Date().toISOString(),
-              messageId: parsed.messageId
-            },
-            status: "pending" as const
-          };
-          
-          const saved = await storage.enqueueEmail(queueItem);
-          console.log(`✅ Raw MIME email queued for processing (Queue ID: ${saved.id})`);
-          
-          res.status(200).send('OK: Raw MIME email queued for processing');
-        } catch (error) {
-          console.error('Error processing raw MIME:', error);
-          res.status(200).send(`Error parsing raw MIME: ${error instanceof Error ? error.message : 'Unknown error'}`);
-        }
-      });
-      
-      // Return nothing here as the response is sent in the end event handler
+      const { spoolFile, size } = await spoolRequestBody(req);
+
+      if (size === 0) {
+        console.warn('⚠️ Empty raw MIME body received from SendGrid.');
+        await removeSpooledMessage(spoolFile);
+        return res.status(200).send('Error: Empty MIME body');
+      }
+
+      console.log(`📊 Spooled ${size} bytes to ${spoolFile}`);
+
+      const queueItem: InsertEmailQueue = {
+        payload: {
+          rawMimeSpoolFile: spoolFile,
+          size,
+          receivedAt: new Date().toISOString(),
+          contentType: req.headers['content-type'] as string,
+          userAgent: req.headers['user-agent'] as string,
+          source
+        },
+        status: "pending" as const
+      };
+
+      const savedQueueItem = await storage.enqueueEmail(queueItem);
+      console.log(`✅ Spooled email queued for processing. Queue ID: ${savedQueueItem.id}`);
+
+      // Always return 200 OK to SendGrid quickly.
+      res.status(200).send('OK: Email data queued for processing.');
+
     } catch (error) {
-      console.error('Error in raw MIME webhook route:', error);
-      return res.status(200).send(`Error: ${error.message}`);
+      console.error('❌ Error spooling raw MIME webhook:', error);
+      // Still return 200 OK to SendGrid.
+      res.status(200).send(`Error processing email: ${error instanceof Error ? error.message : 'Unknown error'}`);
     }
+  };
+
+  // Raw MIME webhook route for when SendGrid is configured to post raw email content
+  app.post("/api/emails/webhook-raw", async (req: Request, res: Response) => {
+    console.log('🔔 === SENDGRID RAW MIME WEBHOOK RECEIVED === 🔔');
+    return spoolInboundEmail(req, res, 'sendgrid-raw-webhook');
   });
 
   // Enhanced SendGrid webhook for better content extraction
@@ -189,79 +234,55 @@ export async function registerRoutes(app: Express): Promise<Server> {
   );
 
   // Main SendGrid Inbound Parse Webhook - handles raw MIME messages
-  app.post(
-    "/api/emails/webhook",
-    express.raw({ type: '*/*', limit: '50mb' }), // Middleware to get raw body
-    async (req: Request, res: Response) => {
-      console.log('🔔 === SENDGRID WEBHOOK (/api/emails/webhook) RECEIVED === 🔔');
-      console.log(`Request received at: ${new Date().toISOString()}`);
-      console.log(`METHOD: ${req.method}`);
-      console.log(`URL: ${req.originalUrl}`);
-      console.log(`HEADERS: ${JSON.stringify(req.headers, null, 2)}`);
-      console.log(`Content-Type Header: ${req.headers['content-type']}`);
-      console.log(`Content-Length Header: ${req.headers['content-length']}`);
-      console.log(`User-Agent: ${req.headers['user-agent']}`);
-
-      if (Buffer.isBuffer(req.body)) {
-        console.log(`✅ req.body is a Buffer. Length: ${req.body.length} bytes.`);
-        if (req.body.length > 0) {
-          try {
-            const preview = req.body.slice(0, 200).toString('utf8');
-            console.log(`Buffer preview (first 200 bytes): ${preview}...`);
-          } catch (e) {
-            console.log(`Buffer preview could not be decoded as UTF-8`);
-          }
-        }
-      } else {
-        console.error(`❌ req.body is NOT a Buffer. Type: ${typeof req.body}`);
-        try {
-          console.error(`req.body (stringified): ${JSON.stringify(req.body).substring(0, 500)}...`);
-        } catch (e) {
-          console.error(`req.body could not be stringified. Raw form: ${String(req.body).substring(0,500)}...`);
-        }
-        return res.status(200).send('Error: Expected raw MIME body as Buffer.');
+  app.post("/api/emails/webhook", async (req: Request, res: Response) => {
+    console.log('🔔 === SENDGRID WEBHOOK (/api/emails/webhook) RECEIVED === 🔔');
+    return spoolInboundEmail(req, res, 'sendgrid-inbound-webhook');
+  });
+  
+  // Get a page of emails for the current user, newest first (cursor paginated like /api/journal)
+  app.get('/api/emails', async (req: Request, res: Response) => {
+    if (!req.isAuthenticated()) {
+      return res.status(401).json({ error: 'Not authenticated' });
+    }
+    
+    try {
+      const { type, isRead, dateRange, conversationId } = req.query;
+      
+      const pageParams = parsePageParams(req.query);
+      if ('error' in pageParams) {
+        return res.status(400).json({ error: pageParams.error });
       }
-
-      try {
-        if (req.body.length === 0) {
-          console.warn('⚠️ Empty raw MIME body received from SendGrid.');
-          return res.status(200).send('Error: Empty MIME body');
-        }
-
-        const rawEmailBuffer = req.body as Buffer;
-        console.log(`📊 Processing raw MIME buffer of ${rawEmailBuffer.length} bytes`);
-
-        // For the queue, store the raw email as base64.
-        // The email-processor will decode and parse it.
-        const queuePayload = {
-          rawMimeBase64: rawEmailBuffer.toString('base64'),
-          receivedAt: new Date().toISOString(),
-          contentType: req.headers['content-type'] as string,
-          userAgent: req.headers['user-agent'] as string,
-          source: 'sendgrid-inbound-webhook'
-        };
-
-        const queueItem: InsertEmailQueue = {
-          payload: queuePayload,
-          status: "pending" as const
-        };
-
-        const savedQueueItem = await storage.enqueueEmail(queueItem);
-        console.log(`✅ Raw MIME email (base64) queued for processing. Queue ID: ${savedQueueItem.id}`);
-
-        // Always return 200 OK to SendGrid quickly.
-        res.status(200).send('OK: Email data queued for processing.');
-
-      } catch (error) {
-        console.error('❌ Error processing raw MIME webhook:', error);
-        // Still return 200 OK to SendGrid.
-        res.status(200).send(`Error processing email: ${error.message}`);
+      
+      const filter: EmailFilter = { ...pageParams };
+      
+      if (type && typeof type === 'string') {
+        filter.type = type;
+      }
+      
+      if (isRead === 'true' || isRead === 'false') {
+        filter.isRead = isRead === 'true';
       }
+      
+      if (dateRange && typeof dateRange === 'string') {
+        filter.dateRange = dateRange;
+      }
+      
+      if (conversationId && typeof conversationId === 'string') {
+        filter.conversationId = conversationId;
+      }
+      
+      const page = await storage.getEmailsPage(req.user.id, filter);
+      setNextCursorHeader(res, page.nextCursor);
+      res.json(page.items);
+    } catch (error) {
+      console.error('Error fetching emails:', error);
+      res.status(500).json({ error: 'Failed to fetch emails' });
     }
-  );
+  });
   
   // Journal entries API endpoints
-  // Get all journal entries for the current user
+  // Get journal entries for the current user, newest first. Pass ?limit= to page
+  // them; the X-Next-Cursor response header goes back as ?cursor= for the next page.
   app.get('/api/journal', async (req: Request, res: Response) => {
     if (!req.isAuthenticated()) {
       return res.status(401).json({ error: 'Not authenticated' });
@@ -271,11 +292,16 @@ export async function registerRoutes(app: Express): Promise<Server> {
       // Extract filter parameters if any
       const { dateRange, mood, tags } = req.query;
       
-      const filter: any = {};
+      const pageParams = parsePageParams(req.query);
+      if ('error' in pageParams) {
+        return res.status(400).json({ error: pageParams.error });
+      }
+      
+      const filter: JournalFilter = { ...pageParams };
       
       // Apply filters if provided
       if (tags && typeof tags === 'string') {
-        filter.tags = tags.split(',');
+        filter.tags = tags.split(',').map(tag => tag.trim()).filter(Boolean);
       }
       
       if (mood && typeof mood === 'string') {
@@ -306,17 +332,54 @@ export async function registerRoutes(app: Express): Promise<Server> {
             startOfYear.setFullYear(today.getFullYear() - 1);
             filter.createdAfter = startOfYear;
             break;
+          default:
+            // 7days, 30days and all are resolved by the storage layer
+            filter.dateRange = dateRange;
         }
       }
       
-      const entries = await storage.getJournalEntries(req.user.id, filter);
-      res.json(entries);
+      const page = await storage.getJournalEntriesPage(req.user.id, filter);
+      setNextCursorHeader(res, page.nextCursor);
+      res.json(page.items);
     } catch (error) {
       console.error('Error fetching journal entries:', error);
       res.status(500).json({ error: 'Failed to fetch journal entries' });
     }
   });
   
+  // Full-text search across the user's journal entries, emails and conversation memories
+  // e.g. /api/search?q=mountain hike&sources=journal,email&limit=20
+  app.get('/api/search', async (req: Request, res: Response) => {
+    if (!req.isAuthenticated()) {
+      return res.status(401).json({ error: 'Not authenticated' });
+    }
+    
+    const query = typeof req.query.q === 'string' ? req.query.q.trim() : '';
+    if (!query) {
+      return res.status(400).json({ error: 'Search query is required' });
+    }
+    
+    let sources = SEARCH_SOURCES;
+    if (typeof req.query.sources === 'string') {
+      sources = req.query.sources.split(',')
+        .map(source => source.trim())
+        .filter((source): source is SearchSource => SEARCH_SOURCES.includes(source as SearchSource));
+      if (sources.length === 0) {
+        return res.status(400).json({ error: 'Invalid search sources' });
+      }
+    }
+    
+    const limit = Math.max(1, Math.min(parseInt(req.query.limit as string) || 20, MAX_SEARCH_RESULTS));
+    
+    try {
+      const results = await storage.searchContent(req.user.id, query, { sources, limit });
+      res.json(results);
+    } catch (error) {
+      console.error('Error searching content:', error);
+      res.status(500).json({ error: 'Failed to search' });
+    }
+  });
+  
   // Get a single journal entry
   app.get('/api/journal/:id', async (req: Request, res: Response) => {
     if (!req.isAuthenticated()) {
@@ -528,9 +591,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
         receiveInsights,
         receiveSms,
         emailDeliveryTime,
+        timezone,
         disableDailyEmails
       } = req.body;
       
+      if (timezone !== undefined && !updateUserPreferencesSchema.shape.timezone.safeParse(timezone).success) {
+        return res.status(400).json({ error: 'Invalid timezone' });
+      }
+      
       // Update user preferences
       const updatedUser = await storage.updateUserPreferences(req.user.id, {
         emailFrequency,
@@ -538,6 +606,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
         receiveInsights,
         receiveSms,
         emailDeliveryTime,
+        timezone,
         disableDailyEmails
       });
       
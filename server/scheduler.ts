@@ -1,52 +1,400 @@
-import { emailService } from "./email";
+import { User } from "@shared/schema";
+import { emailService, MAX_EMAIL_BATCH_SIZE } from "./email";
+import { twilioService } from "./twilio";
+import { storage } from "./storage";
+import { generateFlappyContent, FlappyContent } from "./venice-ai";
 
-// Interval for checking if daily emails need to be sent (every 15 minutes)
-const CHECK_INTERVAL_MS = 15 * 60 * 1000;
+// Users are bucketed into slots of this many minutes across the UTC day
+const SLOT_MINUTES = 5;
+const SLOTS_PER_DAY = (24 * 60) / SLOT_MINUTES;
+const SLOT_MS = SLOT_MINUTES * 60 * 1000;
 
-// Track the last date emails were sent to avoid duplicates
-let lastSendDate: string | null = null;
+// Rebuild the wheel hourly to pick up new users, preference changes and DST shifts
+const REBUILD_INTERVAL_MS = 60 * 60 * 1000;
+
+// On startup, replay slots that fell due this recently. Delivery checkpoints
+// make the replay skip anyone who was already sent today's inspiration.
+const CATCH_UP_MINUTES = 3 * 60;
+
+// Each tick also retries deliveries whose claim expired within this window
+// (a failed send, or a run that died mid-slot), as long as attempts remain
+const RETRY_LOOKBACK_MS = 24 * 60 * 60 * 1000;
+
+const DEFAULT_DELIVERY_TIME = "11:00";
+const DEFAULT_TIMEZONE = process.env.DEFAULT_USER_TIMEZONE ||
+  Intl.DateTimeFormat().resolvedOptions().timeZone || "UTC";
+
+// Concurrent AI content generations per slot
+const GENERATION_CONCURRENCY = 4;
+
+// Emails per SendGrid request, and sustained send rates for each provider
+const EMAIL_BATCH_SIZE = Math.min(100, MAX_EMAIL_BATCH_SIZE);
+const EMAILS_PER_SECOND = 50;
+const SMS_PER_SECOND = 1;
 
 /**
- * Check if it's time to send daily emails based on the current time
+ * Token bucket rate limiter. take() resolves once enough tokens have
+ * accumulated, so callers are paced to the refill rate after the initial burst.
  */
-async function checkAndSendDailyEmails() {
-  const now = new Date();
-  
-  // Get current hour in 24hr format (for delivery time check)
-  const currentHour = now.getHours();
-  const currentMinute = now.getMinutes();
-  
-  // Format today's date as YYYY-MM-DD for tracking
-  const today = now.toISOString().split('T')[0];
-  
-  // If we already sent emails today, skip
-  if (lastSendDate === today) {
-    console.log(`📅 Daily emails already sent for ${today}, skipping check`);
-    return;
+class TokenBucket {
+  private tokens: number;
+  private lastRefill = Date.now();
+
+  constructor(private capacity: number, private refillPerSecond: number) {
+    this.tokens = capacity;
+  }
+
+  async take(count = 1): Promise<void> {
+    count = Math.min(count, this.capacity);
+
+    for (;;) {
+      const now = Date.now();
+      this.tokens = Math.min(this.capacity, this.tokens + (now - this.lastRefill) / 1000 * this.refillPerSecond);
+      this.lastRefill = now;
+
+      if (this.tokens >= count) {
+        this.tokens -= count;
+        return;
+      }
+
+      const waitMs = Math.ceil((count - this.tokens) / this.refillPerSecond * 1000);
+      await new Promise(resolve => setTimeout(resolve, waitMs));
+    }
+  }
+}
+
+/**
+ * Timer wheel of user IDs keyed by the UTC slot their local delivery time falls in
+ */
+class TimerWheel {
+  private slots: number[][] = Array.from({ length: SLOTS_PER_DAY }, () => []);
+  private count = 0;
+
+  get size(): number {
+    return this.count;
+  }
+
+  add(slot: number, userId: number) {
+    this.slots[slot].push(userId);
+    this.count++;
+  }
+
+  get(slot: number): number[] {
+    return this.slots[slot];
+  }
+
+  clear() {
+    this.slots.forEach(slot => slot.length = 0);
+    this.count = 0;
+  }
+}
+
+/**
+ * Run fn over items with at most `concurrency` calls in flight
+ */
+async function mapWithConcurrency<T, R>(items: T[], concurrency: number, fn: (item: T) => Promise<R>): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+
+  const workers = Array.from({ length: Math.min(concurrency, items.length) }, async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index]);
+    }
+  });
+
+  await Promise.all(workers);
+  return results;
+}
+
+type LocalTime = {
+  date: string; // YYYY-MM-DD
+  minuteOfDay: number;
+  weekday: number; // 0 = Sunday
+};
+
+const WEEKDAYS = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"];
+const formatters = new Map<string, Intl.DateTimeFormat>();
+
+function getLocalTime(date: Date, timeZone: string): LocalTime {
+  let formatter = formatters.get(timeZone);
+  if (!formatter) {
+    formatter = new Intl.DateTimeFormat("en-US", {
+      timeZone,
+      hourCycle: "h23",
+      year: "numeric",
+      month: "2-digit",
+      day: "2-digit",
+      hour: "2-digit",
+      minute: "2-digit",
+      weekday: "short"
+    });
+    formatters.set(timeZone, formatter);
   }
-  
-  // Check if it's time to send based on preferred delivery hour (default: 11:00 AM)
-  // We'll send within 15 minutes of the target hour
-  if (currentHour === 11 && currentMinute < 15) {
-    console.log(`🕚 It's around 11:00 AM - time to send daily inspiration emails!`);
-    
+
+  const parts: Record<string, string> = {};
+  formatter.formatToParts(date).forEach(part => parts[part.type] = part.value);
+
+  return {
+    date: `${parts.year}-${parts.month}-${parts.day}`,
+    minuteOfDay: parseInt(parts.hour) * 60 + parseInt(parts.minute),
+    weekday: WEEKDAYS.indexOf(parts.weekday)
+  };
+}
+
+function getUserTimeZone(user: User): string {
+  const timeZone = user.preferences?.timezone;
+  if (timeZone) {
     try {
-      // Send daily inspiration emails
-      const result = await emailService.sendDailyInspiration();
-      
-      if (result.success) {
-        console.log(`✅ Successfully sent ${result.count} daily inspiration emails`);
-        // Update last send date to avoid sending duplicates today
-        lastSendDate = today;
-      } else {
-        console.error(`❌ Failed to send daily inspiration emails`);
+      getLocalTime(new Date(), timeZone);
+      return timeZone;
+    } catch {
+      console.warn(`Invalid timezone "${timeZone}" for user ${user.id}, using ${DEFAULT_TIMEZONE}`);
+    }
+  }
+  return DEFAULT_TIMEZONE;
+}
+
+function parseDeliveryTime(value?: string): number {
+  const match = /^(\d{1,2}):(\d{2})$/.exec(value || DEFAULT_DELIVERY_TIME);
+  if (!match || parseInt(match[1]) > 23 || parseInt(match[2]) > 59) {
+    return parseDeliveryTime(DEFAULT_DELIVERY_TIME);
+  }
+  return parseInt(match[1]) * 60 + parseInt(match[2]);
+}
+
+/**
+ * Map a user's local delivery time to a UTC slot, using today's UTC offset for their timezone
+ */
+function getDeliverySlot(user: User, now: Date): number {
+  const local = getLocalTime(now, getUserTimeZone(user));
+  const utcMinuteOfDay = now.getUTCHours() * 60 + now.getUTCMinutes();
+  const offsetMinutes = local.minuteOfDay - utcMinuteOfDay;
+
+  const deliveryMinute = parseDeliveryTime(user.preferences?.emailDeliveryTime);
+  const utcDeliveryMinute = ((deliveryMinute - offsetMinutes) % 1440 + 1440) % 1440;
+  return Math.floor(utcDeliveryMinute / SLOT_MINUTES);
+}
+
+function isDeliveryDay(user: User, weekday: number): boolean {
+  switch (user.preferences?.emailFrequency) {
+    case "weekdays":
+      return weekday >= 1 && weekday <= 5;
+    case "weekends":
+      return weekday === 0 || weekday === 6;
+    case "weekly":
+      return weekday === 1; // Mondays
+    default:
+      return true;
+  }
+}
+
+function wantsSms(user: User): boolean {
+  return user.isPremium && !!user.preferences?.receiveSms && !!user.preferences?.phoneNumber;
+}
+
+const wheel = new TimerWheel();
+const usersById = new Map<number, User>();
+const emailBucket = new TokenBucket(EMAIL_BATCH_SIZE, EMAILS_PER_SECOND);
+const smsBucket = new TokenBucket(1, SMS_PER_SECOND);
+
+let nextSlotStart = 0; // Epoch ms of the next slot to process
+let lastRebuild = 0;
+let running = false;
+
+/**
+ * Reload users and re-bucket them by their preferred local delivery time
+ */
+async function rebuildWheel(now: Date) {
+  const allUsers = await storage.getAllUsers();
+
+  wheel.clear();
+  usersById.clear();
+
+  for (const user of allUsers) {
+    if (user.preferences?.disableDailyEmails) {
+      continue;
+    }
+    usersById.set(user.id, user);
+    wheel.add(getDeliverySlot(user, now), user.id);
+  }
+
+  lastRebuild = now.getTime();
+  console.log(`📅 Delivery wheel rebuilt: ${wheel.size} users across ${SLOTS_PER_DAY} slots`);
+}
+
+/**
+ * Generate and send today's email inspiration for a slot's users, in rate-limited batches
+ */
+async function deliverEmails(recipients: { user: User; date: string }[]) {
+  let sent = 0;
+
+  for (let i = 0; i < recipients.length; i += EMAIL_BATCH_SIZE) {
+    const chunk = recipients.slice(i, i + EMAIL_BATCH_SIZE);
+
+    // Claim each delivery before spending an AI generation on it
+    const prepared = await mapWithConcurrency(chunk, GENERATION_CONCURRENCY, async ({ user, date }) => {
+      const claim = await storage.claimDailyDelivery(user.id, "email", date);
+      if (!claim) {
+        return null; // Already sent, or being sent by another process
       }
+
+      try {
+        const content: FlappyContent = await generateFlappyContent('dailyInspiration', undefined, {
+          username: user.username,
+          email: user.email,
+          userId: user.id,
+          firstName: user.firstName || undefined,
+          lastName: user.lastName || undefined
+        });
+        return { user, content, claimId: claim.id };
+      } catch (error: any) {
+        await storage.markDailyDeliveryFailed(claim.id, `Content generation failed: ${error?.message || error}`);
+        return null;
+      }
+    });
+
+    const batch = prepared.filter((item): item is NonNullable<typeof item> => item !== null);
+    if (batch.length === 0) {
+      continue;
+    }
+
+    await emailBucket.take(batch.length);
+
+    try {
+      await emailService.sendDailyInspirationBatch(batch);
+      await Promise.all(batch.map(item => storage.markDailyDeliverySent(item.claimId)));
+      sent += batch.length;
+    } catch (error: any) {
+      console.error(`❌ Failed to send daily inspiration batch of ${batch.length}:`, error);
+      await Promise.all(batch.map(item => storage.markDailyDeliveryFailed(item.claimId, error?.message || String(error))));
+    }
+  }
+
+  return sent;
+}
+
+async function deliverSms(recipients: { user: User; date: string }[]) {
+  const results = await mapWithConcurrency(recipients, GENERATION_CONCURRENCY, async ({ user, date }) => {
+    const claim = await storage.claimDailyDelivery(user.id, "sms", date);
+    if (!claim) {
+      return false;
+    }
+
+    await smsBucket.take();
+    const message = await twilioService.sendDailyInspirationSms(user);
+    if (message) {
+      await storage.markDailyDeliverySent(claim.id);
+      return true;
+    }
+    await storage.markDailyDeliveryFailed(claim.id, "SMS send failed");
+    return false;
+  });
+
+  return results.filter(Boolean).length;
+}
+
+/**
+ * Deliver to every user whose local delivery time falls in the slot starting at slotStart
+ */
+async function runSlot(slotStart: Date) {
+  const slot = Math.floor((slotStart.getUTCHours() * 60 + slotStart.getUTCMinutes()) / SLOT_MINUTES);
+  const emailRecipients: { user: User; date: string }[] = [];
+  const smsRecipients: { user: User; date: string }[] = [];
+
+  for (const userId of wheel.get(slot)) {
+    const user = usersById.get(userId);
+    if (!user) continue;
+
+    const local = getLocalTime(slotStart, getUserTimeZone(user));
+    if (!isDeliveryDay(user, local.weekday)) continue;
+
+    emailRecipients.push({ user, date: local.date });
+    if (wantsSms(user)) {
+      smsRecipients.push({ user, date: local.date });
+    }
+  }
+
+  if (emailRecipients.length === 0 && smsRecipients.length === 0) {
+    return;
+  }
+
+  const [emailsSent, smsSent] = await Promise.all([
+    deliverEmails(emailRecipients),
+    deliverSms(smsRecipients)
+  ]);
+
+  console.log(`✅ Slot ${slotStart.toISOString()}: sent ${emailsSent}/${emailRecipients.length} emails, ${smsSent}/${smsRecipients.length} SMS`);
+}
+
+/**
+ * Re-claim deliveries whose earlier claim expired without a send. Only
+ * deliveries still dated the user's local today are retried.
+ */
+async function retryExpiredDeliveries(now: Date) {
+  const deliveries = await storage.getRetryableDailyDeliveries(new Date(now.getTime() - RETRY_LOOKBACK_MS));
+  const emailRecipients: { user: User; date: string }[] = [];
+  const smsRecipients: { user: User; date: string }[] = [];
+
+  for (const delivery of deliveries) {
+    const user = usersById.get(delivery.userId);
+    if (!user) continue;
+    if (getLocalTime(now, getUserTimeZone(user)).date !== delivery.deliveryDate) continue;
+
+    if (delivery.channel === "email") {
+      emailRecipients.push({ user, date: delivery.deliveryDate });
+    } else if (delivery.channel === "sms" && wantsSms(user)) {
+      smsRecipients.push({ user, date: delivery.deliveryDate });
+    }
+  }
+
+  if (emailRecipients.length === 0 && smsRecipients.length === 0) {
+    return;
+  }
+
+  const [emailsSent, smsSent] = await Promise.all([
+    deliverEmails(emailRecipients),
+    deliverSms(smsRecipients)
+  ]);
+
+  console.log(`🔁 Retried expired deliveries: sent ${emailsSent}/${emailRecipients.length} emails, ${smsSent}/${smsRecipients.length} SMS`);
+}
+
+/**
+ * Process every slot that has come due since the last tick, retry expired
+ * claims, then schedule the next tick
+ */
+async function tick() {
+  if (running) return;
+  running = true;
+  let delayMs = 0;
+
+  try {
+    const now = new Date();
+    if (now.getTime() - lastRebuild >= REBUILD_INTERVAL_MS) {
+      await rebuildWheel(now);
+    }
+
+    while (nextSlotStart <= Date.now()) {
+      try {
+        await runSlot(new Date(nextSlotStart));
+      } catch (error) {
+        console.error(`Error running delivery slot ${new Date(nextSlotStart).toISOString()}:`, error);
+      }
+      nextSlotStart += SLOT_MS;
+    }
+
+    try {
+      await retryExpiredDeliveries(new Date());
     } catch (error) {
-      console.error('Error sending daily inspiration emails:', error);
+      console.error('Error retrying expired deliveries:', error);
     }
-  } else {
-    // Not time yet
-    console.log(`⏰ Current time: ${currentHour}:${currentMinute} - Not yet time to send daily emails (scheduled for ~11:00 AM)`);
+  } catch (error) {
+    console.error('Error in daily inspiration scheduler:', error);
+    delayMs = 60 * 1000; // Back off before retrying, e.g. while the database is unreachable
+  } finally {
+    running = false;
+    setTimeout(tick, Math.max(delayMs, 1000, nextSlotStart - Date.now()));
   }
 }
 
@@ -54,13 +402,11 @@ async function checkAndSendDailyEmails() {
  * Start the email scheduler
  */
 export function startEmailScheduler() {
-  console.log('📅 Starting email scheduler service...');
-  
-  // Check immediately on startup (but with a small delay to let other systems initialize)
-  setTimeout(() => {
-    checkAndSendDailyEmails();
-  }, 10000);
-  
-  // Then set up regular interval checks
-  setInterval(checkAndSendDailyEmails, CHECK_INTERVAL_MS);
-}
\ No newline at end of file
+  console.log('📅 Starting daily inspiration scheduler...');
+
+  const catchUpStart = Date.now() - CATCH_UP_MINUTES * 60 * 1000;
+  nextSlotStart = Math.ceil(catchUpStart / SLOT_MS) * SLOT_MS;
+
+  // Start with a small delay to let other systems initialize
+  setTimeout(tick, 10000);
+}
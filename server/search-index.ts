@@ -0,0 +1,262 @@
+/**
+ * In-process full-text search index used by MemStorage.
+ *
+ * DatabaseStorage searches with Postgres tsvector expressions and GIN indexes
+ * (see migrations/add_full_text_search_indexes.sql). This is the in-memory
+ * equivalent: an inverted index per user, updated incrementally as documents
+ * are written, ranked with BM25 and returning highlighted snippets in the same
+ * format as ts_headline.
+ */
+import type { SearchResult, SearchSource } from "./storage-shared";
+
+// Highlight markers shared with the Postgres ts_headline options
+export const HIGHLIGHT_START = "<mark>";
+export const HIGHLIGHT_END = "</mark>";
+
+const SNIPPET_WORDS = 30;
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+
+// Common English words that carry no search signal (mirrors the 'english' text search config)
+const STOP_WORDS = new Set([
+  "a", "about", "after", "again", "all", "am", "an", "and", "any", "are", "as", "at",
+  "be", "because", "been", "before", "being", "but", "by", "can", "could", "did", "do",
+  "does", "doing", "for", "from", "had", "has", "have", "having", "he", "her", "here",
+  "him", "his", "how", "i", "if", "in", "into", "is", "it", "its", "just", "me", "more",
+  "my", "myself", "no", "not", "now", "of", "on", "once", "only", "or", "other", "our",
+  "out", "over", "own", "same", "she", "should", "so", "some", "such", "than", "that",
+  "the", "their", "them", "then", "there", "these", "they", "this", "those", "through",
+  "to", "too", "under", "until", "up", "very", "was", "we", "were", "what", "when",
+  "where", "which", "while", "who", "why", "will", "with", "would", "you", "your"
+]);
+
+// Latin letters including accented forms (U+00C0-U+024F), digits, and an optional 's / 't suffix
+const WORD_PATTERN = /[a-z0-9À-ɏ]+(?:'[a-zÀ-ɏ]+)?/gi;
+
+/**
+ * Reduce a word to the term stored in the index. A deliberately light
+ * normalisation: lowercase, drop possessives and plural/verb suffixes.
+ */
+export function normalizeTerm(word: string): string | null {
+  let term = word.toLowerCase().replace(/'s$/, "");
+  if (STOP_WORDS.has(term)) {
+    return null;
+  }
+  if (term.length > 4 && term.endsWith("ies")) {
+    term = term.slice(0, -3) + "y";
+  } else if (term.length > 5 && term.endsWith("ing")) {
+    term = term.slice(0, -3);
+  } else if (term.length > 4 && term.endsWith("ed")) {
+    term = term.slice(0, -2);
+  } else if (term.length > 3 && term.endsWith("s") && !term.endsWith("ss")) {
+    term = term.slice(0, -1);
+  }
+  // hike / hiking / hiked all reduce to "hik"
+  if (term.length > 3 && term.endsWith("e")) {
+    term = term.slice(0, -1);
+  }
+  return term;
+}
+
+export function tokenize(text: string): string[] {
+  const terms: string[] = [];
+  for (const match of Array.from(text.matchAll(WORD_PATTERN))) {
+    const term = normalizeTerm(match[0]);
+    if (term) {
+      terms.push(term);
+    }
+  }
+  return terms;
+}
+
+function escapeHtml(text: string): string {
+  return text
+    .replace(/&/g, "&amp;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;");
+}
+
+/**
+ * Build an HTML-safe snippet around the densest cluster of query terms,
+ * wrapping each matched word in the highlight markers.
+ */
+export function highlightSnippet(text: string, queryTerms: Set<string>, maxWords = SNIPPET_WORDS): string {
+  const words = Array.from(text.matchAll(WORD_PATTERN));
+  if (words.length === 0) {
+    return escapeHtml(text.slice(0, 200));
+  }
+
+  const isHit = words.map(word => {
+    const term = normalizeTerm(word[0]);
+    return term !== null && queryTerms.has(term);
+  });
+
+  // Slide a window of maxWords across the text and keep the one with most hits
+  let bestStart = 0;
+  let bestHits = -1;
+  let hits = 0;
+  for (let i = 0; i < words.length; i++) {
+    if (isHit[i]) hits++;
+    if (i >= maxWords && isHit[i - maxWords]) hits--;
+    const start = Math.max(0, i - maxWords + 1);
+    if (hits > bestHits) {
+      bestHits = hits;
+      bestStart = start;
+    }
+  }
+
+  const end = Math.min(words.length, bestStart + maxWords);
+  let snippet = "";
+  let position = words[bestStart].index!;
+  for (let i = bestStart; i < end; i++) {
+    const word = words[i];
+    snippet += escapeHtml(text.slice(position, word.index!));
+    snippet += isHit[i] ? `${HIGHLIGHT_START}${escapeHtml(word[0])}${HIGHLIGHT_END}` : escapeHtml(word[0]);
+    position = word.index! + word[0].length;
+  }
+
+  return snippet;
+}
+
+export type IndexedDocument = {
+  source: SearchSource;
+  id: number;
+  title: string | null;
+  body: string;
+  createdAt: Date;
+};
+
+type DocumentStats = {
+  document: IndexedDocument;
+  length: number;
+  terms: Map<string, number>;
+};
+
+/**
+ * Inverted index over one user's documents. Postings map each term to the
+ * documents containing it with a weighted term frequency (title terms count double).
+ */
+class UserIndex {
+  private postings = new Map<string, Map<string, number>>();
+  private documents = new Map<string, DocumentStats>();
+  private totalLength = 0;
+
+  get size(): number {
+    return this.documents.size;
+  }
+
+  upsert(document: IndexedDocument) {
+    const key = `${document.source}:${document.id}`;
+    this.remove(document.source, document.id);
+
+    const terms = new Map<string, number>();
+    for (const term of tokenize(document.title || "")) {
+      terms.set(term, (terms.get(term) || 0) + 2);
+    }
+    for (const term of tokenize(document.body)) {
+      terms.set(term, (terms.get(term) || 0) + 1);
+    }
+
+    let length = 0;
+    terms.forEach((frequency, term) => {
+      length += frequency;
+      let posting = this.postings.get(term);
+      if (!posting) {
+        posting = new Map();
+        this.postings.set(term, posting);
+      }
+      posting.set(key, frequency);
+    });
+
+    this.documents.set(key, { document, length, terms });
+    this.totalLength += length;
+  }
+
+  remove(source: SearchSource, id: number) {
+    const key = `${source}:${id}`;
+    const existing = this.documents.get(key);
+    if (!existing) {
+      return;
+    }
+
+    existing.terms.forEach((_frequency, term) => {
+      const posting = this.postings.get(term);
+      if (!posting) return;
+      posting.delete(key);
+      if (posting.size === 0) {
+        this.postings.delete(term);
+      }
+    });
+
+    this.documents.delete(key);
+    this.totalLength -= existing.length;
+  }
+
+  search(queryTerms: Set<string>, sources: Set<SearchSource>, limit: number): SearchResult[] {
+    const documentCount = this.documents.size;
+    if (documentCount === 0) {
+      return [];
+    }
+    const averageLength = this.totalLength / documentCount;
+
+    // Accumulate BM25 scores only for documents that appear in a posting list
+    const scores = new Map<string, number>();
+    queryTerms.forEach(term => {
+      const posting = this.postings.get(term);
+      if (!posting) return;
+      const idf = Math.log(1 + (documentCount - posting.size + 0.5) / (posting.size + 0.5));
+      posting.forEach((frequency, key) => {
+        const stats = this.documents.get(key)!;
+        if (!sources.has(stats.document.source)) return;
+        const norm = frequency + BM25_K1 * (1 - BM25_B + BM25_B * stats.length / averageLength);
+        scores.set(key, (scores.get(key) || 0) + idf * frequency * (BM25_K1 + 1) / norm);
+      });
+    });
+
+    return Array.from(scores.entries())
+      .sort((a, b) => b[1] - a[1])
+      .slice(0, limit)
+      .map(([key, rank]) => {
+        const { document } = this.documents.get(key)!;
+        return {
+          source: document.source,
+          id: document.id,
+          title: document.title,
+          snippet: highlightSnippet(document.body, queryTerms),
+          rank,
+          createdAt: document.createdAt
+        };
+      });
+  }
+}
+
+export class SearchIndex {
+  private users = new Map<number, UserIndex>();
+
+  upsert(userId: number, document: IndexedDocument) {
+    let index = this.users.get(userId);
+    if (!index) {
+      index = new UserIndex();
+      this.users.set(userId, index);
+    }
+    index.upsert(document);
+  }
+
+  remove(userId: number, source: SearchSource, id: number) {
+    const index = this.users.get(userId);
+    if (!index) return;
+    index.remove(source, id);
+    if (index.size === 0) {
+      this.users.delete(userId);
+    }
+  }
+
+  search(userId: number, query: string, sources: SearchSource[], limit: number): SearchResult[] {
+    const index = this.users.get(userId);
+    const queryTerms = new Set(tokenize(query));
+    if (!index || queryTerms.size === 0) {
+      return [];
+    }
+    return index.search(queryTerms, new Set(sources), limit);
+  }
+}
@@ -0,0 +1,112 @@
+/**
+ * Storage types and helpers shared by MemStorage and DatabaseStorage.
+ *
+ * Kept free of imports from either implementation: storage.ts instantiates
+ * DatabaseStorage at load time, so database-storage.ts must not import
+ * runtime values from storage.ts.
+ */
+
+// Filter types
+export type JournalFilter = {
+  dateRange?: string; // 7days, 30days, year, all
+  createdAfter?: Date; // Explicit cutoff, takes precedence over dateRange
+  mood?: string;
+  tags?: string[]; // Matches entries sharing at least one tag
+  limit?: number; // Page size; omit for the full result set
+  cursor?: PageCursor; // Continue after the last row of a previous page
+};
+
+export type EmailFilter = {
+  type?: string;
+  isRead?: boolean;
+  dateRange?: string; // 7days, 30days, year, all
+  conversationId?: string;
+  messageId?: string;
+  limit?: number; // Page size; omit for the full result set
+  cursor?: PageCursor; // Continue after the last row of a previous page
+};
+
+export type SmsFilter = {
+  direction?: "inbound" | "outbound";
+  isJournalEntry?: boolean;
+  dateRange?: string; // 7days, 30days, year, all
+};
+
+export type DeliveryChannel = "email" | "sms";
+
+// Claims older than this are assumed to belong to a crashed run and may be retried
+export const DELIVERY_CLAIM_TIMEOUT_MS = 15 * 60 * 1000;
+export const MAX_DELIVERY_ATTEMPTS = 3;
+
+// Full-text search types
+export type SearchSource = "journal" | "email" | "memory";
+
+export const SEARCH_SOURCES: SearchSource[] = ["journal", "email", "memory"];
+
+export type SearchOptions = {
+  sources?: SearchSource[]; // Defaults to all sources
+  limit?: number; // Defaults to 20
+};
+
+export type SearchResult = {
+  source: SearchSource;
+  id: number;
+  title: string | null; // Entry title, email subject or memory topic
+  snippet: string; // HTML-escaped excerpt with matches wrapped in <mark></mark>
+  rank: number;
+  createdAt: Date;
+};
+
+// Keyset pagination position: the (timestamp, id) of the last row already returned.
+// The timestamp is kept as Postgres text so microsecond precision survives the round trip.
+export type PageCursor = {
+  timestamp: string;
+  id: number;
+};
+
+export type Page<T> = {
+  items: T[];
+  nextCursor: string | null; // Opaque token for the next page, null on the last page
+};
+
+export function encodeCursor(cursor: PageCursor): string {
+  return Buffer.from(JSON.stringify([cursor.timestamp, cursor.id])).toString("base64url");
+}
+
+export function decodeCursor(token: string): PageCursor | undefined {
+  try {
+    const [timestamp, id] = JSON.parse(Buffer.from(token, "base64url").toString("utf8"));
+    if (typeof timestamp !== "string" || !Number.isInteger(id) || isNaN(Date.parse(timestamp))) {
+      return undefined;
+    }
+    return { timestamp, id };
+  } catch {
+    return undefined;
+  }
+}
+
+// Resolve a dateRange filter value (7days, 30days, year, all) to its cutoff date
+export function getDateRangeCutoff(dateRange?: string): Date | undefined {
+  if (!dateRange || dateRange === 'all') {
+    return undefined;
+  }
+
+  const now = new Date();
+  const cutoffDate = new Date();
+
+  switch (dateRange) {
+    case '7days':
+      cutoffDate.setDate(now.getDate() - 7);
+      break;
+    case '30days':
+      cutoffDate.setDate(now.getDate() - 30);
+      break;
+    case 'year':
+      cutoffDate.setFullYear(now.getFullYear() - 1);
+      break;
+    default:
+      return undefined;
+  }
+
+  return cutoffDate;
+}
@@ -4,11 +4,21 @@ import {
   type Email, type InsertEmail, type UpdateUserPreferences, type SmsMessage, 
   type InsertSmsMessage, type PaymentMethod, type InsertPaymentMethod,
   type BillingTransaction, type InsertBillingTransaction,
-  type ConversationMemory, type InsertConversationMemory, type EmailQueueItem, type InsertEmailQueue
+  type ConversationMemory, type InsertConversationMemory, type EmailQueueItem, type InsertEmailQueue,
+  type DailyDelivery
 } from "@shared/schema";
 import createMemoryStore from "memorystore";
 import session from "express-session";
 import { DatabaseStorage } from "./database-storage";
+import { SearchIndex } from "./search-index";
+import {
+  JournalFilter, EmailFilter, SmsFilter, Page, PageCursor,
+  SearchOptions, SearchResult, SEARCH_SOURCES,
+  DeliveryChannel, DELIVERY_CLAIM_TIMEOUT_MS, MAX_DELIVERY_ATTEMPTS,
+  encodeCursor, getDateRangeCutoff
+} from "./storage-shared";
+
+export * from "./storage-shared";
 
 // Memory store for session
 const MemoryStore = createMemoryStore(session);
@@ -31,6 +41,7 @@ export interface IStorage {
   
   // Journal operations
   getJournalEntries(userId: number, filter?: JournalFilter): Promise<JournalEntry[]>;
+  getJournalEntriesPage(userId: number, filter?: JournalFilter): Promise<Page<JournalEntry>>;
   getJournalEntry(id: number): Promise<JournalEntry | undefined>;
   createJournalEntry(entry: InsertJournalEntry): Promise<JournalEntry>;
   updateJournalEntry(id: number, entry: Partial<InsertJournalEntry>): Promise<JournalEntry | undefined>;
@@ -38,6 +49,7 @@ export interface IStorage {
   
   // Email operations
   getEmails(userId: number, filter?: EmailFilter): Promise<Email[]>;
+  getEmailsPage(userId: number, filter?: EmailFilter): Promise<Page<Email>>;
   getEmail(id: number): Promise<Email | undefined>;
   createEmail(email: InsertEmail): Promise<Email>;
   markEmailAsRead(id: number): Promise<Email | undefined>;
@@ -76,29 +88,20 @@ export interface IStorage {
   markEmailFailed(id: number, errorMessage: string): Promise<EmailQueueItem | undefined>;
   incrementEmailAttempts(id: number): Promise<EmailQueueItem | undefined>;
   
+  // Daily delivery checkpoints
+  claimDailyDelivery(userId: number, channel: DeliveryChannel, deliveryDate: string): Promise<DailyDelivery | undefined>;
+  markDailyDeliverySent(id: number): Promise<DailyDelivery | undefined>;
+  markDailyDeliveryFailed(id: number, errorMessage: string): Promise<DailyDelivery | undefined>;
+  // Unsent deliveries claimed since `since` whose claim has expired and that have attempts left
+  getRetryableDailyDeliveries(since: Date): Promise<DailyDelivery[]>;
+  
+  // Full-text search across journal entries, emails and conversation memories
+  searchContent(userId: number, query: string, options?: SearchOptions): Promise<SearchResult[]>;
+  
   // Session store
   sessionStore: any; // Using any type to avoid SessionStore type issues
 }
 
-// Filter types
-export type JournalFilter = {
-  dateRange?: string; // 7days, 30days, year, all
-  mood?: string;
-  tags?: string[];
-};
-
-export type EmailFilter = {
-  type?: string;
-  isRead?: boolean;
-  dateRange?: string; // 7days, 30days, year, all
-};
-
-export type SmsFilter = {
-  direction?: "inbound" | "outbound";
-  isJournalEntry?: boolean;
-  dateRange?: string; // 7days, 30days, year, all
-};
-
 export class MemStorage implements IStorage {
   private users: Map<number, User>;
   private journalEntries: Map<number, JournalEntry>;
@@ -106,6 +109,11 @@ export class MemStorage implements IStorage {
   private userIdCount: number;
   private journalIdCount: number;
   private emailIdCount: number;
+  private conversationMemories: Map<number, ConversationMemory>;
+  private conversationMemoryIdCount: number;
+  private searchIndex: SearchIndex;
+  private dailyDeliveries: Map<string, DailyDelivery>;
+  private dailyDeliveryIdCount: number;
   sessionStore: session.SessionStore;
 
   constructor() {
@@ -115,6 +123,11 @@ export class MemStorage implements IStorage {
     this.userIdCount = 1;
     this.journalIdCount = 1;
     this.emailIdCount = 1;
+    this.conversationMemories = new Map();
+    this.conversationMemoryIdCount = 1;
+    this.searchIndex = new SearchIndex();
+    this.dailyDeliveries = new Map();
+    this.dailyDeliveryIdCount = 1;
     this.sessionStore = new MemoryStore({
       checkPeriod: 86400000 // Prune expired entries every 24h
     });
@@ -181,34 +194,22 @@ export class MemStorage implements IStorage {
 
   // Journal methods
   async getJournalEntries(userId: number, filter?: JournalFilter): Promise<JournalEntry[]> {
+    const page = await this.getJournalEntriesPage(userId, filter);
+    return page.items;
+  }
+
+  async getJournalEntriesPage(userId: number, filter?: JournalFilter): Promise<Page<JournalEntry>> {
     let entries = Array.from(this.journalEntries.values())
       .filter(entry => entry.userId === userId)
-      .sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime());
+      .sort((a, b) => compareNewestFirst(a.createdAt, a.id, b.createdAt, b.id));
 
     if (filter) {
       // Filter by date range
-      if (filter.dateRange) {
-        const now = new Date();
-        let cutoffDate = new Date();
-        
-        switch(filter.dateRange) {
-          case '7days':
-            cutoffDate.setDate(now.getDate() - 7);
-            break;
-          case '30days':
-            cutoffDate.setDate(now.getDate() - 30);
-            break;
-          case 'year':
-            cutoffDate.setFullYear(now.getFullYear() - 1);
-            break;
-          // 'all' doesn't need filtering
-        }
-        
-        if (filter.dateRange !== 'all') {
-          entries = entries.filter(entry => 
-            new Date(entry.createdAt) >= cutoffDate
-          );
-        }
+      const cutoffDate = filter.createdAfter ?? getDateRangeCutoff(filter.dateRange);
+      if (cutoffDate) {
+        entries = entries.filter(entry => 
+          new Date(entry.createdAt) >= cutoffDate
+        );
       }
       
       // Filter by mood
@@ -224,7 +225,7 @@ export class MemStorage implements IStorage {
       }
     }
     
-    return entries;
+    return paginateNewestFirst(entries, entry => entry.createdAt, filter?.cursor, filter?.limit);
   }
 
   async getJournalEntry(id: number): Promise<JournalEntry | undefined> {
@@ -244,6 +245,7 @@ export class MemStorage implements IStorage {
     };
     
     this.journalEntries.set(id, entry);
+    this.indexJournalEntry(entry);
     return entry;
   }
 
@@ -260,23 +262,40 @@ export class MemStorage implements IStorage {
     };
     
     this.journalEntries.set(id, updatedEntry);
+    this.indexJournalEntry(updatedEntry);
     return updatedEntry;
   }
 
   async deleteJournalEntry(id: number): Promise<boolean> {
-    const exists = this.journalEntries.has(id);
-    if (exists) {
+    const entry = this.journalEntries.get(id);
+    if (entry) {
       this.journalEntries.delete(id);
+      this.searchIndex.remove(entry.userId, "journal", id);
       return true;
     }
     return false;
   }
 
+  private indexJournalEntry(entry: JournalEntry) {
+    this.searchIndex.upsert(entry.userId, {
+      source: "journal",
+      id: entry.id,
+      title: entry.title,
+      body: entry.content,
+      createdAt: entry.createdAt
+    });
+  }
+
   // Email methods
   async getEmails(userId: number, filter?: EmailFilter): Promise<Email[]> {
+    const page = await this.getEmailsPage(userId, filter);
+    return page.items;
+  }
+
+  async getEmailsPage(userId: number, filter?: EmailFilter): Promise<Page<Email>> {
     let userEmails = Array.from(this.emails.values())
       .filter(email => email.userId === userId)
-      .sort((a, b) => new Date(b.sentAt).getTime() - new Date(a.sentAt).getTime());
+      .sort((a, b) => compareNewestFirst(a.sentAt, a.id, b.sentAt, b.id));
     
     if (filter) {
       // Filter by type
@@ -288,34 +307,26 @@ export class MemStorage implements IStorage {
       if (filter.isRead !== undefined) {
         userEmails = userEmails.filter(email => email.isRead === filter.isRead);
       }
+
+      // Filter by thread
+      if (filter.conversationId) {
+        userEmails = userEmails.filter(email => email.conversationId === filter.conversationId);
+      }
+
+      if (filter.messageId) {
+        userEmails = userEmails.filter(email => email.messageId === filter.messageId);
+      }
       
       // Filter by date range
-      if (filter.dateRange) {
-        const now = new Date();
-        let cutoffDate = new Date();
-        
-        switch(filter.dateRange) {
-          case '7days':
-            cutoffDate.setDate(now.getDate() - 7);
-            break;
-          case '30days':
-            cutoffDate.setDate(now.getDate() - 30);
-            break;
-          case 'year':
-            cutoffDate.setFullYear(now.getFullYear() - 1);
-            break;
-          // 'all' doesn't need filtering
-        }
-        
-        if (filter.dateRange !== 'all') {
-          userEmails = userEmails.filter(email => 
-            new Date(email.sentAt) >= cutoffDate
-          );
-        }
+      const cutoffDate = getDateRangeCutoff(filter.dateRange);
+      if (cutoffDate) {
+        userEmails = userEmails.filter(email => 
+          new Date(email.sentAt) >= cutoffDate
+        );
       }
     }
     
-    return userEmails;
+    return paginateNewestFirst(userEmails, email => email.sentAt, filter?.cursor, filter?.limit);
   }
 
   async getEmail(id: number): Promise<Email | undefined> {
@@ -334,6 +345,13 @@ export class MemStorage implements IStorage {
     };
     
     this.emails.set(id, email);
+    this.searchIndex.upsert(email.userId, {
+      source: "email",
+      id,
+      title: email.subject,
+      body: email.content,
+      createdAt: sentAt
+    });
     return email;
   }
 
@@ -351,6 +369,179 @@ export class MemStorage implements IStorage {
     this.emails.set(id, updatedEmail);
     return updatedEmail;
   }
+
+  // Conversation memory methods
+  async getConversationMemories(userId: number, type?: string): Promise<ConversationMemory[]> {
+    return Array.from(this.conversationMemories.values())
+      .filter(memory => memory.userId === userId && (!type || memory.type === type))
+      .sort((a, b) => compareNewestFirst(a.lastDiscussed, a.id, b.lastDiscussed, b.id)); // Most recent first
+  }
+
+  async getConversationMemory(id: number): Promise<ConversationMemory | undefined> {
+    return this.conversationMemories.get(id);
+  }
+
+  async createConversationMemory(insertMemory: InsertConversationMemory): Promise<ConversationMemory> {
+    const id = this.conversationMemoryIdCount++;
+    const now = new Date();
+    
+    const memory: ConversationMemory = {
+      topic: null,
+      sentiment: null,
+      importance: 1,
+      frequency: 1,
+      relatedEntryIds: null,
+      isResolved: false,
+      category: null,
+      emotionalTone: null,
+      growthOpportunity: null,
+      ...insertMemory,
+      id,
+      lastDiscussed: now,
+      firstMentionedAt: now
+    };
+    
+    this.conversationMemories.set(id, memory);
+    this.indexConversationMemory(memory);
+    return memory;
+  }
+
+  async updateConversationMemory(id: number, updates: Partial<InsertConversationMemory>): Promise<ConversationMemory | undefined> {
+    const memory = this.conversationMemories.get(id);
+    if (!memory) {
+      return undefined;
+    }
+    
+    const updatedMemory: ConversationMemory = {
+      ...memory,
+      ...updates,
+      lastDiscussed: new Date()
+    };
+    
+    this.conversationMemories.set(id, updatedMemory);
+    this.indexConversationMemory(updatedMemory);
+    return updatedMemory;
+  }
+
+  async incrementConversationMemoryFrequency(id: number): Promise<ConversationMemory | undefined> {
+    const memory = this.conversationMemories.get(id);
+    if (!memory) {
+      return undefined;
+    }
+    
+    return this.updateConversationMemory(id, { frequency: (memory.frequency || 0) + 1 });
+  }
+
+  async markConversationMemoryResolved(id: number, isResolved: boolean): Promise<ConversationMemory | undefined> {
+    return this.updateConversationMemory(id, { isResolved });
+  }
+
+  // Same fields DatabaseStorage searches: topic as the title, context as the body
+  private indexConversationMemory(memory: ConversationMemory) {
+    this.searchIndex.upsert(memory.userId, {
+      source: "memory",
+      id: memory.id,
+      title: memory.topic,
+      body: memory.context,
+      createdAt: memory.firstMentionedAt
+    });
+  }
+
+  // Daily delivery checkpoint methods
+  async claimDailyDelivery(userId: number, channel: DeliveryChannel, deliveryDate: string): Promise<DailyDelivery | undefined> {
+    const key = `${userId}:${channel}:${deliveryDate}`;
+    const existing = this.dailyDeliveries.get(key);
+    const now = new Date();
+    
+    if (!existing) {
+      const delivery: DailyDelivery = {
+        id: this.dailyDeliveryIdCount++,
+        userId,
+        channel,
+        deliveryDate,
+        status: "pending",
+        attempts: 1,
+        claimedAt: now,
+        sentAt: null,
+        errorMessage: null
+      };
+      this.dailyDeliveries.set(key, delivery);
+      return delivery;
+    }
+    
+    const stale = existing.status === "failed" ||
+      (existing.status === "pending" && now.getTime() - existing.claimedAt.getTime() > DELIVERY_CLAIM_TIMEOUT_MS);
+    if (!stale || existing.attempts >= MAX_DELIVERY_ATTEMPTS) {
+      return undefined;
+    }
+    
+    existing.status = "pending";
+    existing.attempts++;
+    existing.claimedAt = now;
+    return existing;
+  }
+
+  async markDailyDeliverySent(id: number): Promise<DailyDelivery | undefined> {
+    const delivery = Array.from(this.dailyDeliveries.values()).find(d => d.id === id);
+    if (delivery) {
+      delivery.status = "sent";
+      delivery.sentAt = new Date();
+    }
+    return delivery;
+  }
+
+  async markDailyDeliveryFailed(id: number, errorMessage: string): Promise<DailyDelivery | undefined> {
+    const delivery = Array.from(this.dailyDeliveries.values()).find(d => d.id === id);
+    if (delivery) {
+      delivery.status = "failed";
+      delivery.errorMessage = errorMessage;
+    }
+    return delivery;
+  }
+
+  async getRetryableDailyDeliveries(since: Date): Promise<DailyDelivery[]> {
+    const staleBefore = Date.now() - DELIVERY_CLAIM_TIMEOUT_MS;
+    return Array.from(this.dailyDeliveries.values()).filter(delivery =>
+      delivery.status !== "sent" &&
+      delivery.attempts < MAX_DELIVERY_ATTEMPTS &&
+      delivery.claimedAt.getTime() >= since.getTime() &&
+      delivery.claimedAt.getTime() < staleBefore
+    );
+  }
+
+  // Search methods
+  async searchContent(userId: number, query: string, options?: SearchOptions): Promise<SearchResult[]> {
+    const sources = options?.sources?.length ? options.sources : SEARCH_SOURCES;
+    return this.searchIndex.search(userId, query, sources, options?.limit ?? 20);
+  }
+}
+
+function compareNewestFirst(aTime: Date, aId: number, bTime: Date, bId: number): number {
+  return (new Date(bTime).getTime() - new Date(aTime).getTime()) || (bId - aId);
+}
+
+// In-memory equivalent of the keyset pagination DatabaseStorage runs in SQL
+function paginateNewestFirst<T extends { id: number }>(
+  rows: T[],
+  getTime: (row: T) => Date,
+  cursor?: PageCursor,
+  limit?: number
+): Page<T> {
+  if (cursor) {
+    const cursorTime = new Date(cursor.timestamp);
+    rows = rows.filter(row => compareNewestFirst(cursorTime, cursor.id, getTime(row), row.id) < 0);
+  }
+
+  if (!limit || rows.length <= limit) {
+    return { items: rows, nextCursor: null };
+  }
+
+  const items = rows.slice(0, limit);
+  const last = items[items.length - 1];
+  return {
+    items,
+    nextCursor: encodeCursor({ timestamp: new Date(getTime(last)).toISOString(), id: last.id })
+  };
 }
 
 // Use the database storage implementation
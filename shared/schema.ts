@@ -1,7 +1,21 @@
-import { pgTable, text, serial, integer, boolean, timestamp, json, jsonb } from "drizzle-orm/pg-core";
+import { pgTable, text, serial, integer, boolean, timestamp, json, jsonb, index, uniqueIndex } from "drizzle-orm/pg-core";
 import { createInsertSchema } from "drizzle-zod";
+import { sql } from "drizzle-orm";
 import { z } from "zod";
 
+// Full-text search documents: title-like fields weighted A, body weighted B.
+// The GIN expression indexes below and the search queries in DatabaseStorage
+// must use these exact expressions for Postgres to pick the index.
+export const journalSearchVector = sql.raw(
+  `(setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', content), 'B'))`
+);
+export const emailSearchVector = sql.raw(
+  `(setweight(to_tsvector('english', subject), 'A') || setweight(to_tsvector('english', content), 'B'))`
+);
+export const memorySearchVector = sql.raw(
+  `(setweight(to_tsvector('english', coalesce(topic, '')), 'A') || setweight(to_tsvector('english', context), 'B'))`
+);
+
 // Conversations table
 export const conversations = pgTable("conversations", {
   id: serial("id").primaryKey(),
@@ -47,10 +61,16 @@ export const journalEntries = pgTable("journal_entries", {
   createdAt: timestamp("created_at").defaultNow().notNull(),
   updatedAt: timestamp("updated_at").defaultNow().notNull(),
   mood: text("mood"), // happy, calm, neutral, sad, frustrated
-  tags: json("tags").$type<string[]>(),
+  tags: jsonb("tags").$type<string[]>(), // jsonb so tag overlap filters can use a GIN index
   imageUrl: text("image_url"),
   emailId: text("email_id"), // To track which email this entry is responding to
-});
+}, (table) => [
+  // Keyset pagination on (created_at, id), newest first
+  index("journal_entries_user_created_idx").on(table.userId, table.createdAt.desc(), table.id.desc()),
+  index("journal_entries_user_mood_created_idx").on(table.userId, table.mood, table.createdAt.desc(), table.id.desc()),
+  index("journal_entries_tags_gin_idx").using("gin", table.tags),
+  index("journal_entries_search_idx").using("gin", journalSearchVector),
+]);
 
 // Payment methods table
 export const paymentMethods = pgTable("payment_methods", {
@@ -95,7 +115,12 @@ export const emails = pgTable("emails", {
   from: text("from"), // Sender email address
   mood: text("mood"), // Detected mood from content
   tags: json("tags").$type<string[]>(), // Extracted tags
-});
+}, (table) => [
+  // Keyset pagination on (sent_at, id), newest first
+  index("emails_user_sent_idx").on(table.userId, table.sentAt.desc(), table.id.desc()),
+  index("emails_user_conversation_idx").on(table.userId, table.conversationId, table.sentAt.desc()),
+  index("emails_search_idx").using("gin", emailSearchVector),
+]);
 
 // SMS messages table to track SMS conversations
 export const smsMessages = pgTable("sms_messages", {
@@ -128,7 +153,9 @@ export const conversationMemories = pgTable("conversation_memories", {
   category: text("category"), // Category such as work, relationships, health, etc.
   emotionalTone: text("emotional_tone"), // More nuanced emotional analysis
   growthOpportunity: text("growth_opportunity"), // Potential area for personal growth related to this topic
-});
+}, (table) => [
+  index("conversation_memories_search_idx").using("gin", memorySearchVector),
+]);
 
 // Email queue table for asynchronous processing
 export const emailQueue = pgTable("email_queue", {
@@ -142,6 +169,24 @@ export const emailQueue = pgTable("email_queue", {
   processedAt: timestamp("processed_at"),
 });
 
+// Daily inspiration delivery checkpoints, one row per user, channel and local date.
+// The scheduler claims a row before generating content so a restart resumes
+// a run without skipping or duplicating deliveries.
+export const dailyDeliveries = pgTable("daily_deliveries", {
+  id: serial("id").primaryKey(),
+  userId: integer("user_id").references(() => users.id).notNull(),
+  channel: text("channel").notNull(), // email, sms
+  deliveryDate: text("delivery_date").notNull(), // YYYY-MM-DD in the user's timezone
+  status: text("status").default("pending").notNull(), // pending, sent, failed
+  attempts: integer("attempts").default(1).notNull(),
+  claimedAt: timestamp("claimed_at").defaultNow().notNull(),
+  sentAt: timestamp("sent_at"),
+  errorMessage: text("error_message"),
+}, (table) => [
+  uniqueIndex("daily_deliveries_user_channel_date_idx").on(table.userId, table.channel, table.deliveryDate),
+  index("daily_deliveries_unsent_claimed_at_idx").on(table.claimedAt).where(sql`status <> 'sent'`),
+]);
+
 // Types for JSON fields
 export type UserPreferences = {
   emailFrequency: "daily" | "weekdays" | "weekends" | "weekly";
@@ -155,6 +200,7 @@ export type UserPreferences = {
   lastName?: string;
   bio?: string;
   emailDeliveryTime?: string; // Time of day for daily emails, format: "HH:MM" in 24hr format
+  timezone?: string; // IANA timezone the delivery time is in, e.g. "America/New_York"
   disableDailyEmails?: boolean; // Option to turn off daily inspirations
 };
 
@@ -255,6 +301,15 @@ export const insertBillingTransactionSchema = createInsertSchema(billingTransact
     status: z.enum(["succeeded", "failed", "pending"]),
   });
 
+function isValidTimeZone(timeZone: string): boolean {
+  try {
+    new Intl.DateTimeFormat("en-US", { timeZone });
+    return true;
+  } catch {
+    return false;
+  }
+}
+
 export const updateUserPreferencesSchema = z.object({
   emailFrequency: z.enum(["daily", "weekdays", "weekends", "weekly"]),
   marketingEmails: z.boolean().default(false),
@@ -264,6 +319,9 @@ export const updateUserPreferencesSchema = z.object({
   receiveSms: z.boolean().default(false).optional(),
   smsConsent: z.boolean().default(false).optional(),
   emailDeliveryTime: z.string().optional(),
+  timezone: z.string().optional().refine(val => !val || isValidTimeZone(val), {
+    message: "Please enter a valid IANA timezone (e.g., America/New_York)"
+  }),
   disableDailyEmails: z.boolean().optional(),
   phoneNumber: z.string().optional().refine(val => !val || /^\+?[1-9]\d{1,14}$/.test(val), {
     message: "Please enter a valid phone number in E.164 format (e.g., +14155552671)"
@@ -281,6 +339,7 @@ export type BillingTransaction = typeof billingTransactions.$inferSelect;
 export type ConversationMemory = typeof conversationMemories.$inferSelect;
 export type Conversation = typeof conversations.$inferSelect;
 export type EmailQueueItem = typeof emailQueue.$inferSelect;
+export type DailyDelivery = typeof dailyDeliveries.$inferSelect;
 export type InsertJournalEntry = z.infer<typeof insertJournalEntrySchema>;
 export type InsertEmail = z.infer<typeof insertEmailSchema>;
 export type InsertSmsMessage = z.infer<typeof insertSmsMessageSchema>;